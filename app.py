@@ -1,18 +1,24 @@
+# Startup profiler FIRST so its import hook sees every module (--profile-startup)
+from src.core.startup_profiler import PROFILE_STARTUP, get_startup_profiler, startup_step
+
 from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Form, Depends, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional, Union
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from enum import Enum
 from contextlib import asynccontextmanager
 import chromadb
 from pathlib import Path
 import hashlib
+import importlib
 import json
 import logging
 import os
+import sys
 
 # Initialize structured logging FIRST
 from src.core.logging_config import init_app_logging, get_logger, set_request_id, get_request_id
@@ -31,48 +37,8 @@ import tempfile
 from concurrent.futures import ThreadPoolExecutor
 import mimetypes
 
-# Document processing imports
-# Using simple text splitter to avoid langchain dependency conflicts
-import PyPDF2
-import magic
-from docx import Document as DocxDocument
-from pptx import Presentation
-import openpyxl
-import xlrd
-from bs4 import BeautifulSoup
-import email
-from email.mime.text import MIMEText
-from dateutil import parser as date_parser
-
-# OCR imports
-try:
-    import pytesseract
-    from PIL import Image
-    from pdf2image import convert_from_path
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-    logging.warning("OCR dependencies not available")
-
-# LLM provider imports
-import anthropic
-import openai
-import groq
-try:
-    import google.generativeai as genai
-    GOOGLE_AVAILABLE = True
-except ImportError:
-    GOOGLE_AVAILABLE = False
-    logger.warning("Google Generative AI not available")
-
-# File monitoring
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-
-# Rich console output
-from rich.console import Console
-from rich.table import Table
-from tqdm import tqdm
+# Document processing, OCR and LLM provider SDKs are imported by the services
+# that use them, on first use (see src/core/startup_profiler.lazy_import)
 
 # New service layer imports
 try:
@@ -93,10 +59,13 @@ try:
     from src.services.contact_service import ContactService
     from src.services.calendar_service import CalendarService
     from src.services.entity_name_filter_service import EntityNameFilterService
+    from src.services.monitoring_service import get_monitoring_service
+    from src.services.ocr_service import OCR_AVAILABLE
 
     NEW_SERVICES_AVAILABLE = True
 except ImportError as e:
     NEW_SERVICES_AVAILABLE = False
+    OCR_AVAILABLE = False
     logging.warning(f"New service layer not available: {e}")
 
 # Import schemas from centralized models file
@@ -109,7 +78,7 @@ from src.models.schemas import (
 )
 
 # Import route modules
-from src.routes import health, ingest, search, stats, chat, admin, email_threading, evaluation, monitoring
+from src.routes import health, ingest, search, stats, chat, admin, email_threading, evaluation, monitoring, export
 
 # Simple text splitter to replace langchain dependency
 
@@ -117,7 +86,6 @@ from src.routes import health, ingest, search, stats, chat, admin, email_threadi
 from src.services.rag_service import (
     SimpleTextSplitter,
     CostTracker,
-    FileWatchHandler,
     RAGService,
     MODEL_PRICING,
     cost_tracking
@@ -127,7 +95,6 @@ from src.services.rag_service import (
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-console = Console()
 
 # Environment variables with defaults
 CHROMA_HOST = os.getenv("CHROMA_HOST", "localhost")
@@ -246,7 +213,7 @@ LLM_PROVIDERS = {
             "anthropic/claude-3-5-sonnet-20241022": {"max_tokens": 4000, "model_name": "claude-3-5-sonnet-20241022"},
             "anthropic/claude-3-opus-20240229": {"max_tokens": 4000, "model_name": "claude-3-opus-20240229"}
         },
-        "client_class": anthropic.Anthropic
+        "client_class": "anthropic.Anthropic"
     },
     "openai": {
         "api_key": OPENAI_API_KEY,
@@ -254,37 +221,63 @@ LLM_PROVIDERS = {
             "openai/gpt-4o-mini": {"max_tokens": 4000, "model_name": "gpt-4o-mini"},
             "openai/gpt-4o": {"max_tokens": 4000, "model_name": "gpt-4o"}
         },
-        "client_class": openai.OpenAI
+        "client_class": "openai.OpenAI"
     },
     "groq": {
         "api_key": GROQ_API_KEY,
         "models": {
             "groq/llama-3.1-8b-instant": {"max_tokens": 8000, "model_name": "llama-3.1-8b-instant"}
         },
-        "client_class": groq.Groq
+        "client_class": "groq.Groq"
     },
     "google": {
         "api_key": GOOGLE_API_KEY,
         "models": {
             "google/gemini-1.5-pro": {"max_tokens": 8000, "model_name": "gemini-1.5-pro-latest"}
         },
-        "client_class": None  # Will be set during import
+        "client_class": "google.generativeai.GenerativeModel"
     }
 }
 
-# Initialize LLM clients
-llm_clients = {}
-for provider, config in LLM_PROVIDERS.items():
-    if config["api_key"]:
-        try:
-            if provider == "google" and GOOGLE_AVAILABLE:
-                genai.configure(api_key=config["api_key"])
-                llm_clients[provider] = genai.GenerativeModel('gemini-1.5-pro-latest')
-            elif provider in ["groq", "anthropic", "openai"]:
-                llm_clients[provider] = config["client_class"](api_key=config["api_key"])
+class LLMClients(Mapping):
+    """
+    Provider SDK clients for every provider with an API key
+
+    Membership and iteration only look at the configuration; the SDK
+    (anthropic/openai/groq/google, ~1.5s of imports together) is imported and
+    the client constructed the first time a provider's client is accessed.
+    """
+
+    def __init__(self, providers: Dict[str, Dict[str, Any]]):
+        self._providers = {name: config for name, config in providers.items() if config["api_key"]}
+        self._clients: Dict[str, Any] = {}
+
+    def _create(self, provider: str):
+        config = self._providers[provider]
+        module_name, class_name = config["client_class"].rsplit(".", 1)
+        module = importlib.import_module(module_name)
+        if provider == "google":
+            module.configure(api_key=config["api_key"])
+            return getattr(module, class_name)(config["models"]["google/gemini-1.5-pro"]["model_name"])
+        return getattr(module, class_name)(api_key=config["api_key"])
+
+    def __getitem__(self, provider: str):
+        if provider not in self._clients:
+            if provider not in self._providers:
+                raise KeyError(provider)
+            self._clients[provider] = self._create(provider)
             logger.info(f"Initialized {provider} LLM client")
-        except Exception as e:
-            logger.warning(f"Failed to initialize {provider} client: {e}")
+        return self._clients[provider]
+
+    def __iter__(self):
+        return iter(self._providers)
+
+    def __len__(self):
+        return len(self._providers)
+
+
+# LLM clients (constructed on first use)
+llm_clients = LLMClients(LLM_PROVIDERS)
 
 # Cost tracking storage (in-memory for simplicity, could be moved to database)
 cost_tracking = {
@@ -335,6 +328,9 @@ async def lifespan(app: FastAPI):
     # Startup: Pre-load models and initialize services
     logger.info("🚀 Starting up RAG service...")
 
+    if ENABLE_FILE_WATCH and 'watch_ingestor' in globals():
+        watch_ingestor.start()
+
     # Pre-load reranking model in background to avoid blocking startup (if enabled)
     enable_reranking = os.getenv("ENABLE_RERANKING", "true").lower() == "true"
     if enable_reranking:
@@ -365,12 +361,20 @@ async def lifespan(app: FastAPI):
     if ENABLE_FILE_WATCH and 'file_observer' in globals():
         file_observer.stop()
         file_observer.join()
+        await watch_ingestor.stop()
         logger.info("✅ File watcher stopped")
 
     if 'executor' in globals():
         executor.shutdown(wait=True)
         logger.info("✅ Thread pool executor shutdown")
 
+    from src.services.vault_writer_service import get_vault_write_queue
+    get_vault_write_queue().close()
+    logger.info("✅ Obsidian vault writes flushed")
+
+    from src.services.drift_monitor_service import get_corpus_aggregates
+    get_corpus_aggregates().save()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Enhanced RAG Service",
@@ -400,6 +404,23 @@ app.include_router(admin.router)
 app.include_router(email_threading.router)
 app.include_router(evaluation.router)
 app.include_router(monitoring.router)
+app.include_router(export.router)
+
+def _record_request_metrics(request: Request, status_code: int, duration_ms: float):
+    """Per-route request counter and latency sketch (scraped via /metrics)"""
+    route = request.scope.get("route")
+    # Route templates keep label cardinality bounded (no raw IDs in paths)
+    endpoint = getattr(route, "path", None) or "unmatched"
+    metrics = get_monitoring_service().metrics
+    metrics.increment_counter(
+        "http_requests_total",
+        labels={"endpoint": endpoint, "method": request.method, "status": str(status_code)}
+    )
+    metrics.observe_histogram(
+        "http_request_duration_ms",
+        duration_ms,
+        labels={"endpoint": endpoint, "method": request.method}
+    )
 
 # Logging middleware - tracks all requests with timing
 @app.middleware("http")
@@ -420,6 +441,7 @@ async def logging_middleware(request: Request, call_next):
 
         # Calculate duration
         duration_ms = (time.time() - start_time) * 1000
+        _record_request_metrics(request, response.status_code, duration_ms)
 
         # Log response
         logger.info(
@@ -434,6 +456,7 @@ async def logging_middleware(request: Request, call_next):
     except Exception as e:
         # Log errors
         duration_ms = (time.time() - start_time) * 1000
+        _record_request_metrics(request, 500, duration_ms)
         logger.error(
             f"← {request.method} {request.url.path} -> ERROR ({duration_ms:.2f}ms): {str(e)}",
             exc_info=True
@@ -486,14 +509,20 @@ file_watcher = None
 executor = ThreadPoolExecutor(max_workers=4)
 
 # Initialize services
-rag_service = RAGService()
+with startup_step("RAGService"):
+    rag_service = RAGService()
 
 # Expose chroma_client and collection from RAGService for health checks
 from src.services.rag_service import chroma_client, collection
 
 # Setup file watcher
 if ENABLE_FILE_WATCH:
-    file_handler = FileWatchHandler(rag_service)
+    from watchdog.observers import Observer
+    from src.services.watch_folder_service import FileWatchHandler, WatchFolderIngestor
+
+    # Events are debounced and ingested in batches on the app's event loop (started in lifespan)
+    watch_ingestor = WatchFolderIngestor(rag_service.process_file_from_watch)
+    file_handler = FileWatchHandler(watch_ingestor)
     file_observer = Observer()
     os.makedirs(PATHS['input_path'], exist_ok=True)
     file_observer.schedule(file_handler, PATHS['input_path'], recursive=False)
@@ -749,10 +778,21 @@ try:
 except ImportError as e:
     logger.warning(f"Enhanced RAG features not available: {e}")
 
+# Cold start summary (full per-module report: python app.py --profile-startup)
+_startup_report = get_startup_profiler().report(top=3)
+_startup_steps = ", ".join(f"{step['name']} {step['ms']:.0f}ms" for step in _startup_report["init_steps"])
+logger.info(f"⏱️  App initialized in {_startup_report['total_ms']:.0f}ms ({_startup_steps})")
+if PROFILE_STARTUP and "--profile-startup" not in sys.argv:
+    logger.info("\n" + get_startup_profiler().format_report())
+
 if __name__ == "__main__":
     import uvicorn
     import socket
 
+    if "--profile-startup" in sys.argv:
+        print(get_startup_profiler().format_report())
+        sys.exit(0)
+
     # Get port from environment with fallback
     APP_PORT = int(os.getenv("APP_PORT", "8001"))
     APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Chunking Throughput Micro-Benchmark
+
+Measures ChunkingService structure parsing and full chunk_text throughput
+on synthetic Markdown and email corpora (or your own files).
+
+Reports per corpus:
+- Document size (MB)
+- Median parse time and chunk_text time (ms)
+- Throughput (MB/s) and chunks produced
+
+Usage:
+    python scripts/analysis/benchmark_chunking.py
+    python scripts/analysis/benchmark_chunking.py --size-mb 1 --repeats 5
+    python scripts/analysis/benchmark_chunking.py --tokenizer cl100k_base
+    python scripts/analysis/benchmark_chunking.py --files data/output/*.md --output chunking.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.services.chunking_service import ChunkingService  # noqa: E402
+
+WORDS = (
+    "retrieval document chunk vector embedding search query ranking invoice contract "
+    "school meeting project budget schedule report analysis summary decision action "
+    "the a of and to in for with on by from about"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+
+def generate_markdown(size_bytes: int, seed: int = 42) -> str:
+    """Generate Markdown with headings, paragraphs, lists, tables and code"""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    section = 0
+
+    while total < size_bytes:
+        section += 1
+        block = [f"# Chapter {section}", "", " ".join(_sentence(rng) for _ in range(4)), ""]
+        for sub in range(1, 4):
+            block += [f"## Section {section}.{sub}", ""]
+            block += [" ".join(_sentence(rng) for _ in range(5)), ""]
+            block += [f"- {_sentence(rng, 6)}" for _ in range(4)] + [""]
+            block += [f"{n}. {_sentence(rng, 5)}" for n in range(1, 4)] + [""]
+            if sub == 2:
+                block += ["| Item | Amount | Owner |", "|------|--------|-------|"]
+                block += [f"| {rng.choice(WORDS)} | {rng.randint(1, 999)} | {rng.choice(WORDS)} |" for _ in range(5)]
+                block += [""]
+            if sub == 3:
+                block += ["```python", "def handler(event):", "    return process(event)", "```", ""]
+            block += [f"### Details {section}.{sub}.1", "", _sentence(rng, 20), ""]
+
+        text = "\n".join(block)
+        parts.append(text)
+        total += len(text) + 1
+
+    return "\n".join(parts)
+
+
+def generate_email_thread(size_bytes: int, seed: int = 7) -> str:
+    """Generate a long email thread (headers, quoted replies, signatures)"""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    message = 0
+
+    while total < size_bytes:
+        message += 1
+        block = [
+            f"From: sender{message % 7}@example.com",
+            "To: team@example.com",
+            f"Subject: Re: {_sentence(rng, 4)}",
+            f"Date: Mon, {message % 28 + 1} Oct 2025 10:{message % 60:02d}:00 +0200",
+            "",
+            "Hi all,",
+            "",
+            " ".join(_sentence(rng) for _ in range(3)),
+            "",
+        ]
+        block += [f"> {_sentence(rng, 10)}" for _ in range(6)]
+        block += ["", "* " + _sentence(rng, 8), "* " + _sentence(rng, 8), "", "Best regards,", "Sender", "--", ""]
+        text = "\n".join(block)
+        parts.append(text)
+        total += len(text) + 1
+
+    return "\n".join(parts)
+
+
+def _median_ms(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def benchmark(service: ChunkingService, name: str, content: str, repeats: int) -> Dict:
+    """Benchmark parse and full chunking on one document"""
+    size_mb = len(content.encode("utf-8")) / (1024 * 1024)
+    parse_ms = _median_ms(lambda: service._parse_markdown_structure(content), repeats)
+    chunk_ms = _median_ms(lambda: service.chunk_text(content), repeats)
+    chunks = service.chunk_text(content)
+
+    return {
+        "corpus": name,
+        "size_mb": round(size_mb, 3),
+        "parse_ms": round(parse_ms, 2),
+        "chunk_ms": round(chunk_ms, 2),
+        "parse_mb_per_s": round(size_mb / (parse_ms / 1000), 2) if parse_ms else None,
+        "chunk_mb_per_s": round(size_mb / (chunk_ms / 1000), 2) if chunk_ms else None,
+        "chunks": len(chunks),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ChunkingService throughput")
+    parser.add_argument("--size-mb", type=float, default=1.0, help="Synthetic corpus size in MB")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per measurement (median reported)")
+    parser.add_argument("--tokenizer", default="", help="Exact token counting encoding (e.g. cl100k_base)")
+    parser.add_argument("--files", nargs="*", default=[], help="Additional documents to benchmark")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    service = ChunkingService(tokenizer=args.tokenizer)
+    size_bytes = int(args.size_mb * 1024 * 1024)
+
+    corpora = [
+        ("markdown", generate_markdown(size_bytes)),
+        ("email_thread", generate_email_thread(size_bytes)),
+    ]
+    for path in args.files:
+        corpora.append((Path(path).name, Path(path).read_text(encoding="utf-8", errors="ignore")))
+
+    print("=" * 80)
+    print(f"⏱️  CHUNKING BENCHMARK (tokenizer: {args.tokenizer or '4 chars/token'}, repeats: {args.repeats})")
+    print("=" * 80)
+    print(f"{'corpus':<24}{'MB':>8}{'parse ms':>12}{'chunk ms':>12}{'MB/s':>10}{'chunks':>10}")
+
+    results = []
+    for name, content in corpora:
+        result = benchmark(service, name, content, args.repeats)
+        results.append(result)
+        print(
+            f"{name[:23]:<24}{result['size_mb']:>8.2f}{result['parse_ms']:>12.1f}"
+            f"{result['chunk_ms']:>12.1f}{result['chunk_mb_per_s'] or 0:>10.1f}{result['chunks']:>10}"
+        )
+
+    if service.token_counter is not None:
+        print(f"\nToken cache: {service.token_counter.cache_info()}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"tokenizer": args.tokenizer, "results": results}, indent=2))
+        print(f"\n💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Ingestion Throughput Benchmark
+
+Pushes N synthetic documents through create_ingestion_pipeline with the real
+enrichment, quality, chunking, storage and export stages. The LLM is the
+offline FakeLLMService (configurable latency, error rate and 429s),
+embeddings use a deterministic hashing function and the vault is written to
+a temporary directory, so runs need no API keys or network.
+
+Reports:
+- Documents/s (and outcome counts: stored, gated, failed)
+- Per-stage p50/p95 and share of total time (from the ingest traces)
+- Time spent in external calls (LLM, ChromaDB, file I/O)
+- Peak RSS of the process
+
+Usage:
+    python scripts/analysis/benchmark_ingestion.py
+    python scripts/analysis/benchmark_ingestion.py --docs 200 --concurrency 8
+    python scripts/analysis/benchmark_ingestion.py --llm-latency-ms 1500 --rate-limit-rate 0.05
+    python scripts/analysis/benchmark_ingestion.py --output bench/ingestion.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import chromadb  # noqa: E402
+
+from benchmark_retrieval import HashingEmbeddingFunction, generate_corpus, percentile, _git_commit  # noqa: E402
+from src.core.config import get_settings  # noqa: E402
+from src.core.tracing import Trace  # noqa: E402
+from src.pipeline import RawDocument, StageContext, StageResult, create_ingestion_pipeline  # noqa: E402
+from src.services.chunking_service import ChunkingService  # noqa: E402
+from src.services.enrichment_service import EnrichmentService  # noqa: E402
+from src.services.fake_llm_service import FakeLLMService  # noqa: E402
+from src.services.hybrid_search_service import HybridSearchService  # noqa: E402
+from src.services.obsidian_service import ObsidianService  # noqa: E402
+from src.services.quality_scoring_service import QualityScoringService  # noqa: E402
+from src.services.smart_triage_service import SmartTriageService  # noqa: E402
+from src.services.vault_writer_service import VaultWriteQueue  # noqa: E402
+from src.services.vector_service import VectorService  # noqa: E402
+from src.services.vocabulary_service import VocabularyService  # noqa: E402
+from src.models.schemas import DocumentType  # noqa: E402
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def build_pipeline(args, vault_dir: Path):
+    """Wire the production stages with offline stand-ins"""
+    settings = get_settings()
+    llm_service = FakeLLMService(
+        settings,
+        latency_ms=args.llm_latency_ms,
+        jitter_ms=args.llm_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed
+    )
+
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(
+        name=f"ingest_benchmark_{int(time.time() * 1000)}",
+        embedding_function=HashingEmbeddingFunction(),
+        metadata={"hnsw:space": "cosine"}
+    )
+    vector_service = VectorService(collection, settings, enable_cache=False)
+    vector_service.hybrid_search_service = HybridSearchService()
+
+    write_queue = VaultWriteQueue(flush_interval=0)
+    pipeline = create_ingestion_pipeline(
+        enrichment_service=EnrichmentService(llm_service=llm_service, vocab_service=VocabularyService("vocabulary")),
+        quality_service=QualityScoringService(),
+        chunking_service=ChunkingService(target_size=512, min_size=100, max_size=800, overlap=50),
+        vector_service=vector_service,
+        obsidian_service=ObsidianService(
+            output_dir=str(vault_dir),
+            refs_dir=str(vault_dir / "refs"),
+            write_queue=write_queue
+        ),
+        triage_service=SmartTriageService(collection=collection),
+        enable_triage=not args.no_triage,
+        enable_export=not args.no_export,
+        pipeline_name="benchmark_pipeline"
+    )
+    return pipeline, llm_service, write_queue
+
+
+async def ingest_all(pipeline, corpus: List[Dict[str, Any]], concurrency: int) -> List[Dict[str, Any]]:
+    """Run every document through the pipeline, ``concurrency`` at a time"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def ingest(doc: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            context = StageContext(doc_id=doc["doc_id"], filename=doc["metadata"]["filename"], trace=Trace("benchmark"))
+            raw = RawDocument(
+                content=doc["text"],
+                filename=doc["metadata"]["filename"],
+                document_type=DocumentType.email if doc["metadata"]["document_type"] == "email" else DocumentType.text,
+                metadata=doc["metadata"]
+            )
+            result, _ = await pipeline.run(raw, context)
+            return {"result": result, "timings": context.trace.timing_breakdown()}
+
+    return await asyncio.gather(*(ingest(doc) for doc in corpus))
+
+
+def summarize(runs: List[Dict[str, Any]], wall_s: float) -> Dict[str, Any]:
+    stage_ms: Dict[str, List[float]] = defaultdict(list)
+    external_ms: Dict[str, float] = defaultdict(float)
+    external_calls: Dict[str, int] = defaultdict(int)
+    outcomes = {"stored": 0, "gated": 0, "failed": 0}
+
+    for run in runs:
+        outcome = {StageResult.CONTINUE: "stored", StageResult.STOP: "gated"}.get(run["result"], "failed")
+        outcomes[outcome] += 1
+        for stage, ms in run["timings"]["stages"].items():
+            stage_ms[stage].append(ms)
+        for kind, entry in run["timings"]["external"].items():
+            external_ms[kind] += entry["ms"]
+            external_calls[kind] += entry["calls"]
+
+    total_stage_ms = sum(sum(values) for values in stage_ms.values()) or 1.0
+    return {
+        "documents": len(runs),
+        "wall_s": round(wall_s, 3),
+        "docs_per_s": round(len(runs) / wall_s, 2) if wall_s else 0.0,
+        "outcomes": outcomes,
+        "stages": {
+            stage: {
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "total_ms": round(sum(values), 1),
+                "share": round(sum(values) / total_stage_ms, 3),
+            }
+            for stage, values in stage_ms.items()
+        },
+        "external": {
+            kind: {"total_ms": round(external_ms[kind], 1), "calls": external_calls[kind]}
+            for kind in external_ms
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end ingestion with a fake LLM")
+    parser.add_argument("--docs", type=int, default=50, help="Documents to ingest")
+    parser.add_argument("--concurrency", type=int, default=4, help="Documents processed concurrently")
+    parser.add_argument("--llm-latency-ms", type=float, default=800, help="Mean fake LLM latency")
+    parser.add_argument("--llm-jitter-ms", type=float, default=200, help="Fake LLM latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected provider error rate")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Injected 429 rate")
+    parser.add_argument("--german-ratio", type=float, default=0.5, help="Share of German documents")
+    parser.add_argument("--no-triage", action="store_true", help="Disable the triage stage")
+    parser.add_argument("--no-export", action="store_true", help="Disable Obsidian export")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus and fault injection seed")
+    parser.add_argument("--verbose", action="store_true", help="Show service logs")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    # Injected faults are logged as errors by the services; keep the report readable
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.CRITICAL)
+
+    corpus = generate_corpus(args.docs, args.german_ratio, args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="ingest_benchmark_") as vault_dir:
+        pipeline, llm_service, write_queue = build_pipeline(args, Path(vault_dir))
+
+        start = time.perf_counter()
+        runs = asyncio.run(ingest_all(pipeline, corpus, args.concurrency))
+        flush = write_queue.flush()
+        wall_s = time.perf_counter() - start
+
+    summary = summarize(runs, wall_s)
+
+    print("=" * 80)
+    print(
+        f"⏱️  INGESTION BENCHMARK ({args.docs} docs, concurrency {args.concurrency}, "
+        f"LLM {args.llm_latency_ms:.0f}±{args.llm_jitter_ms:.0f}ms)"
+    )
+    print("=" * 80)
+    print(f"Throughput: {summary['docs_per_s']:.2f} docs/s ({summary['wall_s']:.1f}s wall)")
+    print(f"Outcomes:   {summary['outcomes']}")
+    print(f"Peak RSS:   {summary['peak_rss_mb']:.0f} MB")
+    print(f"Vault:      {flush['files_written']} files flushed in {flush['duration_ms']:.0f}ms\n")
+
+    print(f"{'stage':<16}{'p50 ms':>10}{'p95 ms':>10}{'share':>10}")
+    for stage, stats in summary["stages"].items():
+        print(f"{stage:<16}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['share']:>10.1%}")
+
+    print(f"\n{'external':<16}{'total ms':>12}{'calls':>10}")
+    for kind, stats in summary["external"].items():
+        print(f"{kind:<16}{stats['total_ms']:>12.0f}{stats['calls']:>10}")
+    print(f"\nFake LLM: {llm_service.stats}")
+
+    if args.output:
+        result = {
+            "timestamp": datetime.now().isoformat(),
+            "commit": _git_commit(),
+            "config": {k: v for k, v in vars(args).items() if k not in ("output", "verbose")},
+            **summary,
+        }
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(result, indent=2))
+        print(f"\n💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Retrieval Latency Benchmark
+
+Measures search latency of the retrieval stack against an embedded ChromaDB
+filled with a synthetic corpus. Embeddings and reranking use deterministic
+local stand-ins, so runs need no API keys or model downloads and are
+comparable between commits.
+
+Stages timed per query:
+- dense:   VectorService.search (Chroma query, fake embeddings)
+- bm25:    HybridSearchService.bm25_search
+- fusion:  HybridSearchService.hybrid_search (BM25 + fusion + MMR)
+- hybrid:  VectorService.hybrid_search end-to-end (cache disabled)
+- rerank:  RerankingService.rerank (lexical cross-encoder stand-in)
+
+Reports per stage p50/p95/p99 latency (ms) and throughput (queries/s), plus
+ingest throughput. Results can be saved as JSON and compared against a
+previous run to flag regressions.
+
+Usage:
+    python scripts/analysis/benchmark_retrieval.py
+    python scripts/analysis/benchmark_retrieval.py --docs 2000 --queries 200
+    python scripts/analysis/benchmark_retrieval.py --output bench/retrieval.json
+    python scripts/analysis/benchmark_retrieval.py --compare bench/retrieval.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import chromadb  # noqa: E402
+
+from src.core.config import Settings  # noqa: E402
+from src.services.hybrid_search_service import HybridSearchService  # noqa: E402
+from src.services.reranking_service import RerankingService  # noqa: E402
+from src.services.vector_service import VectorService  # noqa: E402
+
+STAGES = ["dense", "bm25", "fusion", "hybrid", "rerank"]
+
+VOCABULARY = {
+    "en": (
+        "invoice contract meeting project budget schedule report analysis summary decision "
+        "school teacher parent appointment insurance tax refund doctor lease payment deadline "
+        "the a of and to in for with on by from about please regards attached"
+    ).split(),
+    "de": (
+        "Rechnung Vertrag Besprechung Projekt Budget Termin Bericht Analyse Zusammenfassung "
+        "Entscheidung Schule Lehrer Eltern Versicherung Steuer Erstattung Arzt Miete Zahlung "
+        "Frist der die das und zu im für mit auf von über bitte Grüße Anhang"
+    ).split(),
+}
+NAMES = ["Anna Schmidt", "Max Müller", "Laura Weber", "John Carter", "Sophie Klein", "Peter Brown"]
+ORGS = ["Stadtwerke Köln", "Techniker Krankenkasse", "Acme Corp", "Finanzamt Köln", "Grundschule Lindenthal"]
+
+
+# =============================================================================
+# Local stand-ins
+# =============================================================================
+
+class HashingEmbeddingFunction:
+    """
+    Deterministic bag-of-words embedding (feature hashing)
+
+    Texts sharing words get similar vectors, so dense search returns
+    meaningful neighbours while costing microseconds per text.
+    """
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+
+    def name(self) -> str:
+        return "benchmark_hashing"
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in input]
+
+    def embed_query(self, query=None, input=None):
+        texts = query if query is not None else input
+        if isinstance(texts, str):
+            texts = [texts]
+        return self(texts)
+
+
+class LexicalCrossEncoder:
+    """Stand-in for the cross-encoder: scores query/document token overlap"""
+
+    def predict(self, pairs: List[List[str]]) -> List[float]:
+        scores = []
+        for query, document in pairs:
+            query_tokens = set(re.findall(r"\w+", query.lower()))
+            doc_tokens = re.findall(r"\w+", document.lower())
+            hits = sum(1 for token in doc_tokens if token in query_tokens)
+            scores.append(hits / (1 + math.log1p(len(doc_tokens))))
+        return scores
+
+
+# =============================================================================
+# Synthetic corpus
+# =============================================================================
+
+def _sentence(rng: random.Random, lang: str, words: int = 14) -> str:
+    vocab = VOCABULARY[lang]
+    text = " ".join(rng.choice(vocab) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _email(rng: random.Random, lang: str, index: int) -> str:
+    sender, recipient = rng.sample(NAMES, 2)
+    greeting = "Hallo" if lang == "de" else "Hi"
+    lines = [
+        f"From: {sender} <{sender.split()[0].lower()}@example.com>",
+        f"To: {recipient}",
+        f"Subject: {_sentence(rng, lang, 5)}",
+        f"Date: 2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+        "",
+        f"{greeting} {recipient.split()[0]},",
+        "",
+        " ".join(_sentence(rng, lang) for _ in range(rng.randint(3, 8))),
+        "",
+    ]
+    lines += [f"> {_sentence(rng, lang, 10)}" for _ in range(rng.randint(0, 4))]
+    return "\n".join(lines)
+
+
+def _pdf_text(rng: random.Random, lang: str, index: int) -> str:
+    """Plain text as extracted from a PDF: headers, page breaks, tables"""
+    org = rng.choice(ORGS)
+    pages = []
+    for page in range(1, rng.randint(2, 4) + 1):
+        lines = [f"{org}  Seite {page}" if lang == "de" else f"{org}  Page {page}", ""]
+        lines += [" ".join(_sentence(rng, lang) for _ in range(4)) for _ in range(rng.randint(2, 4))]
+        if page == 1:
+            lines += [f"{rng.choice(VOCABULARY[lang])}   {rng.randint(1, 9999)},{rng.randint(0, 99):02d} EUR"
+                      for _ in range(4)]
+        pages.append("\n".join(lines))
+    return f"Document {index}\n\n" + "\n\f\n".join(pages)
+
+
+def generate_corpus(docs: int, german_ratio: float = 0.5, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Generate a mixed corpus of emails and PDF-like text documents
+
+    Args:
+        docs: Number of documents
+        german_ratio: Share of German documents
+        seed: Random seed
+
+    Returns:
+        List of {doc_id, text, metadata}
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(docs):
+        lang = "de" if rng.random() < german_ratio else "en"
+        doc_type = "email" if rng.random() < 0.5 else "pdf"
+        text = _email(rng, lang, i) if doc_type == "email" else _pdf_text(rng, lang, i)
+        corpus.append({
+            "doc_id": f"bench_{i:06d}",
+            "text": text,
+            "metadata": {"language": lang, "document_type": doc_type, "filename": f"bench_{i}.txt"},
+        })
+    return corpus
+
+
+def generate_queries(count: int, seed: int = 7) -> List[str]:
+    """Short keyword and entity queries in both languages"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        lang = rng.choice(["de", "en"])
+        content_words = [w for w in VOCABULARY[lang] if len(w) > 4]
+        words = rng.sample(content_words, rng.randint(2, 4))
+        if rng.random() < 0.3:
+            words.append(rng.choice(NAMES + ORGS))
+        queries.append(" ".join(words))
+    return queries
+
+
+def _chunk(text: str, chunk_chars: int) -> List[str]:
+    paragraphs = [p for p in re.split(r"\n\s*\n|\f", text) if p.strip()]
+    chunks, current = [], ""
+    for paragraph in paragraphs:
+        if current and len(current) + len(paragraph) > chunk_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(timings_ms: List[float]) -> Dict[str, float]:
+    total_s = sum(timings_ms) / 1000
+    return {
+        "count": len(timings_ms),
+        "p50_ms": round(percentile(timings_ms, 50), 3),
+        "p95_ms": round(percentile(timings_ms, 95), 3),
+        "p99_ms": round(percentile(timings_ms, 99), 3),
+        "mean_ms": round(sum(timings_ms) / len(timings_ms), 3) if timings_ms else 0.0,
+        "qps": round(len(timings_ms) / total_s, 1) if total_s else 0.0,
+    }
+
+
+async def build_index(
+    corpus: List[Dict[str, Any]],
+    chunk_chars: int,
+    dimensions: int
+) -> Tuple[VectorService, Dict[str, Any]]:
+    """Load the corpus into an in-memory Chroma collection and BM25 index"""
+    client = chromadb.EphemeralClient()
+    collection_name = f"benchmark_{int(time.time() * 1000)}"
+    collection = client.create_collection(
+        name=collection_name,
+        embedding_function=HashingEmbeddingFunction(dimensions),
+        metadata={"hnsw:space": "cosine"}
+    )
+
+    service = VectorService(collection, Settings(), enable_cache=False)
+    # Private BM25 index instead of the process-wide singleton
+    service.hybrid_search_service = HybridSearchService()
+
+    chunk_count = 0
+    start = time.perf_counter()
+    for doc in corpus:
+        chunks = _chunk(doc["text"], chunk_chars)
+        chunk_count += await service.add_document(doc["doc_id"], chunks, doc["metadata"])
+    duration_s = time.perf_counter() - start
+
+    return service, {
+        "documents": len(corpus),
+        "chunks": chunk_count,
+        "duration_s": round(duration_s, 3),
+        "chunks_per_s": round(chunk_count / duration_s, 1) if duration_s else 0.0,
+    }
+
+
+async def run_queries(
+    service: VectorService,
+    reranker: RerankingService,
+    queries: List[str],
+    top_k: int,
+    warmup: int
+) -> Dict[str, Dict[str, float]]:
+    """Time each retrieval stage for every query"""
+    hybrid = service.hybrid_search_service
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+
+    for i, query in enumerate(queries):
+        record = i >= warmup
+
+        start = time.perf_counter()
+        dense = await service.search(query, top_k=top_k * 3, use_cache=False)
+        dense_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        hybrid.bm25_search(query, top_k=top_k * 3)
+        bm25_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        fused = hybrid.hybrid_search(query=query, dense_results=dense, top_k=top_k)
+        fusion_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        await service.hybrid_search(query, top_k=top_k, use_cache=False)
+        hybrid_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        reranker.rerank(query, fused, top_k=top_k)
+        rerank_ms = (time.perf_counter() - start) * 1000
+
+        if record:
+            for stage, ms in zip(STAGES, (dense_ms, bm25_ms, fusion_ms, hybrid_ms, rerank_ms)):
+                timings[stage].append(ms)
+
+    return {stage: summarize(values) for stage, values in timings.items()}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare p50/p95 against a previous run
+
+    Returns:
+        Regression messages (empty if none exceed the threshold)
+    """
+    regressions = []
+    for stage, stats in current["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if base[key] and stats[key] > base[key] * (1 + threshold):
+                change = (stats[key] / base[key] - 1) * 100
+                regressions.append(f"{stage} {key}: {base[key]:.2f} → {stats[key]:.2f} ms (+{change:.0f}%)")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parents[2]
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark retrieval latency on a synthetic corpus")
+    parser.add_argument("--docs", type=int, default=500, help="Synthetic documents to index")
+    parser.add_argument("--queries", type=int, default=100, help="Timed queries")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed warm-up queries")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--german-ratio", type=float, default=0.5, help="Share of German documents")
+    parser.add_argument("--chunk-chars", type=int, default=1200, help="Approximate chunk size in characters")
+    parser.add_argument("--dimensions", type=int, default=384, help="Fake embedding dimensions")
+    parser.add_argument("--real-reranker", action="store_true", help="Use the configured reranker instead of the stand-in")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus random seed")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Previous JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown flagged as regression")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.docs, args.german_ratio, args.seed)
+    queries = generate_queries(args.queries + args.warmup)
+
+    reranker = RerankingService(provider="self-hosted")
+    if not args.real_reranker:
+        reranker.model = LexicalCrossEncoder()
+
+    async def run():
+        service, ingest = await build_index(corpus, args.chunk_chars, args.dimensions)
+        stages = await run_queries(service, reranker, queries, args.top_k, args.warmup)
+        return ingest, stages
+
+    ingest, stages = asyncio.run(run())
+
+    print("=" * 80)
+    print(f"⏱️  RETRIEVAL BENCHMARK ({ingest['documents']} docs, {ingest['chunks']} chunks, {args.queries} queries)")
+    print("=" * 80)
+    print(f"Ingest: {ingest['duration_s']:.2f}s ({ingest['chunks_per_s']:.0f} chunks/s)\n")
+    print(f"{'stage':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'qps':>10}")
+    for stage, stats in stages.items():
+        print(
+            f"{stage:<10}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+            f"{stats['p99_ms']:>10.2f}{stats['mean_ms']:>10.2f}{stats['qps']:>10.1f}"
+        )
+
+    result = {
+        "timestamp": datetime.now().isoformat(),
+        "commit": _git_commit(),
+        "config": {
+            "docs": args.docs,
+            "queries": args.queries,
+            "top_k": args.top_k,
+            "german_ratio": args.german_ratio,
+            "chunk_chars": args.chunk_chars,
+            "dimensions": args.dimensions,
+            "reranker": "real" if args.real_reranker else "lexical",
+            "seed": args.seed,
+        },
+        "ingest": ingest,
+        "stages": stages,
+    }
+
+    exit_code = 0
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(result, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} (commit {baseline.get('commit') or 'unknown'}):")
+        if regressions:
+            exit_code = 1
+            for message in regressions:
+                print(f"   ⚠️  {message}")
+        else:
+            print(f"   ✅ No stage slower than +{args.threshold:.0%}")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(result, indent=2))
+        print(f"\n💾 Results written to {args.output}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,23 @@
 """
 Core module: Configuration and dependency injection
+
+Exports are resolved on first access so that importing a light submodule
+(e.g. src.core.startup_profiler) does not pull in the whole service layer.
 """
-from src.core.config import Settings, get_settings
-from src.core.dependencies import verify_token, get_chroma_client, get_collection
-
-__all__ = [
-    "Settings",
-    "get_settings",
-    "verify_token",
-    "get_chroma_client",
-    "get_collection",
-]
+import importlib
+
+_EXPORTS = {
+    "Settings": "src.core.config",
+    "get_settings": "src.core.config",
+    "verify_token": "src.core.dependencies",
+    "get_chroma_client": "src.core.dependencies",
+    "get_collection": "src.core.dependencies",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
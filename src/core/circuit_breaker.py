@@ -0,0 +1,200 @@
+"""
+Circuit Breakers for LLM Providers
+
+Tracks recent outcomes per provider/model so LLMService can skip endpoints
+that are failing or degraded instead of spending a full timeout on each
+request before falling back.
+
+Features:
+- Sliding window of the last N calls (error rate and slow-call rate)
+- Closed → open (skip) → half-open (single probe) → closed state machine
+- Recent latency quantiles, used to derive the hedging delay
+- No external dependencies, thread-safe
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+LLM_CIRCUIT_BREAKER_ENABLED = os.getenv("LLM_CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+LLM_CIRCUIT_WINDOW = int(os.getenv("LLM_CIRCUIT_WINDOW", "20"))
+LLM_CIRCUIT_MIN_CALLS = int(os.getenv("LLM_CIRCUIT_MIN_CALLS", "5"))
+LLM_CIRCUIT_ERROR_THRESHOLD = float(os.getenv("LLM_CIRCUIT_ERROR_THRESHOLD", "0.5"))
+LLM_CIRCUIT_SLOW_CALL_MS = float(os.getenv("LLM_CIRCUIT_SLOW_CALL_MS", "15000"))
+LLM_CIRCUIT_SLOW_THRESHOLD = float(os.getenv("LLM_CIRCUIT_SLOW_THRESHOLD", "0.8"))
+LLM_CIRCUIT_COOLDOWN_S = float(os.getenv("LLM_CIRCUIT_COOLDOWN_S", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one provider/model
+
+    Opens when, over the last ``window`` calls (at least ``min_calls``), the
+    error rate or the share of calls slower than ``slow_call_ms`` reaches its
+    threshold. After ``cooldown_s`` one probe request is let through
+    (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = LLM_CIRCUIT_WINDOW,
+        min_calls: int = LLM_CIRCUIT_MIN_CALLS,
+        error_threshold: float = LLM_CIRCUIT_ERROR_THRESHOLD,
+        slow_call_ms: float = LLM_CIRCUIT_SLOW_CALL_MS,
+        slow_threshold: float = LLM_CIRCUIT_SLOW_THRESHOLD,
+        cooldown_s: float = LLM_CIRCUIT_COOLDOWN_S
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            name: Provider/model identifier (e.g. "groq/llama-3.1-8b-instant")
+            window: Number of recent calls considered
+            min_calls: Calls needed in the window before the circuit can open
+            error_threshold: Error rate that opens the circuit
+            slow_call_ms: Latency above which a successful call counts as slow
+            slow_threshold: Slow-call rate that opens the circuit
+            cooldown_s: Seconds the circuit stays open before a probe
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.slow_call_ms = slow_call_ms
+        self.slow_threshold = slow_threshold
+        self.cooldown_s = cooldown_s
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._calls: Deque[Tuple[bool, float]] = deque(maxlen=window)  # (success, latency_ms)
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Whether a request may be sent now
+
+        In half-open state only one probe is allowed at a time; the caller
+        must report its outcome with record_success/record_failure.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown_s:
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self, latency_ms: float):
+        with self._lock:
+            self._calls.append((True, latency_ms))
+            if self.state == HALF_OPEN:
+                slow = latency_ms >= self.slow_call_ms
+                self._probe_in_flight = False
+                if slow:
+                    self._open()
+                else:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    self._calls.append((True, latency_ms))
+                return
+            self._evaluate()
+
+    def record_failure(self, latency_ms: float):
+        with self._lock:
+            self._calls.append((False, latency_ms))
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                self._open()
+                return
+            self._evaluate()
+
+    def release(self):
+        """Give back a half-open probe slot without an outcome (e.g. cancelled hedge)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _evaluate(self):
+        if self.state != CLOSED or len(self._calls) < self.min_calls:
+            return
+        total = len(self._calls)
+        errors = sum(1 for success, _ in self._calls if not success)
+        slow = sum(1 for success, latency in self._calls if success and latency >= self.slow_call_ms)
+        if errors / total >= self.error_threshold or slow / total >= self.slow_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """
+        Latency of recent successful calls at quantile q (nearest rank)
+
+        Returns:
+            Latency in ms, or None without successful calls in the window
+        """
+        with self._lock:
+            latencies = sorted(latency for success, latency in self._calls if success)
+        if not latencies:
+            return None
+        return latencies[min(int(len(latencies) * q), len(latencies) - 1)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State and window statistics (for /monitoring)"""
+        with self._lock:
+            total = len(self._calls)
+            errors = sum(1 for success, _ in self._calls if not success)
+            state = self.state
+        return {
+            "state": state,
+            "calls": total,
+            "error_rate": errors / total if total else 0.0,
+            "p95_ms": self.latency_quantile(0.95),
+            "times_opened": self.times_opened,
+        }
+
+
+class CircuitBreakerRegistry:
+    """One CircuitBreaker per provider/model, created on first use"""
+
+    def __init__(self, enabled: bool = LLM_CIRCUIT_BREAKER_ENABLED, **breaker_kwargs):
+        """
+        Initialize registry
+
+        Args:
+            enabled: When False, every request is allowed (stats are still kept)
+            **breaker_kwargs: Passed to each CircuitBreaker
+        """
+        self.enabled = enabled
+        self._breaker_kwargs = breaker_kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, **self._breaker_kwargs)
+            return breaker
+
+    def allow_request(self, name: str) -> bool:
+        return not self.enabled or self.get(name).allow_request()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.snapshot() for name, breaker in breakers.items()}
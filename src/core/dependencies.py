@@ -171,8 +171,8 @@ def get_document_service(settings: Settings = Depends(get_settings)):
 
 def get_llm_service(settings: Settings = Depends(get_settings)):
     """Get LLM Service instance"""
-    from src.services.llm_service import LLMService
-    return LLMService(settings)
+    from src.services.fake_llm_service import create_llm_service
+    return create_llm_service(settings)
 
 
 def get_vector_service(
@@ -0,0 +1,283 @@
+"""
+Startup Profiler - Import and initialization timings for cold starts
+
+Enabled with ``python app.py --profile-startup`` (prints a report and exits)
+or ``PROFILE_STARTUP=true`` (report logged once the app is constructed, e.g.
+under uvicorn).
+
+Features:
+- Import hook timing every module import (cumulative and self time, like
+  ``python -X importtime`` but aggregated per top-level package)
+- ``startup_step`` context manager for service construction timings
+- ``LazyModule`` proxy: defers heavy optional imports to first attribute
+  access and records how long the deferred import took
+
+Only the standard library is imported here, so the hook can be installed
+before anything else.
+"""
+
+import importlib
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+import types
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_STARTUP = (
+    os.getenv("PROFILE_STARTUP", "false").lower() == "true"
+    or "--profile-startup" in sys.argv
+)
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Wraps a module loader and times exec_module"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler._time_import(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, item):
+        # get_resource_reader, is_package, get_source, ... of the wrapped loader
+        return getattr(self._loader, item)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder that delegates to the real finders and wraps their loaders"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimingLoader(spec.loader, self._profiler)
+                    return spec
+            return None
+        finally:
+            self._local.busy = False
+
+
+class StartupProfiler:
+    """Collects import and initialization timings"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self.steps: List[Dict[str, Any]] = []
+        self.deferred_imports: Dict[str, float] = {}
+        self._finder: Optional[_TimingFinder] = None
+        self._stack = threading.local()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Import timing
+    # ------------------------------------------------------------------
+
+    def install_import_hook(self):
+        """Time all subsequent module imports"""
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall_import_hook(self):
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    @contextmanager
+    def _time_import(self, name: str) -> Iterator[None]:
+        stack = getattr(self._stack, "frames", None)
+        if stack is None:
+            stack = self._stack.frames = []
+        frame = {"children_ms": 0.0}
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stack.pop()
+            if stack:
+                stack[-1]["children_ms"] += elapsed_ms
+            with self._lock:
+                self.imports[name] = {
+                    "cumulative_ms": round(elapsed_ms, 3),
+                    "self_ms": round(elapsed_ms - frame["children_ms"], 3),
+                }
+
+    # ------------------------------------------------------------------
+    # Initialization timing
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time one initialization step (service construction, data loading)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.steps.append({"name": name, "ms": round(elapsed_ms, 3)})
+
+    def record_deferred_import(self, name: str, elapsed_ms: float):
+        with self._lock:
+            self.deferred_imports[name] = round(elapsed_ms, 3)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def report(self, top: int = 25) -> Dict[str, Any]:
+        """
+        Summarize timings
+
+        Args:
+            top: Number of slowest modules/packages to include
+
+        Returns:
+            Dict with total time, per-package and per-module imports,
+            initialization steps and deferred imports
+        """
+        with self._lock:
+            imports = dict(self.imports)
+            steps = list(self.steps)
+            deferred = dict(self.deferred_imports)
+
+        packages: Dict[str, float] = {}
+        for name, timing in imports.items():
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0.0) + timing["self_ms"]
+
+        slowest = sorted(imports.items(), key=lambda item: item[1]["cumulative_ms"], reverse=True)
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "import_ms": round(sum(t["self_ms"] for t in imports.values()), 1),
+            "modules_imported": len(imports),
+            "packages": dict(sorted(
+                ((p, round(ms, 1)) for p, ms in packages.items()), key=lambda item: item[1], reverse=True
+            )[:top]),
+            "modules": {name: timing for name, timing in slowest[:top]},
+            "init_steps": steps,
+            "deferred_imports": deferred,
+        }
+
+    def format_report(self, top: int = 25) -> str:
+        """Human-readable report for --profile-startup"""
+        report = self.report(top)
+        lines = [
+            "=" * 72,
+            f"⏱️  STARTUP PROFILE: {report['total_ms']:.0f}ms total, "
+            f"{report['import_ms']:.0f}ms importing {report['modules_imported']} modules",
+            "=" * 72,
+            "",
+            f"{'package (self time)':<48}{'ms':>12}",
+        ]
+        lines += [f"{name:<48}{ms:>12.1f}" for name, ms in report["packages"].items()]
+        lines += ["", f"{'module (cumulative)':<48}{'cum ms':>12}{'self ms':>12}"]
+        lines += [
+            f"{name[:47]:<48}{t['cumulative_ms']:>12.1f}{t['self_ms']:>12.1f}"
+            for name, t in report["modules"].items()
+        ]
+        lines += ["", f"{'initialization step':<48}{'ms':>12}"]
+        lines += [f"{step['name'][:47]:<48}{step['ms']:>12.1f}" for step in report["init_steps"]]
+        if report["deferred_imports"]:
+            lines += ["", f"{'deferred import (loaded on first use)':<48}{'ms':>12}"]
+            lines += [f"{name:<48}{ms:>12.1f}" for name, ms in report["deferred_imports"].items()]
+        return "\n".join(lines)
+
+
+# Global instance (created on import so the hook can go in first)
+_startup_profiler = StartupProfiler()
+if PROFILE_STARTUP:
+    _startup_profiler.install_import_hook()
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """Get the process-wide startup profiler"""
+    return _startup_profiler
+
+
+def startup_step(name: str):
+    """Time an initialization step on the global profiler"""
+    return _startup_profiler.step(name)
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module proxy that imports the real module on first attribute access
+
+    Attribute reads, writes and deletes are forwarded to the real module, so
+    ``unittest.mock.patch("pkg.mod.lazy.attr")`` keeps working.
+    """
+
+    def __init__(self, name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_on_load"] = on_load
+        self.__dict__["_lazy_module"] = None
+
+    def _lazy_load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            on_load = self.__dict__["_lazy_on_load"]
+            if on_load is not None:
+                on_load(module)
+            self.__dict__["_lazy_module"] = module
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _startup_profiler.record_deferred_import(self.__name__, elapsed_ms)
+            logger.debug(f"Deferred import of {self.__name__} took {elapsed_ms:.0f}ms")
+        return module
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._lazy_load(), item)
+
+    def __setattr__(self, key: str, value: Any):
+        setattr(self._lazy_load(), key, value)
+
+    def __delattr__(self, key: str):
+        delattr(self._lazy_load(), key)
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+
+def lazy_import(name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None) -> types.ModuleType:
+    """
+    Import ``name`` on first use
+
+    Returns the real module if it is already imported.
+
+    Args:
+        name: Absolute module name (e.g. "litellm", "docx")
+        on_load: Called once with the real module after it is imported
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        if on_load is not None:
+            on_load(module)
+        return module
+    return LazyModule(name, on_load)
@@ -0,0 +1,167 @@
+"""
+Lightweight Tracing - Span timings for ingestion requests
+
+Records where an ingest spends its time: one span per pipeline stage plus
+spans for external calls (LLM, ChromaDB, embeddings, file I/O) made while
+the stage runs.
+
+Features:
+- Trace object attached to StageContext (spans, timing breakdown)
+- Context-variable propagation: services call ``trace_span`` without being
+  handed the context; asyncio tasks and ``asyncio.to_thread`` inherit it
+- No-op when no trace is active (e.g. search requests)
+- Finished traces exported to structured logs and the /metrics endpoint
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# Active trace and innermost open span for the current task/thread
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+class Span(BaseModel):
+    """One timed operation within a trace"""
+    name: str
+    kind: str = "internal"  # stage, llm, chroma, embedding, file_io, internal
+    parent: Optional[str] = None
+    start_ms: float  # Offset from trace start
+    duration_ms: float = 0.0
+    status: str = "ok"
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+
+
+class Trace:
+    """
+    Collects spans for one ingestion
+
+    Thread-safe: spans may finish on worker threads (``asyncio.to_thread``).
+    """
+
+    def __init__(self, name: str = "ingest"):
+        self.name = name
+        self.spans: List[Span] = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes) -> Iterator[Span]:
+        """
+        Time a block as a span of this trace
+
+        Args:
+            name: Span name (e.g. "enrichment", "llm.call_llm")
+            kind: Span category used for the timing breakdown
+            **attributes: Extra span attributes (model, chunk count, ...)
+        """
+        start = time.perf_counter()
+        span = Span(
+            name=name,
+            kind=kind,
+            parent=_current_span.get(),
+            start_ms=round((start - self._start) * 1000, 3),
+            attributes=attributes
+        )
+        token = _current_span.set(name)
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            with self._lock:
+                self.spans.append(span)
+            if kind != "stage":
+                # Stage latencies are recorded by Pipeline.run. Imported here:
+                # services import this module, so a top-level import would cycle
+                from src.services.monitoring_service import get_monitoring_service
+                get_monitoring_service().metrics.observe_histogram(
+                    "external_call_duration_ms",
+                    span.duration_ms,
+                    labels={"kind": kind, "name": name}
+                )
+
+    @property
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._start) * 1000, 3)
+
+    def timing_breakdown(self) -> Dict[str, Any]:
+        """
+        Summarize spans for API responses
+
+        Returns:
+            Dict with total_ms, per-stage ms, per-kind external call ms/count
+            and the raw span list
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        stages: Dict[str, float] = {}
+        external: Dict[str, Dict[str, float]] = {}
+        for span in spans:
+            if span.kind == "stage":
+                stages[span.name] = round(stages.get(span.name, 0.0) + span.duration_ms, 3)
+            else:
+                entry = external.setdefault(span.kind, {"ms": 0.0, "calls": 0})
+                entry["ms"] = round(entry["ms"] + span.duration_ms, 3)
+                entry["calls"] += 1
+
+        return {
+            "total_ms": self.elapsed_ms,
+            "stages": stages,
+            "external": external,
+            "spans": [span.model_dump() for span in sorted(spans, key=lambda s: s.start_ms)],
+        }
+
+    def log(self, **fields):
+        """Emit the trace as one structured log record"""
+        breakdown = self.timing_breakdown()
+        stages = ", ".join(f"{name}={ms:.0f}ms" for name, ms in breakdown["stages"].items())
+        logger.info(
+            f"⏱️  {self.name} trace: {breakdown['total_ms']:.0f}ms ({stages})",
+            extra={"extra_data": {"trace": self.name, **fields, **breakdown}}
+        )
+
+
+@contextmanager
+def activate_trace(trace: Trace) -> Iterator[Trace]:
+    """Make ``trace`` the target of ``trace_span`` calls in this context"""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def get_current_trace() -> Optional[Trace]:
+    """Trace active in the current context, if any"""
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_span(name: str, kind: str = "internal", **attributes) -> Iterator[Optional[Span]]:
+    """
+    Record a span on the active trace (no-op when none is active)
+
+    Args:
+        name: Span name
+        kind: Span category (llm, chroma, embedding, file_io, ...)
+        **attributes: Extra span attributes
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    with trace.span(name, kind, **attributes) as span:
+        yield span
@@ -224,3 +224,15 @@ class EnrichmentResponse(BaseModel):
                 }
             }
         }
+
+
+class FusedEnrichmentResponse(EnrichmentResponse):
+    """
+    Enrichment response that also carries the semantic document type
+
+    Lets one LLM call replace the separate classification + enrichment calls.
+    """
+
+    semantic_document_type: str = Field(
+        description="ONE semantic document type from the provided controlled vocabulary (e.g. 'legal/contract')"
+    )
@@ -242,6 +242,7 @@ class IngestResponse(BaseModel):
     metadata: ObsidianMetadata = Field(..., description="Generated metadata")
     obsidian_path: Optional[str] = Field(default=None, description="Path to Obsidian markdown file")
     critique: Optional["CritiqueResult"] = Field(default=None, description="Quality critique from LLM-as-critic")
+    timings: Optional[Dict[str, Any]] = Field(default=None, description="Per-stage and external call timing breakdown (ms)")
 
 
 class SearchResult(BaseModel):
@@ -260,6 +261,20 @@ class SearchResponse(BaseModel):
     search_time_ms: float = Field(..., description="Search time in milliseconds")
 
 
+class BatchSearchQuery(BaseModel):
+    """Batch search request (one hybrid search per query text)"""
+    queries: List[str] = Field(..., min_length=1, max_length=100, description="Search query texts")
+    top_k: int = Field(default=5, ge=1, le=100, description="Number of results per query")
+    filter: Optional[Dict[str, Any]] = Field(default=None, description="Metadata filters applied to every query")
+
+
+class BatchSearchResponse(BaseModel):
+    """Batch search results, one response per query in input order"""
+    results: List[SearchResponse] = Field(..., description="Search results per query")
+    total_queries: int = Field(..., description="Number of queries")
+    search_time_ms: float = Field(..., description="Total search time in milliseconds")
+
+
 class DocumentInfo(BaseModel):
     """Document information"""
     id: str = Field(..., description="Document ID")
@@ -298,6 +313,7 @@ class CostInfo(BaseModel):
     model: str = Field(..., description="Model used")
     input_tokens: int = Field(..., description="Input tokens")
     output_tokens: int = Field(..., description="Output tokens")
+    cached_input_tokens: int = Field(default=0, description="Input tokens served from the provider's prompt cache")
     cost_usd: float = Field(..., description="Cost in USD")
     timestamp: datetime = Field(..., description="Operation timestamp")
 
@@ -311,6 +327,9 @@ class CostStats(BaseModel):
     operations_today: int = Field(..., description="Number of operations today")
     most_expensive_operation: Optional[CostInfo] = Field(default=None, description="Most expensive operation")
     cost_by_provider: Dict[str, float] = Field(..., description="Cost breakdown by provider")
+    cached_input_tokens_today: int = Field(default=0, description="Input tokens served from prompt caches today")
+    uncached_input_tokens_today: int = Field(default=0, description="Input tokens processed without cache today")
+    prompt_cache_hit_rate: float = Field(default=0.0, description="Share of today's input tokens that were cached")
 
 
 # ===== Quality Assessment Models (LLM-as-Critic) =====
@@ -65,6 +65,8 @@ def create_ingestion_pipeline(
     vector_service,
     obsidian_service,
     triage_service=None,
+    corpus_aggregates=None,
+    tag_taxonomy=None,
     enable_triage: bool = True,
     enable_quality_gate: bool = True,
     enable_export: bool = True,
@@ -83,6 +85,8 @@ def create_ingestion_pipeline(
         vector_service: Service for ChromaDB operations
         obsidian_service: Service for Obsidian markdown generation
         triage_service: Service for document triage (optional, auto-created if None)
+        corpus_aggregates: Ingest-time corpus statistics updated by storage (optional)
+        tag_taxonomy: Tag taxonomy whose counters are updated by storage (optional)
         enable_triage: Whether to enable triage stage (default: True)
         enable_quality_gate: Whether to enable quality gating (default: True)
         enable_export: Whether to enable Obsidian export (default: True)
@@ -152,6 +156,8 @@ def create_ingestion_pipeline(
     stages.append(
         StorageStage(
             vector_service=vector_service,
+            corpus_aggregates=corpus_aggregates,
+            tag_taxonomy=tag_taxonomy,
             name="storage"
         )
     )
@@ -26,6 +26,10 @@ from typing import Any, Dict, Optional, TypeVar, Generic
 from pydantic import BaseModel, Field
 from enum import Enum
 import logging
+import time
+
+from src.core.tracing import Trace, activate_trace, get_current_trace
+from src.services.monitoring_service import get_monitoring_service
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +53,7 @@ class StageContext(BaseModel):
 
     # Performance tracking
     stage_timings: Dict[str, float] = Field(default_factory=dict)
+    trace: Trace = Field(default_factory=Trace)  # Stage + external call spans
 
     # Quality metrics
     quality_scores: Optional[Dict[str, float]] = None
@@ -197,51 +202,69 @@ class Pipeline:
         current_input = initial_input
         final_result = StageResult.CONTINUE
 
-        for stage in self.stages:
-            # Check if stage should be skipped
-            if stage.should_skip(context):
-                self.logger.info(f"⏭️  Skipping stage: {stage.name}")
-                continue
-
-            self.logger.info(f"▶️  Running stage: {stage.name}")
-
-            try:
-                import time
-                start_time = time.time()
-
-                # Execute stage
-                result, output = await stage.process(current_input, context)
-
-                # Track timing
-                elapsed = time.time() - start_time
-                context.stage_timings[stage.name] = elapsed
-                self.logger.info(f"✅ {stage.name} completed in {elapsed:.2f}s")
-
-                # Handle result
-                if result == StageResult.STOP:
-                    self.logger.info(f"🛑 Pipeline stopped at {stage.name}")
-                    final_result = result
-                    current_input = output
-                    break
-
-                elif result == StageResult.ERROR:
-                    self.logger.error(f"❌ Pipeline error at {stage.name}")
-                    final_result = result
-                    current_input = output
+        # The outermost caller (e.g. process_file) logs the trace when it
+        # started one itself; otherwise the pipeline owns it
+        owns_trace = get_current_trace() is not context.trace
+
+        with activate_trace(context.trace):
+            for stage in self.stages:
+                # Check if stage should be skipped
+                if stage.should_skip(context):
+                    self.logger.info(f"⏭️  Skipping stage: {stage.name}")
+                    continue
+
+                self.logger.info(f"▶️  Running stage: {stage.name}")
+
+                try:
+                    start_time = time.time()
+
+                    # Execute stage (external calls inside become child spans)
+                    with context.trace.span(stage.name, kind="stage") as span:
+                        result, output = await stage.process(current_input, context)
+                    span.attributes["result"] = result.value
+
+                    # Track timing
+                    elapsed = time.time() - start_time
+                    context.stage_timings[stage.name] = elapsed
+                    self._record_stage_metrics(stage.name, elapsed, result.value)
+                    self.logger.info(f"✅ {stage.name} completed in {elapsed:.2f}s")
+
+                    # Handle result
+                    if result == StageResult.STOP:
+                        self.logger.info(f"🛑 Pipeline stopped at {stage.name}")
+                        final_result = result
+                        current_input = output
+                        break
+
+                    elif result == StageResult.ERROR:
+                        self.logger.error(f"❌ Pipeline error at {stage.name}")
+                        final_result = result
+                        current_input = output
+                        break
+
+                    elif result == StageResult.CONTINUE:
+                        # Continue to next stage
+                        current_input = output
+
+                except Exception as e:
+                    self._record_stage_metrics(stage.name, time.time() - start_time, "exception")
+                    self.logger.error(f"💥 Exception in {stage.name}: {e}", exc_info=True)
+                    await stage.on_error(e, context)
+                    final_result = StageResult.ERROR
                     break
 
-                elif result == StageResult.CONTINUE:
-                    # Continue to next stage
-                    current_input = output
-
-            except Exception as e:
-                self.logger.error(f"💥 Exception in {stage.name}: {e}", exc_info=True)
-                await stage.on_error(e, context)
-                final_result = StageResult.ERROR
-                break
+        if owns_trace:
+            context.trace.log(pipeline=self.name, doc_id=context.doc_id, result=final_result.value)
 
         return final_result, current_input
 
+    def _record_stage_metrics(self, stage_name: str, elapsed: float, outcome: str) -> None:
+        """Per-stage latency sketch and outcome counter (scraped via /metrics)"""
+        metrics = get_monitoring_service().metrics
+        labels = {"pipeline": self.name, "stage": stage_name}
+        metrics.observe_histogram("pipeline_stage_duration_ms", elapsed * 1000, labels=labels)
+        metrics.increment_counter("pipeline_stage_runs_total", labels={**labels, "outcome": outcome})
+
     def add_stage(self, stage: PipelineStage, position: Optional[int] = None) -> None:
         """
         Add a stage to the pipeline.
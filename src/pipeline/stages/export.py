@@ -10,6 +10,7 @@ OUTPUT: ExportedDocument
 from typing import Optional
 from src.pipeline.base import PipelineStage, StageResult, StageContext
 from src.pipeline.models import StoredDocument, ExportedDocument
+from src.core.tracing import trace_span
 from src.services.obsidian_service import ObsidianService
 from src.models.schemas import DocumentType
 from datetime import datetime
@@ -105,14 +106,15 @@ class ExportStage(PipelineStage[StoredDocument, ExportedDocument]):
                     self.logger.warning(f"Could not parse created_date: {created_date_str}, using now")
 
             # Export to Obsidian with original content for auto-linking
-            obsidian_path = self.obsidian_service.export_document(
-                title=title,
-                content=input_data.original_content,  # Pass content for entity auto-linking
-                metadata=metadata,  # Pass flat enriched_metadata dict
-                document_type=doc_type_enum,
-                created_at=doc_created_at,  # Use document's original date
-                source=context.filename or "pipeline"
-            )
+            with trace_span("obsidian.export", kind="file_io"):
+                obsidian_path = self.obsidian_service.export_document(
+                    title=title,
+                    content=input_data.original_content,  # Pass content for entity auto-linking
+                    metadata=metadata,  # Pass flat enriched_metadata dict
+                    document_type=doc_type_enum,
+                    created_at=doc_created_at,  # Use document's original date
+                    source=context.filename or "pipeline"
+                )
 
             self.logger.info(f"✅ Exported to: {obsidian_path}")
 
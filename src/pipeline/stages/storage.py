@@ -13,6 +13,10 @@ from src.pipeline.base import PipelineStage, StageResult, StageContext
 from src.pipeline.models import ChunkedDocument, StoredDocument
 from src.services.vector_service import VectorService
 from src.adapters.chroma_adapter import ChromaDBAdapter
+from src.core.tracing import trace_span
+from src.services.drift_monitor_service import CorpusAggregates
+from src.services.tag_taxonomy_service import TagTaxonomyService
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,16 +30,21 @@ class StorageStage(PipelineStage[ChunkedDocument, StoredDocument]):
     1. Flattens metadata for ChromaDB using adapter
     2. Creates chunk IDs
     3. Stores chunks with embeddings in ChromaDB
-    4. Returns StoredDocument with chunk IDs
+    4. Updates corpus aggregates and tag counters with the stored metadata
+    5. Returns StoredDocument with chunk IDs
 
     Dependencies:
     - VectorService (ChromaDB operations)
     - ChromaDBAdapter (format conversions)
+    - CorpusAggregates (optional, ingest-time corpus statistics)
+    - TagTaxonomyService (optional, incremental tag counters)
     """
 
     def __init__(
         self,
         vector_service: VectorService,
+        corpus_aggregates: Optional[CorpusAggregates] = None,
+        tag_taxonomy: Optional[TagTaxonomyService] = None,
         name: Optional[str] = None
     ):
         """
@@ -43,10 +52,14 @@ class StorageStage(PipelineStage[ChunkedDocument, StoredDocument]):
 
         Args:
             vector_service: Service for vector database operations
+            corpus_aggregates: Aggregates to update after each store (optional)
+            tag_taxonomy: Tag taxonomy whose counters are updated after each store (optional)
             name: Optional custom stage name
         """
         super().__init__(name)
         self.vector_service = vector_service
+        self.corpus_aggregates = corpus_aggregates
+        self.tag_taxonomy = tag_taxonomy
 
     async def process(
         self,
@@ -112,15 +125,31 @@ class StorageStage(PipelineStage[ChunkedDocument, StoredDocument]):
                 chunk_metadatas.append(chunk_metadata)
                 chunk_contents.append(chunk.content)
 
-            # Store in ChromaDB
-            self.vector_service.collection.add(
-                ids=chunk_ids,
-                documents=chunk_contents,
-                metadatas=chunk_metadatas
-            )
+            # Store in ChromaDB (off the event loop: embedding calls block,
+            # and concurrent ingests share embedding batches this way)
+            with trace_span("chroma.add", kind="chroma", chunks=len(chunk_ids)):
+                await asyncio.to_thread(
+                    self.vector_service.collection.add,
+                    ids=chunk_ids,
+                    documents=chunk_contents,
+                    metadatas=chunk_metadatas
+                )
 
             self.logger.info(f"✅ Stored {len(chunk_ids)} chunks")
 
+            # Statistics must never fail an ingest; a full recompute repairs them
+            if self.corpus_aggregates is not None:
+                try:
+                    self.corpus_aggregates.record_chunks(chunk_metadatas)
+                except Exception as e:
+                    self.logger.warning(f"Corpus aggregates update failed: {e}")
+
+            if self.tag_taxonomy is not None:
+                try:
+                    self.tag_taxonomy.add_metadatas(chunk_metadatas)
+                except Exception as e:
+                    self.logger.warning(f"Tag taxonomy update failed: {e}")
+
             # Create stored document
             stored_doc = StoredDocument(
                 doc_id=input_data.doc_id,
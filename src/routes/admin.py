@@ -4,12 +4,22 @@ Administrative endpoints for maintenance and cleanup
 from fastapi import APIRouter, HTTPException
 import logging
 from src.services.entity_enrichment_service import EntityEnrichmentService
+from src.services.drift_monitor_service import get_corpus_aggregates
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
+def _invalidate_corpus_statistics():
+    """Bulk deletes: let drift aggregates and tag counters rebuild from the collection"""
+    from app import rag_service
+
+    get_corpus_aggregates().mark_stale()
+    if getattr(rag_service, 'tag_taxonomy', None) is not None:
+        rag_service.tag_taxonomy.invalidate()
+
+
 @router.post("/cleanup-corrupted")
 async def cleanup_corrupted_documents():
     """Remove documents with corrupted or binary content"""
@@ -33,6 +43,7 @@ async def cleanup_corrupted_documents():
 
         if corrupted_ids:
             rag_service.collection.delete(ids=corrupted_ids)
+            _invalidate_corpus_statistics()
             logger.info(f"Removed {len(corrupted_ids)} corrupted documents")
 
         return {
@@ -80,6 +91,7 @@ async def cleanup_duplicates():
 
                 try:
                     collection.delete(ids=ids_to_remove)
+                    _invalidate_corpus_statistics()
                     duplicates_removed += len(ids_to_remove)
                     logger.info(f"Removed {len(ids_to_remove)} duplicates for hash {content_hash}")
                 except Exception as e:
@@ -111,6 +123,7 @@ async def reset_collection(confirm: str = None):
         all_docs = collection.get()
         if all_docs and all_docs['ids']:
             collection.delete(ids=all_docs['ids'])
+            _invalidate_corpus_statistics()
             logger.warning(f"Collection reset - removed {len(all_docs['ids'])} documents")
             return {
                 "success": True,
@@ -5,7 +5,7 @@ Provides API endpoints for:
 - Running evaluation against gold query sets
 - Managing gold queries
 - Viewing evaluation history
-- Comparing evaluation runs
+- Comparing evaluation runs (quality deltas and latency regressions)
 """
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
@@ -16,7 +16,9 @@ import json
 from src.services.evaluation_service import (
     EvaluationService,
     GoldQuery,
-    EvaluationRun
+    EvaluationRun,
+    EVALUATION_CONCURRENCY,
+    EVALUATION_LATENCY_REGRESSION_THRESHOLD
 )
 from src.core.dependencies import get_rag_service
 
@@ -38,6 +40,7 @@ class AddGoldQueryRequest(BaseModel):
 class RunEvaluationRequest(BaseModel):
     """Request to run evaluation"""
     top_k: int = 10
+    concurrency: int = EVALUATION_CONCURRENCY
 
 
 class EvaluationRunSummary(BaseModel):
@@ -52,6 +55,9 @@ class EvaluationRunSummary(BaseModel):
     avg_mrr: float
     pass_rate: float
     failed_queries: List[str]
+    latency_p50_ms: float = 0.0
+    latency_p95_ms: float = 0.0
+    concurrency: int = 1
 
 
 @router.get("/evaluation/gold-queries")
@@ -130,7 +136,7 @@ async def run_evaluation(
     Run evaluation against all gold queries
 
     Args:
-        request: Evaluation parameters (top_k)
+        request: Evaluation parameters (top_k, concurrency)
 
     Returns:
         Evaluation run results with metrics
@@ -161,7 +167,8 @@ async def run_evaluation(
         # Run evaluation
         evaluation_run = await evaluation_service.run_evaluation(
             search_function,
-            top_k=request.top_k
+            top_k=request.top_k,
+            concurrency=request.concurrency
         )
 
         return EvaluationRunSummary(
@@ -174,7 +181,10 @@ async def run_evaluation(
             avg_recall_at_10=evaluation_run.avg_recall_at_10,
             avg_mrr=evaluation_run.avg_mrr,
             pass_rate=evaluation_run.pass_rate,
-            failed_queries=evaluation_run.failed_queries
+            failed_queries=evaluation_run.failed_queries,
+            latency_p50_ms=evaluation_run.latency_p50_ms,
+            latency_p95_ms=evaluation_run.latency_p95_ms,
+            concurrency=evaluation_run.concurrency
         )
 
     except HTTPException:
@@ -206,7 +216,9 @@ async def get_evaluation_history(limit: int = 10):
                 "avg_precision_at_5": run.avg_precision_at_5,
                 "avg_recall_at_5": run.avg_recall_at_5,
                 "avg_mrr": run.avg_mrr,
-                "pass_rate": run.pass_rate
+                "pass_rate": run.pass_rate,
+                "latency_p50_ms": run.latency_p50_ms,
+                "latency_p95_ms": run.latency_p95_ms
             })
 
         return {
@@ -261,16 +273,21 @@ async def get_evaluation_report(run_id: str):
 
 
 @router.get("/evaluation/compare")
-async def compare_evaluation_runs(run_id_1: str, run_id_2: str):
+async def compare_evaluation_runs(
+    run_id_1: str,
+    run_id_2: str,
+    latency_threshold: float = EVALUATION_LATENCY_REGRESSION_THRESHOLD
+):
     """
     Compare two evaluation runs to detect regression/improvement
 
     Args:
         run_id_1: First run ID (baseline)
         run_id_2: Second run ID (current)
+        latency_threshold: Relative p50/p95 slowdown flagged as regression (0.2 = +20%)
 
     Returns:
-        Comparison with delta metrics
+        Comparison with quality deltas, latency deltas and regression flags
     """
     try:
         from pathlib import Path
@@ -298,7 +315,7 @@ async def compare_evaluation_runs(run_id_1: str, run_id_2: str):
         run2 = EvaluationRun(**data2)
 
         # Compare
-        comparison = evaluation_service.compare_runs(run1, run2)
+        comparison = evaluation_service.compare_runs(run1, run2, latency_threshold=latency_threshold)
 
         return comparison
 
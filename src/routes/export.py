@@ -0,0 +1,39 @@
+"""
+Export Routes - Obsidian vault write-behind queue
+
+Provides API endpoints for:
+- Flushing pending vault writes to disk
+- Viewing write-queue statistics (coalesced writes, pending files)
+"""
+
+from fastapi import APIRouter, HTTPException
+import asyncio
+import logging
+
+from src.services.vault_writer_service import get_vault_write_queue
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.post("/flush")
+async def flush_export_queue():
+    """
+    Write all pending Obsidian vault files to disk now
+
+    Returns:
+        Files written, errors, remaining pending files and flush duration
+    """
+    try:
+        result = await asyncio.to_thread(get_vault_write_queue().flush)
+        return {"success": result["errors"] == 0, **result}
+    except Exception as e:
+        logger.error(f"Vault flush failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def get_export_queue_stats():
+    """Get vault write-queue statistics"""
+    return get_vault_write_queue().get_stats()
@@ -83,6 +83,17 @@ async def health_check(
                 "reason": "ENABLE_RERANKING=false"
             }
 
+        # Embedding broker stats (Voyage embeddings or the shared local worker)
+        from src.services import rag_service as rag_module
+        embedding_fn = rag_module.embedding_function
+        if embedding_fn is not None and hasattr(embedding_fn, "get_stats"):
+            try:
+                embedding_status = embedding_fn.get_stats()
+            except Exception as e:
+                embedding_status = {"brokered": True, "error": str(e)}
+        else:
+            embedding_status = {"brokered": False}
+
         # Determine overall health status
         overall_status = "healthy" if chromadb_status == "connected" else "degraded"
 
@@ -104,6 +115,7 @@ async def health_check(
 
             # Services
             "reranking": reranking_status,
+            "embeddings": embedding_status,
             "ocr_available": OCR_AVAILABLE,
             "file_watcher": "enabled" if ENABLE_FILE_WATCH else "disabled",
 
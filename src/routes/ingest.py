@@ -11,6 +11,7 @@ import logging
 
 from src.models.schemas import Document, IngestResponse, ObsidianMetadata
 from src.core.dependencies import get_rag_service, get_paths
+from src.core.tracing import Trace, activate_trace
 
 logger = logging.getLogger(__name__)
 
@@ -25,15 +26,20 @@ async def ingest_document(
     """Ingest document via API"""
     try:
         # Auth handled by app-level middleware
-        return await rag_service.process_document(
-            content=document.content,
-            filename=document.filename,
-            document_type=document.document_type,
-            process_ocr=document.process_ocr,
-            generate_obsidian=document.generate_obsidian,
-            file_metadata=document.metadata,
-            use_critic=document.use_critic
-        )
+        trace = Trace("ingest")
+        with activate_trace(trace):
+            response = await rag_service.process_document(
+                content=document.content,
+                filename=document.filename,
+                document_type=document.document_type,
+                process_ocr=document.process_ocr,
+                generate_obsidian=document.generate_obsidian,
+                file_metadata=document.metadata,
+                use_critic=document.use_critic
+            )
+        response.timings = trace.timing_breakdown()
+        trace.log(doc_id=response.doc_id)
+        return response
     except Exception as e:
         logger.error(f"Document ingestion failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -6,19 +6,26 @@ Provides API endpoints for:
 - Detecting drift and anomalies
 - Viewing dashboard data
 - Alert history
+- Inspecting and repairing ingest-time corpus aggregates
+- Local document type classifier stats and retraining
+- Prometheus metrics scraping (/metrics)
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime, timedelta
 
-from src.services.drift_monitor_service import DriftMonitorService
+import asyncio
+
+from src.services.drift_monitor_service import DriftMonitorService, get_corpus_aggregates
+from src.services.monitoring_service import get_monitoring_service
 
 router = APIRouter(tags=["monitoring"])
 
-# Global service instance
-drift_monitor = DriftMonitorService()
+# Global service instance (snapshots read the aggregates kept by the storage stage)
+drift_monitor = DriftMonitorService(aggregates=get_corpus_aggregates())
 
 
 class CaptureSnapshotResponse(BaseModel):
@@ -42,10 +49,13 @@ class DriftAlertResponse(BaseModel):
 
 
 @router.post("/monitoring/snapshot", response_model=CaptureSnapshotResponse)
-async def capture_snapshot():
+async def capture_snapshot(recompute: bool = False):
     """
     Capture current system state snapshot
 
+    Args:
+        recompute: Rebuild aggregates from a full collection scan first
+
     Returns:
         Snapshot with key metrics
     """
@@ -53,7 +63,7 @@ async def capture_snapshot():
         # Import collection from app
         from app import collection
 
-        snapshot = drift_monitor.capture_snapshot(collection)
+        snapshot = await asyncio.to_thread(drift_monitor.capture_snapshot, collection, None, recompute)
 
         return CaptureSnapshotResponse(
             timestamp=snapshot.timestamp,
@@ -335,6 +345,145 @@ async def schedule_snapshot(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=f"Failed to schedule snapshot: {str(e)}")
 
 
+@router.get("/monitoring/aggregates")
+async def get_aggregates():
+    """
+    Get the state of the ingest-time corpus aggregates
+
+    Returns:
+        Chunk/document counts, last update time and whether a recompute is pending
+    """
+    return drift_monitor.aggregates.get_stats()
+
+
+@router.post("/monitoring/aggregates/rebuild")
+async def rebuild_aggregates():
+    """
+    Repair corpus aggregates with a full collection scan
+
+    Returns:
+        Aggregate stats after the rebuild
+    """
+    try:
+        from app import collection
+
+        await asyncio.to_thread(drift_monitor.recompute_aggregates, collection)
+
+        return {
+            "success": True,
+            **drift_monitor.aggregates.get_stats()
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild aggregates: {str(e)}")
+
+
+@router.get("/monitoring/llm-providers")
+async def get_llm_provider_health():
+    """
+    Circuit breaker state per LLM model used for ingestion
+
+    Returns:
+        Per model: state (closed/open/half_open), recent calls, error rate,
+        p95 latency and how often the circuit opened; plus whether hedging is on
+    """
+    from app import rag_service
+
+    llm_service = rag_service.llm_service
+    return {
+        "hedging_enabled": llm_service.hedging_enabled,
+        "circuit_breakers_enabled": llm_service.circuit_breakers.enabled,
+        "models": llm_service.circuit_breakers.snapshot()
+    }
+
+
+@router.get("/monitoring/document-types")
+async def get_document_type_classifier_stats():
+    """
+    How semantic document types were decided
+
+    Returns:
+        Counts per path (keyword, rule, model, llm), the share that still
+        needed the LLM, and the local model's training state
+    """
+    from app import rag_service
+
+    classifier = rag_service.enrichment_service.doc_type_classifier
+    if classifier is None:
+        return {"enabled": False}
+    return {"enabled": True, **classifier.get_stats()}
+
+
+@router.get("/monitoring/extraction-cache")
+async def get_extraction_cache_stats():
+    """
+    Persistent extraction cache statistics
+
+    Returns:
+        Hits, misses, hit rate and size of the on-disk cache of extracted text
+    """
+    from src.services.extraction_cache_service import get_extraction_cache
+
+    cache = get_extraction_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.get_stats()}
+
+
+@router.get("/monitoring/watch-folder")
+async def get_watch_folder_stats():
+    """
+    Watch-folder ingestion statistics
+
+    Returns:
+        Event, queue, batch and failure counts of the watch-folder ingestor
+    """
+    import app
+
+    ingestor = getattr(app, "watch_ingestor", None)
+    if ingestor is None:
+        return {"enabled": False}
+    return {"enabled": True, **ingestor.get_stats()}
+
+
+@router.post("/monitoring/document-types/train")
+async def train_document_type_classifier():
+    """
+    Retrain the local document type classifier on already classified documents
+
+    Returns:
+        Training stats (samples, labels, training accuracy)
+    """
+    try:
+        from app import collection, rag_service
+
+        classifier = rag_service.enrichment_service.doc_type_classifier
+        if classifier is None:
+            raise HTTPException(status_code=400, detail="Document type classifier is disabled")
+
+        stats = await asyncio.to_thread(classifier.train_from_collection, collection)
+        return {"success": True, **stats}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to train classifier: {str(e)}")
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Prometheus text-format metrics
+
+    Request, pipeline stage and LLM latencies are exported as summaries
+    (p50/p95/p99 from fixed-memory sketches) alongside counters and gauges.
+    """
+    return PlainTextResponse(
+        get_monitoring_service().metrics.export_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 @router.get("/monitoring/health")
 async def monitoring_health():
     """
@@ -2,19 +2,74 @@
 Search and document management endpoints
 """
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from typing import Any, Dict, List
 from pathlib import Path
+import math
+import os
 import re
+import time
 import logging
 
-from src.models.schemas import Query, SearchResponse, DocumentInfo, SearchResult
+from src.models.schemas import Query, SearchResponse, DocumentInfo, SearchResult, BatchSearchQuery, BatchSearchResponse
 from src.core.dependencies import get_rag_service, get_paths, get_app_collection
+from src.services.drift_monitor_service import get_corpus_aggregates
+from src.services.vault_writer_service import get_vault_write_queue
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["search"])
 
 
+def _reranking_enabled() -> bool:
+    return os.getenv("ENABLE_RERANKING", "true").lower() == "true"
+
+
+def _rerank_and_format(
+    query_text: str,
+    hybrid_results: List[Dict[str, Any]],
+    top_k: int,
+    enable_reranking: bool
+) -> List[SearchResult]:
+    """Apply cross-encoder reranking (if enabled) and convert to SearchResult"""
+    # Apply cross-encoder reranking for final ordering (if enabled)
+    if enable_reranking:
+        from src.services.reranking_service import get_reranking_service
+        reranker = get_reranking_service()
+        reranked_results = reranker.rerank(
+            query=query_text,
+            results=hybrid_results,
+            top_k=top_k
+        )
+    else:
+        # Skip reranking, just take top_k from hybrid results
+        reranked_results = hybrid_results[:top_k]
+
+    # Convert to SearchResult format
+    search_results = []
+    for result in reranked_results:
+        # Normalize rerank_score to [0, 1] range if present
+        # Rerank scores from cross-encoders can be any value (-10 to +10 typical)
+        if 'rerank_score' in result:
+            raw_score = result['rerank_score']
+            relevance_score = 1 / (1 + math.exp(-raw_score))
+        elif 'hybrid_score' in result:
+            # Hybrid scores should already be [0, 1] but clamp anyway
+            relevance_score = result['hybrid_score']
+        else:
+            relevance_score = result.get('relevance_score', 0.0)
+
+        # Ensure score is in [0, 1] range
+        relevance_score = max(0.0, min(1.0, relevance_score))
+
+        search_results.append(SearchResult(
+            content=result['content'],
+            metadata=result['metadata'],
+            relevance_score=relevance_score,
+            chunk_id=result.get('chunk_id', result['metadata'].get('chunk_id', 'unknown'))
+        ))
+    return search_results
+
+
 @router.post("/search", response_model=SearchResponse)
 async def search_documents(
     query: Query,
@@ -32,13 +87,11 @@ async def search_documents(
 
     This is the recommended search endpoint for best results.
     """
-    import time
-    import os
     start_time = time.time()
 
     try:
         # Check if reranking is enabled
-        enable_reranking = os.getenv("ENABLE_RERANKING", "true").lower() == "true"
+        enable_reranking = _reranking_enabled()
 
         # Get hybrid search results (BM25 + dense + MMR)
         # Fetch more results if reranking enabled (4x to improve recall)
@@ -50,46 +103,10 @@ async def search_documents(
             apply_mmr=True  # Always use MMR for diversity
         )
 
-        # Apply cross-encoder reranking for final ordering (if enabled)
-        if enable_reranking:
-            from src.services.reranking_service import get_reranking_service
-            reranker = get_reranking_service()
-            reranked_results = reranker.rerank(
-                query=query.text,
-                results=hybrid_results,
-                top_k=query.top_k
-            )
-        else:
-            # Skip reranking, just take top_k from hybrid results
-            reranked_results = hybrid_results[:query.top_k]
+        search_results = _rerank_and_format(query.text, hybrid_results, query.top_k, enable_reranking)
 
         search_time_ms = (time.time() - start_time) * 1000
 
-        # Convert to SearchResult format
-        search_results = []
-        for result in reranked_results:
-            # Normalize rerank_score to [0, 1] range if present
-            # Rerank scores from cross-encoders can be any value (-10 to +10 typical)
-            if 'rerank_score' in result:
-                import math
-                raw_score = result['rerank_score']
-                relevance_score = 1 / (1 + math.exp(-raw_score))
-            elif 'hybrid_score' in result:
-                # Hybrid scores should already be [0, 1] but clamp anyway
-                relevance_score = result['hybrid_score']
-            else:
-                relevance_score = result.get('relevance_score', 0.0)
-
-            # Ensure score is in [0, 1] range
-            relevance_score = max(0.0, min(1.0, relevance_score))
-
-            search_results.append(SearchResult(
-                content=result['content'],
-                metadata=result['metadata'],
-                relevance_score=relevance_score,
-                chunk_id=result.get('chunk_id', result['metadata'].get('chunk_id', 'unknown'))
-            ))
-
         logger.info(f"🔀 Hybrid search completed: {len(search_results)} results in {search_time_ms:.2f}ms")
 
         return SearchResponse(
@@ -104,6 +121,63 @@ async def search_documents(
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_documents_batch(
+    batch: BatchSearchQuery,
+    rag_service = Depends(get_rag_service)
+):
+    """
+    Batch hybrid search - the /search pipeline for up to 100 queries at once
+
+    All uncached queries are embedded and sent to ChromaDB in one request,
+    BM25-scored in one vectorized pass, then fused, diversified and reranked
+    per query. Use this instead of one /search request per query (evaluation
+    runs, bulk lookups).
+
+    Returns one SearchResponse per query, in input order; each response's
+    search_time_ms is its share of the shared retrieval plus its reranking.
+    """
+    if any(not text.strip() for text in batch.queries):
+        raise HTTPException(status_code=422, detail="Query texts must not be empty")
+
+    start_time = time.time()
+
+    try:
+        enable_reranking = _reranking_enabled()
+        multiplier = 4 if enable_reranking else 1
+        hybrid_results_list = await rag_service.vector_service.search_many(
+            batch.queries,
+            top_k=batch.top_k * multiplier,
+            filter=batch.filter,
+            apply_mmr=True
+        )
+        retrieval_share_ms = (time.time() - start_time) * 1000 / len(batch.queries)
+
+        responses = []
+        for query_text, hybrid_results in zip(batch.queries, hybrid_results_list):
+            rerank_start = time.time()
+            search_results = _rerank_and_format(query_text, hybrid_results, batch.top_k, enable_reranking)
+            responses.append(SearchResponse(
+                query=query_text,
+                results=search_results,
+                total_results=len(search_results),
+                search_time_ms=retrieval_share_ms + (time.time() - rerank_start) * 1000
+            ))
+
+        search_time_ms = (time.time() - start_time) * 1000
+        logger.info(f"🔀 Batch search completed: {len(responses)} queries in {search_time_ms:.2f}ms")
+
+        return BatchSearchResponse(
+            results=responses,
+            total_queries=len(responses),
+            search_time_ms=search_time_ms
+        )
+
+    except Exception as e:
+        logger.error(f"Batch search failed for {len(batch.queries)} queries: {e}")
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+
 @router.get("/documents", response_model=List[DocumentInfo])
 async def list_documents(
     collection = Depends(get_app_collection),
@@ -328,7 +402,8 @@ async def get_entity_timeline(
 async def delete_document(
     doc_id: str,
     collection = Depends(get_app_collection),
-    PATHS: dict = Depends(get_paths)
+    PATHS: dict = Depends(get_paths),
+    rag_service = Depends(get_rag_service)
 ):
     """Delete document and associated files"""
     try:
@@ -339,8 +414,12 @@ async def delete_document(
 
         # Delete from ChromaDB
         collection.delete(where={"doc_id": doc_id})
+        get_corpus_aggregates().remove_chunks(results.get('metadatas') or [])
+        if getattr(rag_service, 'tag_taxonomy', None) is not None:
+            rag_service.tag_taxonomy.remove_metadatas(results.get('metadatas') or [])
 
-        # Delete Obsidian files
+        # Delete Obsidian files (drop queued writes first so a flush can't recreate them)
+        get_vault_write_queue().discard_glob(PATHS['obsidian_path'], f"*_{doc_id[:8]}.md")
         obsidian_files = list(Path(PATHS['obsidian_path']).glob(f"*_{doc_id[:8]}.md"))
         for md_file in obsidian_files:
             md_file.unlink()
@@ -13,13 +13,27 @@ Key Features:
 """
 
 import logging
+import os
 import re
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Optional exact token counting (e.g. "cl100k_base"); empty = 4 chars/token heuristic
+CHUNKING_TOKENIZER = os.getenv("CHUNKING_TOKENIZER", "")
+CHUNKING_TOKEN_CACHE_SIZE = int(os.getenv("CHUNKING_TOKEN_CACHE_SIZE", "4096"))
+
+# Precompiled patterns (the structure parser runs them once per line)
+_HEADING_RE = re.compile(r'(#{1,6})\s+(.+)$')
+_LIST_ITEM_RE = re.compile(r'\s*(?:[-*+]|\d+\.)\s+')
+_RAG_IGNORE_RE = re.compile(
+    r'<!--\s*RAG:IGNORE-START\s*-->.*?<!--\s*RAG:IGNORE-END\s*-->',
+    re.IGNORECASE | re.DOTALL
+)
+
 
 class ChunkType(str, Enum):
     """Types of chunks based on document structure"""
@@ -51,6 +65,55 @@ class Chunk:
         }
 
 
+def _new_section(
+    section_type: str,
+    content: List[str],
+    title: Optional[str],
+    parent_titles: List[str],
+    level: int = 0,
+    **extra: Any
+) -> Dict[str, Any]:
+    """Create a parsed section dict"""
+    section = {
+        'type': section_type,
+        'content': content,
+        'title': title,
+        'level': level,
+        'parent_titles': parent_titles
+    }
+    section.update(extra)
+    return section
+
+
+class TokenCounter:
+    """
+    Exact token counting with a tiktoken encoding
+
+    Counts are cached per text, so re-estimating the same sections while
+    merging chunks doesn't re-tokenize them.
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base", cache_size: int = CHUNKING_TOKEN_CACHE_SIZE):
+        import tiktoken
+
+        self.encoding_name = encoding_name
+        self.encoding = tiktoken.get_encoding(encoding_name)
+        self._cached_count = lru_cache(maxsize=cache_size)(self._count)
+
+    def _count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def count(self, text: str) -> int:
+        """Return the exact number of tokens in text"""
+        if not text:
+            return 0
+        return self._cached_count(text)
+
+    def cache_info(self):
+        """Return cache hit/miss statistics"""
+        return self._cached_count.cache_info()
+
+
 class ChunkingService:
     """
     Structure-aware document chunking
@@ -64,15 +127,25 @@ class ChunkingService:
         target_size: int = 512,      # Target tokens per chunk
         min_size: int = 100,          # Minimum chunk size
         max_size: int = 800,          # Maximum chunk size
-        overlap: int = 50             # Overlap in tokens
+        overlap: int = 50,            # Overlap in tokens
+        tokenizer: Optional[str] = CHUNKING_TOKENIZER  # Exact counting (e.g. "cl100k_base")
     ):
         self.target_size = target_size
         self.min_size = min_size
         self.max_size = max_size
         self.overlap = overlap
 
+        self.token_counter: Optional[TokenCounter] = None
+        if tokenizer:
+            try:
+                self.token_counter = TokenCounter(tokenizer)
+            except Exception as e:
+                logger.warning(f"Tokenizer '{tokenizer}' unavailable ({e}), using 4 chars/token estimate")
+
     def estimate_tokens(self, text: str) -> int:
-        """Rough token estimation (4 chars ≈ 1 token)"""
+        """Token count: exact if a tokenizer is configured, else 4 chars ≈ 1 token"""
+        if self.token_counter is not None:
+            return self.token_counter.count(text)
         return len(text) // 4
 
     def _remove_rag_ignore_blocks(self, content: str) -> str:
@@ -82,15 +155,7 @@ class ChunkingService:
         These blocks contain Obsidian-specific wiki-links (xref) that should
         not be indexed for RAG retrieval.
         """
-        import re
-
-        # Pattern to match RAG:IGNORE blocks
-        pattern = r'<!--\s*RAG:IGNORE-START\s*-->.*?<!--\s*RAG:IGNORE-END\s*-->'
-
-        # Remove all matching blocks (case-insensitive, multiline, dotall)
-        cleaned = re.sub(pattern, '', content, flags=re.IGNORECASE | re.DOTALL)
-
-        return cleaned
+        return _RAG_IGNORE_RE.sub('', content)
 
     def chunk_text(self, content: str, preserve_structure: bool = True) -> List[Dict[str, Any]]:
         """
@@ -118,10 +183,67 @@ class ChunkingService:
 
         return [chunk.to_dict() for chunk in chunks]
 
+    def split_into_sections(self, content: str, max_chars: int) -> List[str]:
+        """
+        Group structural sections into windows of at most max_chars
+
+        Used to process long documents section by section (e.g. map-reduce
+        enrichment). Sections are kept whole where possible; a section larger
+        than max_chars is split at paragraph, line or sentence boundaries.
+
+        Args:
+            content: Document content (preferably Markdown)
+            max_chars: Maximum characters per window
+
+        Returns:
+            List of window texts in document order
+        """
+        content = self._remove_rag_ignore_blocks(content)
+
+        windows: List[str] = []
+        current: List[str] = []
+        current_len = 0
+        for section in self._parse_markdown_structure(content):
+            text = '\n'.join(section['content']).strip()
+            if not text:
+                continue
+            for piece in self._split_text(text, max_chars):
+                if current and current_len + len(piece) + 2 > max_chars:
+                    windows.append('\n\n'.join(current))
+                    current, current_len = [], 0
+                current.append(piece)
+                current_len += len(piece) + 2
+
+        if current:
+            windows.append('\n\n'.join(current))
+        return windows
+
+    @staticmethod
+    def _split_text(text: str, max_chars: int) -> List[str]:
+        """Split text into pieces of at most max_chars at the latest natural boundary"""
+        pieces = []
+        while len(text) > max_chars:
+            cut = -1
+            for boundary in ('\n\n', '\n', '. '):
+                cut = text.rfind(boundary, max_chars // 2, max_chars)
+                if cut != -1:
+                    cut += len(boundary)
+                    break
+            if cut == -1:
+                cut = max_chars
+            pieces.append(text[:cut].strip())
+            text = text[cut:].strip()
+        if text:
+            pieces.append(text)
+        return pieces
+
     def _parse_markdown_structure(self, content: str) -> List[Dict[str, Any]]:
         """
         Parse Markdown into structural sections
 
+        Single pass over the lines. Each line is classified by its first
+        non-blank character before any (precompiled) regex is tried.
+
         Detects:
         - Headings (# ## ###)
         - Tables (| ... |)
@@ -130,157 +252,90 @@ class ChunkingService:
         - Paragraphs
         """
         sections = []
-        lines = content.split('\n')
-        current_section = {
-            'type': 'paragraph',
-            'content': [],
-            'title': None,
-            'level': 0,
-            'parent_titles': []
-        }
-
-        heading_stack = []  # Track heading hierarchy
+        heading_levels: List[int] = []   # Track heading hierarchy
+        heading_titles: List[str] = []   # Titles matching heading_levels
+        current_section = _new_section('paragraph', [], None, [])
         in_code_block = False
         in_table = False
-        code_fence = None
 
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-
-            # Code blocks
-            if line.strip().startswith('```'):
-                if not in_code_block:
-                    # Start code block
-                    in_code_block = True
-                    code_fence = line.strip()
-                    language = code_fence[3:].strip() or "text"
-
-                    # Save previous section
-                    if current_section['content']:
-                        sections.append(current_section)
+        for line in content.split('\n'):
+            stripped = line.strip()
 
-                    current_section = {
-                        'type': 'code',
-                        'content': [line],
-                        'title': f"Code block ({language})",
-                        'level': 0,
-                        'parent_titles': heading_stack.copy(),
-                        'language': language
-                    }
-                else:
+            if in_code_block:
+                current_section['content'].append(line)
+                if stripped.startswith('```'):
                     # End code block
-                    current_section['content'].append(line)
                     sections.append(current_section)
-                    current_section = {
-                        'type': 'paragraph',
-                        'content': [],
-                        'title': None,
-                        'level': 0,
-                        'parent_titles': heading_stack.copy()
-                    }
+                    current_section = _new_section('paragraph', [], None, list(heading_titles))
                     in_code_block = False
-
-                i += 1
                 continue
 
-            if in_code_block:
-                current_section['content'].append(line)
-                i += 1
-                continue
-
-            # Headings
-            heading_match = re.match(r'^(#{1,6})\s+(.+)$', line)
-            if heading_match:
-                level = len(heading_match.group(1))
-                title = heading_match.group(2).strip()
+            first = stripped[:1]
 
-                # Save previous section
+            # Code blocks
+            if first == '`' and stripped.startswith('```'):
+                language = stripped[3:].strip() or "text"
                 if current_section['content']:
                     sections.append(current_section)
-
-                # Update heading stack
-                while heading_stack and heading_stack[-1]['level'] >= level:
-                    heading_stack.pop()
-                heading_stack.append({'level': level, 'title': title})
-
-                # Start new section
-                current_section = {
-                    'type': 'heading',
-                    'content': [line],  # Include heading in content
-                    'title': title,
-                    'level': level,
-                    'parent_titles': [h['title'] for h in heading_stack[:-1]]
-                }
-
-                i += 1
+                current_section = _new_section(
+                    'code', [line], f"Code block ({language})", list(heading_titles),
+                    language=language
+                )
+                in_code_block = True
+                in_table = False
                 continue
 
-            # Tables
-            if '|' in line and line.strip().startswith('|'):
-                if not in_table:
-                    # Start table
-                    in_table = True
+            # Headings
+            if first == '#' and line[:1] == '#':
+                heading_match = _HEADING_RE.match(line)
+                if heading_match:
+                    level = len(heading_match.group(1))
+                    title = heading_match.group(2).strip()
 
-                    # Save previous section
                     if current_section['content']:
                         sections.append(current_section)
 
-                    current_section = {
-                        'type': 'table',
-                        'content': [line],
-                        'title': 'Table',
-                        'level': 0,
-                        'parent_titles': [h['title'] for h in heading_stack]
-                    }
-                else:
-                    current_section['content'].append(line)
+                    while heading_levels and heading_levels[-1] >= level:
+                        heading_levels.pop()
+                        heading_titles.pop()
 
-                i += 1
-                continue
-            else:
-                if in_table:
-                    # End of table
-                    sections.append(current_section)
-                    current_section = {
-                        'type': 'paragraph',
-                        'content': [],
-                        'title': None,
-                        'level': 0,
-                        'parent_titles': [h['title'] for h in heading_stack]
-                    }
+                    # Heading included in content; parents exclude the heading itself
+                    current_section = _new_section('heading', [line], title, list(heading_titles), level=level)
+                    heading_levels.append(level)
+                    heading_titles.append(title)
                     in_table = False
+                    continue
 
-            # Lists
-            if re.match(r'^\s*[-*+]\s+', line) or re.match(r'^\s*\d+\.\s+', line):
-                if current_section['type'] != 'list':
-                    # Start list
+            # Tables
+            if first == '|':
+                if in_table:
+                    current_section['content'].append(line)
+                else:
                     if current_section['content']:
                         sections.append(current_section)
+                    current_section = _new_section('table', [line], 'Table', list(heading_titles))
+                    in_table = True
+                continue
 
-                    current_section = {
-                        'type': 'list',
-                        'content': [line],
-                        'title': 'List',
-                        'level': 0,
-                        'parent_titles': [h['title'] for h in heading_stack]
-                    }
-                else:
-                    current_section['content'].append(line)
+            if in_table:
+                # End of table
+                sections.append(current_section)
+                current_section = _new_section('paragraph', [], None, list(heading_titles))
+                in_table = False
 
-                i += 1
+            # Lists
+            if first and (first in '-*+' or first.isdigit()) and _LIST_ITEM_RE.match(line):
+                if current_section['type'] == 'list':
+                    current_section['content'].append(line)
+                else:
+                    if current_section['content']:
+                        sections.append(current_section)
+                    current_section = _new_section('list', [line], 'List', list(heading_titles))
                 continue
 
-            # Regular lines
-            if line.strip():
+            # Regular lines (empty lines kept inside a section, never start one)
+            if stripped or current_section['content']:
                 current_section['content'].append(line)
-            else:
-                # Empty line - potential section break
-                if current_section['content']:
-                    # Add empty line but don't break section yet
-                    current_section['content'].append(line)
-
-            i += 1
 
         # Save final section
         if current_section['content']:
@@ -301,11 +356,15 @@ class ChunkingService:
         chunks = []
         sequence = 0
 
+        # Join and count each section once (merging looks at neighbours repeatedly)
+        section_texts = ['\n'.join(s['content']) for s in sections]
+        section_token_counts = [self.estimate_tokens(text) for text in section_texts]
+
         i = 0
         while i < len(sections):
             section = sections[i]
-            section_content = '\n'.join(section['content'])
-            section_tokens = self.estimate_tokens(section_content)
+            section_content = section_texts[i]
+            section_tokens = section_token_counts[i]
 
             # Tables and code always standalone
             if section['type'] in ['table', 'code']:
@@ -343,8 +402,7 @@ class ChunkingService:
                 if next_section['type'] in ['table', 'code']:
                     break
 
-                next_content = '\n'.join(next_section['content'])
-                next_tokens = self.estimate_tokens(next_content)
+                next_tokens = section_token_counts[j]
 
                 # Check if adding would exceed max_size
                 if chunk_tokens + next_tokens > self.max_size:
@@ -355,9 +413,7 @@ class ChunkingService:
                 j += 1
 
             # Build chunk from accumulated sections
-            combined_content = '\n\n'.join(
-                '\n'.join(s['content']) for s in chunk_sections
-            )
+            combined_content = '\n\n'.join(section_texts[i:j])
 
             # Determine chunk type
             chunk_type = self._determine_chunk_type(chunk_sections)
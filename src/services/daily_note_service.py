@@ -20,6 +20,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from collections import defaultdict
 
+from src.services.vault_writer_service import VaultWriteQueue
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,10 +38,14 @@ class DailyNoteService:
     def __init__(
         self,
         refs_dir: str = "./obsidian_vault/refs",
-        llm_service = None
+        llm_service = None,
+        write_queue: Optional[VaultWriteQueue] = None
     ):
         self.refs_dir = Path(refs_dir)
         self.llm_service = llm_service
+        # Daily notes are rewritten per ingested document; a shared write-behind
+        # queue coalesces those rewrites into one write per note per flush
+        self.write_queue = write_queue or VaultWriteQueue(write_behind=False)
 
         # Create directory structure
         self.days_dir = self.refs_dir / "days"
@@ -86,8 +92,8 @@ class DailyNoteService:
         date_str = doc_date.strftime('%Y-%m-%d')
 
         # Load or create daily note
-        if daily_path.exists():
-            content = daily_path.read_text(encoding='utf-8')
+        content = self.write_queue.read_text(daily_path)
+        if content is not None:
             # Split frontmatter and body
             if content.startswith('---'):
                 parts = content.split('---', 2)
@@ -248,7 +254,7 @@ class DailyNoteService:
         """
         weekly_path = self.get_weekly_note_path(date)
 
-        if weekly_path.exists() and not force_regenerate:
+        if self.write_queue.exists(weekly_path) and not force_regenerate:
             logger.info(f"Weekly note already exists: {weekly_path}")
             return
 
@@ -261,7 +267,7 @@ class DailyNoteService:
         for i in range(7):
             day = week_start + timedelta(days=i)
             daily_path = self.get_daily_note_path(day)
-            if daily_path.exists():
+            if self.write_queue.exists(daily_path):
                 daily_notes.append({
                     'date': day.strftime('%Y-%m-%d'),
                     'day_name': day.strftime('%A'),
@@ -272,7 +278,7 @@ class DailyNoteService:
         llm_chats = []
         for daily_info in daily_notes:
             daily_path = self.days_dir / f"{daily_info['date']}.md"
-            content = daily_path.read_text(encoding='utf-8')
+            content = self.write_queue.read_text(daily_path) or ''
 
             # Extract frontmatter
             if content.startswith('---'):
@@ -334,7 +340,7 @@ class DailyNoteService:
         """
         monthly_path = self.get_monthly_note_path(date)
 
-        if monthly_path.exists() and not force_regenerate:
+        if self.write_queue.exists(monthly_path) and not force_regenerate:
             logger.info(f"Monthly note already exists: {monthly_path}")
             return
 
@@ -356,7 +362,7 @@ class DailyNoteService:
 
             if week_key not in seen_weeks:
                 weekly_path = self.weeks_dir / f"{week_key}.md"
-                if weekly_path.exists():
+                if self.write_queue.exists(weekly_path):
                     weekly_notes.append({
                         'week': week_key,
                         'filename': f"weeks/{week_key}"
@@ -409,12 +415,12 @@ class DailyNoteService:
             # Try to find the document
             doc_path = self.refs_dir.parent / f"{doc_filename}.md"
 
-            if not doc_path.exists():
+            # Read and parse frontmatter
+            content = self.write_queue.read_text(doc_path)
+            if content is None:
                 logger.warning(f"Document not found: {doc_path}")
                 return doc
 
-            # Read and parse frontmatter
-            content = doc_path.read_text(encoding='utf-8')
             if content.startswith('---'):
                 parts = content.split('---', 2)
                 if len(parts) >= 3:
@@ -479,4 +485,4 @@ Write in first person ("I was thinking about..."). Be specific and insightful. F
         content += "---\n\n"
         content += body
 
-        path.write_text(content, encoding='utf-8')
+        self.write_queue.write_text(path, content)
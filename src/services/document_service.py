@@ -5,7 +5,6 @@ Handles document extraction, processing, and chunking for various file formats
 """
 import asyncio
 import logging
-import magic
 import aiofiles
 import email
 import mailbox
@@ -13,21 +12,15 @@ from pathlib import Path
 from typing import Dict, Any, Tuple, Optional, List
 from fastapi import UploadFile
 
-# Document processing libraries
-import PyPDF2
-from docx import Document as DocxDocument
-from pptx import Presentation
-import openpyxl
-import xlrd
-from bs4 import BeautifulSoup
-
 from src.core.config import Settings
+from src.core.startup_profiler import lazy_import
 from src.models.schemas import DocumentType
 from src.services.text_splitter import SimpleTextSplitter
 from src.services.ocr_service import OCRService
 from src.services.whatsapp_parser import WhatsAppParser
 from src.services.llm_chat_parser import LLMChatParser
 from src.services.email_threading_service import EmailThreadingService, EmailMessage
+from src.services.extraction_cache_service import ExtractionCache, get_extraction_cache, hash_file
 from src.services.document_type_handlers import (
     EmailHandler,
     ChatLogHandler,
@@ -35,6 +28,26 @@ from src.services.document_type_handlers import (
 
 logger = logging.getLogger(__name__)
 
+# Document processing libraries - imported on first use of each format
+magic = lazy_import("magic")
+PyPDF2 = lazy_import("PyPDF2")
+docx = lazy_import("docx")
+pptx = lazy_import("pptx")
+openpyxl = lazy_import("openpyxl")
+xlrd = lazy_import("xlrd")
+bs4 = lazy_import("bs4")
+
+# Bump when extraction output changes (parsers, OCR settings) so cached
+# extraction results from older versions are no longer used
+EXTRACTOR_VERSION = "1"
+
+# Formats whose extraction is worth caching (parsing/OCR); text files are cheaper
+# to re-read and emails are not cached because extraction saves their attachments
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.tiff', '.bmp', '.gif'}
+CACHEABLE_EXTENSIONS = {
+    '.pdf', '.docx', '.doc', '.pptx', '.ppt', '.xlsx', '.xls'
+} | IMAGE_EXTENSIONS
+
 
 class DocumentService:
     """
@@ -81,6 +94,15 @@ class DocumentService:
         # Prevents OOM crashes from parallel enrichment calls
         self._processing_semaphore = asyncio.Semaphore(5)
 
+        # Persistent extraction cache (created on first cacheable file)
+        self._extraction_cache: Optional[ExtractionCache] = None
+
+    @property
+    def extraction_cache(self) -> Optional[ExtractionCache]:
+        if self._extraction_cache is None:
+            self._extraction_cache = get_extraction_cache()
+        return self._extraction_cache
+
     async def process_upload(
         self,
         file: UploadFile,
@@ -143,6 +165,10 @@ class DocumentService:
         """
         Extract text from various file formats
 
+        PDF, office and image extraction results are cached on disk by file
+        content (see ExtractionCache), so re-ingesting unchanged files skips
+        parsing and OCR.
+
         Args:
             file_path: Path to file
             process_ocr: Enable OCR for images and scanned PDFs
@@ -166,6 +192,36 @@ class DocumentService:
                 f"File too large: {file_size_mb:.1f}MB (max: {self.settings.max_file_size_mb}MB)"
             )
 
+        # OCR only happens when requested and available - key on what actually runs
+        ocr_active = bool(process_ocr and self.ocr_service)
+        suffix = file_path.suffix.lower()
+
+        # Without OCR an image yields a placeholder naming the file - nothing worth caching
+        cacheable = suffix in CACHEABLE_EXTENSIONS and (ocr_active or suffix not in IMAGE_EXTENSIONS)
+        cache = self.extraction_cache if cacheable else None
+        if cache is None:
+            return await self._extract_text(file_path, process_ocr, file_size_mb)
+
+        cache_key = cache.make_key(await asyncio.to_thread(hash_file, file_path), EXTRACTOR_VERSION, ocr_active)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"🗃️ Extraction cache hit: {file_path.name}")
+            return cached
+
+        text, doc_type, metadata = await self._extract_text(file_path, process_ocr, file_size_mb)
+
+        # Extractors report failures as placeholder text - never cache those
+        if text and text.strip() and not text.startswith("Failed to process"):
+            cache.set(cache_key, text, doc_type, metadata)
+        return text, doc_type, metadata
+
+    async def _extract_text(
+        self,
+        file_path: Path,
+        process_ocr: bool,
+        file_size_mb: float
+    ) -> Tuple[str, DocumentType, Dict[str, Any]]:
+        """Run the format-specific extractor for a file (uncached)"""
         # Detect file type
         mime_type = magic.from_file(str(file_path), mime=True)
         file_extension = file_path.suffix.lower()
@@ -342,7 +398,7 @@ class DocumentService:
             Tuple of (extracted_text, metadata_dict)
         """
         try:
-            doc = DocxDocument(str(file_path))
+            doc = docx.Document(str(file_path))
 
             # Extract paragraphs
             text = "\n".join([paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()])
@@ -366,7 +422,7 @@ class DocumentService:
     async def _process_powerpoint(self, file_path: Path) -> str:
         """Process PowerPoint presentations"""
         try:
-            prs = Presentation(str(file_path))
+            prs = pptx.Presentation(str(file_path))
             text = ""
 
             for slide_num, slide in enumerate(prs.slides, 1):
@@ -543,7 +599,7 @@ class DocumentService:
                             try:
                                 html_content = payload.decode(charset, errors='replace')
                                 # Simple HTML to text conversion
-                                soup = BeautifulSoup(html_content, 'html.parser')
+                                soup = bs4.BeautifulSoup(html_content, 'html.parser')
                                 text += soup.get_text(separator='\n', strip=True)
                             except:
                                 pass
@@ -738,7 +794,7 @@ class DocumentService:
             async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 html_content = await f.read()
 
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = bs4.BeautifulSoup(html_content, 'html.parser')
 
             # Remove script and style elements
             for script in soup(["script", "style", "nav", "footer", "header"]):
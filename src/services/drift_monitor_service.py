@@ -11,11 +11,17 @@ Features:
 - Ingestion pattern monitoring
 - Anomaly detection
 - Dashboard data generation
+- Ingest-time corpus aggregates (snapshots without a collection scan)
 """
 
+import asyncio
+import atexit
 import json
 import logging
-from typing import List, Dict, Set, Optional, Tuple
+import os
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
@@ -24,6 +30,9 @@ import statistics
 
 logger = logging.getLogger(__name__)
 
+CORPUS_AGGREGATES_PATH = os.getenv("CORPUS_AGGREGATES_PATH", "monitoring/corpus_aggregates.json")
+CORPUS_AGGREGATES_SAVE_INTERVAL_SECONDS = float(os.getenv("CORPUS_AGGREGATES_SAVE_INTERVAL_SECONDS", "5.0"))
+
 
 @dataclass
 class DriftSnapshot:
@@ -88,18 +97,384 @@ class DriftReport:
     recommendations: List[str] = field(default_factory=list)
 
 
+class CorpusAggregates:
+    """
+    Rolling corpus statistics maintained at ingest time
+
+    The storage stage calls ``record_chunks`` with the metadata of every chunk
+    it writes and document deletes call ``remove_chunks``, so a drift snapshot
+    becomes a read of counters and sums instead of a full collection scan.
+    Ingestion times are kept in hourly buckets for the last 30 days
+    (24h/7d/30d windows are accurate to one hour).
+
+    State is persisted to a JSON file, throttled to one write per
+    ``save_interval`` seconds (plus a final save at exit). Inside an event
+    loop the write runs in a worker thread.
+    """
+
+    SCORE_FIELDS = ('signalness', 'quality_score', 'novelty_score', 'actionability_score')
+    BUCKET_FORMAT = '%Y-%m-%dT%H'
+    RETENTION_HOURS = 30 * 24
+
+    def __init__(
+        self,
+        path: Optional[str] = CORPUS_AGGREGATES_PATH,
+        save_interval: float = CORPUS_AGGREGATES_SAVE_INTERVAL_SECONDS
+    ):
+        """
+        Initialize corpus aggregates
+
+        Args:
+            path: JSON file to load from and persist to (None = in-memory only)
+            save_interval: Minimum seconds between saves (0 = save on every update)
+        """
+        self.path = Path(path) if path else None
+        self.save_interval = save_interval
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        self._save_task: Optional[asyncio.Task] = None
+        self._reset()
+
+        if self.path is not None:
+            self._load()
+            atexit.register(self.save)
+
+    def _reset(self):
+        self.chunks = 0
+        self.document_ids: Counter = Counter()  # doc id -> chunks
+        self.doc_types: Counter = Counter()
+        self.sources: Counter = Counter()
+        self.topics: Counter = Counter()
+        self.score_sums = {name: 0.0 for name in self.SCORE_FIELDS}
+        self.score_counts = {name: 0 for name in self.SCORE_FIELDS}
+        self.content_hashes: Counter = Counter()  # content hash -> chunks
+        self.duplicates = 0
+        self.ingest_buckets: Counter = Counter()
+        self.storage_bytes = 0
+        self.sized_chunks = 0
+        self.initialized = False
+        self.updated_at: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def record_chunks(self, metadatas: List[Dict]):
+        """
+        Fold stored chunk metadata into the aggregates
+
+        Args:
+            metadatas: Metadata dicts exactly as written to ChromaDB
+        """
+        with self._lock:
+            for metadata in metadatas:
+                self._add(metadata or {})
+            self._prune_buckets(datetime.now())
+            self.updated_at = datetime.now().isoformat()
+            self._dirty = True
+        self._maybe_save()
+
+    def _add(self, metadata: Dict):
+        self.chunks += 1
+
+        doc_id = metadata.get('document_id') or metadata.get('doc_id', '')
+        if doc_id:
+            self.document_ids[doc_id] += 1
+
+        self.doc_types[metadata.get('file_type', 'unknown')] += 1
+        self.sources[metadata.get('source', 'unknown')] += 1
+
+        doc_topics = metadata.get('topics', [])
+        if isinstance(doc_topics, str):
+            # ChromaDB metadata stores lists as comma-separated strings
+            doc_topics = [t.strip() for t in doc_topics.split(',') if t.strip()]
+        if isinstance(doc_topics, list):
+            for topic in doc_topics:
+                self.topics[topic] += 1
+
+        for name in self.SCORE_FIELDS:
+            value = metadata.get(name, 0.0)
+            if isinstance(value, (int, float)) and value > 0:
+                self.score_sums[name] += value
+                self.score_counts[name] += 1
+
+        content_hash = metadata.get('content_hash', '')
+        if content_hash:
+            if self.content_hashes[content_hash]:
+                self.duplicates += 1
+            self.content_hashes[content_hash] += 1
+
+        bucket = self._bucket(metadata)
+        if bucket:
+            self.ingest_buckets[bucket] += 1
+
+        doc_size = metadata.get('file_size_bytes', 0)
+        if isinstance(doc_size, (int, float)) and doc_size > 0:
+            self.storage_bytes += doc_size
+            self.sized_chunks += 1
+
+    def remove_chunks(self, metadatas: List[Dict]):
+        """
+        Remove deleted chunks from the aggregates (inverse of ``record_chunks``)
+
+        Args:
+            metadatas: Metadata dicts of the deleted chunks, as stored in ChromaDB
+        """
+        with self._lock:
+            for metadata in metadatas:
+                self._remove(metadata or {})
+            self.updated_at = datetime.now().isoformat()
+            self._dirty = True
+        self._maybe_save()
+
+    def _remove(self, metadata: Dict):
+        self.chunks = max(0, self.chunks - 1)
+
+        doc_id = metadata.get('document_id') or metadata.get('doc_id', '')
+        if doc_id:
+            self._decrement(self.document_ids, doc_id)
+
+        self._decrement(self.doc_types, metadata.get('file_type', 'unknown'))
+        self._decrement(self.sources, metadata.get('source', 'unknown'))
+
+        doc_topics = metadata.get('topics', [])
+        if isinstance(doc_topics, str):
+            doc_topics = [t.strip() for t in doc_topics.split(',') if t.strip()]
+        if isinstance(doc_topics, list):
+            for topic in doc_topics:
+                self._decrement(self.topics, topic)
+
+        for name in self.SCORE_FIELDS:
+            value = metadata.get(name, 0.0)
+            if isinstance(value, (int, float)) and value > 0 and self.score_counts[name]:
+                self.score_sums[name] = max(0.0, self.score_sums[name] - value)
+                self.score_counts[name] -= 1
+
+        content_hash = metadata.get('content_hash', '')
+        if content_hash and self.content_hashes[content_hash]:
+            self._decrement(self.content_hashes, content_hash)
+            if self.content_hashes[content_hash]:
+                # A surviving chunk still carries this hash
+                self.duplicates = max(0, self.duplicates - 1)
+
+        bucket = self._bucket(metadata)
+        if bucket and bucket in self.ingest_buckets:
+            self._decrement(self.ingest_buckets, bucket)
+
+        doc_size = metadata.get('file_size_bytes', 0)
+        if isinstance(doc_size, (int, float)) and doc_size > 0 and self.sized_chunks:
+            self.storage_bytes = max(0, self.storage_bytes - doc_size)
+            self.sized_chunks -= 1
+
+    @staticmethod
+    def _decrement(counter: Counter, key):
+        if counter[key] <= 1:
+            counter.pop(key, None)
+        else:
+            counter[key] -= 1
+
+    def _bucket(self, metadata: Dict) -> Optional[str]:
+        ingested_at = metadata.get('ingested_at', '')
+        if not ingested_at:
+            return None
+        try:
+            ingested_date = datetime.fromisoformat(ingested_at.replace('Z', '+00:00'))
+            return ingested_date.replace(tzinfo=None).strftime(self.BUCKET_FORMAT)
+        except Exception:
+            return None
+
+    def _prune_buckets(self, now: datetime):
+        cutoff = (now - timedelta(hours=self.RETENTION_HOURS)).strftime(self.BUCKET_FORMAT)
+        for bucket in [b for b in self.ingest_buckets if b < cutoff]:
+            del self.ingest_buckets[bucket]
+
+    def replace_with(self, other: "CorpusAggregates"):
+        """Replace all counters with another instance's (used by full recompute)"""
+        with self._lock:
+            for name in self._state_fields():
+                setattr(self, name, getattr(other, name))
+            self.initialized = True
+            self.updated_at = datetime.now().isoformat()
+            self._dirty = True
+        self.save()
+
+    def mark_stale(self):
+        """Force the next snapshot to recompute (bulk deletes that bypass ``remove_chunks``)"""
+        with self._lock:
+            self.initialized = False
+            self._dirty = True
+        self._maybe_save()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _window(self, now: datetime, hours: int) -> int:
+        cutoff = (now - timedelta(hours=hours - 1)).strftime(self.BUCKET_FORMAT)
+        return sum(count for bucket, count in self.ingest_buckets.items() if bucket >= cutoff)
+
+    def to_snapshot(self) -> DriftSnapshot:
+        """Build a DriftSnapshot from the current aggregates"""
+        with self._lock:
+            now = datetime.now()
+            averages = {
+                name: self.score_sums[name] / self.score_counts[name] if self.score_counts[name] else 0.0
+                for name in self.SCORE_FIELDS
+            }
+            return DriftSnapshot(
+                timestamp=now.isoformat(),
+                total_documents=len(self.document_ids),
+                total_chunks=self.chunks,
+                doc_types=dict(self.doc_types),
+                sources=dict(self.sources),
+                topics=dict(self.topics.most_common(10)),
+                avg_signalness=averages['signalness'],
+                avg_quality_score=averages['quality_score'],
+                avg_novelty_score=averages['novelty_score'],
+                avg_actionability_score=averages['actionability_score'],
+                duplicate_count=self.duplicates,
+                duplicate_rate=self.duplicates / self.chunks if self.chunks else 0.0,
+                docs_last_24h=self._window(now, 24),
+                docs_last_7d=self._window(now, 7 * 24),
+                docs_last_30d=self._window(now, 30 * 24),
+                total_storage_mb=self.storage_bytes / (1024 * 1024),
+                avg_doc_size_kb=self.storage_bytes / self.sized_chunks / 1024 if self.sized_chunks else 0.0
+            )
+
+    def get_stats(self) -> Dict:
+        """Summary of the aggregates themselves (not the snapshot)"""
+        with self._lock:
+            return {
+                'initialized': self.initialized,
+                'updated_at': self.updated_at,
+                'chunks': self.chunks,
+                'documents': len(self.document_ids),
+                'content_hashes': len(self.content_hashes),
+                'ingest_buckets': len(self.ingest_buckets),
+                'path': str(self.path) if self.path else None,
+            }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _state_fields() -> Tuple[str, ...]:
+        return (
+            'chunks', 'document_ids', 'doc_types', 'sources', 'topics',
+            'score_sums', 'score_counts', 'content_hashes', 'duplicates',
+            'ingest_buckets', 'storage_bytes', 'sized_chunks'
+        )
+
+    def _maybe_save(self):
+        if self.path is None:
+            return
+        if time.monotonic() - self._last_save < self.save_interval:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()  # no event loop (scripts, worker threads)
+            return
+        # Serializing grows with the corpus - keep it off the event loop
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(asyncio.to_thread(self.save))
+
+    def save(self) -> bool:
+        """Persist aggregates atomically if they changed"""
+        if self.path is None:
+            return False
+        with self._save_lock:
+            return self._write()
+
+    def _write(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return False
+            data = {
+                'initialized': self.initialized,
+                'updated_at': self.updated_at,
+                'chunks': self.chunks,
+                'document_ids': dict(self.document_ids),
+                'doc_types': dict(self.doc_types),
+                'sources': dict(self.sources),
+                'topics': dict(self.topics),
+                'score_sums': dict(self.score_sums),
+                'score_counts': dict(self.score_counts),
+                'content_hashes': dict(self.content_hashes),
+                'duplicates': self.duplicates,
+                'ingest_buckets': dict(self.ingest_buckets),
+                'storage_bytes': self.storage_bytes,
+                'sized_chunks': self.sized_chunks,
+            }
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save corpus aggregates: {e}")
+            with self._lock:
+                self._dirty = True
+            return False
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            self.chunks = data['chunks']
+            self.document_ids = self._load_counter(data['document_ids'])
+            self.doc_types = Counter(data['doc_types'])
+            self.sources = Counter(data['sources'])
+            self.topics = Counter(data['topics'])
+            self.score_sums.update(data['score_sums'])
+            self.score_counts.update(data['score_counts'])
+            self.content_hashes = self._load_counter(data['content_hashes'])
+            self.duplicates = data['duplicates']
+            self.ingest_buckets = Counter(data['ingest_buckets'])
+            self.storage_bytes = data['storage_bytes']
+            self.sized_chunks = data['sized_chunks']
+            self.initialized = data.get('initialized', True)
+            self.updated_at = data.get('updated_at')
+            logger.info(f"📈 Loaded corpus aggregates ({self.chunks} chunks) from {self.path}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable corpus aggregates {self.path}: {e}")
+            self._reset()
+
+    @staticmethod
+    def _load_counter(value) -> Counter:
+        # Files written before per-id chunk counts stored plain lists
+        return Counter(value) if isinstance(value, dict) else Counter({key: 1 for key in value})
+
+
 class DriftMonitorService:
     """Service for monitoring and detecting system behavior drift"""
 
-    def __init__(self, snapshots_dir: str = "monitoring/drift_snapshots"):
+    def __init__(
+        self,
+        snapshots_dir: str = "monitoring/drift_snapshots",
+        aggregates: Optional[CorpusAggregates] = None
+    ):
         """
         Initialize drift monitor service
 
         Args:
             snapshots_dir: Directory to store drift snapshots
+            aggregates: Ingest-time corpus aggregates (None = scan on every snapshot)
         """
         self.snapshots_dir = Path(snapshots_dir)
         self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        self.aggregates = aggregates
 
         self.snapshots: List[DriftSnapshot] = []
         self.alerts: List[DriftAlert] = []
@@ -116,170 +491,41 @@ class DriftMonitorService:
     def capture_snapshot(
         self,
         collection,
-        metadata_dict: Optional[Dict] = None
+        metadata_dict: Optional[Dict] = None,
+        recompute: bool = False
     ) -> DriftSnapshot:
         """
         Capture current system state snapshot
 
+        Reads the ingest-time aggregates when they are available (O(1));
+        otherwise, or with ``recompute=True``, rebuilds them from a full
+        collection scan first.
+
         Args:
             collection: ChromaDB collection
             metadata_dict: Optional pre-computed metadata
+            recompute: Force a full collection scan (repair)
 
         Returns:
             DriftSnapshot object
         """
         try:
-            # Get collection data
-            all_results = collection.get()
-
-            total_documents = len(all_results['ids']) if all_results['ids'] else 0
-            metadatas = all_results.get('metadatas', [])
-
-            if not metadatas:
-                # Return empty snapshot
-                return DriftSnapshot(
-                    timestamp=datetime.now().isoformat(),
-                    total_documents=0,
-                    total_chunks=0,
-                    doc_types={},
-                    sources={},
-                    topics={},
-                    avg_signalness=0.0,
-                    avg_quality_score=0.0,
-                    avg_novelty_score=0.0,
-                    avg_actionability_score=0.0,
-                    duplicate_count=0,
-                    duplicate_rate=0.0,
-                    docs_last_24h=0,
-                    docs_last_7d=0,
-                    docs_last_30d=0,
-                    total_storage_mb=0.0,
-                    avg_doc_size_kb=0.0
-                )
-
-            # Extract metrics
-            doc_types = Counter()
-            sources = Counter()
-            topics = Counter()
-
-            signalness_scores = []
-            quality_scores = []
-            novelty_scores = []
-            actionability_scores = []
-
-            content_hashes = set()
-            duplicates = 0
-
-            doc_sizes = []
-
-            now = datetime.now()
-            docs_24h = docs_7d = docs_30d = 0
-
-            unique_doc_ids = set()
+            if recompute or self.aggregates is None or not self.aggregates.initialized:
+                aggregates = self.recompute_aggregates(collection)
+            else:
+                aggregates = self.aggregates
 
-            for metadata in metadatas:
-                # Track unique documents (not chunks)
-                doc_id = metadata.get('document_id', '')
-                if doc_id:
-                    unique_doc_ids.add(doc_id)
-
-                # Doc types
-                file_type = metadata.get('file_type', 'unknown')
-                doc_types[file_type] += 1
-
-                # Sources
-                source = metadata.get('source', 'unknown')
-                sources[source] += 1
-
-                # Topics
-                doc_topics = metadata.get('topics', [])
-                if isinstance(doc_topics, list):
-                    for topic in doc_topics:
-                        topics[topic] += 1
-
-                # Scores
-                signalness = metadata.get('signalness', 0.0)
-                if signalness > 0:
-                    signalness_scores.append(signalness)
-
-                quality = metadata.get('quality_score', 0.0)
-                if quality > 0:
-                    quality_scores.append(quality)
-
-                novelty = metadata.get('novelty_score', 0.0)
-                if novelty > 0:
-                    novelty_scores.append(novelty)
-
-                actionability = metadata.get('actionability_score', 0.0)
-                if actionability > 0:
-                    actionability_scores.append(actionability)
-
-                # Duplicates
-                content_hash = metadata.get('content_hash', '')
-                if content_hash:
-                    if content_hash in content_hashes:
-                        duplicates += 1
-                    content_hashes.add(content_hash)
-
-                # Ingestion timing
-                ingested_at = metadata.get('ingested_at', '')
-                if ingested_at:
-                    try:
-                        ingested_date = datetime.fromisoformat(ingested_at.replace('Z', '+00:00'))
-                        delta = now - ingested_date.replace(tzinfo=None)
-
-                        if delta < timedelta(days=1):
-                            docs_24h += 1
-                        if delta < timedelta(days=7):
-                            docs_7d += 1
-                        if delta < timedelta(days=30):
-                            docs_30d += 1
-                    except Exception:
-                        pass
-
-                # Doc sizes
-                doc_size = metadata.get('file_size_bytes', 0)
-                if doc_size > 0:
-                    doc_sizes.append(doc_size)
-
-            # Calculate averages
-            avg_signalness = statistics.mean(signalness_scores) if signalness_scores else 0.0
-            avg_quality = statistics.mean(quality_scores) if quality_scores else 0.0
-            avg_novelty = statistics.mean(novelty_scores) if novelty_scores else 0.0
-            avg_actionability = statistics.mean(actionability_scores) if actionability_scores else 0.0
-
-            duplicate_rate = duplicates / total_documents if total_documents > 0 else 0.0
-
-            total_storage = sum(doc_sizes) / (1024 * 1024) if doc_sizes else 0.0  # MB
-            avg_size = statistics.mean(doc_sizes) / 1024 if doc_sizes else 0.0  # KB
-
-            # Get top 10 topics
-            top_topics = dict(topics.most_common(10))
-
-            snapshot = DriftSnapshot(
-                timestamp=datetime.now().isoformat(),
-                total_documents=len(unique_doc_ids),
-                total_chunks=total_documents,
-                doc_types=dict(doc_types),
-                sources=dict(sources),
-                topics=top_topics,
-                avg_signalness=avg_signalness,
-                avg_quality_score=avg_quality,
-                avg_novelty_score=avg_novelty,
-                avg_actionability_score=avg_actionability,
-                duplicate_count=duplicates,
-                duplicate_rate=duplicate_rate,
-                docs_last_24h=docs_24h,
-                docs_last_7d=docs_7d,
-                docs_last_30d=docs_30d,
-                total_storage_mb=total_storage,
-                avg_doc_size_kb=avg_size
-            )
+            snapshot = aggregates.to_snapshot()
+            if snapshot.total_chunks == 0:
+                return snapshot
 
             self.snapshots.append(snapshot)
             self._save_snapshot(snapshot)
 
-            logger.info(f"Captured drift snapshot: {total_documents} docs, signalness={avg_signalness:.3f}")
+            logger.info(
+                f"Captured drift snapshot: {snapshot.total_chunks} chunks, "
+                f"signalness={snapshot.avg_signalness:.3f}"
+            )
 
             return snapshot
 
@@ -287,6 +533,36 @@ class DriftMonitorService:
             logger.error(f"Failed to capture snapshot: {e}")
             raise
 
+    def recompute_aggregates(self, collection) -> "CorpusAggregates":
+        """
+        Rebuild corpus aggregates from a full collection scan
+
+        This is the repair path: use it after bulk deletes, imports that
+        bypassed the pipeline, or a lost aggregates file.
+
+        Args:
+            collection: ChromaDB collection
+
+        Returns:
+            Rebuilt CorpusAggregates (also replaces the service's live aggregates)
+        """
+        start = time.perf_counter()
+        all_results = collection.get()
+        metadatas = all_results.get('metadatas') or []
+
+        rebuilt = CorpusAggregates(path=None)
+        rebuilt.record_chunks(metadatas)
+
+        if self.aggregates is not None:
+            self.aggregates.replace_with(rebuilt)
+            rebuilt = self.aggregates
+
+        logger.info(
+            f"🔧 Recomputed corpus aggregates from {len(metadatas)} chunks "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return rebuilt
+
     def _save_snapshot(self, snapshot: DriftSnapshot) -> bool:
         """Save snapshot to JSON file"""
         try:
@@ -575,3 +851,15 @@ class DriftMonitorService:
         }
 
         return dashboard_data
+
+
+# Global instance
+_corpus_aggregates: Optional[CorpusAggregates] = None
+
+
+def get_corpus_aggregates() -> CorpusAggregates:
+    """Get or create the global corpus aggregates"""
+    global _corpus_aggregates
+    if _corpus_aggregates is None:
+        _corpus_aggregates = CorpusAggregates()
+    return _corpus_aggregates
@@ -0,0 +1,420 @@
+"""
+Embedding Broker - Micro-batching for embedding API calls
+
+Coalesces embedding requests from concurrent callers (ingestion and search)
+into fewer, fuller provider calls.
+
+Features:
+- Short collection window (default 10ms) before each flush
+- Provider batch limits (max inputs and max estimated tokens per call)
+- Duplicate texts within a flush are embedded once
+- Retry with exponential backoff for transient failures
+- LRU cache for query embeddings
+- Batch-size and latency histograms
+
+Performance Impact:
+- N concurrent callers share ~1 network round trip instead of N
+- Repeated queries skip the embedding API entirely
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.tracing import trace_span
+from src.services.monitoring_service import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+# Provider errors that retrying will not fix (matched by class name so we
+# don't need to import every SDK here)
+NON_RETRYABLE_ERRORS = {
+    "AuthenticationError",
+    "InvalidRequestError",
+    "MalformedRequestError",
+    "PermissionDeniedError",
+    "BadRequestError",
+    "ValueError",
+    "TypeError",
+}
+
+EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "10"))
+EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "128"))
+EMBEDDING_MAX_BATCH_TOKENS = int(os.getenv("EMBEDDING_MAX_BATCH_TOKENS", "120000"))
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+EMBEDDING_QUERY_CACHE_SIZE = int(os.getenv("EMBEDDING_QUERY_CACHE_SIZE", "1000"))
+
+
+@dataclass
+class _EmbeddingRequest:
+    """A single caller's request waiting in the broker queue"""
+    texts: List[str]
+    input_type: str
+    future: Future = field(default_factory=Future)
+
+
+class EmbeddingBroker:
+    """
+    Micro-batching broker in front of an embedding provider
+
+    Callers submit texts from any thread (or via ``aembed`` from async code).
+    A background worker waits for the batch window, groups pending requests by
+    input type, splits them into provider-sized batches and resolves each
+    caller's future with its own slice of the vectors.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str], str], List[List[float]]],
+        name: str = "embeddings",
+        max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+        max_batch_tokens: int = EMBEDDING_MAX_BATCH_TOKENS,
+        batch_window_ms: float = EMBEDDING_BATCH_WINDOW_MS,
+        max_retries: int = EMBEDDING_MAX_RETRIES,
+        retry_base_delay: float = 0.5,
+        query_cache_size: int = EMBEDDING_QUERY_CACHE_SIZE
+    ):
+        """
+        Initialize embedding broker
+
+        Args:
+            embed_fn: Raw provider call ``embed_fn(texts, input_type) -> vectors``
+            name: Broker name for logging and metrics labels
+            max_batch_size: Maximum inputs per provider call
+            max_batch_tokens: Maximum estimated tokens per provider call
+            batch_window_ms: How long to wait for more requests before flushing
+            max_retries: Retries per provider call for transient failures
+            retry_base_delay: Initial backoff delay in seconds (doubles per retry)
+            query_cache_size: Maximum cached query embeddings (0 disables)
+        """
+        self.embed_fn = embed_fn
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_tokens = max(1, max_batch_tokens)
+        self.batch_window_s = max(0.0, batch_window_ms) / 1000.0
+        self.max_retries = max(0, max_retries)
+        self.retry_base_delay = retry_base_delay
+        self.query_cache_size = query_cache_size
+
+        self._queue: "queue.Queue[Optional[_EmbeddingRequest]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._closed = False
+
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self.metrics = MetricsCollector()
+        self.stats = {
+            "requests": 0,
+            "texts": 0,
+            "provider_calls": 0,
+            "deduplicated_texts": 0,
+            "retries": 0,
+            "failures": 0,
+            "query_cache_hits": 0,
+            "query_cache_misses": 0,
+        }
+        self._stats_lock = threading.Lock()
+
+        logger.info(
+            f"🧺 Embedding broker '{name}' initialized "
+            f"(batch: {self.max_batch_size}, window: {batch_window_ms}ms, retries: {self.max_retries})"
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, texts: List[str], input_type: str = "document") -> Future:
+        """
+        Queue texts for embedding and return a future for their vectors
+
+        Args:
+            texts: Texts to embed
+            input_type: Provider input type ("document" or "query")
+
+        Returns:
+            Future resolving to a list of vectors in input order
+        """
+        request = _EmbeddingRequest(texts=list(texts), input_type=input_type)
+        if not request.texts:
+            request.future.set_result([])
+            return request.future
+        if self._closed:
+            raise RuntimeError(f"Embedding broker '{self.name}' is closed")
+
+        self._ensure_worker()
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["texts"] += len(request.texts)
+        self._queue.put(request)
+        return request.future
+
+    def embed(self, texts: List[str], input_type: str = "document") -> List[List[float]]:
+        """
+        Embed texts, blocking until the batch containing them is flushed
+
+        Args:
+            texts: Texts to embed
+            input_type: Provider input type ("document" or "query")
+
+        Returns:
+            List of vectors in input order
+        """
+        with trace_span("embedding.embed", kind="embedding", texts=len(texts), broker=self.name):
+            return self.submit(texts, input_type).result()
+
+    async def aembed(self, texts: List[str], input_type: str = "document") -> List[List[float]]:
+        """Async variant of ``embed`` that doesn't block the event loop"""
+        with trace_span("embedding.embed", kind="embedding", texts=len(texts), broker=self.name):
+            return await asyncio.wrap_future(self.submit(texts, input_type))
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed search queries, serving repeats from the LRU cache
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            List of query vectors in input order
+        """
+        results: List[Optional[List[float]]] = [None] * len(queries)
+        missing: Dict[str, List[int]] = {}
+
+        for i, query in enumerate(queries):
+            cached = self._cache_get(query)
+            if cached is not None:
+                results[i] = cached
+            else:
+                missing.setdefault(query, []).append(i)
+
+        if missing:
+            unique_queries = list(missing.keys())
+            vectors = self.embed(unique_queries, input_type="query")
+            for query, vector in zip(unique_queries, vectors):
+                self._cache_set(query, vector)
+                for i in missing[query]:
+                    results[i] = vector
+
+        return results
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a single search query (cached)"""
+        return self.embed_queries([query])[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get broker statistics
+
+        Returns:
+            Dictionary with counters and batch-size/latency histograms
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        with self._cache_lock:
+            stats["query_cache_size"] = len(self._query_cache)
+        lookups = stats["query_cache_hits"] + stats["query_cache_misses"]
+        stats["query_cache_hit_rate"] = stats["query_cache_hits"] / lookups if lookups else 0.0
+        stats["avg_texts_per_call"] = (
+            stats["texts"] / stats["provider_calls"] if stats["provider_calls"] else 0.0
+        )
+        stats["batch_size"] = self.metrics.get_histogram_stats("embedding_batch_size")
+        stats["latency_ms"] = self.metrics.get_histogram_stats("embedding_call_duration_ms")
+        return stats
+
+    def clear_cache(self):
+        """Clear the query embedding cache"""
+        with self._cache_lock:
+            self._query_cache.clear()
+
+    def close(self):
+        """Stop the background worker (pending requests are flushed first)"""
+        self._closed = True
+        with self._worker_lock:
+            if self._worker and self._worker.is_alive():
+                self._queue.put(None)
+                self._worker.join(timeout=5)
+            self._worker = None
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self):
+        """Start the background worker on first use"""
+        if self._worker and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name=f"embedding-broker-{self.name}",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        """Worker loop: collect a window of requests, then flush them"""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            pending = [first]
+            pending_texts = len(first.texts)
+            stop = False
+            deadline = time.monotonic() + self.batch_window_s
+
+            while pending_texts < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                pending.append(item)
+                pending_texts += len(item.texts)
+
+            self._flush(pending)
+            if stop:
+                return
+
+    def _flush(self, pending: List[_EmbeddingRequest]):
+        """Embed all pending requests, grouped by input type"""
+        by_type: Dict[str, List[_EmbeddingRequest]] = {}
+        for request in pending:
+            by_type.setdefault(request.input_type, []).append(request)
+
+        for input_type, requests in by_type.items():
+            try:
+                # Deduplicate texts across all requests in this group
+                unique_texts: Dict[str, int] = {}
+                for request in requests:
+                    for text in request.texts:
+                        if text not in unique_texts:
+                            unique_texts[text] = len(unique_texts)
+
+                total_texts = sum(len(r.texts) for r in requests)
+                if total_texts > len(unique_texts):
+                    with self._stats_lock:
+                        self.stats["deduplicated_texts"] += total_texts - len(unique_texts)
+
+                texts = list(unique_texts.keys())
+                vectors: List[List[float]] = []
+                for batch in self._split_batches(texts):
+                    vectors.extend(self._call_with_retry(batch, input_type))
+
+                for request in requests:
+                    request.future.set_result([vectors[unique_texts[t]] for t in request.texts])
+
+            except Exception as e:
+                with self._stats_lock:
+                    self.stats["failures"] += 1
+                logger.error(f"Embedding batch failed ({self.name}, {input_type}): {e}")
+                for request in requests:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _split_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into batches within the provider's input and token limits"""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for text in texts:
+            tokens = self._estimate_tokens(text)
+            if current and (
+                len(current) >= self.max_batch_size
+                or current_tokens + tokens > self.max_batch_tokens
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(text)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _call_with_retry(self, batch: List[str], input_type: str) -> List[List[float]]:
+        """Call the provider, retrying transient failures with backoff"""
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                vectors = self.embed_fn(batch, input_type)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+
+                if len(vectors) != len(batch):
+                    raise ValueError(
+                        f"Provider returned {len(vectors)} embeddings for {len(batch)} inputs"
+                    )
+
+                labels = {"broker": self.name, "input_type": input_type}
+                self.metrics.observe_histogram("embedding_batch_size", len(batch))
+                self.metrics.observe_histogram("embedding_call_duration_ms", elapsed_ms)
+                self.metrics.increment_counter("embedding_calls_total", labels=labels)
+                with self._stats_lock:
+                    self.stats["provider_calls"] += 1
+                return [list(v) for v in vectors]
+
+            except Exception as e:
+                retryable = type(e).__name__ not in NON_RETRYABLE_ERRORS
+                if not retryable or attempt >= self.max_retries:
+                    raise
+
+                delay = self.retry_base_delay * (2 ** attempt)
+                delay += random.uniform(0, delay / 2)
+                attempt += 1
+                with self._stats_lock:
+                    self.stats["retries"] += 1
+                logger.warning(
+                    f"Embedding call failed ({type(e).__name__}: {e}), "
+                    f"retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token estimation (4 chars ≈ 1 token)"""
+        return max(1, len(text) // 4)
+
+    # ------------------------------------------------------------------
+    # Query cache
+    # ------------------------------------------------------------------
+
+    def _cache_get(self, query: str) -> Optional[List[float]]:
+        if self.query_cache_size <= 0:
+            return None
+        with self._cache_lock:
+            vector = self._query_cache.get(query)
+            if vector is not None:
+                self._query_cache.move_to_end(query)
+        with self._stats_lock:
+            if vector is not None:
+                self.stats["query_cache_hits"] += 1
+            else:
+                self.stats["query_cache_misses"] += 1
+        return vector
+
+    def _cache_set(self, query: str, vector: List[float]):
+        if self.query_cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._query_cache[query] = vector
+            self._query_cache.move_to_end(query)
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
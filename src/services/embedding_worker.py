@@ -0,0 +1,482 @@
+"""
+Local Embedding Worker - One shared copy of the offline embedding model
+
+When no Voyage API key is configured, every API process (and every uvicorn
+worker) used to load its own SentenceTransformer copy and run inference on the
+request-handling threads. This module moves the model into a dedicated worker
+process reachable over a local socket.
+
+Features:
+- Unix domain socket (``/path/to/sock``) or TCP (``host:port``) transport
+- Length-prefixed JSON protocol with persistent client connections
+- Requests from all connected clients are micro-batched via EmbeddingBroker
+- Optional ONNX backend (``--backend onnx``) for faster CPU inference
+- Chroma-compatible client embedding function
+
+Performance Impact:
+- One model copy in memory instead of one per API worker
+- Inference no longer competes with request handling for the GIL
+- Concurrent ingest/search callers share fuller model batches
+
+Usage:
+    python -m src.services.embedding_worker --address /tmp/rag-embeddings.sock
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.tracing import trace_span
+from src.services.embedding_service import EmbeddingBroker
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_WORKER_ADDRESS = os.getenv("EMBEDDING_WORKER_ADDRESS", "")
+EMBEDDING_WORKER_MODEL = os.getenv("EMBEDDING_WORKER_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_WORKER_BACKEND = os.getenv("EMBEDDING_WORKER_BACKEND", "torch")
+EMBEDDING_WORKER_TIMEOUT = float(os.getenv("EMBEDDING_WORKER_TIMEOUT", "30"))
+
+# 4-byte big-endian payload length precedes every JSON message
+_HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+
+
+class EmbeddingWorkerError(RuntimeError):
+    """Raised when the embedding worker is unreachable or reports an error"""
+
+
+# =============================================================================
+# Protocol
+# =============================================================================
+
+def parse_worker_address(address: str) -> Tuple[int, Any]:
+    """
+    Parse a worker address into a socket family and address
+
+    Args:
+        address: ``unix:/path``, ``/path`` (Unix socket) or ``host:port`` (TCP)
+
+    Returns:
+        Tuple of (socket family, socket address)
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    if address.startswith("/") or address.startswith("."):
+        return socket.AF_UNIX, address
+
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid embedding worker address: {address!r}")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]):
+    """Send one length-prefixed JSON message"""
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+    Receive one length-prefixed JSON message
+
+    Returns:
+        Decoded message, or None if the peer closed the connection
+    """
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise EmbeddingWorkerError(f"Message too large: {length} bytes")
+    payload = _recv_exact(sock, length)
+    if payload is None:
+        raise EmbeddingWorkerError("Connection closed mid-message")
+    return json.loads(payload.decode("utf-8"))
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            if not buffer:
+                return None
+            raise EmbeddingWorkerError("Connection closed mid-message")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+# =============================================================================
+# Model loading
+# =============================================================================
+
+def load_local_model(
+    model_name: str = EMBEDDING_WORKER_MODEL,
+    backend: str = EMBEDDING_WORKER_BACKEND
+) -> Callable[[List[str], str], List[List[float]]]:
+    """
+    Load a SentenceTransformer model and return a batch embedding function
+
+    Args:
+        model_name: SentenceTransformer model name or path
+        backend: "torch" (default) or "onnx" (falls back to torch if the
+            ONNX runtime or export is unavailable)
+
+    Returns:
+        ``embed_fn(texts, input_type) -> vectors`` suitable for EmbeddingBroker
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = None
+    if backend == "onnx":
+        try:
+            model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+            logger.info(f"✅ Loaded {model_name} with ONNX backend")
+        except Exception as e:
+            logger.warning(f"ONNX backend unavailable for {model_name} ({e}), using torch")
+
+    if model is None:
+        model = SentenceTransformer(model_name, device="cpu")
+        logger.info(f"✅ Loaded {model_name} with torch backend")
+
+    def embed_fn(texts: List[str], input_type: str) -> List[List[float]]:
+        # MiniLM-style models have no separate query/document encoders
+        vectors = model.encode(texts, convert_to_numpy=True, batch_size=len(texts))
+        return vectors.tolist()
+
+    return embed_fn
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+class _WorkerRequestHandler(socketserver.BaseRequestHandler):
+    """Serves messages on one persistent client connection"""
+
+    def setup(self):
+        self.server.worker._track_connection(self.request, active=True)
+
+    def finish(self):
+        self.server.worker._track_connection(self.request, active=False)
+
+    def handle(self):
+        worker: "EmbeddingWorkerServer" = self.server.worker
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (OSError, EmbeddingWorkerError, ValueError):
+                return
+            if message is None:
+                return
+
+            try:
+                response = worker.handle_message(message)
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+
+            try:
+                send_message(self.request, response)
+            except OSError:
+                return
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class EmbeddingWorkerServer:
+    """
+    Socket server that owns the embedding model
+
+    Each client connection is served on its own thread; all threads submit
+    to a single EmbeddingBroker so requests from different API workers are
+    coalesced into one model batch.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        embed_fn: Callable[[List[str], str], List[List[float]]],
+        model_name: str = EMBEDDING_WORKER_MODEL,
+        **broker_kwargs
+    ):
+        """
+        Initialize embedding worker server
+
+        Args:
+            address: Listen address (see ``parse_worker_address``)
+            embed_fn: Batch embedding function (e.g. from ``load_local_model``)
+            model_name: Model name reported to clients
+            **broker_kwargs: Passed through to EmbeddingBroker
+        """
+        self.address = address
+        self.model_name = model_name
+        broker_kwargs.setdefault("max_retries", 0)  # local model: failures aren't transient
+        broker_kwargs.setdefault("query_cache_size", 0)  # clients cache their own queries
+        self.broker = EmbeddingBroker(
+            embed_fn=embed_fn,
+            name=f"local-{model_name}",
+            **broker_kwargs
+        )
+
+        family, sock_address = parse_worker_address(address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(sock_address):
+                os.unlink(sock_address)  # stale socket from a previous run
+            self._server = _ThreadingUnixServer(sock_address, _WorkerRequestHandler)
+        else:
+            self._server = _ThreadingTCPServer(sock_address, _WorkerRequestHandler)
+        self._server.worker = self
+        self._socket_path = sock_address if family == socket.AF_UNIX else None
+        self._thread: Optional[threading.Thread] = None
+        self._serving = False
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+
+    def handle_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle one protocol message
+
+        Args:
+            message: ``{"op": "embed", "texts": [...], "input_type": "document"}``,
+                ``{"op": "ping"}`` or ``{"op": "stats"}``
+
+        Returns:
+            Response message
+        """
+        op = message.get("op")
+        if op == "embed":
+            texts = message.get("texts") or []
+            input_type = message.get("input_type", "document")
+            return {"embeddings": self.broker.embed(texts, input_type=input_type)}
+        if op == "ping":
+            return {"status": "ok", "model": self.model_name, "pid": os.getpid()}
+        if op == "stats":
+            return {"model": self.model_name, "broker": self.broker.get_stats()}
+        return {"error": f"Unknown op: {op!r}"}
+
+    def serve_forever(self):
+        """Serve until ``shutdown`` is called"""
+        logger.info(f"🚀 Embedding worker serving {self.model_name} on {self.address}")
+        self._serving = True
+        self._server.serve_forever()
+
+    def start(self):
+        """Serve on a background thread (used by tests and embedded setups)"""
+        self._thread = threading.Thread(target=self.serve_forever, name="embedding-worker", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """Stop serving, close the broker and remove the socket file"""
+        if self._serving:
+            self._server.shutdown()
+            self._serving = False
+        self._server.server_close()
+        with self._connections_lock:
+            connections = list(self._connections)
+        for conn in connections:
+            # Wake handler threads blocked in recv so clients see the restart
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.broker.close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._socket_path and os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+
+    def _track_connection(self, conn: socket.socket, active: bool):
+        with self._connections_lock:
+            if active:
+                self._connections.add(conn)
+            else:
+                self._connections.discard(conn)
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+class LocalWorkerEmbeddingFunction:
+    """
+    Chroma-compatible embedding function backed by the embedding worker
+
+    Keeps one persistent connection per calling thread and reconnects once
+    if the worker was restarted.
+    """
+
+    def __init__(
+        self,
+        address: str = EMBEDDING_WORKER_ADDRESS,
+        model_name: str = EMBEDDING_WORKER_MODEL,
+        timeout: float = EMBEDDING_WORKER_TIMEOUT
+    ):
+        """
+        Initialize worker client
+
+        Args:
+            address: Worker address (see ``parse_worker_address``)
+            model_name: Model served by the worker
+            timeout: Socket timeout in seconds
+        """
+        if not address:
+            raise ValueError("Embedding worker address is not configured")
+        self.address = address
+        self.model_name = model_name
+        self.timeout = timeout
+        self._family, self._sock_address = parse_worker_address(address)
+        self._local = threading.local()
+
+    def name(self) -> str:
+        """
+        Return the name of the embedding function (required by ChromaDB)
+
+        The worker serves the same model as Chroma's in-process
+        SentenceTransformer function, so existing collections stay compatible.
+        """
+        return "sentence_transformer"
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for input texts (documents)
+
+        Args:
+            input: List of texts to embed
+
+        Returns:
+            List of embedding vectors
+        """
+        if not input:
+            return []
+        with trace_span("embedding.worker", kind="embedding", texts=len(input)):
+            return self._embed(list(input), "document")
+
+    def embed_query(self, query=None, input=None):
+        """
+        Generate embedding for search queries
+
+        Args:
+            query: Query text or list of texts to embed
+            input: Alternative name for query (ChromaDB compatibility)
+
+        Returns:
+            Embedding vector(s) for the query (numpy array for ChromaDB)
+        """
+        import numpy as np
+
+        text = query if query is not None else input
+        if not text:
+            return []
+        queries = [q for q in (text if isinstance(text, list) else [text]) if q]
+        if not queries:
+            return []
+        return np.array(self._embed(queries, "query"), dtype=np.float32)
+
+    def ping(self) -> Dict[str, Any]:
+        """Check the worker is reachable and return its model info"""
+        return self._request({"op": "ping"})
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the worker's broker statistics"""
+        stats = self._request({"op": "stats"})
+        stats["address"] = self.address
+        return stats
+
+    def close(self):
+        """Close this thread's connection"""
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            finally:
+                self._local.sock = None
+
+    def _embed(self, texts: List[str], input_type: str) -> List[List[float]]:
+        response = self._request({"op": "embed", "texts": texts, "input_type": input_type})
+        embeddings = response.get("embeddings")
+        if embeddings is None or len(embeddings) != len(texts):
+            raise EmbeddingWorkerError(
+                f"Worker returned {len(embeddings or [])} embeddings for {len(texts)} inputs"
+            )
+        return embeddings
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._sock_address)
+        except OSError:
+            sock.close()
+            raise
+        self._local.sock = sock
+        return sock
+
+    def _request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None)
+            fresh = sock is None
+            try:
+                if sock is None:
+                    sock = self._connect()
+                send_message(sock, message)
+                response = recv_message(sock)
+                if response is None:
+                    raise EmbeddingWorkerError("Worker closed the connection")
+                break
+            except (OSError, EmbeddingWorkerError) as e:
+                self.close()
+                # A reused connection may be stale after a worker restart
+                if fresh or attempt == 1:
+                    raise EmbeddingWorkerError(
+                        f"Embedding worker at {self.address} unavailable: {e}"
+                    ) from e
+
+        if "error" in response:
+            raise EmbeddingWorkerError(f"Embedding worker error: {response['error']}")
+        return response
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Shared local embedding worker")
+    parser.add_argument("--address", default=EMBEDDING_WORKER_ADDRESS or "/tmp/rag-embeddings.sock",
+                        help="Unix socket path or host:port to listen on")
+    parser.add_argument("--model", default=EMBEDDING_WORKER_MODEL, help="SentenceTransformer model")
+    parser.add_argument("--backend", default=EMBEDDING_WORKER_BACKEND, choices=["torch", "onnx"],
+                        help="Inference backend")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    server = EmbeddingWorkerServer(
+        address=args.address,
+        embed_fn=load_local_model(args.model, args.backend),
+        model_name=args.model
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Embedding worker stopped")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,20 +8,32 @@ Major improvements:
 - Recency scoring
 - Better title extraction
 - Document type routing
+- Document type classified locally (rules + small model), else in the enrichment call
+- Long documents enriched section by section in parallel, results merged
 """
 
+import asyncio
 import hashlib
 import json
 import re
 import math
+import os
+from collections import Counter
 from datetime import datetime, date
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 from src.services.llm_service import LLMService
 from src.services.vocabulary_service import VocabularyService
+from src.services.chunking_service import ChunkingService
 from src.services.entity_deduplication_service import get_entity_deduplication_service
+from src.services.document_type_classifier import (
+    DOC_TYPE_CLASSIFIER_ENABLED,
+    DocumentTypeClassifier,
+    get_document_type_classifier,
+)
 from src.models.schemas import DocumentType, SemanticDocumentType
+from src.models.enrichment_models import EnrichmentResponse, FusedEnrichmentResponse
 from src.services.document_type_handlers import (
     EmailHandler,
     ChatLogHandler,
@@ -32,6 +44,25 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Ask for the semantic document type inside the enrichment response instead of a
+# separate classification LLM call (falls back to two calls on failure)
+ENRICHMENT_FUSED_CLASSIFICATION = os.getenv("ENRICHMENT_FUSED_CLASSIFICATION", "true").lower() == "true"
+
+# Version of the static enrichment instructions (system prompt); bump when editing
+# them so cached prefixes and stored metadata can be told apart
+ENRICHMENT_PROMPT_VERSION = "2025-10-v3"
+
+# Content characters sent in one enrichment prompt (~32k leaves room for prompt,
+# vocabulary and response in Groq 3.3 70B's 128k context window)
+ENRICHMENT_PROMPT_MAX_CONTENT_CHARS = 32000
+
+# Long documents: enrich sections concurrently and merge (map-reduce) instead of
+# truncating the content to a single prompt
+ENRICHMENT_LONG_DOC_THRESHOLD_CHARS = int(os.getenv("ENRICHMENT_LONG_DOC_THRESHOLD_CHARS", "32000"))
+ENRICHMENT_SECTION_MAX_CHARS = int(os.getenv("ENRICHMENT_SECTION_MAX_CHARS", "16000"))
+ENRICHMENT_MAX_SECTIONS = int(os.getenv("ENRICHMENT_MAX_SECTIONS", "40"))
+ENRICHMENT_MAX_CONCURRENCY = int(os.getenv("ENRICHMENT_MAX_CONCURRENCY", "4"))
+
 
 class EnrichmentService:
     """Enhanced enrichment with controlled vocabulary (formerly V2)"""
@@ -57,6 +88,15 @@ class EnrichmentService:
         self.email_handler = EmailHandler()
         self.chat_log_handler = ChatLogHandler()
 
+        # Local semantic type classifier (created on first use)
+        self._doc_type_classifier: Optional[DocumentTypeClassifier] = None
+
+        # Section splitting for map-reduce enrichment of long documents
+        self.chunking_service = ChunkingService(tokenizer=None)
+
+        # Static system prompts per variant: {fused_classification: (cache_key, prompt)}
+        self._system_prompt_cache: Dict[bool, Tuple[tuple, str]] = {}
+
     def generate_content_hash(self, content: str) -> str:
         """Generate SHA-256 hash for deduplication"""
         return hashlib.sha256(content.encode('utf-8')).hexdigest()
@@ -487,11 +527,88 @@ class EnrichmentService:
         title: str
     ) -> str:
         """
-        Classify document into semantic type using keyword matching + LLM fallback
+        Classify document into semantic type using keyword matching, the local
+        classifier, and the LLM as fallback
 
         Returns: semantic document type string (e.g., "legal/law", "form/questionnaire")
         """
-        # Fast keyword-based classification first
+        local_type = self._classify_without_llm(content, filename)
+        if local_type:
+            return local_type
+
+        return await self._classify_with_llm(content, filename, title)
+
+    @property
+    def doc_type_classifier(self) -> Optional[DocumentTypeClassifier]:
+        """Local document type classifier (None if disabled or without vocabulary)"""
+        if self._doc_type_classifier is None and DOC_TYPE_CLASSIFIER_ENABLED and self.vocab:
+            try:
+                self._doc_type_classifier = get_document_type_classifier(self.vocab.get_all_document_types())
+            except Exception as e:
+                logger.warning(f"Could not load document type classifier: {e}")
+        return self._doc_type_classifier
+
+    def _classify_without_llm(
+        self,
+        content: str,
+        filename: str,
+        document_type: Optional[DocumentType] = None,
+        metadata: Optional[Dict] = None
+    ) -> Optional[str]:
+        """
+        Keyword rules, then the local classifier (rules + hashed n-gram model)
+
+        Returns: semantic document type string, or None if the LLM should decide
+        """
+        classifier = self.doc_type_classifier
+
+        keyword_type = self._classify_by_keywords(content, filename)
+        if keyword_type:
+            if classifier:
+                classifier.record_path("keyword")
+            return keyword_type
+
+        if classifier:
+            prediction = classifier.classify(
+                content, filename, getattr(document_type, "value", document_type), metadata
+            )
+            if prediction:
+                classifier.record_path(prediction.source)
+                logger.debug(
+                    f"Local document type: {prediction.doc_type} "
+                    f"({prediction.source}, {prediction.confidence:.2f})"
+                )
+                return prediction.doc_type
+
+        return None
+
+    def _learn_document_type(
+        self,
+        content: str,
+        filename: str,
+        doc_type: str,
+        document_type: Optional[DocumentType] = None,
+        metadata: Optional[Dict] = None
+    ):
+        """Record an LLM classification and train the local classifier on it"""
+        classifier = self.doc_type_classifier
+        if not classifier:
+            return
+        classifier.record_path("llm")
+        if doc_type != SemanticDocumentType.unknown.value:
+            try:
+                classifier.learn(
+                    content, filename, doc_type, getattr(document_type, "value", document_type), metadata
+                )
+            except Exception as e:
+                logger.warning(f"Document type classifier update failed: {e}")
+
+    def _classify_by_keywords(self, content: str, filename: str) -> Optional[str]:
+        """
+        Keyword-based semantic type classification (no LLM call)
+
+        Returns: semantic document type string, or None if no keyword matched
+        """
         content_lower = content[:2000].lower()
         filename_lower = filename.lower()
 
@@ -546,7 +663,22 @@ class EnrichmentService:
         if 'policy' in content_lower or 'richtlinie' in content_lower:
             return SemanticDocumentType.government_policy.value
 
-        # If no keyword match, use LLM for classification from controlled vocabulary
+        return None
+
+    async def _classify_with_llm(
+        self,
+        content: str,
+        filename: str,
+        title: str,
+        document_type: Optional[DocumentType] = None,
+        metadata: Optional[Dict] = None
+    ) -> str:
+        """Classify via a separate LLM call using the controlled vocabulary"""
+        doc_type = await self._request_llm_classification(content, filename, title)
+        self._learn_document_type(content, filename, doc_type, document_type, metadata)
+        return doc_type
+
+    async def _request_llm_classification(self, content: str, filename: str, title: str) -> str:
         allowed_types = self.vocab.get_all_document_types() if self.vocab else []
 
         # Format types list for LLM prompt
@@ -570,24 +702,36 @@ Return ONLY the document type string (e.g., "legal/court-decision"), nothing els
                 model_id="groq/llama-3.3-70b-versatile",
                 temperature=0.0
             )
-            doc_type = response.strip().lower()
-
-            # Validate against vocabulary
-            if self.vocab and self.vocab.is_valid_document_type(doc_type):
+            doc_type = self._resolve_document_type(response)
+            if doc_type:
                 return doc_type
 
-            # Try fuzzy matching
-            if self.vocab:
-                suggested = self.vocab.suggest_document_type(doc_type)
-                if suggested != doc_type:
-                    logger.info(f"Document type fuzzy matched: {doc_type} → {suggested}")
-                    return suggested
-
         except Exception as e:
             logger.warning(f"LLM classification failed: {e}")
 
         return SemanticDocumentType.unknown.value
 
+    def _resolve_document_type(self, raw_type: str) -> Optional[str]:
+        """
+        Validate an LLM-provided document type against the vocabulary
+
+        Returns: vocabulary document type (exact or fuzzy match), or None
+        """
+        doc_type = raw_type.strip().lower()
+
+        # Validate against vocabulary
+        if self.vocab and self.vocab.is_valid_document_type(doc_type):
+            return doc_type
+
+        # Try fuzzy matching
+        if self.vocab:
+            suggested = self.vocab.suggest_document_type(doc_type)
+            if suggested != doc_type:
+                logger.info(f"Document type fuzzy matched: {doc_type} → {suggested}")
+                return suggested
+
+        return None
+
     def filter_people_by_document_type(
         self,
         people: List[Dict],
@@ -745,35 +889,43 @@ Return ONLY the document type string (e.g., "legal/court-decision"), nothing els
         # Extract title first (don't rely on LLM for this)
         extracted_title = self.extract_title_from_content(content, filename)
 
-        # Classify semantic document type
-        semantic_doc_type = await self.classify_semantic_document_type(
-            content, filename, extracted_title
-        )
-        logger.info(f"Document type: {semantic_doc_type}")
+        # Classify semantic document type locally (keywords, rules, small model);
+        # if unsure the LLM classifies it (fused into the enrichment call when enabled)
+        semantic_doc_type = self._classify_without_llm(content, filename, document_type, existing_metadata)
 
         # Calculate recency score
         recency_score = self.calculate_recency_score(created_at)
 
-        # Build controlled vocabulary prompt
-        prompt = self._build_controlled_enrichment_prompt(
-            content=content,
-            filename=filename,
-            document_type=document_type,
-            extracted_title=extracted_title,
-            metadata=existing_metadata
-        )
-
         try:
-            # Use Groq Llama 3.3 70B for enrichment (ultra-fast, free, excellent quality)
-            # Oct 2025: Anthropic out of credits, Groq 3.3 70B best free model available
-            from src.models.enrichment_models import EnrichmentResponse
-
-            llm_response, cost, model_used = await self.llm_service.call_llm_structured(
-                prompt=prompt,
-                response_model=EnrichmentResponse,
-                model_id="groq/llama-3.3-70b-versatile",  # Oct 2025: Best free model (70B, 128k context)
-                temperature=0.1
-            )
+            if len(content) > ENRICHMENT_LONG_DOC_THRESHOLD_CHARS:
+                # Long document: enrich sections concurrently, then merge
+                llm_response, cost, semantic_doc_type = await self._enrich_long_document(
+                    content=content,
+                    filename=filename,
+                    document_type=document_type,
+                    extracted_title=extracted_title,
+                    semantic_doc_type=semantic_doc_type,
+                    metadata=existing_metadata
+                )
+            else:
+                # Build controlled vocabulary prompt
+                prompt = self._build_controlled_enrichment_prompt(
+                    content=content,
+                    filename=filename,
+                    document_type=document_type,
+                    extracted_title=extracted_title,
+                    metadata=existing_metadata
+                )
+                llm_response, cost, semantic_doc_type = await self._call_enrichment_llm(
+                    prompt=prompt,
+                    content=content,
+                    filename=filename,
+                    title=extracted_title,
+                    semantic_doc_type=semantic_doc_type,
+                    document_type=document_type,
+                    metadata=existing_metadata
+                )
+            logger.info(f"Document type: {semantic_doc_type}")
 
             # Debug: Log structured LLM response
             logger.info("=" * 80)
@@ -909,6 +1061,287 @@ Return ONLY the document type string (e.g., "legal/court-decision"), nothing els
                 existing_metadata=existing_metadata
             )
 
+    async def _call_enrichment_llm(
+        self,
+        prompt: str,
+        content: str,
+        filename: str,
+        title: str,
+        semantic_doc_type: Optional[str],
+        document_type: Optional[DocumentType] = None,
+        metadata: Optional[Dict] = None
+    ) -> Tuple[EnrichmentResponse, float, str]:
+        """
+        Run the enrichment LLM call, classifying the document type if still needed
+
+        With ENRICHMENT_FUSED_CLASSIFICATION the semantic type is requested in
+        the same structured response (one LLM round trip instead of two). If the
+        fused call fails, the two-call path is used; if only its type is invalid,
+        the type is classified separately and the enrichment is kept.
+
+        Args:
+            prompt: Enrichment prompt
+            content: Document content
+            filename: Original filename
+            title: Extracted title
+            semantic_doc_type: Type from local classification, or None
+            document_type: Format-level document type (for the local classifier)
+            metadata: Extraction metadata (for the local classifier)
+
+        Returns:
+            Tuple of (enrichment response, cost, semantic document type)
+        """
+        if semantic_doc_type is None and ENRICHMENT_FUSED_CLASSIFICATION and self.vocab:
+            try:
+                fused_response, cost, model_used = await self.llm_service.call_llm_structured(
+                    prompt=prompt,
+                    system_prompt=self._get_enrichment_system_prompt(fused_classification=True),
+                    response_model=FusedEnrichmentResponse,
+                    model_id="groq/llama-3.3-70b-versatile",
+                    temperature=0.1
+                )
+                llm_response = EnrichmentResponse.model_validate(
+                    fused_response.model_dump(exclude={"semantic_document_type"})
+                )
+                semantic_doc_type = self._resolve_document_type(fused_response.semantic_document_type)
+                if semantic_doc_type is None:
+                    logger.warning(
+                        f"⚠️ Fused enrichment returned unknown document type "
+                        f"'{fused_response.semantic_document_type}', classifying separately"
+                    )
+                    semantic_doc_type = await self._classify_with_llm(
+                        content, filename, title, document_type, metadata
+                    )
+                else:
+                    self._learn_document_type(content, filename, semantic_doc_type, document_type, metadata)
+                return llm_response, cost, semantic_doc_type
+            except Exception as e:
+                logger.warning(f"⚠️ Fused classification+enrichment failed, using two calls: {e}")
+
+        if semantic_doc_type is None:
+            semantic_doc_type = await self._classify_with_llm(content, filename, title, document_type, metadata)
+
+        llm_response, cost = await self._request_enrichment(prompt)
+        return llm_response, cost, semantic_doc_type
+
+    async def _request_enrichment(self, prompt: str) -> Tuple[EnrichmentResponse, float]:
+        """Structured enrichment call; returns (response, cost)"""
+        # Use Groq Llama 3.3 70B for enrichment (ultra-fast, free, excellent quality)
+        # Oct 2025: Anthropic out of credits, Groq 3.3 70B best free model available
+        llm_response, cost, model_used = await self.llm_service.call_llm_structured(
+            prompt=prompt,
+            system_prompt=self._get_enrichment_system_prompt(),
+            response_model=EnrichmentResponse,
+            model_id="groq/llama-3.3-70b-versatile",  # Oct 2025: Best free model (70B, 128k context)
+            temperature=0.1
+        )
+        return llm_response, cost
+
+    async def _enrich_long_document(
+        self,
+        content: str,
+        filename: str,
+        document_type: DocumentType,
+        extracted_title: str,
+        semantic_doc_type: Optional[str],
+        metadata: Optional[Dict] = None
+    ) -> Tuple[EnrichmentResponse, float, str]:
+        """
+        Map-reduce enrichment for documents longer than one prompt
+
+        Splits the content into structural sections (ChunkingService), enriches
+        them concurrently (at most ENRICHMENT_MAX_CONCURRENCY calls in flight),
+        merges the partial results and condenses the section summaries into one.
+        The first section also resolves the semantic document type if needed.
+
+        Args:
+            content: Full document content
+            filename: Original filename
+            document_type: Format-level document type
+            extracted_title: Extracted title
+            semantic_doc_type: Type from local classification, or None
+            metadata: Extraction metadata
+
+        Returns:
+            Tuple of (merged enrichment response, total cost, semantic document type)
+        """
+        # Fewer, larger sections for very long documents - but never larger than
+        # one prompt, or every section would be truncated
+        section_chars = max(ENRICHMENT_SECTION_MAX_CHARS, -(-len(content) // ENRICHMENT_MAX_SECTIONS))
+        if section_chars > ENRICHMENT_PROMPT_MAX_CONTENT_CHARS:
+            section_chars = ENRICHMENT_PROMPT_MAX_CONTENT_CHARS
+            logger.warning(
+                f"⚠️ Document of {len(content):,} chars needs more than ENRICHMENT_MAX_SECTIONS="
+                f"{ENRICHMENT_MAX_SECTIONS} sections of {section_chars:,} chars; "
+                f"enriching ~{-(-len(content) // section_chars)} sections"
+            )
+        sections = self.chunking_service.split_into_sections(content, section_chars)
+        logger.info(
+            f"📚 Long document ({len(content):,} chars): enriching {len(sections)} sections "
+            f"(concurrency {ENRICHMENT_MAX_CONCURRENCY})"
+        )
+        semaphore = asyncio.Semaphore(ENRICHMENT_MAX_CONCURRENCY)
+
+        async def enrich_section(index: int, section: str) -> Tuple[EnrichmentResponse, float, Optional[str]]:
+            async with semaphore:
+                prompt = (
+                    f"This is section {index + 1} of {len(sections)} of a longer document. "
+                    f"Extract metadata from this section only.\n\n"
+                    + self._build_controlled_enrichment_prompt(
+                        content=section,
+                        filename=filename,
+                        document_type=document_type,
+                        extracted_title=extracted_title,
+                        metadata=metadata
+                    )
+                )
+                if index == 0:
+                    return await self._call_enrichment_llm(
+                        prompt=prompt,
+                        content=content,
+                        filename=filename,
+                        title=extracted_title,
+                        semantic_doc_type=semantic_doc_type,
+                        document_type=document_type,
+                        metadata=metadata
+                    )
+                response, cost = await self._request_enrichment(prompt)
+                return response, cost, None
+
+        results = await asyncio.gather(
+            *(enrich_section(i, section) for i, section in enumerate(sections)),
+            return_exceptions=True
+        )
+
+        responses, total_cost = [], 0.0
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                logger.warning(f"⚠️ Section {index + 1}/{len(sections)} enrichment failed: {result}")
+                continue
+            response, cost, section_doc_type = result
+            responses.append(response)
+            total_cost += cost
+            semantic_doc_type = section_doc_type or semantic_doc_type
+        if not responses:
+            raise next(r for r in results if isinstance(r, BaseException))
+
+        if semantic_doc_type is None:
+            semantic_doc_type = await self._classify_with_llm(
+                content, filename, extracted_title, document_type, metadata
+            )
+
+        summary, summary_cost = await self._reduce_summaries([r.summary for r in responses], extracted_title)
+        total_cost += summary_cost
+
+        logger.info(f"📚 Merged {len(responses)}/{len(sections)} section enrichments (${total_cost:.4f})")
+        return self._merge_section_responses(responses, summary), total_cost, semantic_doc_type
+
+    async def _reduce_summaries(self, summaries: List[str], title: str) -> Tuple[str, float]:
+        """
+        Condense per-section summaries into one document summary
+
+        Returns: (summary, cost); falls back to the joined section summaries
+        """
+        fallback = " ".join(summaries)[:600]
+        if len(summaries) == 1:
+            return summaries[0], 0.0
+
+        numbered = "\n".join(f"{i + 1}. {summary}" for i, summary in enumerate(summaries))
+        prompt = f"""These are summaries of consecutive sections of one document titled "{title}".
+
+{numbered}
+
+Write a 2-3 sentence summary of the whole document (max 500 characters).
+Return ONLY the summary, nothing else."""
+
+        try:
+            summary, cost, _ = await self.llm_service.call_llm(
+                prompt=prompt,
+                model_id="groq/llama-3.3-70b-versatile",
+                temperature=0.1
+            )
+            summary = summary.strip()
+            if len(summary) >= 10:
+                return summary[:600], cost
+        except Exception as e:
+            logger.warning(f"Summary reduce failed, joining section summaries: {e}")
+        return fallback, 0.0
+
+    @staticmethod
+    def _merge_section_responses(responses: List[EnrichmentResponse], summary: str) -> EnrichmentResponse:
+        """
+        Merge per-section enrichment results into one response
+
+        Lists are deduplicated case-insensitively and ranked by how many sections
+        mention a value (ties keep document order), then cut to the model limits.
+        People with the same name are merged field by field.
+        """
+        def ranked(value_lists: List[List], limit: int, key=lambda v: v.strip().lower()) -> List:
+            counts: Counter = Counter()
+            first: Dict[str, object] = {}
+            for values in value_lists:
+                for value in values:
+                    value_key = key(value)
+                    if not value_key:
+                        continue
+                    counts[value_key] += 1
+                    first.setdefault(value_key, value)
+            order = {k: i for i, k in enumerate(first)}
+            keys = sorted(counts, key=lambda k: (-counts[k], order[k]))
+            return [first[k] for k in keys[:limit]]
+
+        entities = [r.entities for r in responses]
+
+        people: Dict[str, Dict] = {}
+        for person in ranked([e.people for e in entities], 50, key=lambda p: p.name.strip().lower()):
+            people[person.name.strip().lower()] = person.model_dump()
+        for entity in entities:
+            for person in entity.people:
+                merged = people.get(person.name.strip().lower())
+                if merged is None:
+                    continue
+                for field, value in person.model_dump().items():
+                    if field == "relationships":
+                        merged[field] += [r for r in value if r not in merged[field]]
+                    elif not merged.get(field) and value:
+                        merged[field] = value
+
+        quality = [r.quality_indicators.model_dump() for r in responses]
+
+        return EnrichmentResponse.model_validate({
+            "title": responses[0].title,
+            "summary": summary,
+            "topics": ranked([r.topics for r in responses], 15),
+            "suggested_topics": ranked([r.suggested_topics for r in responses], 10),
+            "entities": {
+                "people": list(people.values()),
+                "organizations": ranked([e.organizations for e in entities], 20),
+                "places": ranked([e.places for e in entities], 10),
+                "dates": [
+                    d.model_dump()
+                    for d in ranked([e.dates for e in entities], 20, key=lambda d: d.date.strip())
+                ],
+                "numbers": ranked([e.numbers for e in entities], 50),
+                "technologies": ranked([e.technologies for e in entities], 20),
+            },
+            "places": ranked([r.places for r in responses], 5),
+            "quality_indicators": {
+                field: sum(q[field] or 0.0 for q in quality) / len(quality)
+                for field in quality[0]
+            },
+        })
+
+    def _build_document_type_section(self, allowed_types: List[str]) -> str:
+        """Prompt section asking for the semantic document type in the enrichment JSON"""
+        types_list = "\n".join([f"- {t}" for t in allowed_types])
+        return f"""
+Also classify the document into ONE semantic type from the controlled vocabulary below
+and return it as "semantic_document_type" in the same JSON object.
+
+Choose ONLY ONE from these document types:
+{types_list}
+"""
+
     def _get_summary_instructions(self, document_type: DocumentType, metadata: Optional[Dict] = None) -> str:
         """
         Generate type-specific summary instructions.
@@ -978,60 +1411,56 @@ Return ONLY the document type string (e.g., "legal/court-decision"), nothing els
             # Default for other types
             return "2-3 sentence summary of main content"
 
-    def _build_controlled_enrichment_prompt(
-        self,
-        content: str,
-        filename: str,
-        document_type: DocumentType,
-        extracted_title: str,
-        metadata: Optional[Dict] = None
-    ) -> str:
-        """Build enrichment prompt with controlled vocabulary"""
+    def _get_enrichment_system_prompt(self, fused_classification: bool = False) -> str:
+        """
+        Static enrichment instructions: rules, controlled vocabulary, JSON schema
 
-        # Get vocabulary lists
-        all_topics = self.vocab.get_all_topics() if self.vocab else []
-        all_places = self.vocab.get_all_places() if self.vocab else []
+        Identical for every document (until the vocabulary or
+        ENRICHMENT_PROMPT_VERSION changes), so providers can serve it from
+        their prompt cache. Built once per vocabulary state.
 
-        # Truncate content (increased to 32000 for Groq 3.3 70B's 128k context window)
-        # Using ~32k to allow room for prompt + vocabulary + response
-        content_sample = content[:32000]
-        if len(content) > 32000:
-            content_sample += "\n\n[...content truncated...]"
+        Args:
+            fused_classification: Also ask for the semantic document type
 
+        Returns:
+            System prompt text
+        """
         # Show ALL topics to LLM (no truncation - let LLM see full vocabulary)
-        topic_examples = all_topics if all_topics else []
+        all_topics = self.vocab.get_all_topics() if self.vocab else []
+        all_places = self.vocab.get_all_places() if self.vocab else []
+        document_types = self.vocab.get_all_document_types() if self.vocab and fused_classification else []
+
+        cache_key = (
+            ENRICHMENT_PROMPT_VERSION, fused_classification,
+            tuple(all_topics), tuple(all_places[:15]), tuple(document_types)
+        )
+        cached = self._system_prompt_cache.get(fused_classification)
+        if cached and cached[0] == cache_key:
+            return cached[1]
 
-        prompt = f"""Extract metadata from this document using CONTROLLED VOCABULARIES.
+        prompt = f"""[Enrichment instructions {ENRICHMENT_PROMPT_VERSION}]
+Extract metadata from the document in the user message using CONTROLLED VOCABULARIES.
 
 ⚠️⚠️⚠️ CRITICAL RULES ⚠️⚠️⚠️
-1. Extract ONLY from the document content below - NOT from these instructions
+1. Extract ONLY from the document content in the user message - NOT from these instructions
 2. If an entity type has zero matches in the document, return empty array []
 3. DO NOT copy entities from previous documents or examples
 4. DO NOT hallucinate or invent information
 5. USE ONLY the controlled vocabulary provided
 
-**Filename**: {filename}
-**Type**: {document_type}
-**Extracted Title**: {extracted_title}
-
-**Content**:
-{content_sample}
-
-IMPORTANT: Use ONLY the provided controlled vocabulary. Do not invent new tags.
-
 Extract the following (return as JSON):
 
 1. **title**: Generate a clear, descriptive title (10-80 characters)
-   - Review the extracted title: "{extracted_title}"
+   - Review the **Extracted Title** given with the document
    - If it's good and descriptive, use it
    - If it's generic/poor (e.g., "Here are the key points", "Untitled", filename), create a better one from content
    - Format examples: "Q3 Launch: AI Integration Plan", "Legal Motion: Custody Modification", "ChatGPT: RAG Architecture Discussion"
    - Be specific and informative, not generic
 
-2. **summary**: {self._get_summary_instructions(document_type, metadata)}
+2. **summary**: Follow the **Summary instructions** given with the document
 
 3. **topics**: Array of topics from this CONTROLLED list:
-   {json.dumps(topic_examples)}
+   {json.dumps(all_topics)}
 
    CLASSIFICATION GUIDE (with examples):
    - AI/ML/LLM discussions → "technology/ai", "technology/machine-learning", "technology/llm", "technology/nlp"
@@ -1051,7 +1480,7 @@ Extract the following (return as JSON):
    (These will be reviewed by user, not used directly)
 
 5. **entities**: Extract ONLY entities that are EXPLICITLY mentioned in the text:
-   - organizations: Company/organization names that EXPLICITLY APPEAR in the document text above
+   - organizations: Company/organization names that EXPLICITLY APPEAR in the document text
    - people: Extract people as STRUCTURED OBJECTS ONLY if they are HUMAN NAMES EXPLICITLY named in the document.
 
      ⚠️ CRITICAL RULES FOR PERSON CLASSIFICATION ⚠️
@@ -1106,7 +1535,7 @@ Extract the following (return as JSON):
      Extract any technology names you see in the document content.
 
    ⚠️⚠️⚠️ FINAL WARNING ⚠️⚠️⚠️
-   Extract ONLY from the document content shown above.
+   Extract ONLY from the document content in the user message.
    Do NOT invent, hallucinate, or copy entities from instruction examples.
    If an entity type has no matches in the document, return an empty array [].
 
@@ -1165,8 +1594,45 @@ Return ONLY this JSON structure (no markdown, no explanations):
   }}
 }}
 """
+        if fused_classification:
+            prompt += self._build_document_type_section(document_types)
+
+        self._system_prompt_cache[fused_classification] = (cache_key, prompt)
         return prompt
 
+    def _build_controlled_enrichment_prompt(
+        self,
+        content: str,
+        filename: str,
+        document_type: DocumentType,
+        extracted_title: str,
+        metadata: Optional[Dict] = None
+    ) -> str:
+        """
+        Build the per-document part of the enrichment prompt
+
+        Rules and vocabulary live in the static system prompt
+        (_get_enrichment_system_prompt); this user message only carries what
+        changes per document.
+        """
+        # Truncate content to ENRICHMENT_PROMPT_MAX_CONTENT_CHARS
+        # (longer documents are enriched section by section, see _enrich_long_document)
+        content_sample = content[:ENRICHMENT_PROMPT_MAX_CONTENT_CHARS]
+        if len(content) > ENRICHMENT_PROMPT_MAX_CONTENT_CHARS:
+            content_sample += "\n\n[...content truncated...]"
+
+        return f"""**Filename**: {filename}
+**Type**: {document_type}
+**Extracted Title**: {extracted_title}
+**Summary instructions**: {self._get_summary_instructions(document_type, metadata)}
+
+**Content**:
+{content_sample}
+
+IMPORTANT: Use ONLY the provided controlled vocabulary. Do not invent new tags.
+Return ONLY the JSON structure described in the instructions.
+"""
+
     def _parse_llm_response(self, response: str) -> Dict:
         """Parse LLM JSON response"""
         try:
@@ -1411,7 +1877,7 @@ Return ONLY this JSON structure (no markdown, no explanations):
             "title", "summary", "topics", "places", "projects",
             "suggested_topics", "organizations", "people", "people_roles", "dates", "dates_detailed", "numbers", "contacts",
             "quality_score", "recency_score", "ocr_quality",
-            "enrichment_version", "enrichment_date", "enrichment_cost",
+            "enrichment_version", "enrichment_prompt_version", "enrichment_date", "enrichment_cost",
             "word_count", "char_count", "created_at", "enriched", "entities",
             "priority", "status"  # Workflow management fields
         }
@@ -1482,6 +1948,7 @@ Return ONLY this JSON structure (no markdown, no explanations):
 
             # === PROVENANCE ===
             "enrichment_version": "2.0",
+            "enrichment_prompt_version": ENRICHMENT_PROMPT_VERSION,
             "enrichment_date": datetime.now().isoformat(),
             "enrichment_cost": round(enrichment_cost, 6),
 
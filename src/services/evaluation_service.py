@@ -8,13 +8,18 @@ Features:
 - Gold query set management
 - Precision@k, Recall@k, MRR metrics
 - Historical tracking and comparison
-- Automated evaluation runs
-- Performance regression detection
+- Automated evaluation runs (bounded concurrency)
+- Per-query latency with p50/p95 next to quality metrics
+- Performance regression detection (quality and latency)
 """
 
+import asyncio
 import json
 import logging
-from typing import List, Dict, Set, Optional, Tuple
+import math
+import os
+import time
+from typing import Any, List, Dict, Set, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
@@ -22,6 +27,21 @@ import yaml
 
 logger = logging.getLogger(__name__)
 
+EVALUATION_CONCURRENCY = int(os.getenv("EVALUATION_CONCURRENCY", "4"))
+# Relative p50/p95 slowdown flagged as a latency regression by compare_runs
+EVALUATION_LATENCY_REGRESSION_THRESHOLD = float(os.getenv("EVALUATION_LATENCY_REGRESSION_THRESHOLD", "0.2"))
+# Ignore slowdowns smaller than this (timer noise on fast queries)
+EVALUATION_LATENCY_REGRESSION_MIN_MS = float(os.getenv("EVALUATION_LATENCY_REGRESSION_MIN_MS", "5.0"))
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0.0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
 
 @dataclass
 class GoldQuery:
@@ -49,6 +69,7 @@ class QueryResult:
     found_count: int
     expected_count: int
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    latency_ms: float = 0.0  # Time spent in search_function
 
 
 @dataclass
@@ -65,6 +86,10 @@ class EvaluationRun:
     pass_rate: float  # % queries meeting min_precision_at_5
     query_results: List[QueryResult] = field(default_factory=list)
     failed_queries: List[str] = field(default_factory=list)
+    latency_p50_ms: float = 0.0
+    latency_p95_ms: float = 0.0
+    latency_max_ms: float = 0.0
+    concurrency: int = 1
 
 
 class EvaluationService:
@@ -302,14 +327,19 @@ class EvaluationService:
     async def run_evaluation(
         self,
         search_function,
-        top_k: int = 10
+        top_k: int = 10,
+        concurrency: int = EVALUATION_CONCURRENCY
     ) -> EvaluationRun:
         """
         Run complete evaluation against all gold queries
 
+        Queries run concurrently (at most ``concurrency`` in flight); each
+        query's search latency is recorded on its QueryResult.
+
         Args:
             search_function: Async function that takes (query_text, top_k) and returns doc_ids
             top_k: Number of results to retrieve per query
+            concurrency: Maximum concurrent search_function calls
 
         Returns:
             EvaluationRun with aggregate metrics
@@ -329,25 +359,44 @@ class EvaluationService:
             )
 
         run_id = f"eval_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        query_results = []
-        failed_queries = []
-
-        logger.info(f"Starting evaluation run {run_id} with {len(self.gold_queries)} queries")
-
-        for gold_query in self.gold_queries:
-            try:
-                # Run search
-                retrieved_doc_ids = await search_function(gold_query.query_text, top_k)
-
-                # Evaluate
-                result = self.evaluate_query(gold_query, retrieved_doc_ids)
-                query_results.append(result)
+        concurrency = max(1, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        logger.info(f"Starting evaluation run {run_id} with {len(self.gold_queries)} queries (concurrency {concurrency})")
+
+        async def evaluate(gold_query: GoldQuery) -> Optional[QueryResult]:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    retrieved_doc_ids = await search_function(gold_query.query_text, top_k)
+                except Exception as e:
+                    logger.error(f"Failed to evaluate query {gold_query.query_id}: {e}")
+                    return None
+                latency_ms = (time.perf_counter() - start) * 1000
+
+            result = self.evaluate_query(gold_query, retrieved_doc_ids)
+            result.latency_ms = round(latency_ms, 3)
+            logger.debug(
+                f"Query {gold_query.query_id}: P@5={result.precision_at_5:.3f}, "
+                f"R@5={result.recall_at_5:.3f}, {latency_ms:.0f}ms"
+            )
+            return result
 
-                logger.debug(f"Query {gold_query.query_id}: P@5={result.precision_at_5:.3f}, R@5={result.recall_at_5:.3f}")
+        # gather keeps gold query order
+        outcomes = await asyncio.gather(*(evaluate(q) for q in self.gold_queries))
 
-            except Exception as e:
-                logger.error(f"Failed to evaluate query {gold_query.query_id}: {e}")
+        query_results = []
+        failed_queries = []
+        passed = 0
+        for gold_query, result in zip(self.gold_queries, outcomes):
+            if result is None:
                 failed_queries.append(gold_query.query_id)
+                continue
+            query_results.append(result)
+            if result.precision_at_5 >= gold_query.min_precision_at_5:
+                passed += 1
+
+        latencies = [r.latency_ms for r in query_results]
 
         # Calculate aggregate metrics
         if query_results:
@@ -357,11 +406,7 @@ class EvaluationService:
             avg_recall_at_10 = sum(r.recall_at_10 for r in query_results) / len(query_results)
             avg_mrr = sum(r.mrr for r in query_results) / len(query_results)
 
-            # Calculate pass rate (queries meeting min_precision_at_5)
-            passed = sum(
-                1 for i, r in enumerate(query_results)
-                if r.precision_at_5 >= self.gold_queries[i].min_precision_at_5
-            )
+            # Pass rate: queries meeting their own min_precision_at_5
             pass_rate = passed / len(query_results)
         else:
             avg_precision_at_5 = avg_precision_at_10 = 0.0
@@ -379,13 +424,20 @@ class EvaluationService:
             avg_mrr=avg_mrr,
             pass_rate=pass_rate,
             query_results=query_results,
-            failed_queries=failed_queries
+            failed_queries=failed_queries,
+            latency_p50_ms=round(_percentile(latencies, 50), 3),
+            latency_p95_ms=round(_percentile(latencies, 95), 3),
+            latency_max_ms=round(max(latencies), 3) if latencies else 0.0,
+            concurrency=concurrency
         )
 
         self.history.append(evaluation_run)
         self._save_evaluation_run(evaluation_run)
 
-        logger.info(f"Evaluation complete: P@5={avg_precision_at_5:.3f}, Pass rate={pass_rate:.1%}")
+        logger.info(
+            f"Evaluation complete: P@5={avg_precision_at_5:.3f}, Pass rate={pass_rate:.1%}, "
+            f"p50={evaluation_run.latency_p50_ms:.0f}ms, p95={evaluation_run.latency_p95_ms:.0f}ms"
+        )
 
         return evaluation_run
 
@@ -444,18 +496,32 @@ class EvaluationService:
     def compare_runs(
         self,
         run1: EvaluationRun,
-        run2: EvaluationRun
-    ) -> Dict[str, float]:
+        run2: EvaluationRun,
+        latency_threshold: float = EVALUATION_LATENCY_REGRESSION_THRESHOLD,
+        latency_min_ms: float = EVALUATION_LATENCY_REGRESSION_MIN_MS
+    ) -> Dict[str, Any]:
         """
         Compare two evaluation runs to detect regression/improvement
 
+        A latency regression is a p50 or p95 increase of more than
+        ``latency_threshold`` (relative) and ``latency_min_ms`` (absolute).
+        Runs recorded before latency tracking (0ms) are never flagged.
+
         Args:
             run1: First evaluation run (baseline)
             run2: Second evaluation run (current)
+            latency_threshold: Relative slowdown to flag (0.2 = +20%)
+            latency_min_ms: Minimum absolute slowdown to flag
 
         Returns:
-            Dict with delta metrics
+            Dict with delta metrics and latency regression flags
         """
+        latency_regressions = []
+        for name in ("latency_p50_ms", "latency_p95_ms"):
+            before, after = getattr(run1, name), getattr(run2, name)
+            if before > 0 and after - before > max(before * latency_threshold, latency_min_ms):
+                latency_regressions.append(name)
+
         return {
             'precision_at_5_delta': run2.avg_precision_at_5 - run1.avg_precision_at_5,
             'precision_at_10_delta': run2.avg_precision_at_10 - run1.avg_precision_at_10,
@@ -463,6 +529,10 @@ class EvaluationService:
             'recall_at_10_delta': run2.avg_recall_at_10 - run1.avg_recall_at_10,
             'mrr_delta': run2.avg_mrr - run1.avg_mrr,
             'pass_rate_delta': run2.pass_rate - run1.pass_rate,
+            'latency_p50_delta_ms': run2.latency_p50_ms - run1.latency_p50_ms,
+            'latency_p95_delta_ms': run2.latency_p95_ms - run1.latency_p95_ms,
+            'latency_regressions': latency_regressions,
+            'latency_regression': bool(latency_regressions),
             'timestamp_1': run1.timestamp,
             'timestamp_2': run2.timestamp
         }
@@ -492,6 +562,8 @@ class EvaluationService:
 | Recall@10 | {evaluation_run.avg_recall_at_10:.3f} |
 | MRR | {evaluation_run.avg_mrr:.3f} |
 | Pass Rate | {evaluation_run.pass_rate:.1%} |
+| Latency p50 | {evaluation_run.latency_p50_ms:.0f}ms |
+| Latency p95 | {evaluation_run.latency_p95_ms:.0f}ms |
 
 ## Query Results
 
@@ -506,6 +578,7 @@ class EvaluationService:
 - **Precision@5:** {result.precision_at_5:.3f}
 - **Recall@5:** {result.recall_at_5:.3f}
 - **MRR:** {result.mrr:.3f}
+- **Latency:** {result.latency_ms:.0f}ms
 - **Found:** {result.found_count}/{result.expected_count} expected documents
 """
 
@@ -0,0 +1,223 @@
+"""
+Extraction Cache - Persistent cache of extracted document text
+
+Re-ingesting a file whose bytes have not changed (retry_failed.py,
+resume_ingestion.sh, re-uploads) used to repeat PDF parsing, OCR and office
+extraction. This cache stores each extraction result on disk so retries go
+straight to enrichment.
+
+Features:
+- Keyed by (sha256 of the file bytes, extractor version, OCR flag), so
+  renamed/moved files hit and extractor changes invalidate old entries
+- Stores extracted text, document type and metadata as zlib-compressed JSON
+- Size cap with least-recently-used eviction (hits refresh the file mtime)
+- Atomic writes; corrupt or unreadable entries are treated as misses
+- Hit/miss counters (also exported as metrics)
+
+Performance:
+- A hit costs one sha256 pass over the file (~1-2 GB/s) plus a small read
+  and decompress, instead of seconds to minutes of parsing/OCR
+- Text compresses ~3-5x with zlib
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.models.schemas import DocumentType
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+EXTRACTION_CACHE_PATH = os.getenv("EXTRACTION_CACHE_PATH", "data/extraction_cache")
+EXTRACTION_CACHE_MAX_MB = float(os.getenv("EXTRACTION_CACHE_MAX_MB", "500"))
+
+_ENTRY_SUFFIX = ".json.z"
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: Path) -> str:
+    """sha256 hex digest of a file's bytes (read in 1MB blocks)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    On-disk cache of (text, document type, metadata) per file content
+
+    Thread-safe; one file per entry under ``path``.
+    """
+
+    def __init__(self, path: str = EXTRACTION_CACHE_PATH, max_bytes: int = int(EXTRACTION_CACHE_MAX_MB * 1024 * 1024)):
+        """
+        Initialize extraction cache
+
+        Args:
+            path: Cache directory
+            max_bytes: Total size of compressed entries before LRU eviction
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size_bytes = sum(entry.stat().st_size for entry in self.path.glob(f"*{_ENTRY_SUFFIX}"))
+
+        logger.info(f"🗃️ Extraction cache at {self.path} ({self._size_bytes / 1_000_000:.1f}MB)")
+
+    @staticmethod
+    def make_key(file_hash: str, extractor_version: str, process_ocr: bool) -> str:
+        """Cache key for a file's content, extractor version and OCR flag"""
+        return hashlib.sha256(f"{file_hash}:{extractor_version}:{int(process_ocr)}".encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Tuple[str, DocumentType, Dict[str, Any]]]:
+        """
+        Look up an extraction result
+
+        Returns:
+            (text, document_type, metadata), or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            payload = json.loads(zlib.decompress(entry_path.read_bytes()))
+            result = payload["text"], DocumentType(payload["document_type"]), payload["metadata"]
+            os.utime(entry_path)  # LRU: refresh mtime on hit
+        except FileNotFoundError:
+            self._record("miss")
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Dropping unreadable extraction cache entry {entry_path.name}: {e}")
+            self._remove(entry_path)
+            self._record("miss")
+            return None
+
+        self._record("hit")
+        return result
+
+    def set(self, key: str, text: str, document_type: DocumentType, metadata: Dict[str, Any]):
+        """Store an extraction result, evicting least recently used entries above the size cap"""
+        data = zlib.compress(json.dumps({
+            "text": text,
+            "document_type": document_type.value,
+            "metadata": metadata,
+            "created_at": time.time(),
+        }, default=str).encode("utf-8"))
+
+        if len(data) > self.max_bytes:
+            return
+
+        entry_path = self._entry_path(key)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            previous_size = entry_path.stat().st_size if entry_path.exists() else 0
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write extraction cache entry: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._size_bytes += len(data) - previous_size
+            over_cap = self._size_bytes > self.max_bytes
+        if over_cap:
+            self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache is below 90% of the cap"""
+        entries = []
+        for entry_path in self.path.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        removed = 0
+        for _, size, entry_path in entries:
+            if total <= target:
+                break
+            if self._remove(entry_path):
+                total -= size
+                removed += 1
+
+        with self._lock:
+            self._size_bytes = total
+        logger.info(f"🗃️ Evicted {removed} extraction cache entries ({total / 1_000_000:.1f}MB left)")
+
+    def _remove(self, entry_path: Path) -> bool:
+        try:
+            entry_path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _record(self, result: str):
+        with self._lock:
+            if result == "hit":
+                self.hits += 1
+            else:
+                self.misses += 1
+        from src.services.monitoring_service import get_monitoring_service
+        get_monitoring_service().metrics.increment_counter(
+            "extraction_cache_requests_total", labels={"result": result}
+        )
+
+    def clear(self):
+        """Delete all entries"""
+        for entry_path in self.path.glob(f"*{_ENTRY_SUFFIX}"):
+            self._remove(entry_path)
+        with self._lock:
+            self._size_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size_mb": round(self._size_bytes / 1_000_000, 2),
+                "max_size_mb": round(self.max_bytes / 1_000_000, 2),
+            }
+
+
+# Singleton instance
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """
+    Get the process-wide extraction cache
+
+    Returns:
+        ExtractionCache, or None when EXTRACTION_CACHE_ENABLED=false
+    """
+    global _extraction_cache
+    if not EXTRACTION_CACHE_ENABLED:
+        return None
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = ExtractionCache()
+    return _extraction_cache
@@ -7,17 +7,28 @@ Implements:
 - Score normalization and weighted fusion
 - MMR (Maximal Marginal Relevance) for diversity
 - Integration with cross-encoder reranking
+- Cross-worker index: with a shared state store, indexed chunks go to an
+  append-only stream that every worker replays before searching
+- Batched BM25 (bm25_search_many): distinct terms across a batch of queries
+  are scored once and combined with one matrix product
+- Filter-aware BM25: metadata filters are resolved with per-value bitmaps
+  (MetadataBitmapIndex) and only matching chunks are scored, so keyword hits
+  outside the filter no longer take top-k slots after fusion
 
 Blueprint compliance: HIGH priority feature for 10-20% improvement
 """
 
 import logging
+import threading
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from rank_bm25 import BM25Okapi
 from collections import defaultdict
 import re
 
+from src.services.metadata_bitmap_index import MetadataBitmapIndex
+from src.services.shared_state_service import SharedStateStore, get_shared_state
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,11 +41,15 @@ class HybridSearchService:
     Hybrid: Best of both worlds!
     """
 
+    # Shared state stream holding every add_documents() call
+    INDEX_STREAM = "bm25_index"
+
     def __init__(
         self,
         bm25_weight: float = 0.4,
         dense_weight: float = 0.6,
-        mmr_lambda: float = 0.7
+        mmr_lambda: float = 0.7,
+        shared_state: Optional[SharedStateStore] = None
     ):
         """
         Initialize hybrid search service
@@ -43,6 +58,8 @@ class HybridSearchService:
             bm25_weight: Weight for BM25 scores (default 0.4, tuned for better keyword matching)
             dense_weight: Weight for dense scores (default 0.6)
             mmr_lambda: MMR diversity parameter (0=max diversity, 1=max relevance)
+            shared_state: Cross-worker store; documents indexed by any worker become
+                          searchable on all of them (None = this process only)
         """
         self.bm25_weight = bm25_weight
         self.dense_weight = dense_weight
@@ -52,6 +69,13 @@ class HybridSearchService:
         self.bm25_index = None
         self.indexed_documents = []  # List of {chunk_id, content, metadata}
         self.tokenized_corpus = []   # Tokenized documents for BM25
+        self.metadata_index = MetadataBitmapIndex()  # Filter bitmaps over indexed_documents
+
+        # Position in the shared index stream (replayed incrementally)
+        self.shared_state = shared_state
+        self._stream_seq = 0
+        self._stream_generation = 0
+        self._sync_lock = threading.Lock()
 
         logger.info(f"🔀 Hybrid Search initialized (BM25: {bm25_weight}, Dense: {dense_weight}, MMR λ: {mmr_lambda})")
 
@@ -88,33 +112,69 @@ class HybridSearchService:
         if not chunks:
             return 0
 
-        start_idx = len(self.indexed_documents)
+        if self.shared_state is not None:
+            # Other workers pick the chunks up on their next search
+            self.shared_state.append(
+                self.INDEX_STREAM, {"doc_id": doc_id, "chunks": chunks, "metadata": metadata}
+            )
+            self._sync_shared_index()
+        else:
+            self._index_chunks(doc_id, chunks, metadata)
+            # Rebuild BM25 index (fast even for 10k+ docs)
+            self.bm25_index = BM25Okapi(self.tokenized_corpus)
+
+        logger.info(f"📚 Added {len(chunks)} chunks to BM25 index (total: {len(self.indexed_documents)} chunks)")
+        return len(chunks)
 
-        # Add each chunk to index
+    def _index_chunks(self, doc_id: str, chunks: List[str], metadata: Dict[str, Any]):
+        """Append chunks to the corpus (caller rebuilds the BM25 index)"""
         for i, chunk in enumerate(chunks):
             chunk_id = f"{doc_id}_chunk_{i}"
 
             # Store document data
+            chunk_metadata = {**metadata, "chunk_index": i, "doc_id": doc_id}
             self.indexed_documents.append({
                 "chunk_id": chunk_id,
                 "content": chunk,
-                "metadata": {**metadata, "chunk_index": i, "doc_id": doc_id}
+                "metadata": chunk_metadata
             })
+            self.metadata_index.add(chunk_metadata)
 
             # Tokenize for BM25
             tokens = self._tokenize(chunk)
             self.tokenized_corpus.append(tokens)
 
-        # Rebuild BM25 index (fast even for 10k+ docs)
-        self.bm25_index = BM25Okapi(self.tokenized_corpus)
-
-        logger.info(f"📚 Added {len(chunks)} chunks to BM25 index (total: {len(self.indexed_documents)} chunks)")
-        return len(chunks)
+    def _sync_shared_index(self):
+        """Replay index stream entries added (by any worker) since the last sync"""
+        if self.shared_state is None:
+            return
+
+        with self._sync_lock:
+            generation = self.shared_state.stream_generation(self.INDEX_STREAM)
+            if generation != self._stream_generation:
+                # Another worker cleared the index
+                self.bm25_index = None
+                self.indexed_documents = []
+                self.tokenized_corpus = []
+                self.metadata_index.clear()
+                self._stream_seq = 0
+                self._stream_generation = generation
+
+            entries = self.shared_state.read(self.INDEX_STREAM, after_seq=self._stream_seq)
+            if not entries:
+                return
+
+            for seq, entry in entries:
+                self._index_chunks(entry["doc_id"], entry["chunks"], entry["metadata"])
+                self._stream_seq = seq
+            self.bm25_index = BM25Okapi(self.tokenized_corpus)
+            logger.debug(f"🔄 Replayed {len(entries)} shared index entries (total: {len(self.indexed_documents)} chunks)")
 
     def bm25_search(
         self,
         query: str,
-        top_k: int = 20
+        top_k: int = 20,
+        filter: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         BM25 keyword search
@@ -122,37 +182,99 @@ class HybridSearchService:
         Args:
             query: Search query
             top_k: Number of results to return
+            filter: ChromaDB-style metadata filter; only matching chunks are scored
 
         Returns:
             List of results with BM25 scores
         """
-        if not self.bm25_index or not self.indexed_documents:
-            logger.warning("⚠️ BM25 index is empty")
-            return []
+        results = self.bm25_search_many([query], top_k=top_k, filter=filter)[0]
+        logger.info(f"🔍 BM25 search for '{query[:50]}...' returned {len(results)} results")
+        return results
 
-        # Tokenize query
-        query_tokens = self._tokenize(query)
+    def bm25_search_many(
+        self,
+        queries: List[str],
+        top_k: int = 20,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        BM25 keyword search for several queries in one vectorized pass
 
-        # Get BM25 scores for all documents
-        scores = self.bm25_index.get_scores(query_tokens)
+        BM25 is a sum of per-term scores, so each distinct term across all
+        queries is scored against the corpus once and the (queries x corpus)
+        score matrix is a single matrix product of query term counts with
+        those term score vectors.
 
-        # Get top K indices
-        top_indices = np.argsort(scores)[::-1][:top_k]
+        With a filter, the matching chunks are looked up in the metadata
+        bitmaps first and only those are scored.
 
-        # Format results
-        results = []
-        for idx in top_indices:
-            if scores[idx] > 0:  # Only include non-zero scores
-                doc = self.indexed_documents[idx]
-                results.append({
-                    "chunk_id": doc["chunk_id"],
-                    "content": doc["content"],
-                    "metadata": doc["metadata"],
-                    "bm25_score": float(scores[idx])
-                })
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+            filter: ChromaDB-style metadata filter (optional)
 
-        logger.info(f"🔍 BM25 search for '{query[:50]}...' returned {len(results)} results")
-        return results
+        Returns:
+            One result list (with BM25 scores) per query, in input order
+        """
+        self._sync_shared_index()
+
+        if not self.bm25_index or not self.indexed_documents:
+            logger.warning("⚠️ BM25 index is empty")
+            return [[] for _ in queries]
+
+        # Query x term count matrix (repeated query terms count repeatedly, as in BM25Okapi)
+        tokenized_queries = [self._tokenize(query) for query in queries]
+        vocabulary = {token: i for i, token in enumerate(dict.fromkeys(t for tokens in tokenized_queries for t in tokens))}
+        if not vocabulary:
+            return [[] for _ in queries]
+        term_counts = np.zeros((len(queries), len(vocabulary)))
+        for row, tokens in enumerate(tokenized_queries):
+            for token in tokens:
+                term_counts[row, vocabulary[token]] += 1
+
+        # Chunks passing the filter (None = all)
+        mask = self.metadata_index.filter_mask(filter)
+        candidates = None if mask is None else np.flatnonzero(mask)
+        if candidates is not None and len(candidates) == 0:
+            return [[] for _ in queries]
+
+        # Per-term BM25 score vectors, each computed once
+        if candidates is None:
+            term_scores = np.vstack([self.bm25_index.get_scores([token]) for token in vocabulary])
+        else:
+            doc_len = np.asarray(self.bm25_index.doc_len, dtype=float)[candidates]
+            term_scores = np.vstack([self._term_scores(token, candidates, doc_len) for token in vocabulary])
+        scores = term_counts @ term_scores
+
+        all_results = []
+        for row in scores:
+            # Get top K indices
+            top_indices = np.argsort(row)[::-1][:top_k]
+
+            # Format results
+            results = []
+            for idx in top_indices:
+                if row[idx] > 0:  # Only include non-zero scores
+                    doc = self.indexed_documents[idx if candidates is None else candidates[idx]]
+                    results.append({
+                        "chunk_id": doc["chunk_id"],
+                        "content": doc["content"],
+                        "metadata": doc["metadata"],
+                        "bm25_score": float(row[idx])
+                    })
+            all_results.append(results)
+
+        return all_results
+
+    def _term_scores(self, token: str, positions: np.ndarray, doc_len: np.ndarray) -> np.ndarray:
+        """BM25Okapi score of one term for the chunks at ``positions``"""
+        bm25 = self.bm25_index
+        idf = bm25.idf.get(token) or 0
+        if not idf:
+            return np.zeros(len(positions))
+        doc_freqs = bm25.doc_freqs
+        q_freq = np.fromiter((doc_freqs[i].get(token, 0) for i in positions), dtype=float, count=len(positions))
+        return idf * (q_freq * (bm25.k1 + 1) / (q_freq + bm25.k1 * (1 - bm25.b + bm25.b * doc_len / bm25.avgdl)))
 
     def normalize_scores(
         self,
@@ -339,7 +461,8 @@ class HybridSearchService:
         query: str,
         dense_results: List[Dict[str, Any]],
         top_k: int = 10,
-        apply_mmr: bool = True
+        apply_mmr: bool = True,
+        filter: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Complete hybrid search pipeline
@@ -354,12 +477,14 @@ class HybridSearchService:
             dense_results: Results from dense vector search
             top_k: Number of results to return
             apply_mmr: Whether to apply MMR for diversity
+            filter: Metadata filter the dense results were retrieved with
+                    (applied to BM25 so both sides cover the same chunks)
 
         Returns:
             Hybrid search results
         """
         # Get BM25 results (fetch more for better fusion)
-        bm25_results = self.bm25_search(query, top_k=top_k * 3)
+        bm25_results = self.bm25_search(query, top_k=top_k * 3, filter=filter)
 
         # Fuse BM25 + dense
         fused_results = self.fuse_results(
@@ -376,22 +501,66 @@ class HybridSearchService:
 
         return final_results
 
+    def hybrid_search_many(
+        self,
+        queries: List[str],
+        dense_results_list: List[List[Dict[str, Any]]],
+        top_k: int = 10,
+        apply_mmr: bool = True,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Hybrid search pipeline for several queries
+
+        BM25 runs once for all queries (bm25_search_many); fusion and MMR
+        then run per query.
+
+        Args:
+            queries: Search queries
+            dense_results_list: Dense results per query, in the same order
+            top_k: Number of results per query
+            apply_mmr: Whether to apply MMR for diversity
+            filter: Metadata filter the dense results were retrieved with
+
+        Returns:
+            Hybrid search results per query, in input order
+        """
+        bm25_results_list = self.bm25_search_many(queries, top_k=top_k * 3, filter=filter)
+
+        final_results_list = []
+        for query, bm25_results, dense_results in zip(queries, bm25_results_list, dense_results_list):
+            fused_results = self.fuse_results(bm25_results, dense_results, top_k=top_k * 2)
+            if apply_mmr and len(fused_results) > top_k:
+                final_results_list.append(self.apply_mmr(query, fused_results, top_k=top_k))
+            else:
+                final_results_list.append(fused_results[:top_k])
+
+        return final_results_list
+
     def get_stats(self) -> Dict[str, Any]:
         """Get BM25 index statistics"""
+        self._sync_shared_index()
         return {
             "total_documents": len(self.indexed_documents),
             "total_tokens": sum(len(tokens) for tokens in self.tokenized_corpus),
             "avg_doc_length": np.mean([len(tokens) for tokens in self.tokenized_corpus]) if self.tokenized_corpus else 0,
             "bm25_weight": self.bm25_weight,
             "dense_weight": self.dense_weight,
-            "mmr_lambda": self.mmr_lambda
+            "mmr_lambda": self.mmr_lambda,
+            "shared": self.shared_state is not None,
+            "metadata_bitmaps": self.metadata_index.get_stats()
         }
 
     def clear_index(self):
-        """Clear BM25 index (useful for testing)"""
+        """Clear BM25 index (useful for testing; clears it for all workers when shared)"""
+        if self.shared_state is not None:
+            with self._sync_lock:
+                self._stream_generation = self.shared_state.reset_stream(self.INDEX_STREAM)
+                self._stream_seq = 0
         self.bm25_index = None
         self.indexed_documents = []
         self.tokenized_corpus = []
+        self.metadata_index.clear()
         logger.info("🗑️ BM25 index cleared")
 
 
@@ -410,6 +579,7 @@ def get_hybrid_search_service(
         _hybrid_search_service = HybridSearchService(
             bm25_weight=bm25_weight,
             dense_weight=dense_weight,
-            mmr_lambda=mmr_lambda
+            mmr_lambda=mmr_lambda,
+            shared_state=get_shared_state()
         )
     return _hybrid_search_service
@@ -4,15 +4,73 @@ HyDE Service - Hypothetical Document Embeddings
 Improves retrieval by generating hypothetical answers and using them for search.
 Blueprint requirement: HyDE query rewrite for better retrieval.
 
+Features:
+- Hypothetical document variants generated concurrently (one LLM latency
+  instead of N)
+- Variants cached per (query, style, model, variant count), so repeated
+  questions cost no LLM call
+- All variants searched as one multi-query dense request
+- Reciprocal rank fusion (RRF) of the per-variant result lists
+
 Reference: https://arxiv.org/abs/2212.10496
 """
 
 import logging
-from typing import List, Dict, Optional
+import os
+from typing import Any, Awaitable, Callable, List, Dict, Optional
 import asyncio
 
+from src.services.search_cache_service import SearchResultCache
+
 logger = logging.getLogger(__name__)
 
+HYDE_CACHE_SIZE = int(os.getenv("HYDE_CACHE_SIZE", "1000"))
+HYDE_CACHE_TTL_S = int(os.getenv("HYDE_CACHE_TTL_S", "86400"))
+HYDE_RRF_K = int(os.getenv("HYDE_RRF_K", "60"))
+
+STYLE_PROMPTS = {
+    "informative": "You are writing clear, factual documentation.",
+    "technical": "You are writing technical documentation with precise details.",
+    "conversational": "You are writing in a natural, conversational tone.",
+    "email": "You are writing an email response.",
+    "report": "You are writing a formal report."
+}
+
+
+def _result_id(result: Dict[str, Any]) -> Optional[str]:
+    return result.get('chunk_id') or result.get('id') or result.get('doc_id')
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[List[Dict[str, Any]]],
+    k: int = HYDE_RRF_K
+) -> List[Dict[str, Any]]:
+    """
+    Fuse ranked result lists by reciprocal rank
+
+    Each result scores sum(1 / (k + rank)) over the lists it appears in, so
+    documents ranked well by several query variants rise to the top
+    regardless of how the lists' raw scores are scaled.
+
+    Args:
+        result_lists: One ranked result list per query variant
+        k: RRF damping constant (60 in the original paper)
+
+    Returns:
+        Unique results (first occurrence kept) sorted by ``rrf_score``, each
+        annotated with ``from_query_variants``
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for variant, results in enumerate(result_lists):
+        for rank, result in enumerate(results, start=1):
+            result_id = _result_id(result) or f"variant{variant}_rank{rank}"
+            entry = fused.get(result_id)
+            if entry is None:
+                entry = fused[result_id] = {**result, 'rrf_score': 0.0, 'from_query_variants': []}
+            entry['rrf_score'] += 1.0 / (k + rank)
+            entry['from_query_variants'].append(variant)
+    return sorted(fused.values(), key=lambda r: r['rrf_score'], reverse=True)
+
 
 class HyDEService:
     """
@@ -20,19 +78,23 @@ class HyDEService:
 
     Workflow:
     1. User asks question
-    2. LLM generates hypothetical answer(s)
-    3. Search using embeddings of hypothetical answer
-    4. Results are more relevant than searching the question directly
+    2. LLM generates hypothetical answer(s) (concurrently, cached)
+    3. Search using embeddings of the question and the hypothetical answers
+       (one multi-query request)
+    4. Fuse the result lists by reciprocal rank
     """
 
-    def __init__(self, llm_service):
+    def __init__(self, llm_service, model_id: Optional[str] = None):
         """
         Initialize HyDE service
 
         Args:
             llm_service: LLM service for generating hypothetical documents
+            model_id: Model for hypothetical documents (None = LLM service default)
         """
         self.llm_service = llm_service
+        self.model_id = model_id
+        self.cache = SearchResultCache(max_size=HYDE_CACHE_SIZE, ttl_seconds=HYDE_CACHE_TTL_S)
 
     async def generate_hypothetical_document(
         self,
@@ -43,6 +105,9 @@ class HyDEService:
         """
         Generate hypothetical documents that would answer the query
 
+        Variants are generated concurrently with slightly different
+        temperatures; results are cached per (query, style, model).
+
         Args:
             query: User's question or search query
             num_variants: Number of hypothetical documents to generate
@@ -51,18 +116,14 @@ class HyDEService:
         Returns:
             List of hypothetical document texts
         """
-        hypothetical_docs = []
+        cache_type = f"hyde:{document_style}:{self.model_id or 'default'}"
+        cached = self.cache.get(query, num_variants, search_type=cache_type)
+        if cached is not None:
+            logger.info(f"✅ HyDE cache hit for '{query[:50]}'")
+            return list(cached)
 
         # Generate system prompt based on style
-        style_prompts = {
-            "informative": "You are writing clear, factual documentation.",
-            "technical": "You are writing technical documentation with precise details.",
-            "conversational": "You are writing in a natural, conversational tone.",
-            "email": "You are writing an email response.",
-            "report": "You are writing a formal report."
-        }
-
-        system_prompt = style_prompts.get(document_style, style_prompts["informative"])
+        system_prompt = STYLE_PROMPTS.get(document_style, STYLE_PROMPTS["informative"])
 
         # Prompt for generating hypothetical document
         hyde_prompt = f"""Given this question: "{query}"
@@ -72,36 +133,40 @@ Write a short, direct answer (2-3 paragraphs) as if you found the perfect docume
 Do not say "the answer is..." or "based on...". Just write the document content directly.
 Be specific and factual. Include relevant details, names, dates, or numbers if appropriate for the question."""
 
-        try:
-            for i in range(num_variants):
-                # Generate hypothetical answer
-                response = await self.llm_service.generate_completion(
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": hyde_prompt}
-                    ],
-                    max_tokens=300,
-                    temperature=0.7 + (i * 0.1)  # Slight variation for multiple variants
-                )
-
-                hypothetical_doc = response.strip()
-
-                if hypothetical_doc:
-                    hypothetical_docs.append(hypothetical_doc)
-                    logger.info(f"Generated hypothetical document variant {i+1}: {len(hypothetical_doc)} chars")
-
-            return hypothetical_docs
-
-        except Exception as e:
-            logger.error(f"HyDE generation failed: {e}")
-            # Fallback: return original query
+        responses = await asyncio.gather(*(
+            self.llm_service.call_llm(
+                prompt=hyde_prompt,
+                model_id=self.model_id,
+                max_tokens=300,
+                temperature=0.7 + (i * 0.1),  # Slight variation for multiple variants
+                system_prompt=system_prompt
+            )
+            for i in range(num_variants)
+        ), return_exceptions=True)
+
+        hypothetical_docs = []
+        for i, response in enumerate(responses):
+            if isinstance(response, Exception):
+                logger.error(f"HyDE generation failed for variant {i+1}: {response}")
+                continue
+            hypothetical_doc = response[0].strip()
+            if hypothetical_doc:
+                hypothetical_docs.append(hypothetical_doc)
+                logger.info(f"Generated hypothetical document variant {i+1}: {len(hypothetical_doc)} chars")
+
+        if not hypothetical_docs:
+            # Fallback: return original query (not cached, so the next request retries)
             return [query]
 
+        self.cache.set(query, num_variants, hypothetical_docs, search_type=cache_type)
+        return hypothetical_docs
+
     async def expand_query_with_hyde(
         self,
         query: str,
         num_variants: int = 2,
-        include_original: bool = True
+        include_original: bool = True,
+        document_style: str = "informative"
     ) -> List[str]:
         """
         Expand query with hypothetical documents
@@ -110,6 +175,7 @@ Be specific and factual. Include relevant details, names, dates, or numbers if a
             query: Original user query
             num_variants: Number of HyDE variants to generate
             include_original: Whether to include original query in results
+            document_style: Style hint for the hypothetical documents
 
         Returns:
             List of queries to search with (original + hypothetical docs)
@@ -123,10 +189,13 @@ Be specific and factual. Include relevant details, names, dates, or numbers if a
         # Generate hypothetical documents
         hypothetical_docs = await self.generate_hypothetical_document(
             query=query,
-            num_variants=num_variants
+            num_variants=num_variants,
+            document_style=document_style
         )
 
-        queries.extend(hypothetical_docs)
+        # The fallback returns the query itself - don't search it twice
+        if not (include_original and hypothetical_docs == [query]):
+            queries.extend(hypothetical_docs)
 
         logger.info(f"Expanded query into {len(queries)} variants (original: {include_original})")
         return queries
@@ -155,34 +224,36 @@ Be specific and factual. Include relevant details, names, dates, or numbers if a
         all_results = []
         seen_ids = set()
 
-        # Search with each query
-        for idx, query in enumerate(queries):
-            try:
-                results = await search_function(query, top_k_per_query)
+        # Search with all queries concurrently; merge in query order
+        responses = await asyncio.gather(
+            *(search_function(query, top_k_per_query) for query in queries),
+            return_exceptions=True
+        )
 
-                # Add results with provenance
-                for result in results:
-                    doc_id = result.get('id', result.get('doc_id'))
+        for idx, results in enumerate(responses):
+            if isinstance(results, Exception):
+                logger.error(f"Search failed for query variant {idx}: {results}")
+                continue
 
-                    # Deduplicate if enabled
-                    if dedup_by_id and doc_id in seen_ids:
-                        continue
+            # Add results with provenance
+            for result in results:
+                doc_id = result.get('id', result.get('doc_id'))
 
-                    # Track seen IDs
-                    if doc_id:
-                        seen_ids.add(doc_id)
+                # Deduplicate if enabled
+                if dedup_by_id and doc_id in seen_ids:
+                    continue
 
-                    # Add query provenance
-                    result['from_query_variant'] = idx
-                    result['original_score'] = result.get('score', 0.0)
+                # Track seen IDs
+                if doc_id:
+                    seen_ids.add(doc_id)
 
-                    all_results.append(result)
+                # Add query provenance
+                result['from_query_variant'] = idx
+                result['original_score'] = result.get('score', 0.0)
 
-                logger.info(f"Query variant {idx}: {len(results)} results")
+                all_results.append(result)
 
-            except Exception as e:
-                logger.error(f"Search failed for query variant {idx}: {e}")
-                continue
+            logger.info(f"Query variant {idx}: {len(results)} results")
 
         # Re-rank by score and return top K
         all_results.sort(key=lambda x: x.get('original_score', 0.0), reverse=True)
@@ -191,24 +262,63 @@ Be specific and factual. Include relevant details, names, dates, or numbers if a
         logger.info(f"Multi-query search: {len(all_results)} total → {len(final_results)} final")
         return final_results
 
+    async def hyde_search(
+        self,
+        query: str,
+        search_many: Callable[[List[str], int], Awaitable[List[List[Dict]]]],
+        num_variants: int = 2,
+        top_k: int = 10,
+        top_k_per_query: Optional[int] = None,
+        include_original: bool = True,
+        document_style: str = "informative"
+    ) -> List[Dict]:
+        """
+        Expand a query with HyDE, search all variants at once and fuse by RRF
+
+        Args:
+            query: Original user query
+            search_many: Async function taking (queries, top_k) and returning
+                         one result list per query, in order - e.g.
+                         ``VectorService.dense_search_many`` (one embedding
+                         batch and one vector store request)
+            num_variants: Number of hypothetical documents
+            top_k: Final number of results
+            top_k_per_query: Candidates per query variant (default: top_k)
+            include_original: Also search with the original query
+            document_style: Style hint for the hypothetical documents
+
+        Returns:
+            Fused results sorted by ``rrf_score``
+        """
+        queries = await self.expand_query_with_hyde(
+            query,
+            num_variants=num_variants,
+            include_original=include_original,
+            document_style=document_style
+        )
+
+        result_lists = await search_many(queries, top_k_per_query or top_k)
+        fused = reciprocal_rank_fusion(result_lists)[:top_k]
+
+        logger.info(f"🔎 HyDE search: {len(queries)} queries in one request → {len(fused)} fused results")
+        return fused
+
 
 # Mock LLM service for testing
 class MockLLMService:
     """Mock LLM service for testing HyDE"""
 
-    async def generate_completion(self, messages, max_tokens=300, temperature=0.7):
-        # Extract query from messages
-        user_msg = next((m['content'] for m in messages if m['role'] == 'user'), '')
-
+    async def call_llm(self, prompt, model_id=None, max_tokens=300, temperature=0.7, system_prompt=None):
         # Simple mock response
-        if 'kita' in user_msg.lower() or 'handover' in user_msg.lower():
-            return """The kita handover schedule has been updated for autumn break.
+        if 'kita' in prompt.lower() or 'handover' in prompt.lower():
+            text = """The kita handover schedule has been updated for autumn break.
 Parents should pick up children at the new times starting October 15th.
 Late pickups on October 2nd have been approved by the administration."""
         else:
-            return """This document provides comprehensive information about the topic.
+            text = """This document provides comprehensive information about the topic.
 It includes relevant details, context, and answers to common questions.
 The information is current and factually accurate."""
+        return text, 0.0, model_id or "mock"
 
 
 # Test
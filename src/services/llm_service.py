@@ -4,24 +4,43 @@ LLM (Large Language Model) service - LiteLLM Integration
 Unified LLM interface using LiteLLM for provider management,
 with preserved cost tracking and budget enforcement.
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Awaitable, Callable, List, Tuple
 from datetime import datetime
 import os
-
-# LiteLLM unified interface
-import litellm
+import time
 
 from src.core.config import Settings
 from src.models.schemas import LLMProvider, CostInfo, CostStats
+from src.services.monitoring_service import get_monitoring_service
+from src.services.shared_state_service import SharedStateStore, get_shared_state
+from src.core.tracing import trace_span
+from src.core.circuit_breaker import CircuitBreakerRegistry
+from src.core.startup_profiler import lazy_import
 
 logger = logging.getLogger(__name__)
 
-# Suppress LiteLLM verbose logging
-litellm.suppress_debug_info = True
+# LiteLLM unified interface (~2.5s to import - deferred to the first LLM call)
+# Suppress LiteLLM verbose logging once it is loaded
+litellm = lazy_import("litellm", on_load=lambda module: setattr(module, "suppress_debug_info", True))
+
+# Request hedging: if the current provider has not answered after its recent
+# p95 latency, start the next provider too and keep whichever answers first.
+# Off by default - a hedged request can be billed by both providers.
+LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true"
+LLM_HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+LLM_HEDGE_MIN_DELAY_MS = float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "500"))
+LLM_HEDGE_DEFAULT_DELAY_MS = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_MS", "5000"))
+
+# Prompt caching: a stable system prompt is sent as its own message so providers
+# can reuse the processed prefix. OpenAI, Groq, Gemini and DeepSeek cache repeated
+# prefixes automatically; Anthropic needs an explicit cache_control breakpoint.
+LLM_PROMPT_CACHING = os.getenv("LLM_PROMPT_CACHING", "true").lower() == "true"
+EXPLICIT_CACHE_PROVIDERS = {"anthropic"}
 
 
-# Model pricing (per 1M tokens)
+# Model pricing (per 1M tokens); "cached_input" = price of prompt-cache hits
 # Last updated: 2025-10-12 (v3.0 migration)
 # Next review: 2025-11-01 (monthly - 1st of each month)
 # Review script: python scripts/check_model_pricing.py
@@ -32,14 +51,14 @@ MODEL_PRICING = {
     "groq/llama-3.1-70b-versatile": {"input": 0.59, "output": 0.79},
 
     # Anthropic - High quality reasoning
-    "anthropic/claude-3-haiku-20240307": {"input": 0.25, "output": 1.25},
-    "anthropic/claude-3-5-sonnet-20241022": {"input": 3.0, "output": 15.0},
-    "anthropic/claude-3-5-sonnet-latest": {"input": 3.0, "output": 15.0},  # Same as 20241022
-    "anthropic/claude-3-opus-20240229": {"input": 15.0, "output": 75.0},
+    "anthropic/claude-3-haiku-20240307": {"input": 0.25, "output": 1.25, "cached_input": 0.03},
+    "anthropic/claude-3-5-sonnet-20241022": {"input": 3.0, "output": 15.0, "cached_input": 0.30},
+    "anthropic/claude-3-5-sonnet-latest": {"input": 3.0, "output": 15.0, "cached_input": 0.30},  # Same as 20241022
+    "anthropic/claude-3-opus-20240229": {"input": 15.0, "output": 75.0, "cached_input": 1.50},
 
     # OpenAI - Reliable general purpose
-    "openai/gpt-4o-mini": {"input": 0.15, "output": 0.60},
-    "openai/gpt-4o": {"input": 5.0, "output": 15.0},
+    "openai/gpt-4o-mini": {"input": 0.15, "output": 0.60, "cached_input": 0.075},
+    "openai/gpt-4o": {"input": 5.0, "output": 15.0, "cached_input": 2.50},
     "openai/gpt-4-turbo": {"input": 10.0, "output": 30.0},
 
     # Google - Long context specialist
@@ -53,20 +72,29 @@ class CostTracker:
     """
     Tracks LLM API costs and enforces budget limits
 
-    Maintains in-memory storage of operations and costs
+    Maintains in-memory storage of operations and costs. With a shared state
+    store the daily/total/per-provider spend is also kept there, so every
+    worker enforces one budget instead of each spending the full amount.
     """
 
-    def __init__(self, daily_budget: float = 10.0):
+    def __init__(self, daily_budget: float = 10.0, shared_state: Optional[SharedStateStore] = None):
         """
         Initialize cost tracker
 
         Args:
             daily_budget: Daily budget limit in USD
+            shared_state: Cross-worker store for budget totals (None = this process only)
         """
         self.operations: List[CostInfo] = []
         self.daily_totals: Dict[str, float] = {}
         self.total_cost: float = 0.0
         self.daily_budget = daily_budget
+        self.shared_state = shared_state
+
+    def _today_cost(self, today: str) -> float:
+        if self.shared_state is not None:
+            return self.shared_state.get_counter(f"cost:daily:{today}")
+        return self.daily_totals.get(today, 0.0)
 
     def estimate_tokens(self, text: str) -> int:
         """
@@ -80,14 +108,21 @@ class CostTracker:
         """
         return max(1, len(text) // 4)
 
-    def calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+    def calculate_cost(
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cached_input_tokens: int = 0
+    ) -> float:
         """
         Calculate cost based on model pricing
 
         Args:
             model: Model ID (e.g., "groq/llama-3.1-8b-instant")
-            input_tokens: Number of input tokens
+            input_tokens: Number of input tokens (including cached ones)
             output_tokens: Number of output tokens
+            cached_input_tokens: Input tokens served from the provider's prompt cache
 
         Returns:
             Cost in USD
@@ -97,7 +132,9 @@ class CostTracker:
             return 0.0
 
         pricing = MODEL_PRICING[model]
-        input_cost = (input_tokens / 1_000_000) * pricing["input"]
+        cached_input_tokens = min(cached_input_tokens, input_tokens)
+        input_cost = ((input_tokens - cached_input_tokens) / 1_000_000) * pricing["input"]
+        input_cost += (cached_input_tokens / 1_000_000) * pricing.get("cached_input", pricing["input"])
         output_cost = (output_tokens / 1_000_000) * pricing["output"]
 
         return input_cost + output_cost
@@ -110,7 +147,7 @@ class CostTracker:
             True if budget available, False if limit reached
         """
         today = datetime.now().strftime("%Y-%m-%d")
-        today_cost = self.daily_totals.get(today, 0.0)
+        today_cost = self._today_cost(today)
         return today_cost < self.daily_budget
 
     def record_operation(
@@ -119,7 +156,8 @@ class CostTracker:
         model: str,
         input_tokens: int,
         output_tokens: int,
-        cost: float
+        cost: float,
+        cached_input_tokens: int = 0
     ):
         """
         Record an API operation and its cost
@@ -127,9 +165,10 @@ class CostTracker:
         Args:
             provider: LLM provider name
             model: Model ID
-            input_tokens: Input token count
+            input_tokens: Input token count (including cached ones)
             output_tokens: Output token count
             cost: Cost in USD
+            cached_input_tokens: Input tokens served from the prompt cache
         """
         today = datetime.now().strftime("%Y-%m-%d")
 
@@ -138,6 +177,7 @@ class CostTracker:
             model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
+            cached_input_tokens=cached_input_tokens,
             cost_usd=cost,
             timestamp=datetime.now()
         )
@@ -146,7 +186,16 @@ class CostTracker:
         self.daily_totals[today] = self.daily_totals.get(today, 0.0) + cost
         self.total_cost += cost
 
-        logger.info(f"Recorded ${cost:.6f} cost for {provider}/{model}")
+        if self.shared_state is not None:
+            self.shared_state.incr(f"cost:daily:{today}", cost)
+            self.shared_state.incr("cost:total", cost)
+            self.shared_state.incr(f"cost:provider:{today}:{provider}", cost)
+            self.shared_state.incr(f"cost:operations:{today}")
+            self.shared_state.incr(f"tokens:input:{today}", input_tokens)
+            self.shared_state.incr(f"tokens:cached_input:{today}", cached_input_tokens)
+
+        cache_note = f" ({cached_input_tokens}/{input_tokens} input tokens cached)" if cached_input_tokens else ""
+        logger.info(f"Recorded ${cost:.6f} cost for {provider}/{model}{cache_note}")
 
     def get_stats(self) -> CostStats:
         """
@@ -160,26 +209,43 @@ class CostTracker:
 
         cost_by_provider: Dict[str, float] = {}
         operations_today = 0
+        input_tokens_today = 0
+        cached_input_tokens_today = 0
         most_expensive: Optional[CostInfo] = None
         max_cost = 0.0
 
         for op in self.operations:
             if op.timestamp.strftime("%Y-%m-%d") == today:
                 operations_today += 1
+                input_tokens_today += op.input_tokens
+                cached_input_tokens_today += op.cached_input_tokens
                 cost_by_provider[op.provider] = cost_by_provider.get(op.provider, 0.0) + op.cost_usd
 
                 if op.cost_usd > max_cost:
                     max_cost = op.cost_usd
                     most_expensive = op
 
+        total_cost = self.total_cost
+        if self.shared_state is not None:
+            # Totals across all workers; most_expensive_operation stays per-worker
+            today_cost = self._today_cost(today)
+            total_cost = self.shared_state.get_counter("cost:total")
+            cost_by_provider = self.shared_state.get_counters(f"cost:provider:{today}:")
+            operations_today = int(self.shared_state.get_counter(f"cost:operations:{today}"))
+            input_tokens_today = int(self.shared_state.get_counter(f"tokens:input:{today}"))
+            cached_input_tokens_today = int(self.shared_state.get_counter(f"tokens:cached_input:{today}"))
+
         return CostStats(
             total_cost_today=today_cost,
-            total_cost_all_time=self.total_cost,
+            total_cost_all_time=total_cost,
             daily_budget=self.daily_budget,
             budget_remaining=max(0.0, self.daily_budget - today_cost),
             operations_today=operations_today,
             most_expensive_operation=most_expensive,
-            cost_by_provider=cost_by_provider
+            cost_by_provider=cost_by_provider,
+            cached_input_tokens_today=cached_input_tokens_today,
+            uncached_input_tokens_today=input_tokens_today - cached_input_tokens_today,
+            prompt_cache_hit_rate=cached_input_tokens_today / input_tokens_today if input_tokens_today else 0.0
         )
 
 
@@ -198,7 +264,7 @@ class LLMService:
             settings: Application settings with API keys
         """
         self.settings = settings
-        self.cost_tracker = CostTracker(daily_budget=settings.daily_budget_usd)
+        self.cost_tracker = CostTracker(daily_budget=settings.daily_budget_usd, shared_state=get_shared_state())
 
         # Configure LiteLLM with environment variables
         self._configure_litellm()
@@ -216,6 +282,10 @@ class LLMService:
         # Provider-to-model mapping for fallbacks
         self.fallback_models = self._build_fallback_models()
 
+        # Recent error/latency stats per model: skip failing providers, derive hedge delays
+        self.circuit_breakers = CircuitBreakerRegistry()
+        self.hedging_enabled = LLM_HEDGING_ENABLED
+
         logger.info(f"✅ LiteLLM service initialized with providers: {self.available_providers}")
 
     def _configure_litellm(self):
@@ -257,7 +327,8 @@ class LLMService:
         prompt: str,
         model_id: Optional[str] = None,
         max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        system_prompt: Optional[str] = None
     ) -> Tuple[str, float, str]:
         """
         Call LLM via LiteLLM with automatic fallback
@@ -267,6 +338,7 @@ class LLMService:
             model_id: Specific model to use (optional, uses default if None)
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
+            system_prompt: Static instructions sent as a separate (cacheable) system message
 
         Returns:
             Tuple of (response_text, cost_usd, model_used)
@@ -295,36 +367,152 @@ class LLMService:
         if not models_to_try:
             raise Exception("No LLM providers available")
 
-        # Try models in order (LiteLLM handles fallback automatically)
-        for attempt_model in models_to_try:
-            try:
-                result, cost = await self._call_with_litellm(
-                    prompt=prompt,
-                    model_id=attempt_model,
-                    max_tokens=max_tokens,
-                    temperature=temperature
-                )
-                return result, cost, attempt_model
+        # Try models in order, skipping open circuits (hedged if enabled)
+        return await self._call_with_fallback(
+            models_to_try,
+            "call_llm",
+            lambda attempt_model: self._call_with_litellm(
+                prompt=prompt,
+                model_id=attempt_model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system_prompt=system_prompt
+            )
+        )
 
-            except Exception as e:
-                provider = attempt_model.split('/')[0] if '/' in attempt_model else "unknown"
-                logger.warning(f"LLM call failed for {attempt_model}: {e}")
+    async def _call_with_fallback(
+        self,
+        models_to_try: List[str],
+        method: str,
+        call: Callable[[str], Awaitable[Tuple[Any, float]]]
+    ) -> Tuple[Any, float, str]:
+        """
+        Run ``call`` against the fallback chain
 
-                # If this was the last model, raise the exception
-                if attempt_model == models_to_try[-1]:
-                    raise Exception(f"All LLM providers failed. Last error: {e}")
+        Models whose circuit is open are skipped (unless every model is open).
+        Without hedging the models are tried one after another. With hedging,
+        when the running attempt exceeds its model's recent p95 latency, the
+        next model is started as well; the first success wins and the other
+        attempts are cancelled.
 
-                # Otherwise continue to next model
-                continue
+        Args:
+            models_to_try: Models in fallback order
+            method: "call_llm" or "call_llm_structured" (spans, metrics, logs)
+            call: Coroutine factory returning (response, cost) for a model
 
-        raise Exception("All LLM providers failed")
+        Returns:
+            Tuple of (response, cost_usd, model_used)
+
+        Raises:
+            Exception: If all models fail
+        """
+        candidates = [m for m in models_to_try if self.circuit_breakers.allow_request(m)]
+        skipped = [m for m in models_to_try if m not in candidates]
+        for model in skipped:
+            provider = model.split('/')[0] if '/' in model else "unknown"
+            logger.warning(f"⚡ Circuit open for {model}, skipping")
+            get_monitoring_service().metrics.increment_counter(
+                "llm_requests_skipped_total", labels={"provider": provider, "reason": "circuit_open"}
+            )
+        if not candidates:
+            # Every circuit is open: a degraded provider beats failing outright
+            candidates = list(models_to_try)
+
+        pending: Dict[asyncio.Task, str] = {}
+        next_index = 0
+        last_error: Optional[Exception] = None
+
+        def launch():
+            nonlocal next_index
+            model = candidates[next_index]
+            next_index += 1
+            task = asyncio.create_task(self._attempt(model, method, call))
+            pending[task] = model
+            return model
+
+        current_model = launch()
+        try:
+            while pending:
+                timeout = None
+                if self.hedging_enabled and next_index < len(candidates):
+                    timeout = self._hedge_delay_ms(current_model) / 1000
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # Hedge: current attempt is slower than usual, start the next provider too
+                    hedge_model = launch()
+                    logger.info(f"🏃 Hedging {method}: {current_model} slow, also trying {hedge_model}")
+                    get_monitoring_service().metrics.increment_counter(
+                        "llm_hedged_requests_total", labels={"method": method}
+                    )
+                    current_model = hedge_model
+                    continue
+
+                for task in done:
+                    model = pending.pop(task)
+                    try:
+                        response, cost = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    return response, cost, model
+
+                if not pending:
+                    if next_index >= len(candidates):
+                        break
+                    current_model = launch()
+        finally:
+            for task, model in pending.items():
+                task.cancel()
+                self.circuit_breakers.get(model).release()
+            for model in candidates[next_index:]:
+                # Never attempted: return any half-open probe slot reserved above
+                self.circuit_breakers.get(model).release()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise Exception(f"All LLM providers failed. Last error: {last_error}")
+
+    async def _attempt(
+        self,
+        model_id: str,
+        method: str,
+        call: Callable[[str], Awaitable[Tuple[Any, float]]]
+    ) -> Tuple[Any, float]:
+        """One provider attempt with span, metrics and circuit breaker bookkeeping"""
+        breaker = self.circuit_breakers.get(model_id)
+        start_time = time.perf_counter()
+        try:
+            with trace_span(f"llm.{method}", kind="llm", model=model_id):
+                result = await call(model_id)
+        except asyncio.CancelledError:
+            # Lost a hedge race - not the provider's fault
+            raise
+        except Exception as e:
+            self._record_call_metrics(model_id, method, start_time, success=False)
+            breaker.record_failure((time.perf_counter() - start_time) * 1000)
+            label = "LLM call" if method == "call_llm" else "Structured LLM call"
+            logger.warning(f"{label} failed for {model_id}: {e}")
+            raise
+        self._record_call_metrics(model_id, method, start_time, success=True)
+        breaker.record_success((time.perf_counter() - start_time) * 1000)
+        return result
+
+    def _hedge_delay_ms(self, model_id: str) -> float:
+        """Recent p95 latency of the model (default until it has successful calls)"""
+        latency = self.circuit_breakers.get(model_id).latency_quantile(LLM_HEDGE_QUANTILE)
+        if latency is None:
+            return LLM_HEDGE_DEFAULT_DELAY_MS
+        return max(LLM_HEDGE_MIN_DELAY_MS, latency)
 
     async def _call_with_litellm(
         self,
         prompt: str,
         model_id: str,
         max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        system_prompt: Optional[str] = None
     ) -> Tuple[str, float]:
         """
         Call LiteLLM and return response with cost tracking
@@ -334,6 +522,7 @@ class LLMService:
             model_id: Model ID to use (LiteLLM format: "provider/model")
             max_tokens: Maximum tokens
             temperature: Sampling temperature
+            system_prompt: Static instructions sent as a separate (cacheable) system message
 
         Returns:
             Tuple of (response_text, cost_usd)
@@ -341,9 +530,6 @@ class LLMService:
         Raises:
             Exception: If LiteLLM call fails
         """
-        # Estimate input tokens for cost tracking
-        input_tokens = self.cost_tracker.estimate_tokens(prompt)
-
         # Set default parameters
         tokens = max_tokens or 4000
         temp = temperature if temperature is not None else self.settings.llm_temperature
@@ -352,7 +538,7 @@ class LLMService:
             # Call LiteLLM (async)
             response = await litellm.acompletion(
                 model=model_id,
-                messages=[{"role": "user", "content": prompt}],
+                messages=self._build_messages(prompt, model_id, system_prompt),
                 max_tokens=tokens,
                 temperature=temp,
                 timeout=30
@@ -361,23 +547,7 @@ class LLMService:
             # Extract response text
             result = response.choices[0].message.content
 
-            # Estimate output tokens
-            output_tokens = self.cost_tracker.estimate_tokens(result)
-
-            # Calculate cost
-            cost = self.cost_tracker.calculate_cost(model_id, input_tokens, output_tokens)
-
-            # Record operation
-            if self.settings.enable_cost_tracking:
-                provider = model_id.split('/')[0] if '/' in model_id else "unknown"
-                self.cost_tracker.record_operation(
-                    provider=provider,
-                    model=model_id,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost=cost
-                )
-
+            cost = self._record_usage(model_id, response, (system_prompt or "") + prompt, result)
             return result, cost
 
         except Exception as e:
@@ -390,7 +560,8 @@ class LLMService:
         response_model: Any,
         model_id: Optional[str] = None,
         max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        system_prompt: Optional[str] = None
     ) -> Tuple[Any, float, str]:
         """
         Call LLM with Instructor for type-safe structured outputs
@@ -401,6 +572,7 @@ class LLMService:
             model_id: Specific model to use (optional)
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
+            system_prompt: Static instructions sent as a separate (cacheable) system message
 
         Returns:
             Tuple of (structured_response, cost_usd, model_used)
@@ -408,9 +580,6 @@ class LLMService:
         Raises:
             Exception: If all providers fail or budget exceeded
         """
-        import instructor
-        from pydantic import BaseModel
-
         # Check budget
         if self.settings.enable_cost_tracking and not self.cost_tracker.check_budget():
             raise Exception(f"Daily budget limit (${self.settings.daily_budget_usd}) reached")
@@ -428,59 +597,142 @@ class LLMService:
         if not models_to_try:
             raise Exception("No LLM providers available")
 
-        # Try models in order
-        for attempt_model in models_to_try:
-            try:
-                # Estimate input tokens
-                input_tokens = self.cost_tracker.estimate_tokens(prompt)
-
-                # Set parameters
-                tokens = max_tokens or 4000
-                temp = temperature if temperature is not None else self.settings.llm_temperature
-
-                # Create Instructor client wrapping LiteLLM
-                client = instructor.from_litellm(litellm.acompletion)
-
-                # Call with structured output using OpenAI-style interface
-                response = await client.chat.completions.create(
-                    model=attempt_model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_model=response_model,
-                    max_tokens=tokens,
-                    temperature=temp,
-                    timeout=30
-                )
-
-                # Estimate output tokens (use serialized response)
-                response_text = response.model_dump_json() if isinstance(response, BaseModel) else str(response)
-                output_tokens = self.cost_tracker.estimate_tokens(response_text)
-
-                # Calculate cost
-                cost = self.cost_tracker.calculate_cost(attempt_model, input_tokens, output_tokens)
-
-                # Record operation
-                if self.settings.enable_cost_tracking:
-                    provider = attempt_model.split('/')[0] if '/' in attempt_model else "unknown"
-                    self.cost_tracker.record_operation(
-                        provider=provider,
-                        model=attempt_model,
-                        input_tokens=input_tokens,
-                        output_tokens=output_tokens,
-                        cost=cost
-                    )
+        # Try models in order, skipping open circuits (hedged if enabled)
+        return await self._call_with_fallback(
+            models_to_try,
+            "call_llm_structured",
+            lambda attempt_model: self._call_structured_with_litellm(
+                prompt=prompt,
+                response_model=response_model,
+                model_id=attempt_model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system_prompt=system_prompt
+            )
+        )
+
+    async def _call_structured_with_litellm(
+        self,
+        prompt: str,
+        response_model: Any,
+        model_id: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system_prompt: Optional[str] = None
+    ) -> Tuple[Any, float]:
+        """
+        Call LiteLLM through Instructor and return the parsed response with cost tracking
+
+        Args:
+            prompt: Input prompt
+            response_model: Pydantic model class for structured response
+            model_id: Model ID to use (LiteLLM format: "provider/model")
+            max_tokens: Maximum tokens
+            temperature: Sampling temperature
+            system_prompt: Static instructions sent as a separate (cacheable) system message
+
+        Returns:
+            Tuple of (structured_response, cost_usd)
+
+        Raises:
+            Exception: If the call or response validation fails
+        """
+        import instructor
+        from pydantic import BaseModel
+
+        # Set parameters
+        tokens = max_tokens or 4000
+        temp = temperature if temperature is not None else self.settings.llm_temperature
+
+        # Create Instructor client wrapping LiteLLM
+        client = instructor.from_litellm(litellm.acompletion)
+
+        # Call with structured output using OpenAI-style interface
+        # (raw completion kept for its token usage, including cached tokens)
+        response, completion = await client.chat.completions.create_with_completion(
+            model=model_id,
+            messages=self._build_messages(prompt, model_id, system_prompt),
+            response_model=response_model,
+            max_tokens=tokens,
+            temperature=temp,
+            timeout=30
+        )
+
+        response_text = response.model_dump_json() if isinstance(response, BaseModel) else str(response)
+        cost = self._record_usage(model_id, completion, (system_prompt or "") + prompt, response_text)
+        return response, cost
+
+    def _build_messages(self, prompt: str, model_id: str, system_prompt: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Chat messages with the static system prompt first (cacheable prefix)
 
-                return response, cost, attempt_model
+        For providers without automatic prefix caching the system prompt is
+        marked with an ephemeral cache_control breakpoint.
+        """
+        messages: List[Dict[str, Any]] = []
+        if system_prompt:
+            provider = model_id.split('/')[0] if '/' in model_id else "unknown"
+            if LLM_PROMPT_CACHING and provider in EXPLICIT_CACHE_PROVIDERS:
+                messages.append({
+                    "role": "system",
+                    "content": [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+                })
+            else:
+                messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _record_usage(self, model_id: str, completion: Any, prompt_text: str, response_text: str) -> float:
+        """
+        Cost of one completion, recorded in the cost tracker
 
-            except Exception as e:
-                provider = attempt_model.split('/')[0] if '/' in attempt_model else "unknown"
-                logger.warning(f"Structured LLM call failed for {attempt_model}: {e}")
+        Uses the provider-reported usage (prompt, completion and cached prompt
+        tokens) when available, else estimates from the text.
 
-                if attempt_model == models_to_try[-1]:
-                    raise Exception(f"All LLM providers failed. Last error: {e}")
+        Returns:
+            Cost in USD
+        """
+        usage = getattr(completion, "usage", None)
+        input_tokens = getattr(usage, "prompt_tokens", None)
+        output_tokens = getattr(usage, "completion_tokens", None)
+        cached_tokens = 0
+        if isinstance(input_tokens, int) and isinstance(output_tokens, int):
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", None)
+            if not isinstance(cached_tokens, int):
+                cached_tokens = getattr(usage, "cache_read_input_tokens", 0)  # Anthropic-style usage
+            cached_tokens = cached_tokens if isinstance(cached_tokens, int) else 0
+        else:
+            input_tokens = self.cost_tracker.estimate_tokens(prompt_text)
+            output_tokens = self.cost_tracker.estimate_tokens(response_text)
 
-                continue
+        cost = self.cost_tracker.calculate_cost(model_id, input_tokens, output_tokens, cached_tokens)
 
-        raise Exception("All LLM providers failed")
+        if self.settings.enable_cost_tracking:
+            provider = model_id.split('/')[0] if '/' in model_id else "unknown"
+            self.cost_tracker.record_operation(
+                provider=provider,
+                model=model_id,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost=cost,
+                cached_input_tokens=cached_tokens
+            )
+        return cost
+
+    def _record_call_metrics(self, model_id: str, method: str, start_time: float, success: bool):
+        """Per-provider latency sketch and outcome counter (scraped via /metrics)"""
+        provider = model_id.split('/')[0] if '/' in model_id else "unknown"
+        metrics = get_monitoring_service().metrics
+        metrics.observe_histogram(
+            "llm_request_duration_ms",
+            (time.perf_counter() - start_time) * 1000,
+            labels={"provider": provider, "method": method}
+        )
+        metrics.increment_counter(
+            "llm_requests_total",
+            labels={"provider": provider, "method": method, "success": str(success)}
+        )
 
     def get_cost_stats(self) -> CostStats:
         """
@@ -0,0 +1,261 @@
+"""
+Metadata Bitmap Index - Per-value chunk bitmaps for filtered sparse retrieval
+
+The BM25 corpus is a flat list of chunks. This index keeps one packed bitmap
+per (field, value) over chunk positions so a ChromaDB-style ``where`` filter
+becomes a few bitwise operations, and BM25 only scores the chunks that pass.
+
+Features:
+- Bitmaps for BM25_BITMAP_FIELDS (doc_type, document_type, source, year,
+  thread_id, people): one per exact value, one per list element (people,
+  comma-separated or list) for ``$contains``, one per field for presence
+- ChromaDB filter semantics: implicit equality, $eq, $ne, $in, $nin,
+  $contains, $gt/$gte/$lt/$lte, $and, $or (several top-level keys = $and)
+- Conditions on other fields or range operators fall back to a scan of the
+  chunk metadata, so every filter is answered correctly
+- Chunks missing a field never match conditions on it (as in ChromaDB)
+
+Performance:
+- Bitmaps are packed (np.packbits, 1 bit per chunk): 100k chunks = 12.5KB
+  per value
+- Bitmaps are rebuilt lazily, only for values touched since the last query
+"""
+
+import logging
+import os
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.adapters.chroma_adapter import ChromaDBAdapter
+
+logger = logging.getLogger(__name__)
+
+BM25_BITMAP_FIELDS = [
+    field.strip()
+    for field in os.getenv("BM25_BITMAP_FIELDS", "doc_type,document_type,source,year,thread_id,people").split(",")
+    if field.strip()
+]
+
+# Fields holding several values (list or comma-separated string), matched with $contains
+_LIST_FIELDS = set(ChromaDBAdapter.ENTITY_FIELDS) | set(ChromaDBAdapter.LIST_FIELDS)
+
+_SET_OPERATORS = {"$eq", "$ne", "$in", "$nin", "$contains"}
+_RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+
+# Bitmap key kinds
+_PRESENT = "present"
+_VALUE = "value"
+_ELEMENT = "element"
+
+
+def _elements(field: str, value: Any) -> List[str]:
+    """Individual values of a list-valued field (people dicts contribute their name)"""
+    if isinstance(value, list):
+        value = [item.get("name") or item.get("label") if isinstance(item, dict) else item for item in value]
+    return ChromaDBAdapter.parse_entity_field(value, field)
+
+
+def _value_key(value: Any) -> Hashable:
+    # ChromaDB compares typed values: "2024" != 2024, True != 1
+    return (type(value).__name__, value) if isinstance(value, Hashable) else (type(value).__name__, repr(value))
+
+
+def _compare(operator: str, actual: Any, expected: Any) -> bool:
+    try:
+        if operator == "$gt":
+            return actual > expected
+        if operator == "$gte":
+            return actual >= expected
+        if operator == "$lt":
+            return actual < expected
+        if operator == "$lte":
+            return actual <= expected
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def matches_filter(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """
+    Evaluate a ChromaDB-style ``where`` filter against one metadata dict
+
+    Args:
+        metadata: Chunk metadata
+        where: Filter, e.g. {"$and": [{"doc_type": "email"}, {"year": {"$gte": 2024}}]}
+
+    Returns:
+        True if the metadata passes the filter (always True for no filter)
+    """
+    if not where:
+        return True
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif not _matches_condition(metadata, key, condition):
+            return False
+    return True
+
+
+def _matches_condition(metadata: Dict[str, Any], field: str, condition: Any) -> bool:
+    if field not in metadata or metadata[field] is None:
+        return False
+    actual = metadata[field]
+    operator, expected = next(iter(condition.items())) if isinstance(condition, dict) else ("$eq", condition)
+
+    if operator == "$contains":
+        return str(expected) in _elements(field, actual)
+    if isinstance(actual, (list, dict)):
+        return False  # lists only support $contains
+    if operator == "$eq":
+        return _value_key(actual) == _value_key(expected)
+    if operator == "$ne":
+        return _value_key(actual) != _value_key(expected)
+    if operator == "$in":
+        return _value_key(actual) in {_value_key(v) for v in expected}
+    if operator == "$nin":
+        return _value_key(actual) not in {_value_key(v) for v in expected}
+    return _compare(operator, actual, expected)
+
+
+class MetadataBitmapIndex:
+    """
+    Packed per-value bitmaps over chunk positions
+
+    Chunks are added in position order (position = index in the BM25 corpus);
+    ``filter_mask`` turns a ``where`` filter into a boolean mask over them.
+    """
+
+    def __init__(self, fields: Iterable[str] = BM25_BITMAP_FIELDS):
+        """
+        Initialize bitmap index
+
+        Args:
+            fields: Metadata fields to keep bitmaps for
+        """
+        self.fields: Set[str] = set(fields)
+        self.size = 0
+        self._metadatas: List[Dict[str, Any]] = []  # for fallback scans
+        self._positions: Dict[Tuple[str, str, Hashable], List[int]] = {}
+        self._bitmaps: Dict[Tuple[str, str, Hashable], np.ndarray] = {}
+        self._dirty: Set[Tuple[str, str, Hashable]] = set()
+
+    def add(self, metadata: Dict[str, Any]) -> int:
+        """
+        Add the next chunk's metadata
+
+        Returns:
+            The chunk's position
+        """
+        position = self.size
+        self.size += 1
+        self._metadatas.append(metadata)
+
+        for field in self.fields:
+            value = metadata.get(field)
+            if value is None:
+                continue
+            keys = [(field, _PRESENT, None)]
+            if not isinstance(value, (list, dict)):
+                keys.append((field, _VALUE, _value_key(value)))
+            if field in _LIST_FIELDS:
+                keys.extend((field, _ELEMENT, element) for element in set(_elements(field, value)))
+            for key in keys:
+                self._positions.setdefault(key, []).append(position)
+                self._dirty.add(key)
+        return position
+
+    def clear(self):
+        self.size = 0
+        self._metadatas = []
+        self._positions = {}
+        self._bitmaps = {}
+        self._dirty = set()
+
+    # ------------------------------------------------------------------
+    # Packed bitmaps
+    # ------------------------------------------------------------------
+
+    def _bitmap(self, key: Tuple[str, str, Hashable]) -> np.ndarray:
+        """Packed bitmap for a key, padded to the current corpus size"""
+        n_bytes = (self.size + 7) // 8
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None or key in self._dirty:
+            positions = self._positions.get(key)
+            if not positions:
+                return np.zeros(n_bytes, dtype=np.uint8)
+            mask = np.zeros(self.size, dtype=bool)
+            mask[positions] = True
+            bitmap = self._bitmaps[key] = np.packbits(mask)
+            self._dirty.discard(key)
+        if len(bitmap) < n_bytes:
+            # Chunks added since the build don't carry this value
+            bitmap = np.concatenate([bitmap, np.zeros(n_bytes - len(bitmap), dtype=np.uint8)])
+        return bitmap
+
+    def _full(self) -> np.ndarray:
+        return np.packbits(np.ones(self.size, dtype=bool))
+
+    def _scan(self, field: str, condition: Any) -> np.ndarray:
+        """Packed bitmap for one condition, by scanning chunk metadata"""
+        return np.packbits(np.fromiter(
+            (_matches_condition(metadata, field, condition) for metadata in self._metadatas),
+            dtype=bool, count=self.size
+        ))
+
+    def _evaluate(self, where: Dict[str, Any]) -> np.ndarray:
+        result = self._full()
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    result &= self._evaluate(clause)
+            elif key == "$or":
+                any_clause = np.zeros_like(result)
+                for clause in condition:
+                    any_clause |= self._evaluate(clause)
+                result &= any_clause
+            else:
+                result &= self._condition(key, condition)
+        return result
+
+    def _condition(self, field: str, condition: Any) -> np.ndarray:
+        operator, expected = next(iter(condition.items())) if isinstance(condition, dict) else ("$eq", condition)
+        if field not in self.fields or operator not in _SET_OPERATORS:
+            return self._scan(field, condition)
+
+        if operator == "$contains":
+            return self._bitmap((field, _ELEMENT, str(expected)))
+
+        values = expected if operator in ("$in", "$nin") else [expected]
+        matched = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        for value in values:
+            matched |= self._bitmap((field, _VALUE, _value_key(value)))
+        if operator in ("$ne", "$nin"):
+            return self._bitmap((field, _PRESENT, None)) & ~matched
+        return matched
+
+    def filter_mask(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Boolean mask of chunks passing a ``where`` filter
+
+        Args:
+            where: ChromaDB-style filter
+
+        Returns:
+            Boolean array of length ``size``, or None when there is no filter
+        """
+        if not where:
+            return None
+        return np.unpackbits(self._evaluate(where), count=self.size).astype(bool)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "fields": sorted(self.fields),
+            "bitmaps": len(self._positions),
+            "bitmap_bytes": int(sum(bitmap.nbytes for bitmap in self._bitmaps.values())),
+        }
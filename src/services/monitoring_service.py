@@ -6,7 +6,8 @@ Blueprint requirement: Production ops (monitoring, metrics, health checks).
 
 Features:
 - Structured JSON logging
-- Metrics collection (counters, gauges, histograms)
+- Metrics collection (counters, gauges, fixed-memory quantile histograms)
+- Prometheus text exposition (/metrics)
 - Health check system
 - Performance tracking
 - Error rate monitoring
@@ -14,11 +15,14 @@ Features:
 
 import logging
 import json
+import math
+import re
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, deque
 from enum import Enum
 
 
@@ -107,18 +111,132 @@ class StructuredLogger:
         )
 
 
+class QuantileSketch:
+    """
+    Fixed-memory quantile sketch for latency histograms
+
+    Keeps raw values (exact quantiles) for the first ``exact_limit``
+    observations, then switches to logarithmic buckets (DDSketch-style):
+    every quantile is within ``relative_accuracy`` of the true value and
+    memory is bounded by ``max_buckets`` regardless of traffic.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 2048,
+        exact_limit: int = 256
+    ):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.exact_limit = exact_limit
+
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+        self._exact: Optional[List[float]] = []
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0  # Values too small for a log bucket (incl. zero)
+
+    def add(self, value: float):
+        """Record one observation"""
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if self._exact is not None:
+            self._exact.append(value)
+            if len(self._exact) > self.exact_limit:
+                for v in self._exact:
+                    self._add_to_bucket(v)
+                self._exact = None
+            return
+
+        self._add_to_bucket(value)
+
+    def _add_to_bucket(self, value: float):
+        if value <= 1e-9:
+            self._zero_count += 1
+            return
+
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+        if len(self._buckets) > self.max_buckets:
+            # Collapse the two lowest buckets: keeps accuracy for high quantiles
+            lowest, second = sorted(self._buckets)[:2]
+            self._buckets[second] += self._buckets.pop(lowest)
+
+    def quantile(self, q: float) -> float:
+        """
+        Value at quantile q (nearest rank)
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value (0.0 if empty)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = min(int(self.count * q), self.count - 1)
+
+        if self._exact is not None:
+            return sorted(self._exact)[rank]
+
+        if rank < self._zero_count:
+            return min(max(0.0, self.min), self.max)
+
+        seen = self._zero_count
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    def stats(self) -> Dict[str, float]:
+        """Count, sum, avg, min, max, p50, p95, p99"""
+        if not self.count:
+            return {"count": 0, "sum": 0, "avg": 0}
+
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+
 class MetricsCollector:
     """
     Collect and aggregate metrics
 
-    Supports counters, gauges, and histograms
+    Supports counters, gauges, and histograms. Histograms are fixed-memory
+    quantile sketches and all updates are lock-protected, so one collector
+    can be shared by request handlers and worker threads.
     """
 
-    def __init__(self):
+    PROMETHEUS_QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, history_size: int = 1000):
         self.counters: Dict[str, float] = defaultdict(float)
         self.gauges: Dict[str, float] = {}
-        self.histograms: Dict[str, List[float]] = defaultdict(list)
-        self.metric_history: List[MetricPoint] = []
+        self.histograms: Dict[str, QuantileSketch] = {}
+        self.metric_history: Deque[MetricPoint] = deque(maxlen=history_size)
+        self._series: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
 
     def increment_counter(
         self,
@@ -135,8 +253,10 @@ class MetricsCollector:
             labels: Metric labels
         """
         key = self._make_key(name, labels)
-        self.counters[key] += value
-        self._record_metric(name, self.counters[key], labels)
+        with self._lock:
+            self._series.setdefault(key, (name, dict(labels or {})))
+            self.counters[key] += value
+            self._record_metric(name, self.counters[key], labels)
 
     def set_gauge(
         self,
@@ -153,8 +273,10 @@ class MetricsCollector:
             labels: Metric labels
         """
         key = self._make_key(name, labels)
-        self.gauges[key] = value
-        self._record_metric(name, value, labels)
+        with self._lock:
+            self._series.setdefault(key, (name, dict(labels or {})))
+            self.gauges[key] = value
+            self._record_metric(name, value, labels)
 
     def observe_histogram(
         self,
@@ -171,8 +293,13 @@ class MetricsCollector:
             labels: Metric labels
         """
         key = self._make_key(name, labels)
-        self.histograms[key].append(value)
-        self._record_metric(name, value, labels)
+        with self._lock:
+            sketch = self.histograms.get(key)
+            if sketch is None:
+                sketch = self.histograms[key] = QuantileSketch()
+                self._series[key] = (name, dict(labels or {}))
+            sketch.add(value)
+            self._record_metric(name, value, labels)
 
     def get_counter(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
         """Get counter value"""
@@ -196,36 +323,66 @@ class MetricsCollector:
             Dict with count, sum, avg, min, max, p50, p95, p99
         """
         key = self._make_key(name, labels)
-        values = self.histograms.get(key, [])
-
-        if not values:
-            return {"count": 0, "sum": 0, "avg": 0}
-
-        sorted_values = sorted(values)
-        count = len(values)
-
-        return {
-            "count": count,
-            "sum": sum(values),
-            "avg": sum(values) / count,
-            "min": min(values),
-            "max": max(values),
-            "p50": sorted_values[int(count * 0.50)],
-            "p95": sorted_values[int(count * 0.95)] if count > 1 else sorted_values[0],
-            "p99": sorted_values[int(count * 0.99)] if count > 1 else sorted_values[0]
-        }
+        with self._lock:
+            sketch = self.histograms.get(key)
+            if sketch is None:
+                return {"count": 0, "sum": 0, "avg": 0}
+            return sketch.stats()
 
     def get_all_metrics(self) -> Dict[str, Any]:
         """Get all metrics summary"""
+        with self._lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            names = set(k.split("|")[0] for k in self.histograms.keys())
         return {
-            "counters": dict(self.counters),
-            "gauges": dict(self.gauges),
+            "counters": counters,
+            "gauges": gauges,
             "histograms": {
                 name: self.get_histogram_stats(name)
-                for name in set(k.split("|")[0] for k in self.histograms.keys())
+                for name in names
             }
         }
 
+    def export_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Histograms are exported as summaries (p50/p95/p99, _sum, _count).
+
+        Returns:
+            Exposition text (version 0.0.4)
+        """
+        families: Dict[str, Tuple[str, List[str]]] = {}
+
+        with self._lock:
+            for kind, values in (("counter", self.counters), ("gauge", self.gauges)):
+                for key, value in values.items():
+                    name, labels = self._series[key]
+                    metric = _prometheus_name(name)
+                    families.setdefault(metric, (kind, []))[1].append(
+                        f"{metric}{_prometheus_labels(labels)} {_prometheus_value(value)}"
+                    )
+
+            for key, sketch in self.histograms.items():
+                name, labels = self._series[key]
+                metric = _prometheus_name(name)
+                lines = families.setdefault(metric, ("summary", []))[1]
+                for q in self.PROMETHEUS_QUANTILES:
+                    lines.append(
+                        f"{metric}{_prometheus_labels({**labels, 'quantile': str(q)})} "
+                        f"{_prometheus_value(sketch.quantile(q))}"
+                    )
+                lines.append(f"{metric}_sum{_prometheus_labels(labels)} {_prometheus_value(sketch.sum)}")
+                lines.append(f"{metric}_count{_prometheus_labels(labels)} {sketch.count}")
+
+        output = []
+        for metric in sorted(families):
+            kind, lines = families[metric]
+            output.append(f"# TYPE {metric} {kind}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
+
     def _make_key(self, name: str, labels: Optional[Dict[str, str]]) -> str:
         """Create unique key from name and labels"""
         if not labels:
@@ -239,14 +396,36 @@ class MetricsCollector:
         value: float,
         labels: Optional[Dict[str, str]]
     ):
-        """Record metric in history"""
+        """Record metric in history (bounded deque keeps the last 1000 points)"""
         self.metric_history.append(
             MetricPoint(name=name, value=value, labels=labels or {})
         )
 
-        # Keep only last 1000 points
-        if len(self.metric_history) > 1000:
-            self.metric_history = self.metric_history[-1000:]
+
+_PROMETHEUS_NAME_RE = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _prometheus_name(name: str) -> str:
+    name = _PROMETHEUS_NAME_RE.sub("_", name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def _prometheus_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in sorted(labels.items()):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{_prometheus_name(key)}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _prometheus_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    return repr(float(value))
 
 
 class HealthCheckMonitor:
@@ -444,6 +623,18 @@ class MonitoringService:
         }
 
 
+# Global instance
+_monitoring_service: Optional[MonitoringService] = None
+
+
+def get_monitoring_service() -> MonitoringService:
+    """Get or create the global monitoring service"""
+    global _monitoring_service
+    if _monitoring_service is None:
+        _monitoring_service = MonitoringService()
+    return _monitoring_service
+
+
 # Test
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
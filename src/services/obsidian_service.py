@@ -19,14 +19,47 @@ import re
 import yaml
 from datetime import datetime
 from pathlib import Path
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from slugify import slugify
 
 from src.models.schemas import DocumentType
+from src.services.vault_writer_service import VaultWriteQueue
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _compile_entity_matcher(names: tuple) -> "re.Pattern":
+    """
+    Compile entity names into a single trie-shaped regex
+
+    Names sharing a prefix share one branch (``dan(?:iel(?: teckentrup)?)?``),
+    so a line is scanned once for all entities instead of once per entity.
+    Longer names are preferred at each position, and matches must not be
+    inside a word. Cached per entity set, so re-exports reuse the automaton.
+    """
+    trie: Dict[str, Any] = {}
+    for name in names:
+        node = trie
+        for char in name.lower():
+            node = node.setdefault(char, {})
+        node[''] = True  # end of a name
+
+    def to_pattern(node: Dict[str, Any]) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # Optional continuation is greedy: longest name first, shorter on backtrack
+        return group + '?' if is_end else group
+
+    return re.compile(r'(?<!\w)' + to_pattern(trie) + r'(?!\w)', re.IGNORECASE)
+
+
 class ObsidianService:
     """
     Generate RAG-first Obsidian notes with entity stubs (formerly V3)
@@ -42,11 +75,15 @@ class ObsidianService:
         self,
         output_dir: str = "./obsidian_vault",
         refs_dir: str = "./obsidian_vault/refs",
-        daily_note_service = None
+        daily_note_service = None,
+        write_queue: Optional[VaultWriteQueue] = None
     ):
         self.output_dir = Path(output_dir)
         self.refs_dir = Path(refs_dir)
         self.daily_note_service = daily_note_service
+        # Shared with DailyNoteService so both see pending (unflushed) files;
+        # without one, every write goes straight to disk
+        self.write_queue = write_queue or VaultWriteQueue(write_behind=False)
 
         # Create directory structure
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -443,134 +480,99 @@ class ObsidianService:
         if not content or not entities:
             return content
 
-        import re
-
-        # Track linked entities to avoid double-linking
-        linked_entities = set()
-
         # Build entity map: {name: (type, slug)}
         entity_map = {}
+        for entity_key, entity_type in (
+            ('people', 'persons'),
+            ('places', 'places'),
+            ('organizations', 'orgs'),
+            ('technologies', 'technologies'),
+        ):
+            for entity in entities.get(entity_key, []):
+                if isinstance(entity, dict):
+                    name = entity.get('label', entity.get('name', ''))
+                else:
+                    name = entity
+                if name:
+                    entity_map[name] = (entity_type, slugify(name))
 
-        # People
-        for person in entities.get('people', []):
-            if isinstance(person, dict):
-                name = person.get('label', person.get('name', ''))
-            else:
-                name = person
-            if name:
-                entity_map[name] = ('persons', slugify(name))
-
-        # Places
-        for place in entities.get('places', []):
-            if isinstance(place, dict):
-                name = place.get('label', place.get('name', ''))
-            else:
-                name = place
-            if name:
-                entity_map[name] = ('places', slugify(name))
-
-        # Organizations
-        for org in entities.get('organizations', []):
-            if isinstance(org, dict):
-                name = org.get('label', org.get('name', ''))
-            else:
-                name = org
-            if name:
-                entity_map[name] = ('orgs', slugify(name))
-
-        # Technologies
-        for tech in entities.get('technologies', []):
-            if isinstance(tech, dict):
-                name = tech.get('label', tech.get('name', ''))
-            else:
-                name = tech
-            if name:
-                entity_map[name] = ('technologies', slugify(name))
+        if not entity_map:
+            return content
 
-        # Sort by length (longest first) to avoid partial matches
-        # e.g., "Daniel Teckentrup" should be matched before "Daniel"
-        sorted_entities = sorted(entity_map.keys(), key=len, reverse=True)
+        # One automaton for all entities; case-insensitive lookup back to the
+        # canonical name (first entity wins if two differ only by case)
+        matcher = _compile_entity_matcher(tuple(sorted(entity_map)))
+        canonical = {}
+        for name in entity_map:
+            canonical.setdefault(name.lower(), name)
+        wikilinks = {
+            name: f"[[refs/{entity_type}/{entity_slug}|{name}]]"
+            for name, (entity_type, entity_slug) in entity_map.items()
+        }
+        # Shorter names ending inside a longer one at the same start, longest
+        # first ("daniel" for "daniel teckentrup"): once the longer name is
+        # linked, its later mentions still link the shorter one
+        shorter = {}
+        if not link_all_occurrences:
+            by_length = sorted(canonical, key=len, reverse=True)
+            for text in canonical:
+                shorter[text] = [
+                    other for other in by_length
+                    if len(other) < len(text) and text.startswith(other) and not re.match(r'\w', text[len(other)])
+                ]
 
-        # Split content into lines to preserve structure
-        lines = content.split('\n')
-        result_lines = []
+        # Track linked entities to avoid double-linking
+        linked_entities = set()
+        pieces: List[str] = []
 
         in_code_block = False
         in_yaml_frontmatter = False
 
-        for line in lines:
+        for line_number, line in enumerate(content.split('\n')):
+            if line_number:
+                pieces.append('\n')
+            stripped = line.strip()
+
             # Track code blocks
-            if line.strip().startswith('```'):
+            if stripped.startswith('```'):
                 in_code_block = not in_code_block
-                result_lines.append(line)
+                pieces.append(line)
                 continue
 
             # Track YAML frontmatter
-            if line.strip() == '---':
-                if not in_yaml_frontmatter:
-                    in_yaml_frontmatter = True
-                else:
-                    in_yaml_frontmatter = False
-                result_lines.append(line)
+            if stripped == '---':
+                in_yaml_frontmatter = not in_yaml_frontmatter
+                pieces.append(line)
                 continue
 
-            # Skip linking in code blocks and frontmatter
-            if in_code_block or in_yaml_frontmatter:
-                result_lines.append(line)
+            # Skip linking in code blocks and frontmatter, and on lines that
+            # already have WikiLinks (don't double-link)
+            if in_code_block or in_yaml_frontmatter or '[[' in line:
+                pieces.append(line)
                 continue
 
-            # Skip if line already has WikiLinks (don't double-link)
-            if '[[' in line:
-                result_lines.append(line)
-                continue
-
-            # Replace entity mentions with WikiLinks
-            modified_line = line
-
-            # Track created WikiLinks to prevent nesting
-            wikilink_placeholders = {}
-            placeholder_counter = 0
-
-            for entity_name in sorted_entities:
-                # Skip if already linked (in this session)
-                if not link_all_occurrences and entity_name in linked_entities:
-                    continue
-
-                # Word boundary regex for case-insensitive matching
-                # \b ensures we match whole words only
-                pattern = r'\b(' + re.escape(entity_name) + r')\b'
-
-                entity_type, entity_slug = entity_map[entity_name]
-                wikilink = f"[[refs/{entity_type}/{entity_slug}|{entity_name}]]"
-
-                # Check if entity exists in this line
-                if re.search(pattern, modified_line, re.IGNORECASE):
-                    # Replace first occurrence (or all if link_all_occurrences=True)
-                    if link_all_occurrences:
-                        modified_line = re.sub(pattern, wikilink, modified_line, flags=re.IGNORECASE)
-                    else:
-                        modified_line = re.sub(pattern, wikilink, modified_line, count=1, flags=re.IGNORECASE)
-                        linked_entities.add(entity_name)
-
-                    # Protect newly created WikiLinks from further replacements
-                    # Extract all WikiLinks and replace with placeholders
-                    wikilink_pattern = r'\[\[([^\]]+)\]\]'
-                    matches = list(re.finditer(wikilink_pattern, modified_line))
-
-                    # Replace from end to start to preserve positions
-                    for match in reversed(matches):
-                        placeholder = f"__WIKILINK_{placeholder_counter}__"
-                        wikilink_placeholders[placeholder] = match.group(0)
-                        modified_line = modified_line[:match.start()] + placeholder + modified_line[match.end():]
-                        placeholder_counter += 1
-
-            # Restore WikiLinks from placeholders
-            for placeholder, wikilink in wikilink_placeholders.items():
-                modified_line = modified_line.replace(placeholder, wikilink)
-
-            result_lines.append(modified_line)
-
-        return '\n'.join(result_lines)
+            # Single left-to-right scan; the longest entity not yet linked wins
+            # at each position
+            position = search_from = 0
+            while True:
+                match = matcher.search(line, search_from)
+                if not match:
+                    break
+                start, text = match.start(), match.group(0).lower()
+                if not link_all_occurrences:
+                    if canonical[text] in linked_entities:
+                        text = next((other for other in shorter[text] if canonical[other] not in linked_entities), None)
+                        if text is None:
+                            # Entities starting inside the skipped one may still match
+                            search_from = start + 1
+                            continue
+                    linked_entities.add(canonical[text])
+                pieces.append(line[position:start])
+                pieces.append(wikilinks[canonical[text]])
+                position = search_from = start + len(text)
+            pieces.append(line[position:] if position else line)
+
+        return ''.join(pieces)
 
     def _format_paragraphs(self, content: str) -> str:
         """
@@ -1016,7 +1018,7 @@ class ObsidianService:
         file_path = entity_dir / f"{safe_name}.md"
 
         # Don't overwrite if exists (stubs are created once)
-        if file_path.exists():
+        if self.write_queue.exists(file_path):
             return file_path
 
         # Build stub frontmatter
@@ -1433,7 +1435,7 @@ LIMIT 50
 
         # Write stub
         stub_content = f"---\n{stub_yaml}---\n\n{stub_body}"
-        file_path.write_text(stub_content, encoding='utf-8')
+        self.write_queue.write_text(file_path, stub_content)
 
         return file_path
 
@@ -1624,7 +1626,7 @@ LIMIT 50
         full_content = f"{frontmatter}# {title}\n\n{body}\n\n{xref}"
 
         # Write file
-        file_path.write_text(full_content, encoding='utf-8')
+        self.write_queue.write_text(file_path, full_content)
 
         # Create entity stubs with resource links
 
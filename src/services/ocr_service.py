@@ -3,21 +3,28 @@ OCR (Optical Character Recognition) service for extracting text from images and
 """
 import os
 import logging
+from importlib.util import find_spec
 from typing import List, Optional
 from pathlib import Path
 
+from src.core.startup_profiler import lazy_import
+
 logger = logging.getLogger(__name__)
 
-# Check OCR dependencies
-try:
-    import pytesseract
-    from PIL import Image
-    from pdf2image import convert_from_path
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+# Check OCR dependencies without importing them - they load on the first OCR call
+OCR_AVAILABLE = all(find_spec(name) is not None for name in ("pytesseract", "PIL", "pdf2image"))
+if not OCR_AVAILABLE:
     logger.warning("OCR dependencies (pytesseract, PIL, pdf2image) not available")
 
+pytesseract = lazy_import("pytesseract")
+Image = lazy_import("PIL.Image")
+pdf2image = lazy_import("pdf2image")
+
+
+def convert_from_path(pdf_path: str, **kwargs):
+    """Render PDF pages to PIL images (pdf2image, imported on first use)"""
+    return pdf2image.convert_from_path(pdf_path, **kwargs)
+
 
 class OCRService:
     """
@@ -9,7 +9,7 @@ This service coordinates all document processing operations including:
 - Quality scoring and triage
 - Cost tracking
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import uuid
 import hashlib
@@ -20,8 +20,6 @@ import asyncio
 import time
 import chromadb
 
-from watchdog.events import FileSystemEventHandler
-
 # Import all service dependencies
 try:
     from src.core.config import get_settings
@@ -38,10 +36,15 @@ try:
         VectorService,
         OCRService
     )
+    from src.services.fake_llm_service import FakeLLMService, USE_FAKE_LLM
     from src.services.enrichment_service import EnrichmentService
+    from src.services.embedding_service import EmbeddingBroker
+    from src.services.embedding_worker import LocalWorkerEmbeddingFunction
     from src.services.vocabulary_service import VocabularyService
     from src.services.chunking_service import ChunkingService
     from src.services.obsidian_service import ObsidianService
+    from src.services.vault_writer_service import get_vault_write_queue
+    from src.services.drift_monitor_service import get_corpus_aggregates
     from src.services.daily_note_service import DailyNoteService
     from src.services.tag_taxonomy_service import TagTaxonomyService
     from src.services.smart_triage_service import SmartTriageService
@@ -51,6 +54,8 @@ try:
 
     # Pipeline architecture
     from src.pipeline import create_ingestion_pipeline, StageContext, RawDocument, StageResult
+    from src.core.tracing import Trace, activate_trace, get_current_trace, trace_span
+    from src.core.startup_profiler import startup_step
     from src.services.entity_name_filter_service import EntityNameFilterService
 except ImportError as e:
     raise ImportError(f"Failed to import required services: {e}")
@@ -68,6 +73,12 @@ COLLECTION_NAME = os.getenv("COLLECTION_NAME", "documents")
 # Global ChromaDB instances (module-level)
 chroma_client = None
 collection = None
+embedding_function = None
+
+# Email attachments: extracted once per email, then processed as sub-documents
+# concurrently (bounded so one large email cannot monopolize the LLM/OCR budget)
+EMAIL_ATTACHMENT_CONCURRENCY = int(os.getenv("EMAIL_ATTACHMENT_CONCURRENCY", "4"))
+_IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico'}
 
 # Cost tracking configuration
 DAILY_BUDGET_USD = float(os.getenv("DAILY_BUDGET_USD", "10.0"))
@@ -105,7 +116,8 @@ class VoyageEmbeddingFunction:
 
     Supports:
     - voyage-3-lite (512 dims, MTEB ~68, $0.02/1M tokens)
-    - Batch processing (up to 128 inputs)
+    - Micro-batching via EmbeddingBroker (up to 128 inputs per call)
+    - Retries for transient API failures and a query embedding LRU
     - Input type specification (document vs query)
     """
 
@@ -121,6 +133,12 @@ class VoyageEmbeddingFunction:
             import voyageai
             self.client = voyageai.Client(api_key=api_key)
             self.model_name = model_name
+            # Shared by ingestion (__call__) and search (embed_query) so that
+            # concurrent callers coalesce into fuller provider requests
+            self.broker = EmbeddingBroker(
+                embed_fn=self._embed_batch,
+                name=f"voyage-{model_name}"
+            )
             logger.info(f"✅ Initialized Voyage AI embeddings: {model_name}")
         except ImportError:
             logger.error("voyageai package not installed. Run: pip install voyageai")
@@ -138,6 +156,15 @@ class VoyageEmbeddingFunction:
         """
         return f"voyage-{self.model_name}"
 
+    def _embed_batch(self, texts: List[str], input_type: str) -> List[List[float]]:
+        """Single Voyage API call (invoked by the broker with provider-sized batches)"""
+        response = self.client.embed(
+            texts,
+            model=self.model_name,
+            input_type=input_type
+        )
+        return response.embeddings
+
     def __call__(self, input: List[str]) -> List[List[float]]:
         """
         Generate embeddings for input texts (documents)
@@ -152,20 +179,16 @@ class VoyageEmbeddingFunction:
             return []
 
         try:
-            response = self.client.embed(
-                input,
-                model=self.model_name,
-                input_type="document"  # Use "document" for indexing
-            )
-            # Return plain Python lists (ChromaDB handles conversion internally)
-            return response.embeddings
+            # Use "document" for indexing. Return plain Python lists
+            # (ChromaDB handles conversion internally)
+            return self.broker.embed(list(input), input_type="document")
         except Exception as e:
             logger.error(f"Voyage embedding failed: {e}")
             raise
 
     def embed_query(self, query = None, input = None):
         """
-        Generate embedding for a search query
+        Generate embedding for search queries
 
         Args:
             query: Query text or list of texts to embed
@@ -182,27 +205,25 @@ class VoyageEmbeddingFunction:
             return []
 
         # Handle both string and list inputs
-        if isinstance(text, list):
-            if len(text) == 0:
-                return []
-            text = text[0]  # Use first element
-
-        if not text:
+        queries = text if isinstance(text, list) else [text]
+        queries = [q for q in queries if q]
+        if not queries:
             return []
 
         try:
-            response = self.client.embed(
-                [text],
-                model=self.model_name,
-                input_type="query"  # Use "query" for search
-            )
+            # Use "query" for search (served from the LRU when repeated)
+            embeddings = self.broker.embed_queries(queries)
             # Convert to numpy array (ChromaDB expects .tolist() method)
-            embeddings_array = np.array(response.embeddings, dtype=np.float32)
+            embeddings_array = np.array(embeddings, dtype=np.float32)
             return embeddings_array
         except Exception as e:
             logger.error(f"Voyage query embedding failed: {e}")
             raise
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get embedding broker statistics (batch sizes, latency, cache hits)"""
+        return self.broker.get_stats()
+
 
 class SimpleTextSplitter:
     def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
@@ -326,18 +347,6 @@ class CostTracker:
         )
 
 
-# ============================================================================
-# FILE WATCH HANDLER
-# ============================================================================
-class FileWatchHandler(FileSystemEventHandler):
-    def __init__(self, rag_service):
-        self.rag_service = rag_service
-
-    def on_created(self, event):
-        if not event.is_directory:
-            logger.info(f"New file detected: {event.src_path}")
-            asyncio.create_task(self.rag_service.process_file_from_watch(event.src_path))
-
 # ============================================================================
 # MAIN RAG SERVICE
 # ============================================================================
@@ -345,15 +354,17 @@ class FileWatchHandler(FileSystemEventHandler):
 # All functionality now handled by new service layer in src/services/
 class RAGService:
     def __init__(self):
-        # Setup ChromaDB first
-        self.setup_chromadb()
+        # Setup ChromaDB first (embedding model load dominates cold start)
+        with startup_step("RAGService.setup_chromadb"):
+            self.setup_chromadb()
 
         # Initialize new service layer
         try:
             logger.info("✅ Using new service layer architecture")
             settings = get_settings()
             self.settings = settings  # Store settings for attachment linking
-            self.llm_service = LLMService(settings)
+            # Offline stand-in (no API calls) when USE_FAKE_LLM=true
+            self.llm_service = FakeLLMService(settings) if USE_FAKE_LLM else LLMService(settings)
             self.vector_service = VectorService(collection, settings)
             self.document_service = DocumentService(settings)
             self.ocr_service = OCRService(languages=['eng', 'deu', 'fra', 'spa'])
@@ -363,7 +374,8 @@ class RAGService:
             self.triage_service = SmartTriageService(collection=collection)
 
             # Initialize vocabulary and enrichment service (formerly V2)
-            self.vocabulary_service = VocabularyService("vocabulary")
+            with startup_step("RAGService.vocabulary"):
+                self.vocabulary_service = VocabularyService("vocabulary")
             self.enrichment_service = EnrichmentService(
                 llm_service=self.llm_service,
                 vocab_service=self.vocabulary_service
@@ -379,16 +391,21 @@ class RAGService:
 
             # Initialize daily note service for automatic journal generation
             obsidian_output_dir = os.getenv("OBSIDIAN_VAULT_PATH", "./obsidian_vault")
+            # Shared write-behind queue: stubs and daily notes touched by many
+            # documents are written once per flush instead of once per mention
+            self.vault_write_queue = get_vault_write_queue()
             self.daily_note_service = DailyNoteService(
                 refs_dir=f"{obsidian_output_dir}/refs",
-                llm_service=self.llm_service
+                llm_service=self.llm_service,
+                write_queue=self.vault_write_queue
             )
 
             # Initialize Obsidian export service (formerly V3 - RAG-first)
             self.obsidian_service = ObsidianService(
                 output_dir=obsidian_output_dir,
                 refs_dir=f"{obsidian_output_dir}/refs",
-                daily_note_service=self.daily_note_service
+                daily_note_service=self.daily_note_service,
+                write_queue=self.vault_write_queue
             )
 
             # Initialize contact/calendar export services (opt-in via ENABLE_VCF_ICS=true)
@@ -412,6 +429,9 @@ class RAGService:
             # Initialize quality scoring service (blueprint do_index gates)
             self.quality_scoring_service = QualityScoringService()
 
+            # Corpus statistics updated at ingest time (drift snapshots read these)
+            self.corpus_aggregates = get_corpus_aggregates()
+
             # Initialize ingestion pipeline (modular architecture)
             # NEW: Triage stage runs BEFORE enrichment to save costs on duplicates/junk
             self.pipeline = create_ingestion_pipeline(
@@ -421,6 +441,8 @@ class RAGService:
                 vector_service=self.vector_service,
                 obsidian_service=self.obsidian_service,
                 triage_service=self.triage_service,  # NEW: Enable smart triage
+                corpus_aggregates=self.corpus_aggregates,
+                tag_taxonomy=self.tag_taxonomy,
                 enable_triage=True,  # NEW: Duplicate detection + junk filtering
                 enable_quality_gate=True,  # CHANGED: Enable quality gating (was False)
                 enable_export=True  # Re-enabled after fixing API mismatch
@@ -446,7 +468,7 @@ class RAGService:
             raise RuntimeError(f"Service layer is required but initialization failed: {e}")
 
     def setup_chromadb(self):
-        global chroma_client, collection
+        global chroma_client, collection, embedding_function
         try:
             chroma_client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
             chroma_client.heartbeat()
@@ -469,6 +491,20 @@ class RAGService:
                     logger.info("Falling back to sentence-transformers")
                     embedding_function = None
 
+            worker_address = os.getenv("EMBEDDING_WORKER_ADDRESS")
+            if embedding_function is None and worker_address:
+                try:
+                    # Shared local worker: one model copy for all API processes
+                    worker_function = LocalWorkerEmbeddingFunction(address=worker_address)
+                    worker_info = worker_function.ping()
+                    embedding_function = worker_function
+                    embedding_info = (
+                        f"sentence-transformers {worker_info.get('model')} via embedding worker at {worker_address}"
+                    )
+                    logger.info(f"✅ Using shared embedding worker: {embedding_info}")
+                except Exception as e:
+                    logger.warning(f"Embedding worker unavailable ({e}), loading model in-process")
+
             if embedding_function is None:
                 # Fallback: sentence-transformers (local, free, 384 dims)
                 from chromadb.utils import embedding_functions
@@ -924,11 +960,15 @@ class RAGService:
                 chunk_contents.append(chunk)
 
             # Add to ChromaDB
-            collection.add(
-                ids=chunk_ids,
-                documents=chunk_contents,
-                metadatas=chunk_metadatas
-            )
+            with trace_span("chroma.add", kind="chroma", chunks=len(chunk_ids)):
+                collection.add(
+                    ids=chunk_ids,
+                    documents=chunk_contents,
+                    metadatas=chunk_metadatas
+                )
+            get_corpus_aggregates().record_chunks(chunk_metadatas)
+            if hasattr(self, 'tag_taxonomy'):
+                self.tag_taxonomy.add_metadatas(chunk_metadatas)
 
             # ============================================================
             # STEP 3: OBSIDIAN EXPORT (if enabled)
@@ -1098,10 +1138,11 @@ class RAGService:
                 metadata=metadata or {}  # Pass through original metadata from document parsing
             )
 
-            # Create pipeline context
+            # Create pipeline context (joins the caller's trace, e.g. process_file)
             context = StageContext(
                 doc_id=doc_id,
-                filename=filename
+                filename=filename,
+                trace=get_current_trace() or Trace()
             )
 
             # Run pipeline
@@ -1125,6 +1166,7 @@ class RAGService:
                         "entities": {"people": [], "organizations": [], "locations": [], "technologies": []}
                     },
                     obsidian_path=None,
+                    timings=context.trace.timing_breakdown(),
                     message=f"Document blocked by {context.gate_reason} filter"
                 )
             elif result == StageResult.ERROR:
@@ -1222,7 +1264,8 @@ class RAGService:
                 doc_id=doc_id,
                 chunks=chunk_count,
                 metadata=response_metadata,
-                obsidian_path=obsidian_path
+                obsidian_path=obsidian_path,
+                timings=context.trace.timing_breakdown()
             )
 
         except Exception as e:
@@ -1240,26 +1283,47 @@ class RAGService:
             use_critic: Use LLM-as-critic quality scoring
             use_iteration: Use self-improvement loop
             process_attachments: Process email attachments as separate documents (default: True)
+
+        Returns:
+            IngestResponse whose ``timings`` cover extraction, pipeline stages
+            and attachment processing
         """
+        trace = Trace("ingest_file")
+        with activate_trace(trace):
+            result = await self._process_file(
+                file_path, process_ocr, generate_obsidian, use_critic, use_iteration, process_attachments
+            )
+
+        result.timings = trace.timing_breakdown()
+        trace.log(file=Path(file_path).name, doc_id=result.doc_id)
+        return result
+
+    async def _process_file(self, file_path: str, process_ocr: bool, generate_obsidian: bool, use_critic: bool, use_iteration: bool, process_attachments: bool) -> IngestResponse:
+        """Body of process_file, run inside the file's trace"""
         try:
             # Extract text using document service
             logger.info(f"🔄 Processing file: {file_path}")
-            content, document_type, metadata = await self.document_service.extract_text_from_file(
-                file_path,
-                process_ocr=process_ocr
-            )
+            with trace_span("extract_text", kind="file_io", file=Path(file_path).name):
+                content, document_type, metadata = await self.document_service.extract_text_from_file(
+                    file_path,
+                    process_ocr=process_ocr
+                )
 
             filename = Path(file_path).name
 
-            # For emails with attachments: extract attachment summaries FIRST
+            # For emails with attachments: extract every attachment once (reused for the
+            # email's enrichment context and for the attachment sub-documents)
             attachment_summaries = []
+            extracted_attachments = None
             if process_attachments and metadata.get('has_attachments', False):
                 attachment_paths = metadata.get('attachment_paths', [])
                 if attachment_paths:
-                    logger.info(f"📎 Extracting summaries from {len(attachment_paths)} attachments for email context...")
+                    logger.info(f"📎 Extracting {len(attachment_paths)} attachments for email context...")
+                    extracted_attachments = await self._extract_attachments(attachment_paths, process_ocr)
                     attachment_summaries = await self._extract_attachment_summaries(
                         attachment_paths=attachment_paths,
-                        process_ocr=process_ocr
+                        process_ocr=process_ocr,
+                        extracted=extracted_attachments
                     )
 
                     # Add attachment context to email content
@@ -1305,7 +1369,8 @@ class RAGService:
                         parent_doc_id=result.doc_id,
                         parent_metadata=metadata,
                         process_ocr=process_ocr,
-                        generate_obsidian=generate_obsidian
+                        generate_obsidian=generate_obsidian,
+                        extracted=extracted_attachments
                     )
 
             return result
@@ -1313,59 +1378,99 @@ class RAGService:
             logger.error(f"File processing failed for {file_path}: {e}")
             raise
 
+    @staticmethod
+    def _is_small_image(att_path_obj: Path) -> bool:
+        """Small images (< 50KB) are logos/icons, not content"""
+        return (
+            att_path_obj.suffix.lower() in _IMAGE_SUFFIXES
+            and att_path_obj.exists()
+            and att_path_obj.stat().st_size < 50000
+        )
+
+    async def _extract_attachments(
+        self,
+        attachment_paths: List[str],
+        process_ocr: bool = False
+    ) -> Dict[str, Optional[Tuple[str, DocumentType, Dict[str, Any]]]]:
+        """
+        Extract text from every attachment of an email, once
+
+        Args:
+            attachment_paths: List of paths to attachment files
+            process_ocr: Enable OCR for image attachments
+
+        Returns:
+            Dict of attachment path -> (content, doc_type, metadata), or None
+            for attachments that are skipped (logos, failed or empty extraction)
+        """
+        semaphore = asyncio.Semaphore(EMAIL_ATTACHMENT_CONCURRENCY)
+
+        async def extract(att_path: str):
+            att_path_obj = Path(att_path)
+            if self._is_small_image(att_path_obj):
+                logger.debug(f"   ⏭️  Skipping small image: {att_path_obj.name}")
+                return None
+            async with semaphore:
+                try:
+                    with trace_span("extract_attachment", kind="file_io", file=att_path_obj.name):
+                        content, doc_type, att_metadata = await self.document_service.extract_text_from_file(
+                            att_path,
+                            process_ocr=process_ocr
+                        )
+                except Exception as e:
+                    logger.warning(f"   ⚠️  Failed to extract attachment {att_path_obj.name}: {e}")
+                    return None
+
+            # Skip if no meaningful content extracted
+            if not content or len(content.strip()) < 20:
+                logger.debug(f"   ⏭️  Skipping attachment with minimal content: {att_path_obj.name}")
+                return None
+            return content, doc_type, att_metadata
+
+        results = await asyncio.gather(*(extract(att_path) for att_path in attachment_paths))
+        return dict(zip(attachment_paths, results))
+
     async def _process_email_attachments(
         self,
         attachment_paths: List[str],
         parent_doc_id: str,
         parent_metadata: Dict[str, Any],
         process_ocr: bool = False,
-        generate_obsidian: bool = True
+        generate_obsidian: bool = True,
+        extracted: Optional[Dict[str, Optional[Tuple[str, DocumentType, Dict[str, Any]]]]] = None
     ):
         """
         Process email attachments as separate documents
 
+        Attachments are processed concurrently (at most
+        EMAIL_ATTACHMENT_CONCURRENCY at a time); the parent email's links are
+        updated once, after all of them finished.
+
         Args:
             attachment_paths: List of paths to attachment files
             parent_doc_id: Document ID of parent email
             parent_metadata: Metadata from parent email (for threading context)
             process_ocr: Enable OCR for image attachments
             generate_obsidian: Generate Obsidian markdown for attachments
+            extracted: Result of _extract_attachments (extracted here if None)
         """
-        success_count = 0
-        skip_count = 0
-        attachment_doc_ids = []  # Collect attachment doc IDs for WikiLinks
+        if extracted is None:
+            extracted = await self._extract_attachments(attachment_paths, process_ocr)
 
-        for att_path in attachment_paths:
-            att_path_obj = Path(att_path)
-
-            # Skip non-document attachments (logos, icons, etc.)
-            if att_path_obj.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico']:
-                # Only process if they're large enough to be content (not logos)
-                if att_path_obj.exists() and att_path_obj.stat().st_size < 50000:  # < 50KB = likely logo/icon
-                    logger.debug(f"   ⏭️  Skipping small image: {att_path_obj.name} ({att_path_obj.stat().st_size} bytes)")
-                    skip_count += 1
-                    continue
+        semaphore = asyncio.Semaphore(EMAIL_ATTACHMENT_CONCURRENCY)
 
-            try:
-                # Extract content from attachment
-                content, doc_type, att_metadata = await self.document_service.extract_text_from_file(
-                    att_path,
-                    process_ocr=process_ocr
-                )
-
-                # Skip if no meaningful content extracted
-                if not content or len(content.strip()) < 20:
-                    logger.debug(f"   ⏭️  Skipping attachment with minimal content: {att_path_obj.name}")
-                    skip_count += 1
-                    continue
+        async def process(att_path: str, content: str, doc_type: DocumentType, att_metadata: Dict[str, Any]):
+            att_path_obj = Path(att_path)
 
-                # Enrich attachment metadata with parent context
-                att_metadata['parent_doc_id'] = parent_doc_id
-                att_metadata['thread_id'] = parent_metadata.get('thread_id', '')
-                att_metadata['subject'] = f"Attachment: {parent_metadata.get('subject', 'Email')}"
-                att_metadata['is_attachment'] = True
-                att_metadata['parent_sender'] = parent_metadata.get('sender', 'Unknown')
+            # Enrich attachment metadata with parent context
+            att_metadata = dict(att_metadata)
+            att_metadata['parent_doc_id'] = parent_doc_id
+            att_metadata['thread_id'] = parent_metadata.get('thread_id', '')
+            att_metadata['subject'] = f"Attachment: {parent_metadata.get('subject', 'Email')}"
+            att_metadata['is_attachment'] = True
+            att_metadata['parent_sender'] = parent_metadata.get('sender', 'Unknown')
 
+            async with semaphore:
                 # Process as regular document
                 result = await self.process_document(
                     content=content,
@@ -1377,23 +1482,31 @@ class RAGService:
                     use_critic=False,  # Skip critic for attachments (cost optimization)
                     use_iteration=False
                 )
+            logger.info(f"   ✅ Processed attachment: {att_path_obj.name}")
+            return result
 
-                # Collect attachment doc ID and filename for WikiLinks
-                if result.success and result.doc_id:
-                    attachment_doc_ids.append({
-                        'doc_id': result.doc_id,
-                        'filename': att_path_obj.name,
-                        'obsidian_path': result.obsidian_path
-                    })
-
-                success_count += 1
-                logger.info(f"   ✅ Processed attachment: {att_path_obj.name}")
+        to_process = [(att_path, extracted[att_path]) for att_path in attachment_paths if extracted.get(att_path)]
+        skip_count = len(attachment_paths) - len(to_process)
+        results = await asyncio.gather(
+            *(process(att_path, *extraction) for att_path, extraction in to_process),
+            return_exceptions=True
+        )
 
-            except Exception as e:
-                logger.warning(f"   ⚠️  Failed to process attachment {att_path_obj.name}: {e}")
+        success_count = 0
+        attachment_doc_ids = []  # Collect attachment doc IDs for WikiLinks (in attachment order)
+        for (att_path, _), result in zip(to_process, results):
+            if isinstance(result, Exception):
+                logger.warning(f"   ⚠️  Failed to process attachment {Path(att_path).name}: {result}")
                 continue
+            success_count += 1
+            if result.success and result.doc_id:
+                attachment_doc_ids.append({
+                    'doc_id': result.doc_id,
+                    'filename': Path(att_path).name,
+                    'obsidian_path': result.obsidian_path
+                })
 
-        # Update parent email with WikiLinks to attachments
+        # Update parent email with WikiLinks to all attachments in one write
         if attachment_doc_ids and generate_obsidian:
             await self._update_parent_with_attachment_links(parent_doc_id, attachment_doc_ids)
 
@@ -1402,7 +1515,8 @@ class RAGService:
     async def _extract_attachment_summaries(
         self,
         attachment_paths: List[str],
-        process_ocr: bool = False
+        process_ocr: bool = False,
+        extracted: Optional[Dict[str, Optional[Tuple[str, DocumentType, Dict[str, Any]]]]] = None
     ) -> List[Dict[str, str]]:
         """
         Extract quick summaries from attachments for email enrichment context
@@ -1410,55 +1524,42 @@ class RAGService:
         Args:
             attachment_paths: List of paths to attachment files
             process_ocr: Enable OCR for image attachments
+            extracted: Result of _extract_attachments (extracted here if None)
 
         Returns:
             List of dicts with filename and summary
         """
+        if extracted is None:
+            extracted = await self._extract_attachments(attachment_paths, process_ocr)
+
         summaries = []
 
         for att_path in attachment_paths:
             att_path_obj = Path(att_path)
+            extraction = extracted.get(att_path)
+            if extraction is None:
+                continue
 
-            # Check file size first to avoid OOM on large attachments
+            # Large attachments (>1MB) are left out of the email's context;
+            # they are still processed as separate documents
             if att_path_obj.exists():
                 file_size = att_path_obj.stat().st_size
-
-                # Skip very large attachments (>1MB) for summary extraction
-                # They will still be processed as separate documents later
                 if file_size > 1_000_000:  # 1MB
                     logger.info(f"   ⏭️  Skipping large attachment for summary: {att_path_obj.name} ({file_size / 1_000_000:.1f}MB)")
                     continue
 
-            # Skip non-document attachments (logos, icons, etc.)
-            if att_path_obj.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico']:
-                if att_path_obj.exists() and att_path_obj.stat().st_size < 50000:  # < 50KB
-                    continue
-
-            try:
-                # Extract content from attachment
-                content, doc_type, att_metadata = await self.document_service.extract_text_from_file(
-                    att_path,
-                    process_ocr=process_ocr
-                )
+            content, doc_type, _ = extraction
 
-                # Skip if no meaningful content
-                if not content or len(content.strip()) < 20:
-                    continue
+            # Generate quick summary (first 500 chars)
+            summary = content[:500].strip()
+            if len(content) > 500:
+                summary += "..."
 
-                # Generate quick summary (first 500 chars)
-                summary = content[:500].strip()
-                if len(content) > 500:
-                    summary += "..."
-
-                summaries.append({
-                    'filename': att_path_obj.name,
-                    'summary': summary,
-                    'doc_type': str(doc_type)
-                })
-
-            except Exception as e:
-                logger.warning(f"   ⚠️  Failed to extract summary from {att_path_obj.name}: {e}")
-                continue
+            summaries.append({
+                'filename': att_path_obj.name,
+                'summary': summary,
+                'doc_type': str(doc_type)
+            })
 
         return summaries
 
@@ -1475,6 +1576,10 @@ class RAGService:
             attachment_info: List of dicts with doc_id, filename, obsidian_path
         """
         try:
+            # Parent export may still be queued; flush so the glob can find it
+            write_queue = self.obsidian_service.write_queue
+            write_queue.flush()
+
             # Find parent Obsidian file
             obsidian_path = Path(self.settings.obsidian_path)
             parent_files = list(obsidian_path.glob(f"*{parent_doc_id[:8]}*.md"))
@@ -1486,8 +1591,7 @@ class RAGService:
             parent_file = parent_files[0]
 
             # Read current content
-            with open(parent_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = write_queue.read_text(parent_file) or ""
 
             # Replace file path listings with WikiLinks
             if "--- Attachments ---" in content:
@@ -1517,8 +1621,7 @@ class RAGService:
                     new_lines.append(line)
 
                 # Write updated content
-                with open(parent_file, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(new_lines))
+                write_queue.write_text(parent_file, '\n'.join(new_lines))
 
                 logger.info(f"✅ Updated parent email with {len(attachment_info)} attachment WikiLinks")
 
@@ -7,6 +7,8 @@ Features:
 - Hit/miss tracking with statistics
 - Configurable size and TTL
 - Thread-safe operations
+- Shared across uvicorn workers when SHARED_STATE_BACKEND is set
+  (SharedSearchResultCache)
 
 Performance Impact:
 - 200-500ms saved per cached query
@@ -21,6 +23,8 @@ from typing import List, Dict, Optional, Any
 from collections import OrderedDict
 import threading
 
+from src.services.shared_state_service import SharedStateStore, get_shared_state
+
 logger = logging.getLogger(__name__)
 
 
@@ -192,6 +196,94 @@ class SearchResultCache:
             logger.info(f"🔄 Cache invalidated for query: {query[:50]}...")
 
 
+class SharedSearchResultCache(SearchResultCache):
+    """
+    Search cache stored in the cross-worker SharedStateStore
+
+    Every worker sees the same entries and hit/miss counts, so a query cached
+    by one worker is a hit on all of them and clear() invalidates everywhere.
+    """
+
+    PREFIX = "search_cache:"
+
+    def __init__(self, store: SharedStateStore, max_size: int = 500, ttl_seconds: int = 300):
+        """
+        Initialize shared search result cache
+
+        Args:
+            store: Shared state store
+            max_size: Maximum cache entries across all workers (LRU eviction)
+            ttl_seconds: Time-to-live in seconds
+        """
+        self.store = store
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        logger.info(f"🚀 Shared search cache initialized (size: {max_size}, TTL: {ttl_seconds}s)")
+
+    def get(
+        self,
+        query: str,
+        top_k: int,
+        filter_dict: Optional[Dict] = None,
+        search_type: str = "hybrid"
+    ) -> Optional[List[Dict]]:
+        key = self.PREFIX + self._make_key(query, top_k, filter_dict, search_type)
+        results = self.store.get(key)
+        if results is None:
+            self.store.incr(self.PREFIX + "misses")
+            logger.debug(f"❌ Shared cache MISS for query: {query[:50]}...")
+            return None
+        self.store.incr(self.PREFIX + "hits")
+        logger.debug(f"✅ Shared cache HIT for query: {query[:50]}...")
+        return results
+
+    def set(
+        self,
+        query: str,
+        top_k: int,
+        results: List[Dict],
+        filter_dict: Optional[Dict] = None,
+        search_type: str = "hybrid"
+    ):
+        key = self.PREFIX + self._make_key(query, top_k, filter_dict, search_type)
+        self.store.set(key, results, ttl_seconds=self.ttl_seconds)
+        self.store.evict(self.PREFIX, self.max_size)
+        logger.debug(f"💾 Cached results in shared store for query: {query[:50]}...")
+
+    @property
+    def hits(self) -> int:
+        return int(self.store.get_counter(self.PREFIX + "hits"))
+
+    @property
+    def misses(self) -> int:
+        return int(self.store.get_counter(self.PREFIX + "misses"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "size": self.store.count(self.PREFIX),
+            "max_size": self.max_size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total > 0 else 0.0,
+            "ttl_seconds": self.ttl_seconds,
+            "total_requests": total,
+            "shared": True
+        }
+
+    def clear(self):
+        """Clear cache and statistics for all workers"""
+        self.store.clear(self.PREFIX)
+        logger.info("✅ Shared search cache cleared")
+
+    def invalidate_query(self, query: str):
+        """Invalidate cached results (clears the whole shared cache, like the local cache)"""
+        self.clear()
+        logger.info(f"🔄 Cache invalidated for query: {query[:50]}...")
+
+
 # Singleton instance
 _search_cache = None
 
@@ -208,11 +300,16 @@ def get_search_cache(
         ttl_seconds: TTL in seconds (default 5 minutes)
 
     Returns:
-        SearchResultCache instance
+        SearchResultCache instance (SharedSearchResultCache when a shared
+        state backend is configured)
     """
     global _search_cache
     if _search_cache is None:
-        _search_cache = SearchResultCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        store = get_shared_state()
+        if store is not None:
+            _search_cache = SharedSearchResultCache(store, max_size=max_size, ttl_seconds=ttl_seconds)
+        else:
+            _search_cache = SearchResultCache(max_size=max_size, ttl_seconds=ttl_seconds)
     return _search_cache
 
 
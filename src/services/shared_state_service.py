@@ -0,0 +1,317 @@
+"""
+Shared State Service - Cross-worker state for multi-worker deployments
+
+With ``uvicorn --workers N`` every worker process has its own module
+globals: its own search cache (split hit rate), its own BM25 index (stale
+until that worker ingests the document itself) and its own cost tracker
+(each worker enforcing the full daily budget). This store gives the workers
+on one host a common view without an external server.
+
+Backends (SHARED_STATE_BACKEND):
+- local: no shared store, services keep per-process state (default; single
+  worker, tests)
+- sqlite: SQLite database in WAL mode, by default on /dev/shm so it lives in
+  shared memory; safe for concurrent readers/writers across processes
+
+Features:
+- Key/value entries with TTL and least-recently-used eviction (search cache)
+- Atomic float counters (cost budget, cache hit/miss counts)
+- Append-only streams that workers replay incrementally (BM25 sparse index)
+- One connection per thread; all values JSON-encoded
+
+Performance:
+- Reads/writes are single indexed statements (~20-50μs on tmpfs)
+- Stream replay only fetches entries after the caller's last sequence number
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "local").lower()
+SHARED_STATE_PATH = os.getenv(
+    "SHARED_STATE_PATH",
+    "/dev/shm/rag_shared_state.db" if os.path.isdir("/dev/shm")
+    else os.path.join(tempfile.gettempdir(), "rag_shared_state.db")
+)
+SHARED_STATE_TIMEOUT_S = float(os.getenv("SHARED_STATE_TIMEOUT_S", "5"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS kv_accessed ON kv (accessed_at);
+CREATE TABLE IF NOT EXISTS counters (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS streams (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    stream TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS streams_stream_seq ON streams (stream, seq);
+"""
+
+
+# Thread-locals holding connections inherited over fork() (kept alive, never closed)
+_inherited_connections: List[threading.local] = []
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """[low, high) key range covering every key starting with prefix"""
+    return prefix, prefix + "\U0010ffff"
+
+
+class SharedStateStore:
+    """
+    SQLite-backed key/value store, counters and streams shared by processes
+
+    All methods are thread-safe and process-safe; writes use short
+    IMMEDIATE transactions so concurrent workers serialize on the WAL lock.
+    """
+
+    def __init__(self, path: str = SHARED_STATE_PATH, timeout_s: float = SHARED_STATE_TIMEOUT_S):
+        """
+        Initialize shared state store
+
+        Args:
+            path: Database file (":memory:" is per-connection and only useful in tests
+                  with a single thread)
+            timeout_s: How long a writer waits for the lock held by another worker
+        """
+        self.path = path
+        self.timeout_s = timeout_s
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+        logger.info(f"🔗 Shared state store at {path}")
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # Forked worker: SQLite connections must not cross fork(), and closing
+            # the inherited one would drop locks held by the parent - just leave it
+            _inherited_connections.append(self._local)
+            self._local = threading.local()
+            self._pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout_s, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, sql: str, params: tuple = ()) -> Tuple[List[tuple], Optional[int]]:
+        """Run one statement in its own transaction; returns (RETURNING rows, lastrowid)"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(sql, params)
+            rows = cursor.fetchall()  # RETURNING rows must be consumed before COMMIT
+            conn.execute("COMMIT")
+            return rows, cursor.lastrowid
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------
+    # Key/value with TTL
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, touch: bool = True) -> Optional[Any]:
+        """
+        Get a value (None if missing or expired)
+
+        Args:
+            key: Entry key
+            touch: Update the access time used for LRU eviction
+        """
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM kv WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            self.delete(key)
+            return None
+        if touch:
+            self._write("UPDATE kv SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a JSON-serializable value, optionally expiring after ttl_seconds"""
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        self._write(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, default=str), expires_at, now)
+        )
+
+    def delete(self, key: str):
+        self._write("DELETE FROM kv WHERE key = ?", (key,))
+
+    def count(self, prefix: str) -> int:
+        """Number of unexpired entries whose key starts with prefix"""
+        low, high = _prefix_range(prefix)
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM kv WHERE key >= ? AND key < ? AND (expires_at IS NULL OR expires_at > ?)",
+            (low, high, time.time())
+        ).fetchone()[0]
+
+    def evict(self, prefix: str, max_entries: int) -> int:
+        """
+        Drop expired entries and the least recently used ones beyond max_entries
+
+        Returns:
+            Number of entries removed
+        """
+        low, high = _prefix_range(prefix)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = conn.execute(
+                "DELETE FROM kv WHERE key >= ? AND key < ? AND expires_at IS NOT NULL AND expires_at <= ?",
+                (low, high, time.time())
+            ).rowcount
+            removed += conn.execute(
+                "DELETE FROM kv WHERE key IN ("
+                "  SELECT key FROM kv WHERE key >= ? AND key < ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?"
+                ")",
+                (low, high, max_entries)
+            ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    def clear(self, prefix: str):
+        """Delete all entries and counters whose key starts with prefix"""
+        low, high = _prefix_range(prefix)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM kv WHERE key >= ? AND key < ?", (low, high))
+            conn.execute("DELETE FROM counters WHERE key >= ? AND key < ?", (low, high))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    def incr(self, key: str, amount: float = 1.0) -> float:
+        """Atomically add amount to a counter and return the new value"""
+        return self._write(
+            "INSERT INTO counters (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value RETURNING value",
+            (key, amount)
+        )[0][0][0]
+
+    def get_counter(self, key: str) -> float:
+        row = self._conn().execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0.0
+
+    def get_counters(self, prefix: str) -> Dict[str, float]:
+        """All counters whose key starts with prefix (keys returned without the prefix)"""
+        low, high = _prefix_range(prefix)
+        rows = self._conn().execute(
+            "SELECT key, value FROM counters WHERE key >= ? AND key < ?", (low, high)
+        ).fetchall()
+        return {key[len(prefix):]: value for key, value in rows}
+
+    # ------------------------------------------------------------------
+    # Streams
+    # ------------------------------------------------------------------
+
+    def append(self, stream: str, value: Any) -> int:
+        """Append an entry to a stream and return its sequence number"""
+        return self._write(
+            "INSERT INTO streams (stream, value) VALUES (?, ?)",
+            (stream, json.dumps(value, default=str))
+        )[1]
+
+    def read(self, stream: str, after_seq: int = 0) -> List[Tuple[int, Any]]:
+        """Entries of a stream with sequence number > after_seq, in order"""
+        rows = self._conn().execute(
+            "SELECT seq, value FROM streams WHERE stream = ? AND seq > ? ORDER BY seq",
+            (stream, after_seq)
+        ).fetchall()
+        return [(seq, json.loads(value)) for seq, value in rows]
+
+    def reset_stream(self, stream: str) -> int:
+        """
+        Drop all entries of a stream
+
+        Returns:
+            Sequence number marking the reset; readers whose position is older
+            than the stream's generation start over
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM streams WHERE stream = ?", (stream,))
+            generation = conn.execute(
+                "INSERT INTO counters (key, value) VALUES (?, 1) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + 1 RETURNING value",
+                (f"stream_generation:{stream}",)
+            ).fetchall()[0][0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return int(generation)
+
+    def stream_generation(self, stream: str) -> int:
+        """Incremented by every reset_stream()"""
+        return int(self.get_counter(f"stream_generation:{stream}"))
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# Singleton instance
+_shared_state: Optional[SharedStateStore] = None
+_shared_state_lock = threading.Lock()
+
+
+def get_shared_state() -> Optional[SharedStateStore]:
+    """
+    Get the process-wide shared state store
+
+    Returns:
+        SharedStateStore, or None when SHARED_STATE_BACKEND=local (services
+        then keep their per-process state)
+    """
+    global _shared_state
+    if SHARED_STATE_BACKEND == "local":
+        return None
+    if SHARED_STATE_BACKEND != "sqlite":
+        raise ValueError(f"Unknown SHARED_STATE_BACKEND: {SHARED_STATE_BACKEND} (expected local or sqlite)")
+    if _shared_state is None:
+        with _shared_state_lock:
+            if _shared_state is None:
+                _shared_state = SharedStateStore()
+    return _shared_state
@@ -7,10 +7,17 @@ Manages an evolving tag hierarchy that:
 - Suggests specific, contextual tags
 - Maintains consistency across documents
 - Supports SmartNotes/Zettelkasten workflow patterns
+
+Performance:
+- Frequency, domain and co-occurrence counters are updated incrementally on
+  add/delete; the collection scan is only a first-use/repair operation
+- Similar-tag lookup uses a trigram + path-component index
 """
 
+import asyncio
 import logging
 import re
+import threading
 from typing import List, Dict, Set, Tuple, Optional
 from collections import Counter, defaultdict
 from datetime import datetime
@@ -19,6 +26,21 @@ import json
 logger = logging.getLogger(__name__)
 
 
+def _normalize_tag(tag: str) -> str:
+    """Normalized form used for similarity matching"""
+    return tag.lower().replace("-", " ").replace("_", " ")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _parse_tags(metadata: Dict) -> List[str]:
+    """Parse tags from a comma-separated metadata string"""
+    tags_str = metadata.get("tags", "") or ""
+    return [t.strip() for t in tags_str.split(",") if t.strip()]
+
+
 class TagTaxonomyService:
     """Manages evolving tag taxonomy with awareness of existing tags"""
 
@@ -26,6 +48,8 @@ class TagTaxonomyService:
         self.collection = collection
         self.tag_cache = {}  # Cache of existing tags
         self.last_refresh = None
+        self._lock = threading.RLock()
+        self._reset_counters()
 
         # Base taxonomy (SmartNotes methodology - always available)
         self.base_taxonomy = {
@@ -46,53 +70,44 @@ class TagTaxonomyService:
             }
         }
 
+    def _reset_counters(self):
+        """Reset incremental counters and the similarity index"""
+        self._frequency: Counter = Counter()
+        self._co_occurrence: Dict[str, Counter] = defaultdict(Counter)
+        self._by_domain: Dict[str, Counter] = defaultdict(Counter)
+        self._total_docs = 0
+
+        # Similarity index: trigram -> tags, path component -> tags
+        self._trigram_index: Dict[str, Set[str]] = defaultdict(set)
+        self._component_index: Dict[str, Set[str]] = defaultdict(set)
+        self._trigram_counts: Dict[str, int] = {}
+        self._short_tags: Set[str] = set()
+        self._tag_order: Dict[str, int] = {}
+        self._next_order = 0
+
     async def refresh_tag_cache(self, force: bool = False):
-        """Refresh cache of existing tags from ChromaDB"""
+        """
+        Build tag counters from ChromaDB
+
+        Counters are kept up to date incrementally by ``add_metadatas`` and
+        ``remove_metadatas``, so the full scan only runs on first use, after
+        ``invalidate()``, or when forced (repair).
+        """
         if not self.collection:
             return
 
-        # Refresh every 5 minutes or when forced
         if not force and self.last_refresh:
-            elapsed = (datetime.now() - self.last_refresh).seconds
-            if elapsed < 300:
-                return
+            return
 
         try:
             # Get all documents with tags
-            all_docs = self.collection.get(include=["metadatas"])
-
-            tag_frequency = Counter()
-            tag_co_occurrence = defaultdict(Counter)
-            domain_tags = defaultdict(set)
-
-            for metadata in all_docs.get("metadatas", []):
-                if not metadata:
-                    continue
-
-                # Parse tags from comma-separated string
-                tags_str = metadata.get("tags", "")
-                doc_tags = [t.strip() for t in tags_str.split(",") if t.strip()]
-
-                domain = metadata.get("domain", "general")
-
-                # Track frequency
-                for tag in doc_tags:
-                    tag_frequency[tag] += 1
-                    domain_tags[domain].add(tag)
-
-                # Track co-occurrence (which tags appear together)
-                for i, tag1 in enumerate(doc_tags):
-                    for tag2 in doc_tags[i+1:]:
-                        tag_co_occurrence[tag1][tag2] += 1
-                        tag_co_occurrence[tag2][tag1] += 1
-
-            self.tag_cache = {
-                "frequency": dict(tag_frequency),
-                "co_occurrence": dict(tag_co_occurrence),
-                "by_domain": dict(domain_tags),
-                "total_docs": len(all_docs.get("ids", [])),
-                "unique_tags": len(tag_frequency)
-            }
+            all_docs = await asyncio.to_thread(self.collection.get, include=["metadatas"])
+
+            with self._lock:
+                self._reset_counters()
+                self._total_docs = len(all_docs.get("ids", []))
+                self._apply(all_docs.get("metadatas", []), 1)
+                self._publish()
 
             self.last_refresh = datetime.now()
 
@@ -101,6 +116,134 @@ class TagTaxonomyService:
         except Exception as e:
             logger.error(f"Failed to refresh tag cache: {e}")
 
+    def add_metadatas(self, metadatas: List[Dict]):
+        """
+        Count tags of newly stored chunks
+
+        Args:
+            metadatas: Chunk metadata as written to ChromaDB
+        """
+        with self._lock:
+            self._total_docs += len(metadatas)
+            self._apply(metadatas, 1)
+            self._publish()
+
+    def remove_metadatas(self, metadatas: List[Dict]):
+        """
+        Uncount tags of deleted chunks
+
+        Args:
+            metadatas: Metadata of the deleted chunks
+        """
+        with self._lock:
+            self._total_docs = max(0, self._total_docs - len(metadatas))
+            self._apply(metadatas, -1)
+            self._publish()
+
+    def invalidate(self):
+        """Force a full rebuild on the next refresh (e.g. after bulk deletes)"""
+        self.last_refresh = None
+
+    def _apply(self, metadatas: List[Dict], delta: int):
+        for metadata in metadatas:
+            if not metadata:
+                continue
+
+            doc_tags = _parse_tags(metadata)
+            domain = metadata.get("domain", "general")
+
+            # Track frequency
+            for tag in doc_tags:
+                self._bump(self._frequency, tag, delta)
+                self._bump(self._by_domain[domain], tag, delta)
+                if delta > 0 and tag not in self._tag_order:
+                    self._index_tag(tag)
+                elif delta < 0 and tag not in self._frequency and tag in self._tag_order:
+                    self._unindex_tag(tag)
+            if not self._by_domain[domain]:
+                del self._by_domain[domain]
+
+            # Track co-occurrence (which tags appear together)
+            for i, tag1 in enumerate(doc_tags):
+                for tag2 in doc_tags[i+1:]:
+                    self._bump(self._co_occurrence[tag1], tag2, delta)
+                    self._bump(self._co_occurrence[tag2], tag1, delta)
+                    for tag in (tag1, tag2):
+                        if not self._co_occurrence[tag]:
+                            del self._co_occurrence[tag]
+
+    @staticmethod
+    def _bump(counter: Counter, key: str, delta: int):
+        value = counter[key] + delta
+        if value > 0:
+            counter[key] = value
+        else:
+            del counter[key]
+
+    def _publish(self):
+        """Expose live counters through the tag_cache view"""
+        self.tag_cache = {
+            "frequency": self._frequency,
+            "co_occurrence": self._co_occurrence,
+            "by_domain": self._by_domain,
+            "total_docs": self._total_docs,
+            "unique_tags": len(self._frequency)
+        }
+
+    def _index_tag(self, tag: str):
+        normalized = _normalize_tag(tag)
+        grams = _trigrams(normalized)
+        for gram in grams:
+            self._trigram_index[gram].add(tag)
+        for part in set(normalized.split("/")):
+            self._component_index[part].add(tag)
+        if not grams:
+            self._short_tags.add(tag)
+        self._trigram_counts[tag] = len(grams)
+        self._tag_order[tag] = self._next_order
+        self._next_order += 1
+
+    def _unindex_tag(self, tag: str):
+        normalized = _normalize_tag(tag)
+        for gram in _trigrams(normalized):
+            self._trigram_index[gram].discard(tag)
+            if not self._trigram_index[gram]:
+                del self._trigram_index[gram]
+        for part in set(normalized.split("/")):
+            self._component_index[part].discard(tag)
+            if not self._component_index[part]:
+                del self._component_index[part]
+        self._short_tags.discard(tag)
+        del self._trigram_counts[tag]
+        del self._tag_order[tag]
+
+    def _similarity_candidates(self, proposed_lower: str, proposed_parts: Set[str]) -> List[str]:
+        """
+        Tags that can score > 0 against the proposed tag
+
+        Substring matches share all trigrams of the shorter string, and
+        hierarchical matches share a path component, so the trigram and
+        component indexes give an exact candidate set.
+        """
+        grams = _trigrams(proposed_lower)
+        if not grams:
+            # Too short for trigrams: any tag containing it is a candidate
+            return list(self._frequency)
+
+        hits: Counter = Counter()
+        for gram in grams:
+            hits.update(self._trigram_index.get(gram, ()))
+
+        candidates = {
+            tag for tag, count in hits.items()
+            if count == len(grams) or count == self._trigram_counts[tag]
+        }
+        candidates.update(self._short_tags)
+        for part in proposed_parts:
+            candidates.update(self._component_index.get(part, ()))
+
+        return sorted(candidates, key=self._tag_order.__getitem__)
+
     def get_existing_tags_for_context(self, domain: str = None, limit: int = 50) -> List[str]:
         """Get existing tags to provide as context to LLM"""
         if not self.tag_cache or not self.tag_cache.get("frequency"):
@@ -114,12 +257,7 @@ class TagTaxonomyService:
             return domain_tags[:limit]
 
         # Otherwise return most frequent tags
-        sorted_tags = sorted(
-            self.tag_cache["frequency"].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        return [tag for tag, freq in sorted_tags[:limit]]
+        return [tag for tag, freq in self._frequency.most_common(limit)]
 
     def get_tag_statistics(self) -> Dict:
         """Get statistics about tag usage"""
@@ -130,13 +268,11 @@ class TagTaxonomyService:
         if not freq:
             return {}
 
-        frequencies = list(freq.values())
-
         return {
             "total_unique_tags": len(freq),
             "total_documents": self.tag_cache.get("total_docs", 0),
-            "avg_frequency": sum(frequencies) / len(frequencies) if frequencies else 0,
-            "most_used": sorted(freq.items(), key=lambda x: x[1], reverse=True)[:10],
+            "avg_frequency": sum(freq.values()) / len(freq),
+            "most_used": self._frequency.most_common(10),
             "domains": list(self.tag_cache.get("by_domain", {}).keys())
         }
 
@@ -145,14 +281,16 @@ class TagTaxonomyService:
         if not self.tag_cache or not self.tag_cache.get("frequency"):
             return []
 
-        existing_tags = list(self.tag_cache["frequency"].keys())
         similar = []
 
-        proposed_lower = proposed_tag.lower().replace("-", " ").replace("_", " ")
+        proposed_lower = _normalize_tag(proposed_tag)
         proposed_parts = set(proposed_lower.split("/"))
 
-        for existing_tag in existing_tags:
-            existing_lower = existing_tag.lower().replace("-", " ").replace("_", " ")
+        with self._lock:
+            candidates = self._similarity_candidates(proposed_lower, proposed_parts)
+
+        for existing_tag in candidates:
+            existing_lower = _normalize_tag(existing_tag)
             existing_parts = set(existing_lower.split("/"))
 
             # Exact match
@@ -3,6 +3,7 @@ Vector database service for ChromaDB operations
 
 Handles document storage, retrieval, and search operations
 """
+import asyncio
 import logging
 import uuid
 from typing import List, Dict, Any, Optional
@@ -93,15 +94,17 @@ class VectorService:
 
             # Add to ChromaDB
             if embeddings:
-                self.collection.add(
+                await asyncio.to_thread(
+                    self.collection.add,
                     ids=chunk_ids,
                     documents=chunk_texts,
                     metadatas=chunk_metadatas,
                     embeddings=embeddings
                 )
             else:
-                # Let ChromaDB generate embeddings
-                self.collection.add(
+                # Let ChromaDB generate embeddings (via the embedding broker)
+                await asyncio.to_thread(
+                    self.collection.add,
                     ids=chunk_ids,
                     documents=chunk_texts,
                     metadatas=chunk_metadatas
@@ -144,30 +147,7 @@ class VectorService:
                 return cached
 
         try:
-            # Perform similarity search
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=top_k,
-                where=filter,
-                include=["documents", "metadatas", "distances"]
-            )
-
-            # Format results
-            formatted_results = []
-
-            if results and results["ids"] and len(results["ids"]) > 0:
-                for i in range(len(results["ids"][0])):
-                    # Convert distance to similarity and clamp to [0, 1] range
-                    # ChromaDB distances can vary based on distance metric used
-                    distance = results["distances"][0][i]
-                    relevance_score = max(0.0, min(1.0, 1.0 - distance))
-
-                    formatted_results.append({
-                        "chunk_id": results["ids"][0][i],
-                        "content": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i],
-                        "relevance_score": relevance_score,
-                    })
+            formatted_results = (await self.dense_search_many([query], top_k=top_k, filter=filter))[0]
 
             # Store in cache
             if self.enable_cache and use_cache and self.cache:
@@ -180,6 +160,59 @@ class VectorService:
             logger.error(f"Search failed for query '{query}': {e}")
             raise
 
+    async def dense_search_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Dense search for several queries in one ChromaDB request (uncached)
+
+        All query texts are embedded in one batch and queried together, so N
+        queries cost roughly one round trip instead of N.
+
+        Args:
+            queries: Search query texts
+            top_k: Number of results per query
+            filter: Metadata filters applied to every query (optional)
+
+        Returns:
+            One result list per query, in input order
+        """
+        if not queries:
+            return []
+
+        # Perform similarity search (in a worker thread so concurrent
+        # searches and ingests can share embedding batches)
+        results = await asyncio.to_thread(
+            self.collection.query,
+            query_texts=list(queries),
+            n_results=top_k,
+            where=filter,
+            include=["documents", "metadatas", "distances"]
+        )
+
+        # Format results
+        formatted = []
+        for q in range(len(queries)):
+            formatted_results = []
+            if results and results["ids"] and len(results["ids"]) > q:
+                for i in range(len(results["ids"][q])):
+                    # Convert distance to similarity and clamp to [0, 1] range
+                    # ChromaDB distances can vary based on distance metric used
+                    distance = results["distances"][q][i]
+                    relevance_score = max(0.0, min(1.0, 1.0 - distance))
+
+                    formatted_results.append({
+                        "chunk_id": results["ids"][q][i],
+                        "content": results["documents"][q][i],
+                        "metadata": results["metadatas"][q][i],
+                        "relevance_score": relevance_score,
+                    })
+            formatted.append(formatted_results)
+        return formatted
+
     async def hybrid_search(
         self,
         query: str,
@@ -224,7 +257,8 @@ class VectorService:
                 query=query,
                 dense_results=dense_results,
                 top_k=top_k,
-                apply_mmr=apply_mmr
+                apply_mmr=apply_mmr,
+                filter=filter
             )
 
             # Store in cache
@@ -238,6 +272,64 @@ class VectorService:
             logger.error(f"Hybrid search failed for query '{query}': {e}")
             raise
 
+    async def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+        apply_mmr: bool = True,
+        use_cache: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Hybrid search for a batch of queries
+
+        Cached queries are answered from the search cache (shared with
+        hybrid_search); the rest are embedded and queried in one ChromaDB
+        request, BM25-scored in one vectorized pass and fused per query.
+
+        Args:
+            queries: Search query texts
+            top_k: Number of results per query
+            filter: Metadata filters applied to every query (optional)
+            apply_mmr: Whether to apply MMR for diversity
+            use_cache: Use cache if enabled (default True)
+
+        Returns:
+            One hybrid result list per query, in input order
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        caching = self.enable_cache and use_cache and self.cache
+
+        # Distinct queries not in the cache
+        pending = []
+        for query in dict.fromkeys(queries):
+            cached = self.cache.get(query, top_k, filter, search_type="hybrid") if caching else None
+            if cached is not None:
+                results[query] = cached
+            else:
+                pending.append(query)
+
+        if pending:
+            try:
+                dense_results_list = await self.dense_search_many(pending, top_k=top_k * 3, filter=filter)
+                hybrid_results_list = self.hybrid_search_service.hybrid_search_many(
+                    pending, dense_results_list, top_k=top_k, apply_mmr=apply_mmr, filter=filter
+                )
+            except Exception as e:
+                logger.error(f"Batch search failed for {len(pending)} queries: {e}")
+                raise
+
+            for query, hybrid_results in zip(pending, hybrid_results_list):
+                results[query] = hybrid_results
+                if caching:
+                    self.cache.set(query, top_k, hybrid_results, filter, search_type="hybrid")
+
+        logger.info(
+            f"🔀 Batch search: {len(queries)} queries ({len(results) - len(pending)} cached, "
+            f"{len(pending)} searched in one request)"
+        )
+        return [results[query] for query in queries]
+
     async def delete_document(self, doc_id: str) -> bool:
         """
         Delete all chunks for a document
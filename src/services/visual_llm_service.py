@@ -12,7 +12,10 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from PIL import Image
 import io
-import litellm
+
+from src.core.startup_profiler import lazy_import
+
+litellm = lazy_import("litellm")
 
 try:
     from pdf2image import convert_from_path
@@ -0,0 +1,259 @@
+"""
+Watch Folder Ingestion - Debounced, batched ingestion of dropped files
+
+watchdog delivers filesystem events on its own thread, where there is no
+running event loop, and fires as soon as a file is created - usually before
+it has been fully written. This ingestor hands events to the application's
+event loop, waits until each file stops changing and feeds a bounded queue
+that is drained in batches.
+
+Features:
+- Thread-safe event hand-off (loop.call_soon_threadsafe); events arriving
+  before the loop starts are buffered
+- Debounce: a file is ingested once its size and mtime have been stable for
+  WATCH_DEBOUNCE_S
+- Deduplication by path (repeated created/modified events) and by content
+  hash (the same file dropped twice while the first copy is still queued;
+  later copies are caught by the pipeline's duplicate detection)
+- Bounded queue (WATCH_QUEUE_SIZE) with batches of WATCH_BATCH_SIZE files
+  processed concurrently - a dropped folder of 500 files no longer spawns
+  500 tasks at once
+
+Performance:
+- Stability checks are one stat() per pending file per poll interval
+- At most WATCH_BATCH_SIZE files are extracted/enriched at the same time
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from watchdog.events import FileSystemEventHandler
+
+from src.services.extraction_cache_service import hash_file
+
+logger = logging.getLogger(__name__)
+
+WATCH_DEBOUNCE_S = float(os.getenv("WATCH_DEBOUNCE_S", "2.0"))
+WATCH_POLL_INTERVAL_S = float(os.getenv("WATCH_POLL_INTERVAL_S", "0.5"))
+WATCH_BATCH_SIZE = int(os.getenv("WATCH_BATCH_SIZE", "4"))
+WATCH_QUEUE_SIZE = int(os.getenv("WATCH_QUEUE_SIZE", "100"))
+
+# Temporary files written by editors, browsers and sync clients
+_IGNORED_SUFFIXES = {".tmp", ".part", ".crdownload", ".swp", ".download"}
+
+
+class WatchFolderIngestor:
+    """
+    Debounces watch-folder events and ingests stable files in batches
+
+    Call ``notify`` from any thread; ``start``/``stop`` from the event loop.
+    """
+
+    def __init__(
+        self,
+        process_file: Callable[[str], Awaitable[Any]],
+        debounce_s: float = WATCH_DEBOUNCE_S,
+        poll_interval_s: float = WATCH_POLL_INTERVAL_S,
+        batch_size: int = WATCH_BATCH_SIZE,
+        queue_size: int = WATCH_QUEUE_SIZE
+    ):
+        """
+        Initialize watch folder ingestor
+
+        Args:
+            process_file: Coroutine function ingesting one file path
+            debounce_s: Seconds a file's size/mtime must stay unchanged
+            poll_interval_s: How often pending files are checked
+            batch_size: Files processed concurrently per batch
+            queue_size: Stable files waiting for ingestion before the
+                        debouncer blocks (backpressure)
+        """
+        self.process_file = process_file
+        self.debounce_s = debounce_s
+        self.poll_interval_s = poll_interval_s
+        self.batch_size = max(1, batch_size)
+        self.queue_size = queue_size
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._early_events: List[str] = []
+        self._early_lock = threading.Lock()
+
+        # path -> ((size, mtime), monotonic time of last change); touched only on the loop
+        self._pending: Dict[str, Tuple[Tuple[int, float], float]] = {}
+        self._queued: Dict[str, str] = {}  # path -> content hash, queued or processing
+        self._queued_hashes: Dict[str, str] = {}  # content hash -> path
+
+        self.stats = {"events": 0, "queued": 0, "processed": 0, "failed": 0, "duplicates": 0, "batches": 0}
+
+    # ------------------------------------------------------------------
+    # Event hand-off
+    # ------------------------------------------------------------------
+
+    def notify(self, path: str):
+        """Report a created/modified file (safe to call from the watchdog thread)"""
+        if Path(path).suffix.lower() in _IGNORED_SUFFIXES or Path(path).name.startswith("."):
+            return
+        with self._early_lock:
+            loop = self._loop
+            if loop is None:
+                self._early_events.append(path)
+                return
+        loop.call_soon_threadsafe(self._on_event, path)
+
+    def _on_event(self, path: str):
+        self.stats["events"] += 1
+        if path in self._queued:
+            return
+        # (Re)start the debounce window; stat happens on the next poll
+        self._pending[path] = ((-1, -1.0), time.monotonic())
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the debouncer and batch worker on the running event loop"""
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            loop.create_task(self._debounce_loop()),
+            loop.create_task(self._worker()),
+        ]
+        with self._early_lock:
+            self._loop = loop
+            early, self._early_events = self._early_events, []
+        for path in early:
+            self._on_event(path)
+        logger.info(
+            f"👀 Watch folder ingestion started (debounce {self.debounce_s}s, batch {self.batch_size}, "
+            f"queue {self.queue_size})"
+        )
+
+    async def stop(self):
+        """Cancel the debouncer and worker (files still pending are picked up on the next start)"""
+        with self._early_lock:
+            self._loop = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ------------------------------------------------------------------
+    # Debounce
+    # ------------------------------------------------------------------
+
+    async def _debounce_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval_s)
+            try:
+                for path in self._stable_paths():
+                    await self._enqueue(path)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # One bad file must not end watch-folder ingestion
+                logger.error(f"❌ Watch folder debounce pass failed: {e}")
+
+    def _stable_paths(self) -> List[str]:
+        """Pending paths whose size and mtime have not changed for debounce_s"""
+        now = time.monotonic()
+        stable = []
+        for path, (signature, changed_at) in list(self._pending.items()):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                del self._pending[path]  # moved away or deleted before it settled
+                continue
+            except OSError as e:
+                del self._pending[path]
+                logger.warning(f"⚠️ Dropping unreadable watched file {path}: {e}")
+                continue
+            current = (stat.st_size, stat.st_mtime)
+            if current != signature:
+                self._pending[path] = (current, now)
+            elif now - changed_at >= self.debounce_s:
+                del self._pending[path]
+                stable.append(path)
+        return stable
+
+    async def _enqueue(self, path: str):
+        try:
+            file_hash = await asyncio.to_thread(hash_file, path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not read watched file {path}: {e}")
+            return
+
+        if file_hash in self._queued_hashes:
+            self.stats["duplicates"] += 1
+            logger.info(f"⏭️ Skipping {Path(path).name}: same content as queued {Path(self._queued_hashes[file_hash]).name}")
+            return
+
+        self._queued[path] = file_hash
+        self._queued_hashes[file_hash] = path
+        self.stats["queued"] += 1
+        await self._queue.put(path)  # blocks while the queue is full (backpressure)
+
+    # ------------------------------------------------------------------
+    # Batch worker
+    # ------------------------------------------------------------------
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            self.stats["batches"] += 1
+            logger.info(f"📥 Ingesting {len(batch)} watched file(s), {self._queue.qsize()} queued")
+            results = await asyncio.gather(*(self.process_file(path) for path in batch), return_exceptions=True)
+
+            for path, result in zip(batch, results):
+                self._queued_hashes.pop(self._queued.pop(path, None), None)
+                self._queue.task_done()
+                if isinstance(result, Exception):
+                    self.stats["failed"] += 1
+                    logger.error(f"❌ Watch file processing failed for {path}: {result}")
+                else:
+                    self.stats["processed"] += 1
+
+    async def join(self):
+        """Wait until every queued file has been processed (pending, unstable files excluded)"""
+        await self._queue.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending": len(self._pending),
+            "queue_size": self._queue.qsize() if self._queue else 0,
+            "running": self._loop is not None,
+        }
+
+
+class FileWatchHandler(FileSystemEventHandler):
+    """watchdog handler forwarding file events to a WatchFolderIngestor"""
+
+    def __init__(self, ingestor: WatchFolderIngestor):
+        self.ingestor = ingestor
+
+    def on_created(self, event):
+        if not event.is_directory:
+            logger.info(f"New file detected: {event.src_path}")
+            self.ingestor.notify(event.src_path)
+
+    def on_modified(self, event):
+        # Still being written - restarts the file's debounce window
+        if not event.is_directory:
+            self.ingestor.notify(event.src_path)
+
+    def on_moved(self, event):
+        # Renamed inside the folder (e.g. "x.pdf.part" -> "x.pdf"); files moved out
+        # after processing are ignored
+        if not event.is_directory and Path(event.dest_path).parent == Path(event.src_path).parent:
+            self.ingestor.notify(event.dest_path)
@@ -8,7 +8,7 @@ Tests structure-aware chunking including:
 - Chunk type determination
 """
 import pytest
-from src.services.chunking_service import ChunkingService, ChunkType, Chunk
+from src.services.chunking_service import ChunkingService, ChunkType, Chunk, TokenCounter
 
 
 # =============================================================================
@@ -253,6 +253,109 @@ Paragraph 2
         assert len(chunks) >= 1
 
 
+# =============================================================================
+# Structure Parser Tests
+# =============================================================================
+
+class TestMarkdownStructureParser:
+    """Test the single-pass Markdown structure parser"""
+
+    @pytest.fixture
+    def service(self):
+        return ChunkingService()
+
+    def test_section_types(self, service):
+        content = "# Title\nIntro\n- a\n- b\n| x |\n| y |\n```py\ncode\n```\ntext"
+
+        sections = service._parse_markdown_structure(content)
+
+        assert [s['type'] for s in sections] == ['heading', 'list', 'table', 'code', 'paragraph']
+        assert sections[3]['language'] == 'py'
+        assert sections[3]['content'] == ['```py', 'code', '```']
+
+    def test_parent_titles_are_strings(self, service):
+        content = "# A\n## B\ntext\n```\ncode\n```\n### C\n| t |"
+
+        sections = service._parse_markdown_structure(content)
+        by_type = {s['type']: s for s in sections}
+
+        assert sections[1]['title'] == 'B'
+        assert sections[1]['parent_titles'] == ['A']
+        assert by_type['code']['parent_titles'] == ['A', 'B']
+        assert by_type['table']['parent_titles'] == ['A', 'B', 'C']
+
+    def test_heading_stack_pops_siblings(self, service):
+        sections = service._parse_markdown_structure("# A\n## B\n## C\n# D\n## E")
+
+        assert [s['parent_titles'] for s in sections] == [[], ['A'], ['A'], [], ['D']]
+
+    def test_markers_inside_code_ignored(self, service):
+        sections = service._parse_markdown_structure("```\n# not a heading\n- not a list\n```")
+
+        assert len(sections) == 1
+        assert sections[0]['type'] == 'code'
+
+    def test_list_requires_marker_spacing(self, service):
+        sections = service._parse_markdown_structure("-notalist\n2024 was a year\n  * item\n10. ten")
+
+        assert sections[0]['type'] == 'paragraph'
+        assert sections[1]['type'] == 'list'
+        assert sections[1]['content'] == ['  * item', '10. ten']
+
+    def test_heading_ends_table(self, service):
+        sections = service._parse_markdown_structure("| a |\n# Title\ntext")
+
+        assert [s['type'] for s in sections] == ['table', 'heading']
+        assert sections[1]['content'] == ['# Title', 'text']
+
+    def test_leading_blank_lines_skipped(self, service):
+        sections = service._parse_markdown_structure("\n\nText\n\nMore")
+
+        assert sections[0]['content'] == ['Text', '', 'More']
+
+
+# =============================================================================
+# Token Counting Tests
+# =============================================================================
+
+class TestTokenCounting:
+    """Test optional exact token counting"""
+
+    def test_heuristic_by_default(self):
+        service = ChunkingService(tokenizer="")
+
+        assert service.token_counter is None
+        assert service.estimate_tokens("a" * 40) == 10
+
+    def test_unknown_tokenizer_falls_back(self):
+        service = ChunkingService(tokenizer="no-such-encoding")
+
+        assert service.token_counter is None
+        assert service.estimate_tokens("a" * 40) == 10
+
+    def test_exact_counts_are_cached(self):
+        pytest.importorskip("tiktoken")
+        try:
+            counter = TokenCounter("cl100k_base")
+        except Exception as e:  # encoding file not downloadable offline
+            pytest.skip(f"cl100k_base unavailable: {e}")
+
+        assert counter.count("") == 0
+        first = counter.count("hello world")
+        second = counter.count("hello world")
+
+        assert first == second == 2
+        assert counter.cache_info().hits == 1
+
+    def test_chunks_use_token_counter(self):
+        service = ChunkingService()
+        service.token_counter = type("FixedCounter", (), {"count": lambda self, text: 7})()
+
+        chunks = service.chunk_text("# Title\n\nBody text", preserve_structure=True)
+
+        assert chunks[0]['estimated_tokens'] == 7
+
+
 # =============================================================================
 # Chat Log Chunking Tests
 # =============================================================================
@@ -318,3 +421,33 @@ class TestChatLogChunking:
         assert 'Turn' in chunk_content
         assert 'User:' in chunk_content
         assert 'Assistant:' in chunk_content
+
+
+# =============================================================================
+# Section Window Tests
+# =============================================================================
+
+class TestSplitIntoSections:
+    """Test grouping sections into bounded windows (long-document enrichment)"""
+
+    def test_sections_grouped_under_limit(self):
+        content = "\n\n".join(f"## Part {i}\n\n" + "Sentence about the topic. " * 20 for i in range(10))
+
+        windows = ChunkingService().split_into_sections(content, max_chars=1500)
+
+        assert len(windows) > 1
+        assert all(len(w) <= 1500 for w in windows)
+        assert windows[0].startswith("## Part 0")
+        assert sum(w.count("## Part") for w in windows) == 10
+
+    def test_oversized_plain_text_split_at_boundaries(self):
+        content = "\n".join("Line number %d of an mbox thread." % i for i in range(500))
+
+        windows = ChunkingService().split_into_sections(content, max_chars=2000)
+
+        assert all(len(w) <= 2000 for w in windows)
+        assert all(w.endswith("thread.") for w in windows)
+        assert "".join(windows).count("Line number") == 500
+
+    def test_short_content_single_window(self):
+        assert ChunkingService().split_into_sections("# Title\n\nBody", max_chars=1000) == ["# Title\n\nBody"]
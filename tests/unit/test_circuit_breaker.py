@@ -0,0 +1,161 @@
+"""
+Unit tests for LLM circuit breakers and hedged requests
+
+Tests provider resilience including:
+- Circuit opens on error rate / slow calls and half-opens after cooldown
+- LLMService skips models with an open circuit
+- Hedged requests: the next provider starts after the p95 delay and the
+  slower attempt is cancelled
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from src.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.core.config import Settings
+from src.services.llm_service import LLMService
+
+GROQ = "groq/llama-3.1-8b-instant"
+ANTHROPIC = "anthropic/claude-3-5-sonnet-20241022"
+
+
+@pytest.fixture
+def settings():
+    settings = Mock(spec=Settings)
+    settings.groq_api_key = "test_groq_key"
+    settings.anthropic_api_key = "test_anthropic_key"
+    settings.openai_api_key = None
+    settings.google_api_key = None
+    settings.llm_temperature = 0.1
+    settings.daily_budget_usd = 10.0
+    settings.default_llm = "groq"
+    settings.fallback_llm = "anthropic"
+    settings.emergency_llm = "openai"
+    settings.enable_cost_tracking = False
+    return settings
+
+
+def make_call(latency_s: dict, fail: set = frozenset(), calls: list = None):
+    """Fake _call_with_litellm: per-model latency, optional failures, records calls"""
+    async def call(prompt, model_id, max_tokens=None, temperature=None, system_prompt=None):
+        if calls is not None:
+            calls.append(model_id)
+        await asyncio.sleep(latency_s.get(model_id, 0))
+        if model_id in fail:
+            raise RuntimeError(f"{model_id} unavailable")
+        return f"answer from {model_id}", 0.0
+    return call
+
+
+# =============================================================================
+# CircuitBreaker Tests
+# =============================================================================
+
+class TestCircuitBreaker:
+    """Test the breaker state machine"""
+
+    def test_opens_on_error_rate(self):
+        breaker = CircuitBreaker("m", min_calls=4, error_threshold=0.5)
+        for _ in range(2):
+            breaker.record_success(100)
+        breaker.record_failure(100)
+        assert breaker.state == CLOSED
+
+        breaker.record_failure(100)
+        assert breaker.state == OPEN
+        assert breaker.allow_request() is False
+
+    def test_opens_on_slow_calls(self):
+        breaker = CircuitBreaker("m", min_calls=3, slow_call_ms=1000, slow_threshold=0.6)
+        for _ in range(3):
+            breaker.record_success(5000)
+
+        assert breaker.state == OPEN
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker("m", min_calls=1, cooldown_s=0)
+        breaker.record_failure(10)
+        assert breaker.state == OPEN
+
+        assert breaker.allow_request() is True   # probe
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request() is False  # one probe at a time
+
+        breaker.record_success(10)
+        assert breaker.state == CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("m", min_calls=1, cooldown_s=0)
+        breaker.record_failure(10)
+        breaker.allow_request()
+        breaker.record_failure(10)
+
+        assert breaker.state == OPEN
+        assert breaker.times_opened == 2
+
+    def test_latency_quantile(self):
+        breaker = CircuitBreaker("m")
+        assert breaker.latency_quantile(0.95) is None
+        for latency in range(1, 21):
+            breaker.record_success(latency * 10)
+
+        assert breaker.latency_quantile(0.95) == 200
+
+
+# =============================================================================
+# LLMService Fallback Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestResilientFallback:
+    """Test circuit skipping and hedging in LLMService"""
+
+    async def test_open_circuit_is_skipped(self, settings):
+        service = LLMService(settings)
+        calls = []
+        service._call_with_litellm = make_call({}, fail={GROQ}, calls=calls)
+
+        for _ in range(6):
+            _, _, model = await service.call_llm("hello")
+            assert model == ANTHROPIC
+
+        assert service.circuit_breakers.get(GROQ).state == OPEN
+        assert calls.count(GROQ) == 5  # min_calls failures, then skipped
+
+    async def test_all_open_still_tries(self, settings):
+        service = LLMService(settings)
+        service._call_with_litellm = make_call({}, fail={GROQ, ANTHROPIC})
+        for model in (GROQ, ANTHROPIC):
+            service.circuit_breakers.get(model)._open()
+
+        with pytest.raises(Exception, match="All LLM providers failed"):
+            await service.call_llm("hello")
+
+    async def test_hedge_beats_slow_provider(self, settings):
+        service = LLMService(settings)
+        service.hedging_enabled = True
+        for _ in range(10):
+            service.circuit_breakers.get(GROQ).record_success(20)  # p95 = 20ms, clamped to min delay
+        service._call_with_litellm = make_call({GROQ: 5.0, ANTHROPIC: 0.01})
+
+        start = asyncio.get_running_loop().time()
+        response, _, model = await service.call_llm("hello")
+
+        assert model == ANTHROPIC
+        assert response == f"answer from {ANTHROPIC}"
+        assert asyncio.get_running_loop().time() - start < 2.0
+        # Cancelled loser is not counted against the slow provider
+        assert service.circuit_breakers.get(GROQ).snapshot()["calls"] == 10
+
+    async def test_no_hedge_when_fast(self, settings):
+        service = LLMService(settings)
+        service.hedging_enabled = True
+        calls = []
+        service._call_with_litellm = make_call({GROQ: 0.01}, calls=calls)
+
+        _, _, model = await service.call_llm("hello")
+
+        assert model == GROQ
+        assert calls == [GROQ]
@@ -0,0 +1,195 @@
+"""
+Unit tests for the local document type classifier
+
+Tests classification without the LLM including:
+- Rules for email header blocks/MIME, chat exports and filename keywords
+- Hashed n-gram model: trained predictions, confidence threshold, online learning
+- Weight persistence (online saves in a worker thread)
+- Path statistics (keyword / rule / model / llm)
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.services.document_type_classifier import DocumentTypeClassifier
+
+LABELS = [
+    "communication/email",
+    "communication/llm-chat",
+    "financial/invoice",
+    "healthcare/prescription",
+    "education/schedule",
+]
+
+TRAINING_TEXTS = {
+    "financial/invoice": [
+        "Rechnungsnummer {n} Betrag netto Mehrwertsteuer zahlbar innerhalb von 14 Tagen",
+        "Invoice number {n} total amount due VAT payment within 30 days",
+        "Rechnung Nr {n} Leistungszeitraum Gesamtbetrag Überweisung IBAN",
+    ],
+    "healthcare/prescription": [
+        "Rezept Patient Medikament Dosierung {n} mg dreimal täglich Arzt Praxis",
+        "Prescription patient medication dosage {n} mg twice daily pharmacy",
+        "Verordnung Apotheke Wirkstoff Tabletten {n} Packung Krankenkasse Patient",
+    ],
+    "education/schedule": [
+        "Stundenplan Montag Mathematik Deutsch Englisch Klasse {n} Pause Sport",
+        "Timetable Monday maths English science class {n} break lessons",
+        "Stundenplan Dienstag Kunst Musik Religion Klasse {n} Lehrer Raum",
+    ],
+}
+
+
+def training_samples(copies: int = 10):
+    return [
+        {"content": text.format(n=i), "filename": f"scan_{i}.pdf", "doc_type": label}
+        for label, texts in TRAINING_TEXTS.items()
+        for text in texts
+        for i in range(copies)
+    ]
+
+
+@pytest.fixture
+def classifier():
+    return DocumentTypeClassifier(LABELS, path=None, n_features=2 ** 12, min_samples=20, min_confidence=0.6)
+
+
+# =============================================================================
+# Rule Tests
+# =============================================================================
+
+class TestRules:
+    """Test high-precision rules"""
+
+    def test_email_headers(self, classifier):
+        content = "From: Anna Schmidt <anna@example.com>\nSubject: Elternabend\n\nHallo zusammen"
+
+        prediction = classifier.classify(content, "message.txt")
+
+        assert prediction.doc_type == "communication/email"
+        assert prediction.source == "rule"
+
+    def test_email_header_block_with_folded_lines(self, classifier):
+        content = (
+            "Date: Mon, 7 Oct 2024 09:12:00 +0200\n"
+            "From: Kita Sonnenschein\n <info@kita-sonnenschein.de>\n"
+            "To: eltern@example.com\n\n"
+            "Liebe Eltern"
+        )
+        assert classifier.apply_rules(content, "scan.pdf") == "communication/email"
+
+    @pytest.mark.parametrize("content", [
+        # German authority letter
+        "Stadt Musterstadt - Bürgeramt\n\nDatum: 12.03.2024\nBetreff: Ihr Antrag vom 01.03.2024\n\nSehr geehrte Frau Schmidt,",
+        # Internal memo (no email address)
+        "To: All staff\nFrom: Facilities\nSubject: Office closure\n\nThe office is closed on Friday.",
+        # Markdown note with frontmatter
+        "---\ndate: 2024-05-01\n---\n\nFrom: anna@example.com\nTo: jonas@example.com\nNotes on the call",
+        # Headers not at the top
+        "Forwarded below.\n\nFrom: anna@example.com\nSubject: Elternabend",
+    ])
+    def test_header_like_text_is_not_email(self, classifier, content):
+        assert classifier.apply_rules(content, "scan.pdf") is None
+        assert classifier.apply_rules(content, "mail.eml") == "communication/email"
+
+    def test_email_attachment_is_not_email(self, classifier):
+        prediction = classifier.classify(
+            "Quarterly numbers", "report.pdf", document_type="email", metadata={"parent_sender": "a@b.de"}
+        )
+        assert prediction is None
+
+    def test_filename_keyword_and_chat_export(self, classifier):
+        assert classifier.classify("...", "2024_Rechnung_Stadtwerke.pdf").doc_type == "financial/invoice"
+        assert classifier.classify("...", "chat.json", document_type="llm_chat").doc_type == "communication/llm-chat"
+
+    def test_rule_type_must_be_in_vocabulary(self, classifier):
+        assert classifier.apply_rules("...", "Vollmacht.pdf") is None
+
+
+# =============================================================================
+# Model Tests
+# =============================================================================
+
+class TestModel:
+    """Test the hashed n-gram linear model"""
+
+    def test_untrained_model_defers_to_llm(self, classifier):
+        assert classifier.classify("Betrag netto Mehrwertsteuer Rechnungsnummer", "scan.pdf") is None
+
+    def test_trained_model_classifies(self, classifier):
+        stats = classifier.train(training_samples())
+
+        prediction = classifier.classify("Rechnungsnummer 991 Betrag netto zahlbar per Überweisung", "scan.pdf")
+
+        assert stats["training_accuracy"] == 1.0
+        assert prediction.doc_type == "financial/invoice"
+        assert prediction.source == "model"
+        assert prediction.confidence >= 0.6
+
+    def test_low_confidence_defers_to_llm(self, classifier):
+        classifier.train(training_samples())
+        classifier.min_confidence = 0.99
+
+        assert classifier.classify("Ein Gedicht über den Herbst", "gedicht.txt") is None
+
+    def test_online_learning(self, classifier):
+        for i in range(30):
+            classifier.learn(f"Stundenplan Klasse {i} Mathematik Deutsch Pause", f"plan_{i}.pdf", "education/schedule")
+
+        assert classifier.samples_seen == 30
+        assert classifier.predict("Stundenplan Mathematik Pause", "plan.pdf")[0] == "education/schedule"
+
+    def test_new_label_from_llm_is_added(self, classifier):
+        classifier.learn("Diary entry about the weekend", "notes.txt", "personal/diary")
+
+        assert "personal/diary" in classifier.labels
+        assert classifier.weights.shape == (2 ** 12, len(LABELS) + 1)
+
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / "classifier.npz"
+        trained = DocumentTypeClassifier(LABELS, path=str(path), n_features=2 ** 12)
+        trained.train(training_samples())
+
+        loaded = DocumentTypeClassifier(LABELS, path=str(path), n_features=2 ** 12)
+
+        assert loaded.samples_seen == trained.samples_seen
+        text = "Prescription medication dosage 5 mg daily"
+        assert loaded.predict(text, "x.pdf") == trained.predict(text, "x.pdf")
+
+    def test_online_save_runs_off_event_loop(self, tmp_path, monkeypatch):
+        path = tmp_path / "classifier.npz"
+        classifier = DocumentTypeClassifier(LABELS, path=str(path), n_features=2 ** 12, save_every=2)
+        main_thread = threading.get_ident()
+        save_threads = []
+        original_save = classifier.save
+        monkeypatch.setattr(classifier, "save", lambda: save_threads.append(threading.get_ident()) or original_save())
+
+        async def learn_twice():
+            classifier.learn("Stundenplan Montag", "plan.pdf", "education/schedule")
+            classifier.learn("Stundenplan Dienstag", "plan.pdf", "education/schedule")
+            await classifier._save_task
+
+        asyncio.run(learn_twice())
+
+        assert len(save_threads) == 1 and save_threads[0] != main_thread
+        assert DocumentTypeClassifier(LABELS, path=str(path), n_features=2 ** 12).samples_seen == 2
+
+
+# =============================================================================
+# Stats Tests
+# =============================================================================
+
+class TestStats:
+    """Test path statistics"""
+
+    def test_path_counts(self, classifier):
+        for path in ("rule", "rule", "model", "llm"):
+            classifier.record_path(path)
+
+        stats = classifier.get_stats()
+
+        assert stats["paths"] == {"rule": 2, "model": 1, "llm": 1}
+        assert stats["llm_rate"] == 0.25
+        assert stats["model_active"] is False
@@ -7,11 +7,15 @@ Tests drift detection including:
 - Alert generation
 - Trend analysis
 - Dashboard data generation
+- Ingest-time corpus aggregates
 """
+import asyncio
+import json
 import pytest
 from datetime import datetime, timedelta
 from pathlib import Path
 from src.services.drift_monitor_service import (
+    CorpusAggregates,
     DriftMonitorService,
     DriftSnapshot,
     DriftAlert,
@@ -593,3 +597,186 @@ class TestEdgeCases:
         # Should not crash
         alerts = service.detect_drift(current, baseline)
         assert isinstance(alerts, list)
+
+
+# =============================================================================
+# Corpus Aggregates Tests
+# =============================================================================
+
+def _chunk(doc_id, content_hash, hours_ago=0, **overrides):
+    metadata = {
+        'doc_id': doc_id,
+        'file_type': 'pdf',
+        'source': 'upload',
+        'topics': 'ai,ml',
+        'signalness': 0.8,
+        'quality_score': 0.6,
+        'content_hash': content_hash,
+        'ingested_at': (datetime.now() - timedelta(hours=hours_ago)).isoformat(),
+        'file_size_bytes': 2048,
+    }
+    metadata.update(overrides)
+    return metadata
+
+
+class ListCollection:
+    """Collection stub returning a fixed list of chunk metadata"""
+
+    def __init__(self, metadatas):
+        self.metadatas = metadatas
+        self.get_calls = 0
+
+    def get(self):
+        self.get_calls += 1
+        return {'ids': [f"c{i}" for i in range(len(self.metadatas))], 'metadatas': self.metadatas}
+
+
+class TestCorpusAggregates:
+    """Test incremental corpus statistics"""
+
+    @pytest.fixture
+    def chunks(self):
+        return [
+            _chunk('doc1', 'h1'),
+            _chunk('doc1', 'h1'),
+            _chunk('doc2', 'h2', hours_ago=48, file_type='email', source='email', topics='ai'),
+            _chunk('doc3', 'h3', hours_ago=24 * 20, signalness=0.0),
+        ]
+
+    def test_record_chunks(self, chunks):
+        aggregates = CorpusAggregates(path=None)
+        aggregates.record_chunks(chunks)
+        snapshot = aggregates.to_snapshot()
+
+        assert snapshot.total_chunks == 4
+        assert snapshot.total_documents == 3
+        assert snapshot.doc_types == {'pdf': 3, 'email': 1}
+        assert snapshot.topics == {'ai': 4, 'ml': 3}
+        assert snapshot.avg_signalness == pytest.approx(0.8)
+        assert snapshot.duplicate_count == 1
+        assert snapshot.docs_last_24h == 2
+        assert snapshot.docs_last_7d == 3
+        assert snapshot.docs_last_30d == 4
+
+    def test_incremental_matches_recompute(self, tmp_path, chunks):
+        incremental = CorpusAggregates(path=None)
+        for chunk in chunks:
+            incremental.record_chunks([chunk])
+
+        service = DriftMonitorService(snapshots_dir=str(tmp_path / "snapshots"))
+        recomputed = service.recompute_aggregates(ListCollection(chunks)).to_snapshot()
+        snapshot = incremental.to_snapshot()
+
+        for field_name in ('total_documents', 'total_chunks', 'doc_types', 'topics',
+                           'avg_quality_score', 'duplicate_rate', 'docs_last_7d', 'total_storage_mb'):
+            assert getattr(snapshot, field_name) == getattr(recomputed, field_name)
+
+    def test_persistence_roundtrip(self, tmp_path, chunks):
+        path = tmp_path / "aggregates.json"
+        aggregates = CorpusAggregates(path=str(path), save_interval=0)
+        aggregates.mark_stale()
+        aggregates.replace_with(CorpusAggregates(path=None))
+        aggregates.record_chunks(chunks)
+
+        reloaded = CorpusAggregates(path=str(path))
+
+        assert reloaded.initialized
+        assert reloaded.to_snapshot().total_chunks == 4
+        assert reloaded.to_snapshot().duplicate_count == 1
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        path = tmp_path / "aggregates.json"
+        path.write_text("{not json")
+
+        aggregates = CorpusAggregates(path=str(path))
+
+        assert not aggregates.initialized
+        assert aggregates.chunks == 0
+
+    def test_snapshot_reads_aggregates_without_scan(self, tmp_path, chunks):
+        aggregates = CorpusAggregates(path=None)
+        service = DriftMonitorService(snapshots_dir=str(tmp_path / "snapshots"), aggregates=aggregates)
+        collection = ListCollection(chunks)
+
+        # First snapshot repairs the uninitialized aggregates with a scan
+        service.capture_snapshot(collection)
+        assert collection.get_calls == 1
+
+        aggregates.record_chunks([_chunk('doc4', 'h4')])
+        snapshot = service.capture_snapshot(collection)
+
+        assert collection.get_calls == 1
+        assert snapshot.total_chunks == 5
+
+    def test_mark_stale_forces_recompute(self, tmp_path, chunks):
+        aggregates = CorpusAggregates(path=None)
+        service = DriftMonitorService(snapshots_dir=str(tmp_path / "snapshots"), aggregates=aggregates)
+        collection = ListCollection(chunks)
+        service.capture_snapshot(collection)
+
+        collection.metadatas = chunks[:2]
+        aggregates.mark_stale()
+        snapshot = service.capture_snapshot(collection)
+
+        assert collection.get_calls == 2
+        assert snapshot.total_chunks == 2
+
+    def test_remove_chunks_matches_recompute(self, tmp_path, chunks):
+        extra = [_chunk('doc4', 'h1'), _chunk('doc5', 'h5', hours_ago=30, file_type='email')]
+        aggregates = CorpusAggregates(path=None)
+        aggregates.record_chunks(chunks + extra)
+
+        # Delete doc1 (both chunks) and doc5; doc4 still carries hash h1
+        aggregates.remove_chunks(chunks[:2] + extra[1:])
+
+        survivors = chunks[2:] + extra[:1]
+        service = DriftMonitorService(snapshots_dir=str(tmp_path / "snapshots"))
+        recomputed = service.recompute_aggregates(ListCollection(survivors)).to_snapshot()
+        snapshot = aggregates.to_snapshot()
+
+        for field_name in ('total_documents', 'total_chunks', 'doc_types', 'sources', 'topics',
+                           'avg_signalness', 'avg_quality_score', 'duplicate_count',
+                           'docs_last_24h', 'docs_last_7d', 'docs_last_30d', 'total_storage_mb'):
+            assert getattr(snapshot, field_name) == pytest.approx(getattr(recomputed, field_name))
+        assert aggregates.content_hashes['h1'] == 1
+
+    def test_delete_does_not_force_recompute(self, tmp_path, chunks):
+        aggregates = CorpusAggregates(path=None)
+        service = DriftMonitorService(snapshots_dir=str(tmp_path / "snapshots"), aggregates=aggregates)
+        collection = ListCollection(chunks)
+        service.capture_snapshot(collection)
+
+        aggregates.remove_chunks(chunks[2:])
+        snapshot = service.capture_snapshot(collection)
+
+        assert collection.get_calls == 1
+        assert snapshot.total_chunks == 2
+        assert snapshot.total_documents == 1
+
+    def test_persists_counts_and_loads_legacy_lists(self, tmp_path, chunks):
+        path = tmp_path / "aggregates.json"
+        aggregates = CorpusAggregates(path=str(path), save_interval=0)
+        aggregates.record_chunks(chunks)
+
+        data = json.loads(path.read_text())
+        assert data['document_ids'] == {'doc1': 2, 'doc2': 1, 'doc3': 1}
+        assert data['content_hashes'] == {'h1': 2, 'h2': 1, 'h3': 1}
+
+        data['document_ids'] = ['doc1', 'doc2']
+        data['content_hashes'] = ['h1']
+        path.write_text(json.dumps(data))
+        reloaded = CorpusAggregates(path=str(path))
+
+        assert reloaded.to_snapshot().total_documents == 2
+        assert reloaded.content_hashes['h1'] == 1
+
+    @pytest.mark.asyncio
+    async def test_save_runs_off_event_loop(self, tmp_path, chunks):
+        path = tmp_path / "aggregates.json"
+        aggregates = CorpusAggregates(path=str(path), save_interval=0)
+
+        aggregates.record_chunks(chunks)
+        assert aggregates._save_task is not None
+        await aggregates._save_task
+
+        assert json.loads(path.read_text())['chunks'] == 4
@@ -0,0 +1,235 @@
+"""
+Unit tests for EmbeddingBroker
+
+Tests micro-batching of embedding requests including:
+- Coalescing concurrent requests into one provider call
+- Provider batch size and token limits
+- Retry of transient failures
+- Query embedding LRU cache
+- Statistics and histograms
+"""
+
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.services.embedding_service import EmbeddingBroker
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+class FakeProvider:
+    """Deterministic embedding provider that records every call"""
+
+    def __init__(self, fail_times: int = 0, error: Exception = None):
+        self.calls = []
+        self.fail_times = fail_times
+        self.error = error or ConnectionError("temporary outage")
+        self.lock = threading.Lock()
+
+    def __call__(self, texts, input_type):
+        with self.lock:
+            self.calls.append((list(texts), input_type))
+            if self.fail_times > 0:
+                self.fail_times -= 1
+                raise self.error
+        return [[float(len(t)), 1.0 if input_type == "query" else 0.0] for t in texts]
+
+
+@pytest.fixture
+def provider():
+    return FakeProvider()
+
+
+@pytest.fixture
+def broker(provider):
+    b = EmbeddingBroker(
+        embed_fn=provider,
+        name="test",
+        max_batch_size=4,
+        batch_window_ms=50,
+        retry_base_delay=0.001
+    )
+    yield b
+    b.close()
+
+
+# =============================================================================
+# Batching Tests
+# =============================================================================
+
+class TestBatching:
+    """Test request coalescing and batch splitting"""
+
+    def test_embed_returns_vectors_in_order(self, broker):
+        vectors = broker.embed(["a", "bbb", "cc"])
+
+        assert vectors == [[1.0, 0.0], [3.0, 0.0], [2.0, 0.0]]
+
+    def test_empty_input(self, broker, provider):
+        assert broker.embed([]) == []
+        assert provider.calls == []
+
+    def test_concurrent_requests_share_one_call(self, broker, provider):
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(broker.embed, [f"text{i}"]) for i in range(3)]
+            results = [f.result() for f in futures]
+
+        assert len(provider.calls) == 1
+        assert sorted(provider.calls[0][0]) == ["text0", "text1", "text2"]
+        assert all(len(r) == 1 for r in results)
+
+    def test_respects_max_batch_size(self, broker, provider):
+        vectors = broker.embed([f"t{i}" for i in range(10)])
+
+        assert len(vectors) == 10
+        assert [len(call[0]) for call in provider.calls] == [4, 4, 2]
+
+    def test_respects_max_batch_tokens(self, provider):
+        broker = EmbeddingBroker(embed_fn=provider, max_batch_size=100, max_batch_tokens=10, batch_window_ms=0)
+        try:
+            broker.embed(["x" * 32, "y" * 32, "z" * 32])  # 8 tokens each
+        finally:
+            broker.close()
+
+        assert [len(call[0]) for call in provider.calls] == [1, 1, 1]
+
+    def test_duplicate_texts_embedded_once(self, broker, provider):
+        vectors = broker.embed(["same", "same", "other"])
+
+        assert provider.calls[0][0] == ["same", "other"]
+        assert vectors[0] == vectors[1]
+        assert broker.get_stats()["deduplicated_texts"] == 1
+
+    def test_input_types_not_mixed(self, broker, provider):
+        f1 = broker.submit(["doc"], input_type="document")
+        f2 = broker.submit(["query"], input_type="query")
+
+        assert f1.result() == [[3.0, 0.0]]
+        assert f2.result() == [[5.0, 1.0]]
+        assert {call[1] for call in provider.calls} == {"document", "query"}
+
+    @pytest.mark.asyncio
+    async def test_aembed(self, broker):
+        vectors = await broker.aembed(["abcd"])
+
+        assert vectors == [[4.0, 0.0]]
+
+
+# =============================================================================
+# Retry Tests
+# =============================================================================
+
+class TestRetry:
+    """Test retry behaviour for provider failures"""
+
+    def test_transient_failure_retried(self):
+        provider = FakeProvider(fail_times=2)
+        broker = EmbeddingBroker(embed_fn=provider, batch_window_ms=0, max_retries=3, retry_base_delay=0.001)
+        try:
+            vectors = broker.embed(["abc"])
+        finally:
+            broker.close()
+
+        assert vectors == [[3.0, 0.0]]
+        assert len(provider.calls) == 3
+        assert broker.get_stats()["retries"] == 2
+
+    def test_gives_up_after_max_retries(self):
+        provider = FakeProvider(fail_times=10)
+        broker = EmbeddingBroker(embed_fn=provider, batch_window_ms=0, max_retries=1, retry_base_delay=0.001)
+        try:
+            with pytest.raises(ConnectionError):
+                broker.embed(["abc"])
+        finally:
+            broker.close()
+
+        assert len(provider.calls) == 2
+        assert broker.get_stats()["failures"] == 1
+
+    def test_non_retryable_error_not_retried(self):
+        class AuthenticationError(Exception):
+            pass
+
+        provider = FakeProvider(fail_times=5, error=AuthenticationError("bad key"))
+        broker = EmbeddingBroker(embed_fn=provider, batch_window_ms=0, max_retries=3, retry_base_delay=0.001)
+        try:
+            with pytest.raises(AuthenticationError):
+                broker.embed(["abc"])
+        finally:
+            broker.close()
+
+        assert len(provider.calls) == 1
+
+
+# =============================================================================
+# Query Cache Tests
+# =============================================================================
+
+class TestQueryCache:
+    """Test the query embedding LRU"""
+
+    def test_repeated_query_served_from_cache(self, broker, provider):
+        first = broker.embed_query("what is bm25")
+        second = broker.embed_query("what is bm25")
+
+        assert first == second
+        assert len(provider.calls) == 1
+        stats = broker.get_stats()
+        assert stats["query_cache_hits"] == 1
+        assert stats["query_cache_misses"] == 1
+
+    def test_embed_queries_mixes_hits_and_misses(self, broker, provider):
+        broker.embed_query("cached")
+        vectors = broker.embed_queries(["cached", "new one", "cached"])
+
+        assert len(vectors) == 3
+        assert vectors[0] == vectors[2]
+        assert provider.calls[-1][0] == ["new one"]
+
+    def test_lru_eviction(self, provider):
+        broker = EmbeddingBroker(embed_fn=provider, batch_window_ms=0, query_cache_size=2)
+        try:
+            broker.embed_query("a")
+            broker.embed_query("b")
+            broker.embed_query("c")  # evicts "a"
+            broker.embed_query("a")
+        finally:
+            broker.close()
+
+        assert len(provider.calls) == 4
+
+    def test_clear_cache(self, broker, provider):
+        broker.embed_query("q")
+        broker.clear_cache()
+        broker.embed_query("q")
+
+        assert len(provider.calls) == 2
+
+
+# =============================================================================
+# Stats Tests
+# =============================================================================
+
+class TestStats:
+    """Test broker statistics"""
+
+    def test_stats_include_histograms(self, broker):
+        broker.embed(["a", "b", "c"])
+        stats = broker.get_stats()
+
+        assert stats["provider_calls"] == 1
+        assert stats["texts"] == 3
+        assert stats["avg_texts_per_call"] == 3.0
+        assert stats["batch_size"]["count"] == 1
+        assert stats["batch_size"]["max"] == 3
+        assert stats["latency_ms"]["count"] == 1
+
+    def test_closed_broker_rejects_requests(self, provider):
+        broker = EmbeddingBroker(embed_fn=provider, batch_window_ms=0)
+        broker.close()
+
+        with pytest.raises(RuntimeError):
+            broker.submit(["x"])
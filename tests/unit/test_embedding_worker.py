@@ -0,0 +1,168 @@
+"""
+Unit tests for the shared local embedding worker
+
+Tests the socket worker and its Chroma-compatible client including:
+- Address parsing (Unix socket and TCP)
+- Document and query embedding over the socket
+- Coalescing requests from several clients into one model call
+- Error propagation and reconnect after a worker restart
+"""
+
+import socket
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.services.embedding_worker import (
+    EmbeddingWorkerError,
+    EmbeddingWorkerServer,
+    LocalWorkerEmbeddingFunction,
+    parse_worker_address,
+)
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+class FakeModel:
+    """Deterministic local model that records every batch"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, texts, input_type):
+        with self.lock:
+            self.calls.append(list(texts))
+        if any(t == "boom" for t in texts):
+            raise ValueError("model exploded")
+        return [[float(len(t)), 0.5] for t in texts]
+
+
+@pytest.fixture
+def model():
+    return FakeModel()
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "embed.sock")
+
+
+@pytest.fixture
+def server(model, socket_path):
+    s = EmbeddingWorkerServer(socket_path, embed_fn=model, model_name="fake-model", batch_window_ms=50)
+    s.start()
+    yield s
+    s.shutdown()
+
+
+@pytest.fixture
+def client(server, socket_path):
+    c = LocalWorkerEmbeddingFunction(address=socket_path, timeout=5)
+    yield c
+    c.close()
+
+
+# =============================================================================
+# Address Tests
+# =============================================================================
+
+class TestParseAddress:
+    """Test worker address parsing"""
+
+    def test_unix_path(self):
+        assert parse_worker_address("/tmp/x.sock") == (socket.AF_UNIX, "/tmp/x.sock")
+
+    def test_unix_prefix(self):
+        assert parse_worker_address("unix:/tmp/x.sock") == (socket.AF_UNIX, "/tmp/x.sock")
+
+    def test_tcp(self):
+        assert parse_worker_address("embedding-worker:8765") == (socket.AF_INET, ("embedding-worker", 8765))
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_worker_address("no-port")
+
+
+# =============================================================================
+# Client/Server Tests
+# =============================================================================
+
+class TestEmbeddingWorker:
+    """Test embedding over the worker socket"""
+
+    def test_ping(self, client):
+        info = client.ping()
+
+        assert info["status"] == "ok"
+        assert info["model"] == "fake-model"
+
+    def test_embed_documents(self, client):
+        assert client(["a", "bbb"]) == [[1.0, 0.5], [3.0, 0.5]]
+        assert client([]) == []
+
+    def test_embed_query_returns_array(self, client):
+        result = client.embed_query("abcd")
+
+        assert result.shape == (1, 2)
+        assert result[0][0] == 4.0
+
+    def test_name_matches_in_process_function(self, client):
+        assert client.name() == "sentence_transformer"
+
+    def test_clients_share_model_batches(self, server, socket_path, model):
+        clients = [LocalWorkerEmbeddingFunction(address=socket_path, timeout=5) for _ in range(4)]
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [pool.submit(c, [f"text{i}"]) for i, c in enumerate(clients)]
+                results = [f.result() for f in futures]
+        finally:
+            for c in clients:
+                c.close()
+
+        assert all(len(r) == 1 for r in results)
+        assert len(model.calls) < 4
+        assert server.broker.get_stats()["texts"] == 4
+
+    def test_stats(self, client):
+        client(["x"])
+        stats = client.get_stats()
+
+        assert stats["model"] == "fake-model"
+        assert stats["broker"]["provider_calls"] == 1
+
+    def test_model_error_propagates(self, client):
+        with pytest.raises(EmbeddingWorkerError, match="model exploded"):
+            client(["boom"])
+
+        # Connection remains usable after an error response
+        assert client(["ok"]) == [[2.0, 0.5]]
+
+    def test_unreachable_worker(self, tmp_path):
+        c = LocalWorkerEmbeddingFunction(address=str(tmp_path / "missing.sock"), timeout=1)
+
+        with pytest.raises(EmbeddingWorkerError):
+            c.ping()
+
+    def test_reconnects_after_restart(self, model, socket_path):
+        first = EmbeddingWorkerServer(socket_path, embed_fn=model, batch_window_ms=0)
+        first.start()
+        c = LocalWorkerEmbeddingFunction(address=socket_path, timeout=5)
+        try:
+            assert c(["a"]) == [[1.0, 0.5]]
+            first.shutdown()
+
+            second = EmbeddingWorkerServer(socket_path, embed_fn=model, batch_window_ms=0)
+            second.start()
+            try:
+                assert c(["ab"]) == [[2.0, 0.5]]
+            finally:
+                second.shutdown()
+        finally:
+            c.close()
+
+    def test_requires_address(self):
+        with pytest.raises(ValueError):
+            LocalWorkerEmbeddingFunction(address="")
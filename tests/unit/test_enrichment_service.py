@@ -6,17 +6,35 @@ Tests controlled vocabulary enrichment including:
 - Recency score calculation
 - Title extraction strategies
 - Title sanitization
+- Static (cacheable) system prompt vs per-document user message
+- Fused classification + enrichment (one LLM call, two-call fallback)
+- Local document type classification skipping the LLM
+- Map-reduce enrichment of long documents (bounded concurrency, merged results)
 """
 import pytest
+import asyncio
+import re
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import date, timedelta
 import hashlib
 from src.services.enrichment_service import EnrichmentService
+from src.models.enrichment_models import EnrichmentResponse, FusedEnrichmentResponse
+from src.services.document_type_classifier import DocumentTypeClassifier
 from src.services.llm_service import LLMService
 from src.services.vocabulary_service import VocabularyService
 from src.models.schemas import DocumentType
 
 
+@pytest.fixture(autouse=True)
+def in_memory_doc_type_classifier():
+    """Fresh, unpersisted local classifier per test"""
+    with patch(
+        "src.services.enrichment_service.get_document_type_classifier",
+        lambda labels: DocumentTypeClassifier(labels, path=None, n_features=2 ** 10)
+    ):
+        yield
+
+
 # =============================================================================
 # EnrichmentService Tests
 # =============================================================================
@@ -243,6 +261,21 @@ This is content."""
         assert "    " not in result
         assert "Title with extra spaces" == result or "Title  with  extra  spaces" in result
 
+    def test_system_prompt_is_static(self, service, mock_vocab_service):
+        """Vocabulary and rules go into one cached system prompt, not per-document messages"""
+        system = service._get_enrichment_system_prompt()
+        first = service._build_controlled_enrichment_prompt("Elternabend am Montag.", "a.md", DocumentType.text, "Elternabend")
+        second = service._build_controlled_enrichment_prompt("Quartalsplanung Q4.", "b.md", DocumentType.text, "Planung")
+
+        assert service._get_enrichment_system_prompt() is system
+        assert '"school/admin"' in system
+        assert "Elternabend" not in system
+        assert "school/admin" not in first and "school/admin" not in second
+        assert "**Content**:\nElternabend am Montag." in first
+
+        mock_vocab_service.get_all_topics.return_value = ["school/admin", "health/doctor"]
+        assert '"health/doctor"' in service._get_enrichment_system_prompt()
+
 
 # =============================================================================
 # Integration-style Tests
@@ -305,3 +338,264 @@ class TestEnrichmentServiceIntegration:
         hash2 = service.generate_content_hash(content)
 
         assert hash1 == hash2  # Deduplication should work
+
+
+# =============================================================================
+# Fused Classification Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestFusedClassification:
+    """Semantic type and enrichment from one structured LLM response"""
+
+    CONTENT = "Notes about the garden party planning with neighbours."
+    DOCUMENT_TYPES = ["communication/email", "personal/note"]
+
+    @pytest.fixture
+    def mock_vocab_service(self):
+        vocab = Mock(spec=VocabularyService)
+        vocab.get_all_topics.return_value = ["personal/events"]
+        vocab.get_active_projects.return_value = []
+        vocab.get_all_places.return_value = []
+        vocab.get_all_people.return_value = []
+        vocab.get_all_document_types.return_value = self.DOCUMENT_TYPES
+        vocab.is_valid_document_type.side_effect = lambda t: t in self.DOCUMENT_TYPES
+        vocab.suggest_document_type.side_effect = lambda t: t
+        return vocab
+
+    @pytest.fixture
+    def service(self, mock_vocab_service):
+        return EnrichmentService(Mock(spec=LLMService), mock_vocab_service)
+
+    def fused(self, doc_type: str) -> FusedEnrichmentResponse:
+        return FusedEnrichmentResponse(
+            title="Garden Party Planning", summary="Planning notes for a party.", semantic_document_type=doc_type
+        )
+
+    async def call(self, service, content=None):
+        content = content or self.CONTENT
+        return await service._call_enrichment_llm(
+            prompt="PROMPT",
+            content=content,
+            filename="party.md",
+            title="Garden Party Planning",
+            semantic_doc_type=service._classify_by_keywords(content, "party.md")
+        )
+
+    async def test_single_llm_call(self, service):
+        service.llm_service.call_llm_structured = AsyncMock(return_value=(self.fused("personal/note"), 0.002, "m"))
+        service.llm_service.call_llm = AsyncMock()
+
+        response, cost, doc_type = await self.call(service)
+
+        assert doc_type == "personal/note"
+        assert cost == 0.002
+        assert type(response) is EnrichmentResponse
+        service.llm_service.call_llm.assert_not_called()
+        kwargs = service.llm_service.call_llm_structured.call_args.kwargs
+        assert kwargs["response_model"] is FusedEnrichmentResponse
+        assert "- personal/note" in kwargs["system_prompt"]
+        assert "- personal/note" not in kwargs["prompt"]
+
+    async def test_failure_falls_back_to_two_calls(self, service):
+        plain = EnrichmentResponse(title="Garden Party Planning", summary="Planning notes for a party.")
+        service.llm_service.call_llm_structured = AsyncMock(side_effect=[ValueError("bad json"), (plain, 0.001, "m")])
+        service.llm_service.call_llm = AsyncMock(return_value=("personal/note", 0.0, "m"))
+
+        response, _, doc_type = await self.call(service)
+
+        assert response is plain
+        assert doc_type == "personal/note"
+        assert service.llm_service.call_llm.await_count == 1
+        assert service.llm_service.call_llm_structured.call_args.kwargs["response_model"] is EnrichmentResponse
+
+    async def test_invalid_type_classified_separately(self, service):
+        service.llm_service.call_llm_structured = AsyncMock(return_value=(self.fused("diary"), 0.002, "m"))
+        service.llm_service.call_llm = AsyncMock(return_value=("communication/email", 0.0, "m"))
+
+        response, _, doc_type = await self.call(service)
+
+        assert doc_type == "communication/email"
+        assert response.title == "Garden Party Planning"
+        assert service.llm_service.call_llm_structured.await_count == 1
+
+    async def test_keyword_match_skips_classification(self, service):
+        plain = EnrichmentResponse(title="Invoice Stadtwerke", summary="Invoice for electricity.")
+        service.llm_service.call_llm_structured = AsyncMock(return_value=(plain, 0.001, "m"))
+        service.llm_service.call_llm = AsyncMock()
+
+        _, _, doc_type = await self.call(service, content="Rechnung der Stadtwerke für Strom")
+
+        assert doc_type == "financial/invoice"
+        service.llm_service.call_llm.assert_not_called()
+        assert service.llm_service.call_llm_structured.call_args.kwargs["prompt"] == "PROMPT"
+
+    async def test_disabled_uses_two_calls(self, service):
+        plain = EnrichmentResponse(title="Garden Party Planning", summary="Planning notes for a party.")
+        service.llm_service.call_llm_structured = AsyncMock(return_value=(plain, 0.001, "m"))
+        service.llm_service.call_llm = AsyncMock(return_value=("personal/note", 0.0, "m"))
+
+        with patch("src.services.enrichment_service.ENRICHMENT_FUSED_CLASSIFICATION", False):
+            _, _, doc_type = await self.call(service)
+
+        assert doc_type == "personal/note"
+        assert service.llm_service.call_llm.await_count == 1
+
+    async def test_llm_classification_trains_local_classifier(self, service):
+        service.llm_service.call_llm_structured = AsyncMock(return_value=(self.fused("personal/note"), 0.002, "m"))
+
+        await self.call(service)
+
+        classifier = service.doc_type_classifier
+        assert classifier.samples_seen == 1
+        assert classifier.get_stats()["paths"] == {"llm": 1}
+
+
+@pytest.mark.asyncio
+class TestLocalClassification:
+    """Semantic type decided without an LLM round trip"""
+
+    @pytest.fixture
+    def service(self):
+        vocab = Mock(spec=VocabularyService)
+        vocab.get_all_document_types.return_value = ["communication/email", "personal/note"]
+        llm = Mock(spec=LLMService)
+        llm.call_llm = AsyncMock()
+        return EnrichmentService(llm, vocab)
+
+    async def test_rule_match_skips_llm(self, service):
+        doc_type = await service.classify_semantic_document_type(
+            "From: anna@example.com\nSubject: Treffen\n\nHallo", "mail.txt", "Treffen"
+        )
+
+        assert doc_type == "communication/email"
+        service.llm_service.call_llm.assert_not_called()
+        assert service.doc_type_classifier.get_stats()["paths"] == {"rule": 1}
+
+    async def test_confident_model_skips_llm(self, service):
+        service.doc_type_classifier.train([
+            {"content": f"Notiz Einkauf Garten Wochenende {i}", "filename": "n.md", "doc_type": "personal/note"}
+            for i in range(60)
+        ])
+
+        doc_type = await service.classify_semantic_document_type("Notiz Garten Wochenende", "x.md", "Notiz")
+
+        assert doc_type == "personal/note"
+        service.llm_service.call_llm.assert_not_called()
+        assert service.doc_type_classifier.get_stats()["paths"] == {"model": 1}
+
+
+# =============================================================================
+# Long Document Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestLongDocumentEnrichment:
+    """Sections enriched concurrently and merged"""
+
+    SECTIONS = 6
+
+    @pytest.fixture
+    def long_content(self):
+        return "\n\n".join(
+            f"## Chapter {i}\n\n" + f"Chapter {i} discusses the Stadtwerke contract in detail. " * 40
+            for i in range(self.SECTIONS)
+        )
+
+    @pytest.fixture
+    def service(self):
+        vocab = Mock(spec=VocabularyService)
+        vocab.get_all_topics.return_value = []
+        vocab.get_all_places.return_value = []
+        vocab.get_all_document_types.return_value = ["legal/contract"]
+        return EnrichmentService(Mock(spec=LLMService), vocab)
+
+    def section_llm(self, in_flight: list, fail_section: int = None):
+        async def call_llm_structured(prompt, response_model, model_id=None, temperature=None, system_prompt=None):
+            section = int(re.search(r"This is section (\d+) of", prompt).group(1))
+            in_flight.append(in_flight[-1] + 1 if in_flight else 1)
+            await asyncio.sleep(0.01)
+            in_flight.append(in_flight[-1] - 1)
+            if section == fail_section:
+                raise RuntimeError("rate limited")
+            fields = dict(
+                title=f"Contract Chapter {section}",
+                summary=f"Section {section} of the contract.",
+                topics=["legal/contract", f"topic/{section % 2}"],
+                entities={
+                    "people": [{"name": "Anna Schmidt", "role": "Lawyer" if section == 2 else None}],
+                    "organizations": ["Stadtwerke", "stadtwerke ", f"Org {section}"],
+                    "dates": [{"date": "2025-01-31"}],
+                },
+            )
+            if response_model is FusedEnrichmentResponse:
+                fields["semantic_document_type"] = "legal/contract"
+            return response_model(**fields), 0.01, "m"
+        return call_llm_structured
+
+    async def enrich(self, service, content):
+        with patch.multiple(
+            "src.services.enrichment_service",
+            ENRICHMENT_LONG_DOC_THRESHOLD_CHARS=5000,
+            ENRICHMENT_SECTION_MAX_CHARS=2500,
+            ENRICHMENT_MAX_CONCURRENCY=2
+        ):
+            return await service._enrich_long_document(
+                content=content, filename="vertrag_scan.pdf", document_type=DocumentType.pdf,
+                extracted_title="Contract", semantic_doc_type=None
+            )
+
+    async def test_sections_merged_with_bounded_concurrency(self, service, long_content):
+        in_flight = []
+        service.llm_service.call_llm_structured = self.section_llm(in_flight)
+        service.llm_service.call_llm = AsyncMock(return_value=("The whole contract with the Stadtwerke.", 0.001, "m"))
+
+        response, cost, doc_type = await self.enrich(service, long_content)
+
+        assert max(in_flight) == 2
+        assert len(in_flight) == 2 * self.SECTIONS
+        assert doc_type == "legal/contract"
+        assert cost == pytest.approx(0.01 * self.SECTIONS + 0.001)
+        assert response.title == "Contract Chapter 1"
+        assert response.summary == "The whole contract with the Stadtwerke."
+        assert response.topics[0] == "legal/contract"
+        assert response.entities.organizations[0] == "Stadtwerke"
+        assert len(response.entities.organizations) == 1 + self.SECTIONS
+        assert [p.role for p in response.entities.people] == ["Lawyer"]
+        assert [d.date for d in response.entities.dates] == ["2025-01-31"]
+
+    async def test_failed_section_is_skipped(self, service, long_content):
+        service.llm_service.call_llm_structured = self.section_llm([], fail_section=3)
+        service.llm_service.call_llm = AsyncMock(side_effect=RuntimeError("down"))
+
+        response, _, _ = await self.enrich(service, long_content)
+
+        assert "Org 3" not in response.entities.organizations
+        assert "Org 4" in response.entities.organizations
+        assert response.summary.startswith("Section 1 of the contract. Section 2")
+
+    async def test_sections_never_exceed_prompt_limit(self, service, long_content):
+        service.llm_service.call_llm_structured = self.section_llm([])
+        service.llm_service.call_llm = AsyncMock(return_value=("Summary.", 0.001, "m"))
+        split = service.chunking_service.split_into_sections
+        windows = []
+        service.chunking_service.split_into_sections = lambda content, max_chars: windows.extend(
+            split(content, max_chars)) or windows
+
+        with patch.multiple(
+            "src.services.enrichment_service",
+            ENRICHMENT_MAX_SECTIONS=2,
+            ENRICHMENT_PROMPT_MAX_CONTENT_CHARS=3000
+        ):
+            await self.enrich(service, long_content)
+
+        assert len(windows) > 2
+        assert all(len(window) <= 3000 for window in windows)
+
+    async def test_short_documents_use_single_call(self, service):
+        service._enrich_long_document = AsyncMock()
+        service._call_enrichment_llm = AsyncMock(side_effect=RuntimeError("stop"))
+
+        await service.enrich_document("Short note about the contract.", "note.md", DocumentType.text)
+
+        service._enrich_long_document.assert_not_called()
@@ -8,6 +8,7 @@ Tests gold query evaluation including:
 - Historical tracking
 - Report generation
 """
+import asyncio
 import pytest
 import json
 from pathlib import Path
@@ -397,6 +398,63 @@ class TestEvaluationRuns:
         assert len(evaluation_run.query_results) == 0
 
 
+class TestConcurrentEvaluation:
+    """Test bounded concurrency and latency capture"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        service = EvaluationService()
+        service.results_dir = tmp_path / "results"
+        service.results_dir.mkdir(exist_ok=True)
+        for i in range(6):
+            service.add_gold_query(f"Query {i}", [f"doc{i}"], min_precision=0.2)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, service):
+        in_flight = 0
+        peak = 0
+
+        async def slow_search(query_text, top_k):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [f"doc{query_text.split()[-1]}"]
+
+        evaluation_run = await service.run_evaluation(slow_search, concurrency=2)
+
+        assert peak == 2
+        assert evaluation_run.concurrency == 2
+        assert [r.query_id for r in evaluation_run.query_results] == [q.query_id for q in service.gold_queries]
+
+    @pytest.mark.asyncio
+    async def test_latency_recorded(self, service):
+        async def search(query_text, top_k):
+            await asyncio.sleep(0.02 if query_text.endswith("5") else 0.001)
+            return []
+
+        evaluation_run = await service.run_evaluation(search, concurrency=6)
+
+        assert all(r.latency_ms > 0 for r in evaluation_run.query_results)
+        assert evaluation_run.latency_p95_ms >= 20
+        assert evaluation_run.latency_p50_ms < evaluation_run.latency_p95_ms
+
+    @pytest.mark.asyncio
+    async def test_pass_rate_skips_failed_queries(self, service):
+        async def search(query_text, top_k):
+            index = query_text.split()[-1]
+            if index == "0":
+                raise Exception("Search failed")
+            return [f"doc{index}"]
+
+        evaluation_run = await service.run_evaluation(search)
+
+        assert evaluation_run.failed_queries == ["q001"]
+        assert evaluation_run.pass_rate == 1.0
+
+
 # =============================================================================
 # Historical Tracking Tests
 # =============================================================================
@@ -468,6 +526,25 @@ class TestHistoricalTracking:
         assert comparison['recall_at_5_delta'] == pytest.approx(0.10)
         assert comparison['pass_rate_delta'] == pytest.approx(0.10)
 
+    def _run(self, p50, p95):
+        return EvaluationRun(
+            run_id="run", timestamp="2025-01-01T12:00:00", total_queries=5,
+            avg_precision_at_5=0.7, avg_precision_at_10=0.7, avg_recall_at_5=0.7,
+            avg_recall_at_10=0.7, avg_mrr=0.7, pass_rate=0.7,
+            latency_p50_ms=p50, latency_p95_ms=p95
+        )
+
+    def test_compare_runs_flags_latency_regression(self, service):
+        comparison = service.compare_runs(self._run(100, 200), self._run(105, 300))
+
+        assert comparison['latency_regression'] is True
+        assert comparison['latency_regressions'] == ['latency_p95_ms']
+        assert comparison['latency_p95_delta_ms'] == pytest.approx(100)
+
+    def test_compare_runs_ignores_small_or_untracked_latency(self, service):
+        assert service.compare_runs(self._run(2, 3), self._run(3, 5))['latency_regression'] is False
+        assert service.compare_runs(self._run(0, 0), self._run(100, 200))['latency_regression'] is False
+
 
 # =============================================================================
 # Report Generation Tests
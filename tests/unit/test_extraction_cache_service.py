@@ -0,0 +1,135 @@
+"""
+Unit tests for ExtractionCache
+
+Tests persistent extraction caching including:
+- Round trip of text, document type and metadata
+- Keys depending on file content, extractor version and OCR flag
+- LRU eviction above the size cap
+- Corrupt entries treated as misses
+- DocumentService skipping extraction for unchanged files
+"""
+
+import os
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.core.config import Settings
+from src.models.schemas import DocumentType
+from src.services.document_service import DocumentService
+from src.services.extraction_cache_service import ExtractionCache, hash_file
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(str(tmp_path / "cache"), max_bytes=10_000)
+
+
+# =============================================================================
+# ExtractionCache Tests
+# =============================================================================
+
+class TestExtractionCache:
+    """Test the on-disk cache"""
+
+    def test_round_trip(self, cache):
+        key = cache.make_key("abc", "1", False)
+        assert cache.get(key) is None
+
+        cache.set(key, "Rechnung Stadtwerke", DocumentType.pdf, {"file_extension": ".pdf", "pages": 2})
+
+        assert cache.get(key) == ("Rechnung Stadtwerke", DocumentType.pdf, {"file_extension": ".pdf", "pages": 2})
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_key_depends_on_version_and_ocr(self, tmp_path):
+        file_path = tmp_path / "scan.pdf"
+        file_path.write_bytes(b"%PDF-1.4 fake")
+        file_hash = hash_file(file_path)
+
+        keys = {
+            ExtractionCache.make_key(file_hash, "1", False),
+            ExtractionCache.make_key(file_hash, "1", True),
+            ExtractionCache.make_key(file_hash, "2", False),
+        }
+
+        assert len(keys) == 3
+
+    def test_evicts_least_recently_used(self, cache):
+        for i in range(3):
+            cache.set(f"k{i}", os.urandom(2500).hex(), DocumentType.pdf, {})
+            os.utime(cache._entry_path(f"k{i}"), (time.time() - 100 + i, time.time() - 100 + i))
+        cache.get("k0")  # touch
+
+        cache.set("k3", os.urandom(2500).hex(), DocumentType.pdf, {})
+
+        assert cache.get("k0") is not None
+        assert cache.get("k1") is None
+        assert cache.get_stats()["size_mb"] <= 0.01
+
+    def test_corrupt_entry_is_a_miss(self, cache):
+        cache._entry_path("bad").write_bytes(b"not zlib")
+
+        assert cache.get("bad") is None
+        assert not cache._entry_path("bad").exists()
+
+
+# =============================================================================
+# DocumentService Integration Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestDocumentServiceCaching:
+    """Unchanged files skip extraction on re-ingest"""
+
+    @pytest.fixture
+    def service(self, cache):
+        settings = Mock(spec=Settings)
+        settings.chunk_size = 1000
+        settings.chunk_overlap = 200
+        settings.use_ocr = False
+        settings.max_file_size_mb = 50
+        service = DocumentService(settings)
+        service._extraction_cache = cache
+        service._extract_text = AsyncMock(return_value=("Extracted PDF text", DocumentType.pdf, {"mime_type": "application/pdf"}))
+        return service
+
+    async def test_second_extraction_hits_cache(self, service, tmp_path):
+        original = tmp_path / "invoice.pdf"
+        original.write_bytes(b"%PDF-1.4 invoice")
+        retry = tmp_path / "retry_invoice.pdf"
+        retry.write_bytes(b"%PDF-1.4 invoice")
+
+        first = await service.extract_text_from_file(original)
+        second = await service.extract_text_from_file(retry)
+
+        assert first == second == ("Extracted PDF text", DocumentType.pdf, {"mime_type": "application/pdf"})
+        assert service._extract_text.await_count == 1
+
+    async def test_failures_and_text_files_not_cached(self, service, tmp_path):
+        service._extract_text.return_value = ("Failed to process Word document: a.docx", DocumentType.office, {})
+        docx_path = tmp_path / "a.docx"
+        docx_path.write_bytes(b"PK fake")
+        text_path = tmp_path / "notes.txt"
+        text_path.write_text("plain notes")
+
+        for path in (docx_path, docx_path, text_path, text_path):
+            await service.extract_text_from_file(path)
+
+        assert service._extract_text.await_count == 4
+        assert service.extraction_cache.get_stats()["size_mb"] == 0
+
+    async def test_image_placeholder_not_cached_without_ocr(self, service, tmp_path):
+        service.ocr_service = None
+        service._extract_text.side_effect = lambda path, *_: (f"Image file: {path.name}", DocumentType.image, {})
+        first = tmp_path / "receipt.jpg"
+        first.write_bytes(b"\xff\xd8 same image")
+        copy = tmp_path / "receipt_copy.jpg"
+        copy.write_bytes(b"\xff\xd8 same image")
+
+        await service.extract_text_from_file(first, process_ocr=True)
+        text, _, _ = await service.extract_text_from_file(copy, process_ocr=True)
+
+        assert text == "Image file: receipt_copy.jpg"
+        assert service.extraction_cache.get_stats()["size_mb"] == 0
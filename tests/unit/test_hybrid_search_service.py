@@ -245,6 +245,31 @@ class TestBM25Search:
         assert "metadata" in results[0]
         assert results[0]["metadata"]["title"] == "Test Document"
 
+    def test_bm25_search_many_matches_single_queries(self, hybrid_service, sample_chunks, sample_metadata):
+        """Test batched BM25 returns the same results as one search per query"""
+        hybrid_service.add_documents("doc1", sample_chunks, sample_metadata)
+        queries = ["Python programming", "learning learning networks", "quantum physics", "programming"]
+
+        batched = hybrid_service.bm25_search_many(queries, top_k=3)
+
+        assert len(batched) == len(queries)
+        for query, results in zip(queries, batched):
+            single = hybrid_service.bm25_search(query, top_k=3)
+            assert [r["chunk_id"] for r in results] == [r["chunk_id"] for r in single]
+            assert [r["bm25_score"] for r in results] == pytest.approx([r["bm25_score"] for r in single])
+        assert batched[2] == []
+
+    def test_bm25_search_many_scores_each_term_once(self, hybrid_service, sample_chunks, sample_metadata, monkeypatch):
+        """Test terms shared across queries are scored against the corpus once"""
+        hybrid_service.add_documents("doc1", sample_chunks, sample_metadata)
+        scored_terms = []
+        get_scores = hybrid_service.bm25_index.get_scores
+        monkeypatch.setattr(hybrid_service.bm25_index, "get_scores", lambda q: scored_terms.extend(q) or get_scores(q))
+
+        hybrid_service.bm25_search_many(["python programming", "programming data", "python"], top_k=3)
+
+        assert sorted(scored_terms) == ["data", "programming", "python"]
+
 
 # =============================================================================
 # Score Normalization Tests
@@ -582,6 +607,19 @@ class TestHybridSearch:
         # Should still work using only BM25
         assert len(results) >= 0
 
+    def test_hybrid_search_many_input_order(self, hybrid_service, sample_chunks, sample_metadata):
+        """Test batched hybrid search returns one result list per query, in order"""
+        hybrid_service.add_documents("doc1", sample_chunks, sample_metadata)
+        dense_results_list = [
+            [{"chunk_id": "doc1_chunk_0", "content": sample_chunks[0], "metadata": {}, "relevance_score": 0.9}],
+            [{"chunk_id": "doc1_chunk_3", "content": sample_chunks[3], "metadata": {}, "relevance_score": 0.9}],
+        ]
+
+        results = hybrid_service.hybrid_search_many(["Python", "neural networks"], dense_results_list, top_k=2)
+
+        assert results[0][0]["chunk_id"] == "doc1_chunk_0"
+        assert results[1][0]["chunk_id"] == "doc1_chunk_3"
+
 
 # =============================================================================
 # Stats and Utility Tests
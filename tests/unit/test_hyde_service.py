@@ -7,19 +7,21 @@ import pytest
 import asyncio
 from unittest.mock import AsyncMock, Mock
 
-from src.services.hyde_service import HyDEService
+from src.services.hyde_service import HyDEService, reciprocal_rank_fusion
 
 
 class MockLLMService:
     """Mock LLM service for testing"""
 
-    def __init__(self, response="Hypothetical document content."):
+    def __init__(self, response="Hypothetical document content.", delay=0.0):
         self.response = response
+        self.delay = delay
         self.call_count = 0
 
-    async def generate_completion(self, messages, max_tokens=300, temperature=0.7):
+    async def call_llm(self, prompt, model_id=None, max_tokens=300, temperature=0.7, system_prompt=None):
         self.call_count += 1
-        return self.response
+        await asyncio.sleep(self.delay)
+        return self.response, 0.0, model_id or "mock"
 
 
 class TestHyDEService:
@@ -203,7 +205,7 @@ class TestHyDEService:
         """Test fallback to original query on LLM error"""
         # Create LLM that raises error
         class ErrorLLM:
-            async def generate_completion(self, messages, max_tokens=300, temperature=0.7):
+            async def call_llm(self, prompt, model_id=None, max_tokens=300, temperature=0.7, system_prompt=None):
                 raise Exception("LLM service unavailable")
 
         service = HyDEService(llm_service=ErrorLLM())
@@ -233,3 +235,80 @@ class TestHyDEService:
         assert all('from_query_variant' in r for r in result)
         assert any(r['from_query_variant'] == 0 for r in result)
         assert any(r['from_query_variant'] == 1 for r in result)
+
+
+class TestHyDEPerformance:
+    """Test concurrent generation, caching and fused multi-query search"""
+
+    @pytest.mark.asyncio
+    async def test_variants_generated_concurrently(self):
+        """N variants cost one LLM latency, not N"""
+        mock_llm = MockLLMService(delay=0.2)
+        service = HyDEService(llm_service=mock_llm)
+
+        start = asyncio.get_running_loop().time()
+        result = await service.generate_hypothetical_document("Wann ist die Kita zu?", num_variants=4)
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert len(result) == 4
+        assert mock_llm.call_count == 4
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_cached(self):
+        """Repeated questions cost zero LLM calls; style and model are part of the key"""
+        mock_llm = MockLLMService()
+        service = HyDEService(llm_service=mock_llm)
+
+        first = await service.generate_hypothetical_document("Kita handover", num_variants=2)
+        second = await service.generate_hypothetical_document("Kita handover", num_variants=2)
+        assert first == second
+        assert mock_llm.call_count == 2
+
+        await service.generate_hypothetical_document("Kita handover", num_variants=2, document_style="email")
+        assert mock_llm.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_keeps_successful_variants(self):
+        """One failed variant doesn't discard the others"""
+        class FlakyLLM(MockLLMService):
+            async def call_llm(self, prompt, model_id=None, max_tokens=300, temperature=0.7, system_prompt=None):
+                self.call_count += 1
+                if self.call_count == 1:
+                    raise Exception("rate limited")
+                return self.response, 0.0, "mock"
+
+        service = HyDEService(llm_service=FlakyLLM())
+
+        result = await service.generate_hypothetical_document("Test query", num_variants=3)
+
+        assert result == ["Hypothetical document content."] * 2
+
+    def test_reciprocal_rank_fusion(self):
+        """Documents ranked well by several variants win"""
+        fused = reciprocal_rank_fusion([
+            [{"chunk_id": "a", "score": 0.9}, {"chunk_id": "b", "score": 0.8}],
+            [{"chunk_id": "b", "score": 0.4}, {"chunk_id": "c", "score": 0.3}],
+        ], k=60)
+
+        assert [r["chunk_id"] for r in fused] == ["b", "a", "c"]
+        assert fused[0]["rrf_score"] == pytest.approx(1 / 62 + 1 / 61)
+        assert fused[0]["from_query_variants"] == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_hyde_search_single_multi_query_request(self):
+        """All variants go to search_many in one call"""
+        mock_llm = MockLLMService(response="Hypothetical answer.")
+        service = HyDEService(llm_service=mock_llm)
+        calls = []
+
+        async def search_many(queries, top_k):
+            calls.append((list(queries), top_k))
+            return [[{"chunk_id": f"doc{i}", "score": 0.5}, {"chunk_id": "shared", "score": 0.4}]
+                    for i in range(len(queries))]
+
+        result = await service.hyde_search("Test query", search_many, num_variants=2, top_k=2)
+
+        assert calls == [(["Test query", "Hypothetical answer.", "Hypothetical answer."], 2)]
+        assert result[0]["chunk_id"] == "shared"
+        assert len(result) == 2
@@ -6,6 +6,7 @@ Tests the multi-provider LLM service including:
 - Token estimation
 - Provider availability checking
 - Cost calculation logic
+- Prompt caching (system message layout, cached-token accounting)
 """
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
@@ -316,6 +317,81 @@ class TestLLMService:
         assert call_args[1]['temperature'] == 0.7
 
 
+# =============================================================================
+# Prompt Caching Tests
+# =============================================================================
+
+class TestPromptCaching:
+    """Test cacheable system prompts and cached-token accounting"""
+
+    @pytest.fixture
+    def settings(self):
+        settings = Mock(spec=Settings)
+        settings.groq_api_key = "test_groq_key"
+        settings.anthropic_api_key = "test_anthropic_key"
+        settings.openai_api_key = "test_openai_key"
+        settings.google_api_key = None
+        settings.llm_temperature = 0.1
+        settings.daily_budget_usd = 10.0
+        settings.default_llm = "groq"
+        settings.fallback_llm = "anthropic"
+        settings.emergency_llm = "openai"
+        settings.enable_cost_tracking = True
+        return settings
+
+    def test_cached_tokens_billed_at_cached_price(self):
+        tracker = CostTracker()
+
+        full = tracker.calculate_cost("anthropic/claude-3-5-sonnet-20241022", 10_000, 0)
+        cached = tracker.calculate_cost("anthropic/claude-3-5-sonnet-20241022", 10_000, 0, cached_input_tokens=8_000)
+
+        # 2k uncached at $3/M + 8k cached at $0.30/M
+        assert full == pytest.approx(0.03)
+        assert cached == pytest.approx(0.006 + 0.0024)
+
+    def test_stats_report_cached_and_uncached_tokens(self):
+        tracker = CostTracker()
+        tracker.record_operation("anthropic", "anthropic/claude-3-haiku-20240307", 4000, 100, 0.001)
+        tracker.record_operation("anthropic", "anthropic/claude-3-haiku-20240307", 4000, 100, 0.0005,
+                                 cached_input_tokens=3000)
+
+        stats = tracker.get_stats()
+
+        assert stats.cached_input_tokens_today == 3000
+        assert stats.uncached_input_tokens_today == 5000
+        assert stats.prompt_cache_hit_rate == pytest.approx(3000 / 8000)
+
+    def test_system_prompt_messages(self, settings):
+        service = LLMService(settings)
+
+        anthropic = service._build_messages("doc", "anthropic/claude-3-haiku-20240307", "RULES")
+        groq = service._build_messages("doc", "groq/llama-3.1-8b-instant", "RULES")
+
+        assert anthropic[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert anthropic[0]["content"][0]["text"] == "RULES"
+        assert groq == [{"role": "system", "content": "RULES"}, {"role": "user", "content": "doc"}]
+        assert service._build_messages("doc", "groq/llama-3.1-8b-instant") == [{"role": "user", "content": "doc"}]
+
+    @pytest.mark.asyncio
+    @patch('src.services.llm_service.litellm.acompletion')
+    async def test_reported_usage_used_for_cost(self, mock_acompletion, settings):
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = "ok"
+        response.usage = Mock(prompt_tokens=5000, completion_tokens=20)
+        response.usage.prompt_tokens_details = Mock(cached_tokens=4096)
+        mock_acompletion.return_value = response
+        service = LLMService(settings)
+
+        _, cost, _ = await service.call_llm("doc", model_id="openai/gpt-4o-mini", system_prompt="RULES")
+
+        operation = service.cost_tracker.operations[0]
+        assert operation.input_tokens == 5000
+        assert operation.cached_input_tokens == 4096
+        assert cost == pytest.approx((904 * 0.15 + 4096 * 0.075 + 20 * 0.60) / 1_000_000)
+        assert mock_acompletion.call_args.kwargs["messages"][0] == {"role": "system", "content": "RULES"}
+
+
 # =============================================================================
 # Integration Test Markers
 # =============================================================================
@@ -0,0 +1,135 @@
+"""
+Unit tests for MetadataBitmapIndex
+
+Tests filter evaluation over per-value bitmaps including:
+- Equality, $in/$nin, $ne and $contains on indexed fields
+- $and/$or combinations
+- Scan fallback for unindexed fields and range operators
+- Agreement with matches_filter (the per-metadata reference)
+- Filtered BM25 in HybridSearchService
+"""
+
+import pytest
+
+from src.services.hybrid_search_service import HybridSearchService
+from src.services.metadata_bitmap_index import MetadataBitmapIndex, matches_filter
+
+
+METADATAS = [
+    {"doc_type": "email", "thread_id": "t1", "year": 2024, "people": "Anna Schmidt,Jonas Weber", "quality_score": 0.9},
+    {"doc_type": "email", "thread_id": "t2", "year": 2025, "people": ["Jonas Weber"], "quality_score": 0.4},
+    {"doc_type": "pdf", "source": "scanner", "year": 2024, "quality_score": 0.7},
+    {"doc_type": "pdf", "source": "upload", "year": "2024", "people": [{"name": "Anna Schmidt"}]},
+    {"title": "no indexed fields"},
+]
+
+FILTERS = [
+    {"doc_type": "email"},
+    {"doc_type": {"$ne": "email"}},
+    {"year": 2024},
+    {"year": {"$in": [2024, 2025]}},
+    {"source": {"$nin": ["scanner"]}},
+    {"people": {"$contains": "Anna Schmidt"}},
+    {"$and": [{"doc_type": "pdf"}, {"year": 2024}]},
+    {"$or": [{"thread_id": "t2"}, {"source": "upload"}]},
+    {"doc_type": "email", "year": 2024},
+    {"quality_score": {"$gte": 0.7}},
+    {"$and": [{"doc_type": "email"}, {"quality_score": {"$lt": 0.5}}]},
+    {"title": "no indexed fields"},
+]
+
+
+@pytest.fixture
+def index():
+    index = MetadataBitmapIndex()
+    for metadata in METADATAS:
+        index.add(metadata)
+    return index
+
+
+def matching(index, where):
+    return [int(i) for i in index.filter_mask(where).nonzero()[0]]
+
+
+# =============================================================================
+# MetadataBitmapIndex Tests
+# =============================================================================
+
+class TestMetadataBitmapIndex:
+    """Test bitmap filter evaluation"""
+
+    def test_no_filter(self, index):
+        assert index.filter_mask(None) is None
+        assert index.filter_mask({}) is None
+
+    def test_equality_is_typed(self, index):
+        assert matching(index, {"year": 2024}) == [0, 2]
+        assert matching(index, {"year": "2024"}) == [3]
+
+    def test_missing_field_never_matches(self, index):
+        assert matching(index, {"doc_type": {"$ne": "email"}}) == [2, 3]
+        assert matching(index, {"source": {"$nin": ["scanner"]}}) == [3]
+
+    def test_contains_list_and_comma_separated(self, index):
+        assert matching(index, {"people": {"$contains": "Jonas Weber"}}) == [0, 1]
+        assert matching(index, {"people": {"$contains": "Anna Schmidt"}}) == [0, 3]
+
+    @pytest.mark.parametrize("where", FILTERS)
+    def test_agrees_with_matches_filter(self, index, where):
+        expected = [i for i, metadata in enumerate(METADATAS) if matches_filter(metadata, where)]
+        assert matching(index, where) == expected
+
+    def test_chunks_added_after_query(self, index):
+        assert matching(index, {"doc_type": "email"}) == [0, 1]
+
+        for i in range(10):
+            index.add({"doc_type": "pdf" if i % 2 else "email"})
+
+        assert matching(index, {"doc_type": "email"}) == [0, 1, 5, 7, 9, 11, 13]
+        assert len(index.filter_mask({"doc_type": "email"})) == 15
+
+
+# =============================================================================
+# Filtered BM25 Tests
+# =============================================================================
+
+class TestFilteredBM25:
+    """Test BM25 only scores chunks passing the filter"""
+
+    @pytest.fixture
+    def service(self):
+        service = HybridSearchService()
+        service.add_documents("mail1", ["Rechnung Stadtwerke Strom Oktober"], {"doc_type": "email", "year": 2024})
+        service.add_documents("scan1", ["Rechnung Stadtwerke Gas", "Zählerstand Gas"], {"doc_type": "pdf", "year": 2024})
+        service.add_documents("mail2", ["Kita Abholzeiten Herbstferien"], {"doc_type": "email", "year": 2025})
+        service.add_documents("notes", [f"Notiz {i} ohne Treffer" for i in range(6)], {"doc_type": "text", "year": 2023})
+        return service
+
+    def test_filtered_results_match_filter(self, service):
+        results = service.bm25_search("Rechnung Stadtwerke Gas", top_k=5, filter={"doc_type": "email"})
+
+        assert [r["chunk_id"] for r in results] == ["mail1_chunk_0"]
+
+    def test_filtered_scores_equal_unfiltered(self, service):
+        unfiltered = {r["chunk_id"]: r["bm25_score"] for r in service.bm25_search("Rechnung Gas", top_k=10)}
+
+        filtered = service.bm25_search("Rechnung Gas", top_k=10, filter={"doc_type": "pdf"})
+
+        assert filtered
+        for result in filtered:
+            assert result["bm25_score"] == pytest.approx(unfiltered[result["chunk_id"]])
+
+    def test_only_matching_chunks_scored(self, service, monkeypatch):
+        scored_positions = []
+        original = service._term_scores
+        monkeypatch.setattr(
+            service, "_term_scores",
+            lambda token, positions, doc_len: scored_positions.append(list(positions)) or original(token, positions, doc_len)
+        )
+
+        service.bm25_search_many(["Kita", "Rechnung"], top_k=5, filter={"$and": [{"doc_type": "email"}, {"year": 2025}]})
+
+        assert scored_positions == [[3], [3]]
+
+    def test_empty_filter_result(self, service):
+        assert service.bm25_search_many(["Rechnung"], filter={"doc_type": "whatsapp"}) == [[]]
@@ -6,11 +6,14 @@ Tests structured logging, metrics collection, health checks, and observability
 
 import pytest
 import json
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from src.services.monitoring_service import (
     StructuredLogger,
     MetricsCollector,
+    QuantileSketch,
     HealthCheckMonitor,
     MonitoringService,
     HealthStatus,
@@ -286,6 +289,90 @@ class TestMetricsCollector:
         assert collector.get_counter("req", {"a": "1", "b": "2"}) == 2.0
 
 
+# =============================================================================
+# Quantile Sketch and Prometheus Export Tests
+# =============================================================================
+
+class TestQuantileSketch:
+    """Test fixed-memory latency histograms"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Sketch quantiles stay within 1% of the exact values"""
+        rng = random.Random(0)
+        values = [rng.lognormvariate(4, 1) for _ in range(20000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(len(ordered) * q)]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+        assert sketch.count == 20000
+        assert sketch.sum == pytest.approx(sum(values))
+
+    def test_memory_bounded(self):
+        """Bucket count does not grow with the number of observations"""
+        sketch = QuantileSketch(max_buckets=64)
+        for i in range(1, 50000):
+            sketch.add(float(i))
+
+        assert sketch._exact is None
+        assert len(sketch._buckets) <= 64
+        assert sketch.quantile(0.99) == pytest.approx(49500, rel=0.02)
+
+    def test_zero_values(self):
+        """Zero-latency observations are counted"""
+        sketch = QuantileSketch(exact_limit=0)
+        for _ in range(10):
+            sketch.add(0.0)
+        sketch.add(100.0)
+
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(0.99) == pytest.approx(100.0, rel=0.02)
+
+    def test_concurrent_counters(self):
+        """Counter increments from many threads are not lost"""
+        collector = MetricsCollector()
+
+        def work(_):
+            for _ in range(1000):
+                collector.increment_counter("hits")
+                collector.observe_histogram("latency_ms", 1.0)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(work, range(8)))
+
+        assert collector.get_counter("hits") == 8000
+        assert collector.get_histogram_stats("latency_ms")["count"] == 8000
+
+    def test_export_prometheus(self):
+        """Metrics render in the text exposition format"""
+        collector = MetricsCollector()
+        collector.increment_counter("http_requests_total", labels={"endpoint": "/search", "status": "200"})
+        collector.set_gauge("queue.depth", 3)
+        for v in (10.0, 20.0, 30.0):
+            collector.observe_histogram("search_duration_ms", v, labels={"endpoint": "/search"})
+
+        text = collector.export_prometheus()
+
+        assert "# TYPE http_requests_total counter" in text
+        assert 'http_requests_total{endpoint="/search",status="200"} 1.0' in text
+        assert "# TYPE queue_depth gauge" in text
+        assert "# TYPE search_duration_ms summary" in text
+        assert 'search_duration_ms{endpoint="/search",quantile="0.5"} 20.0' in text
+        assert 'search_duration_ms_count{endpoint="/search"} 3' in text
+        assert text.endswith("\n")
+
+    def test_export_escapes_label_values(self):
+        """Quotes and backslashes in label values are escaped"""
+        collector = MetricsCollector()
+        collector.increment_counter("errors_total", labels={"error": 'bad "quote" \\ here'})
+
+        assert 'error="bad \\"quote\\" \\\\ here"' in collector.export_prometheus()
+
+
 # =============================================================================
 # Health Check Monitor Tests
 # =============================================================================
@@ -373,6 +373,77 @@ class TestObsidianService:
         assert "inner2" not in cleaned["outer"]
 
 
+# =============================================================================
+# Entity Auto-Linking Tests
+# =============================================================================
+
+class TestAutoLinkEntities:
+    """Test single-pass entity WikiLink generation"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        return ObsidianService(output_dir=str(tmp_path), refs_dir=str(tmp_path / "refs"))
+
+    @pytest.fixture
+    def entities(self):
+        return {
+            'people': ['Daniel Teckentrup', 'Daniel', {'label': 'Anna Schmidt'}],
+            'organizations': ['ACME'],
+            'technologies': ['Python'],
+        }
+
+    def test_longest_entity_wins(self, service, entities):
+        result = service._auto_link_entities("Daniel Teckentrup joined.", entities)
+
+        assert result == "[[refs/persons/daniel-teckentrup|Daniel Teckentrup]] joined."
+
+    def test_shorter_entity_linked_inside_already_linked_longer_one(self, service, entities):
+        content = "Daniel Teckentrup called.\nLater Daniel Teckentrup wrote to Daniel."
+
+        result = service._auto_link_entities(content, entities)
+
+        assert result == (
+            "[[refs/persons/daniel-teckentrup|Daniel Teckentrup]] called.\n"
+            "Later [[refs/persons/daniel|Daniel]] Teckentrup wrote to Daniel."
+        )
+
+    def test_partially_overlapping_entities_link_leftmost(self, service):
+        entities = {'organizations': ['Kita Sonnenschein', 'Sonnenschein GmbH']}
+
+        result = service._auto_link_entities("Kita Sonnenschein GmbH", entities)
+
+        assert result == "[[refs/orgs/kita-sonnenschein|Kita Sonnenschein]] GmbH"
+
+    def test_first_occurrence_only(self, service, entities):
+        result = service._auto_link_entities("acme and ACME\nACME", entities)
+
+        assert result == "[[refs/orgs/acme|ACME]] and ACME\nACME"
+
+    def test_link_all_occurrences(self, service, entities):
+        result = service._auto_link_entities("Python, python", entities, link_all_occurrences=True)
+
+        assert result.count("[[refs/technologies/python|Python]]") == 2
+
+    def test_word_boundaries(self, service, entities):
+        result = service._auto_link_entities("Pythonic Danielle", entities)
+
+        assert result == "Pythonic Danielle"
+
+    def test_skips_code_frontmatter_and_linked_lines(self, service, entities):
+        content = "---\nauthor: Daniel\n---\n```\nPython\n```\nSee [[x]] Python\nAnna Schmidt"
+
+        result = service._auto_link_entities(content, entities)
+
+        assert "author: Daniel\n" in result
+        assert "```\nPython\n```" in result
+        assert "See [[x]] Python" in result
+        assert result.endswith("[[refs/persons/anna-schmidt|Anna Schmidt]]")
+
+    def test_no_entities(self, service):
+        assert service._auto_link_entities("text", {}) == "text"
+        assert service._auto_link_entities("text", {'people': ['']}) == "text"
+
+
 # =============================================================================
 # Integration-style Tests
 # =============================================================================
@@ -6,11 +6,13 @@ Tests cover:
 - ChromaDB setup
 - Document processing pipeline
 - File processing
+- Email attachments (single extraction, concurrent sub-documents)
 - Search functionality
 - Error handling
 - Cost tracking integration
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime, date
@@ -421,6 +423,60 @@ class TestFileProcessing:
             await rag_service.process_file("/nonexistent/file.txt")
 
 
+class TestEmailAttachments:
+    """Email attachments are extracted once and processed concurrently"""
+
+    @pytest.fixture
+    def service(self):
+        service = RAGService.__new__(RAGService)
+        service.document_service = Mock()
+        service.document_service.extract_text_from_file = AsyncMock(
+            side_effect=lambda path, process_ocr=False: (
+                f"Attachment text of {Path(path).name} with enough content.", DocumentType.pdf, {"file_extension": ".pdf"}
+            )
+        )
+        service._update_parent_with_attachment_links = AsyncMock()
+        return service
+
+    @pytest.fixture
+    def attachments(self, tmp_path):
+        paths = []
+        for name, size in [("a.pdf", 100), ("b.pdf", 100), ("c.pdf", 100), ("logo.png", 10)]:
+            path = tmp_path / name
+            path.write_bytes(b"x" * size)
+            paths.append(str(path))
+        return paths
+
+    @pytest.mark.asyncio
+    async def test_single_extraction_and_batched_links(self, service, attachments):
+        in_flight = []
+
+        async def process_document(**kwargs):
+            in_flight.append(in_flight[-1] + 1 if in_flight else 1)
+            await asyncio.sleep(0.01)
+            in_flight.append(in_flight[-1] - 1)
+            if "b.pdf" in kwargs["filename"]:
+                raise RuntimeError("enrichment failed")
+            name = kwargs["filename"].split()[-1]
+            return Mock(success=True, doc_id=f"id-{name}", obsidian_path=f"/vault/{name}.md")
+        service.process_document = process_document
+
+        extracted = await service._extract_attachments(attachments)
+        summaries = await service._extract_attachment_summaries(attachments, extracted=extracted)
+        await service._process_email_attachments(
+            attachments, "parent1", {"sender": "anna@example.com"}, extracted=extracted
+        )
+
+        assert service.document_service.extract_text_from_file.await_count == 3  # logo skipped, no re-extraction
+        assert [s["filename"] for s in summaries] == ["a.pdf", "b.pdf", "c.pdf"]
+        assert max(in_flight) == 3
+        service._update_parent_with_attachment_links.assert_awaited_once()
+        parent_id, links = service._update_parent_with_attachment_links.call_args.args
+        assert parent_id == "parent1"
+        assert [link["filename"] for link in links] == ["a.pdf", "c.pdf"]
+        assert extracted[attachments[0]][2] == {"file_extension": ".pdf"}  # cached metadata not mutated
+
+
 # ============================================================================
 # Search Tests
 # ============================================================================
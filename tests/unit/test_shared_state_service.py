@@ -0,0 +1,145 @@
+"""
+Unit tests for SharedStateStore and the services that use it
+
+Tests cross-worker state including:
+- Key/value TTL and LRU eviction
+- Atomic counters and replayable streams
+- Search cache hits shared between cache instances (workers)
+- One cost budget enforced across trackers
+- BM25 documents indexed by one worker searchable on another
+- Concurrent writers from separate processes
+"""
+
+import multiprocessing
+import time
+
+import pytest
+
+from src.services.hybrid_search_service import HybridSearchService
+from src.services.llm_service import CostTracker
+from src.services.search_cache_service import SharedSearchResultCache
+from src.services.shared_state_service import SharedStateStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "shared_state.db")
+
+
+@pytest.fixture
+def store(db_path):
+    return SharedStateStore(db_path)
+
+
+def _incr_many(store, count):
+    for _ in range(count):
+        store.incr("requests")
+
+
+# =============================================================================
+# Store Tests
+# =============================================================================
+
+class TestSharedStateStore:
+    """Test the SQLite backend"""
+
+    def test_set_get_and_ttl(self, store):
+        store.set("a", {"x": [1, 2]})
+        store.set("b", "gone", ttl_seconds=0.01)
+        time.sleep(0.02)
+
+        assert store.get("a") == {"x": [1, 2]}
+        assert store.get("b") is None
+        assert store.get("missing") is None
+
+    def test_evict_least_recently_used(self, store):
+        for key in ("p:1", "p:2", "p:3"):
+            store.set(key, key)
+            time.sleep(0.001)
+        store.get("p:1")  # touch
+
+        removed = store.evict("p:", max_entries=2)
+
+        assert removed == 1
+        assert store.get("p:2") is None
+        assert store.count("p:") == 2
+
+    def test_counters(self, store):
+        store.incr("cost:provider:groq", 0.5)
+        store.incr("cost:provider:groq", 0.25)
+        store.incr("cost:provider:openai", 1.0)
+
+        assert store.get_counter("cost:provider:groq") == pytest.approx(0.75)
+        assert store.get_counters("cost:provider:") == {"groq": 0.75, "openai": 1.0}
+
+    def test_streams_and_reset(self, store):
+        first = store.append("s", {"n": 1})
+        store.append("s", {"n": 2})
+
+        assert [v["n"] for _, v in store.read("s")] == [1, 2]
+        assert [v["n"] for _, v in store.read("s", after_seq=first)] == [2]
+
+        generation = store.reset_stream("s")
+        assert store.read("s") == []
+        assert store.stream_generation("s") == generation == 1
+
+    def test_counters_atomic_across_forked_workers(self, store):
+        store.incr("requests", 0)  # parent connection open at fork time
+        processes = [multiprocessing.Process(target=_incr_many, args=(store, 50)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+
+        assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+        assert store.get_counter("requests") == 200
+
+
+# =============================================================================
+# Service Integration Tests
+# =============================================================================
+
+class TestSharedServices:
+    """Two instances on one store behave like two workers"""
+
+    def test_search_cache_shared_between_workers(self, db_path):
+        worker_a = SharedSearchResultCache(SharedStateStore(db_path), max_size=10)
+        worker_b = SharedSearchResultCache(SharedStateStore(db_path), max_size=10)
+
+        worker_a.set("steuer", 5, [{"id": "doc1", "score": 0.9}])
+
+        assert worker_b.get("steuer", 5) == [{"id": "doc1", "score": 0.9}]
+        assert worker_b.get("other", 5) is None
+        assert worker_a.get_stats()["hits"] == 1
+        assert worker_a.get_stats()["misses"] == 1
+
+        worker_b.clear()
+        assert worker_a.get("steuer", 5) is None
+
+    def test_cost_budget_shared_between_workers(self, db_path):
+        worker_a = CostTracker(daily_budget=1.0, shared_state=SharedStateStore(db_path))
+        worker_b = CostTracker(daily_budget=1.0, shared_state=SharedStateStore(db_path))
+
+        worker_a.record_operation("groq", "groq/llama-3.1-8b-instant", 100, 50, 0.6)
+        assert worker_b.check_budget() is True
+        worker_b.record_operation("openai", "openai/gpt-4o-mini", 100, 50, 0.6)
+
+        assert worker_a.check_budget() is False
+        stats = worker_a.get_stats()
+        assert stats.total_cost_today == pytest.approx(1.2)
+        assert stats.operations_today == 2
+        assert set(stats.cost_by_provider) == {"groq", "openai"}
+
+    def test_bm25_index_shared_between_workers(self, db_path):
+        worker_a = HybridSearchService(shared_state=SharedStateStore(db_path))
+        worker_b = HybridSearchService(shared_state=SharedStateStore(db_path))
+
+        worker_a.add_documents("doc1", ["Die Steuererklärung ist fällig", "Rechnung der Stadtwerke"], {"title": "T"})
+        worker_a.add_documents("doc2", ["Kita Anmeldung im Herbst"], {"title": "K"})
+
+        results = worker_b.bm25_search("stadtwerke", top_k=3)
+        assert results[0]["chunk_id"] == "doc1_chunk_1"
+        assert worker_b.get_stats()["total_documents"] == 3
+
+        worker_b.clear_index()
+        assert worker_a.bm25_search("stadtwerke") == []
@@ -0,0 +1,102 @@
+"""
+Unit tests for the startup profiler
+
+Tests cold start instrumentation including:
+- Import hook recording cumulative and self time
+- Initialization step timing
+- LazyModule deferring imports and forwarding attribute writes (patching)
+- Heavy optional libraries staying unloaded until first use
+"""
+
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from src.core.startup_profiler import LazyModule, StartupProfiler, lazy_import
+
+
+# =============================================================================
+# Profiler Tests
+# =============================================================================
+
+class TestStartupProfiler:
+    """Test import and init timing"""
+
+    def test_import_hook_records_modules(self):
+        profiler = StartupProfiler()
+        sys.modules.pop("colorsys", None)
+        profiler.install_import_hook()
+        try:
+            import colorsys  # noqa: F401
+        finally:
+            profiler.uninstall_import_hook()
+
+        report = profiler.report()
+        assert "colorsys" in report["modules"]
+        timing = report["modules"]["colorsys"]
+        assert timing["cumulative_ms"] >= timing["self_ms"] >= 0
+        assert "colorsys" in report["packages"]
+
+    def test_uninstall_removes_hook(self):
+        profiler = StartupProfiler()
+        profiler.install_import_hook()
+        profiler.uninstall_import_hook()
+
+        sys.modules.pop("colorsys", None)
+        import colorsys  # noqa: F401
+
+        assert profiler.report()["modules_imported"] == 0
+
+    def test_steps_and_report_format(self):
+        profiler = StartupProfiler()
+        with profiler.step("RAGService.vocabulary"):
+            pass
+
+        report = profiler.report()
+        assert report["init_steps"][0]["name"] == "RAGService.vocabulary"
+        assert "STARTUP PROFILE" in profiler.format_report()
+
+
+# =============================================================================
+# Lazy Import Tests
+# =============================================================================
+
+class TestLazyImport:
+    """Test deferred module loading"""
+
+    def test_returns_loaded_module_directly(self):
+        assert lazy_import("json") is sys.modules["json"]
+
+    def test_defers_until_attribute_access(self):
+        sys.modules.pop("colorsys", None)
+        loaded = []
+        module = lazy_import("colorsys", on_load=lambda m: loaded.append(m))
+
+        assert isinstance(module, LazyModule)
+        assert "colorsys" not in sys.modules
+
+        assert module.rgb_to_hsv(1, 0, 0)[0] == 0
+        assert loaded == [sys.modules["colorsys"]]
+
+    def test_patch_through_proxy(self):
+        module = LazyModule("colorsys")
+
+        with patch.object(module, "rgb_to_hsv", return_value="patched"):
+            assert sys.modules["colorsys"].rgb_to_hsv(1, 0, 0) == "patched"
+        assert sys.modules["colorsys"].rgb_to_hsv(1, 0, 0) != "patched"
+
+    def test_service_imports_do_not_load_heavy_libraries(self):
+        """litellm, document format, OCR and watchdog libraries load on first use, not at import"""
+        code = (
+            "import sys; import src.services; import src.services.rag_service; "
+            "print(sorted(m for m in ('litellm', 'docx', 'pptx', 'openpyxl', 'PyPDF2', "
+            "'pytesseract', 'pdf2image', 'watchdog') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, timeout=120,
+            env={**os.environ, "LITELLM_LOCAL_MODEL_COST_MAP": "True"}
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -7,6 +7,7 @@ Tests evolving tag hierarchy management including:
 - Similarity detection
 - Deduplication
 - Statistics generation
+- Incremental counter updates and the similarity index
 """
 import pytest
 from unittest.mock import Mock, AsyncMock
@@ -322,6 +323,80 @@ class TestCoOccurrence:
         assert co_occur['tag-b']['tag-c'] == 1
 
 
+# =============================================================================
+# Incremental Counter Tests
+# =============================================================================
+
+class TestIncrementalCounters:
+    """Test counters maintained on add/delete instead of rescans"""
+
+    METADATAS = [
+        {"tags": "tech/ai/ml, literature", "domain": "technology"},
+        {"tags": "tech/ai, psychology/cognitive", "domain": "psychology"},
+        {"tags": "tech/ai/ml, project/active", "domain": "technology"},
+    ]
+
+    def test_add_metadatas(self):
+        service = TagTaxonomyService()
+        service.add_metadatas(self.METADATAS)
+
+        assert service.tag_cache['frequency']['tech/ai/ml'] == 2
+        assert service.tag_cache['co_occurrence']['tech/ai/ml']['literature'] == 1
+        assert 'tech/ai' in service.tag_cache['by_domain']['psychology']
+        assert service.tag_cache['total_docs'] == 3
+
+    def test_remove_metadatas(self):
+        service = TagTaxonomyService()
+        service.add_metadatas(self.METADATAS)
+        service.remove_metadatas(self.METADATAS[:2])
+
+        cache = service.tag_cache
+        assert dict(cache['frequency']) == {'tech/ai/ml': 1, 'project/active': 1}
+        assert 'literature' not in cache['co_occurrence']
+        assert 'psychology' not in cache['by_domain']
+        assert cache['unique_tags'] == 2
+        assert service.suggest_similar_tags("literature") == []
+
+    @pytest.mark.asyncio
+    async def test_refresh_does_not_rescan_after_build(self):
+        mock_collection = Mock()
+        mock_collection.get.return_value = {"ids": ["doc1"], "metadatas": [self.METADATAS[0]]}
+        service = TagTaxonomyService(collection=mock_collection)
+
+        await service.refresh_tag_cache()
+        service.last_refresh = datetime.now() - timedelta(hours=1)
+        service.add_metadatas([self.METADATAS[1]])
+        await service.refresh_tag_cache()
+
+        assert mock_collection.get.call_count == 1
+        assert service.tag_cache['frequency']['tech/ai'] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_rebuilds(self):
+        mock_collection = Mock()
+        mock_collection.get.return_value = {"ids": ["doc1"], "metadatas": [self.METADATAS[0]]}
+        service = TagTaxonomyService(collection=mock_collection)
+        await service.refresh_tag_cache()
+        service.add_metadatas([self.METADATAS[1]])
+
+        service.invalidate()
+        await service.refresh_tag_cache()
+
+        assert mock_collection.get.call_count == 2
+        assert 'tech/ai' not in service.tag_cache['frequency']
+
+    def test_similarity_index_finds_all_match_kinds(self):
+        service = TagTaxonomyService()
+        service.add_metadatas([{"tags": "ai, tech/ai/ml, health/mental, ml/tech"}])
+
+        similar = dict(service.suggest_similar_tags("tech/ai", threshold=0.5))
+
+        assert similar["tech/ai/ml"] == 0.9   # proposed is a substring
+        assert similar["ai"] == 0.9           # existing is a substring
+        assert similar["ml/tech"] == 0.5      # shared path component
+        assert "health/mental" not in similar
+
+
 # =============================================================================
 # Edge Cases and Error Handling Tests
 # =============================================================================
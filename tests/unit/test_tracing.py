@@ -0,0 +1,120 @@
+"""
+Unit tests for ingestion tracing
+
+Tests span recording including:
+- One span per pipeline stage on StageContext.trace
+- External call spans nested under the running stage
+- Timing breakdown structure
+- No-op behaviour without an active trace
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.tracing import Trace, activate_trace, get_current_trace, trace_span
+from src.pipeline.base import Pipeline, PipelineStage, StageResult, StageContext
+
+
+class CallingStage(PipelineStage):
+    """Stage that makes a fake external call"""
+
+    def __init__(self, name: str, kind: str = "llm", fail: bool = False):
+        super().__init__(name)
+        self.kind = kind
+        self.fail = fail
+
+    async def process(self, input_data, context):
+        with trace_span(f"{self.kind}.call", kind=self.kind):
+            await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("boom")
+        return StageResult.CONTINUE, input_data
+
+
+# =============================================================================
+# Trace Tests
+# =============================================================================
+
+class TestTrace:
+    """Test span bookkeeping"""
+
+    def test_span_records_parent_and_duration(self):
+        trace = Trace()
+        with activate_trace(trace):
+            with trace.span("enrichment", kind="stage"):
+                with trace_span("llm.call_llm", kind="llm", model="groq/llama"):
+                    pass
+
+        by_name = {span.name: span for span in trace.spans}
+        assert by_name["llm.call_llm"].parent == "enrichment"
+        assert by_name["llm.call_llm"].attributes == {"model": "groq/llama"}
+        assert by_name["enrichment"].parent is None
+        assert all(span.duration_ms >= 0 for span in trace.spans)
+
+    def test_span_marks_errors(self):
+        trace = Trace()
+        with pytest.raises(ValueError):
+            with trace.span("chroma.add", kind="chroma"):
+                raise ValueError("bad")
+
+        assert trace.spans[0].status == "error"
+
+    def test_trace_span_noop_without_trace(self):
+        assert get_current_trace() is None
+        with trace_span("llm.call_llm", kind="llm") as span:
+            assert span is None
+
+    def test_timing_breakdown(self):
+        trace = Trace()
+        with trace.span("storage", kind="stage"):
+            with trace.span("embedding.embed", kind="embedding"):
+                pass
+            with trace.span("embedding.embed", kind="embedding"):
+                pass
+
+        breakdown = trace.timing_breakdown()
+
+        assert set(breakdown) == {"total_ms", "stages", "external", "spans"}
+        assert "storage" in breakdown["stages"]
+        assert breakdown["external"]["embedding"]["calls"] == 2
+        assert len(breakdown["spans"]) == 3
+
+
+# =============================================================================
+# Pipeline Integration Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestPipelineTracing:
+    """Test spans recorded by Pipeline.run"""
+
+    async def test_stage_and_external_spans(self):
+        pipeline = Pipeline([CallingStage("enrichment", "llm"), CallingStage("storage", "chroma")])
+        context = StageContext(doc_id="doc", filename="doc.txt")
+
+        await pipeline.run("input", context)
+
+        breakdown = context.trace.timing_breakdown()
+        assert list(breakdown["stages"]) == ["enrichment", "storage"]
+        assert breakdown["external"]["llm"]["calls"] == 1
+        assert breakdown["external"]["chroma"]["calls"] == 1
+        parents = {span.name: span.parent for span in context.trace.spans}
+        assert parents["llm.call"] == "enrichment"
+        assert parents["chroma.call"] == "storage"
+
+    async def test_failing_stage_span_has_error_status(self):
+        pipeline = Pipeline([CallingStage("enrichment", fail=True)])
+        context = StageContext(doc_id="doc", filename="doc.txt")
+
+        result, _ = await pipeline.run("input", context)
+
+        assert result == StageResult.ERROR
+        stage_span = next(s for s in context.trace.spans if s.kind == "stage")
+        assert stage_span.status == "error"
+
+    async def test_trace_deactivated_after_run(self):
+        pipeline = Pipeline([CallingStage("enrichment")])
+        await pipeline.run("input", StageContext(doc_id="doc", filename="doc.txt"))
+
+        assert get_current_trace() is None
@@ -0,0 +1,181 @@
+"""
+Unit tests for VaultWriteQueue
+
+Tests write-behind batching of Obsidian vault files including:
+- Coalescing repeated writes to the same file
+- Read-through of pending content
+- Atomic flushes and size-triggered flushes
+- Direct (non-batched) mode
+- Daily note and entity stub integration
+"""
+
+import os
+import stat
+
+import pytest
+from datetime import datetime
+
+from src.services.vault_writer_service import VaultWriteQueue
+from src.services.daily_note_service import DailyNoteService
+from src.services.obsidian_service import ObsidianService
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def queue():
+    q = VaultWriteQueue(flush_interval=0, max_pending=100, write_behind=True)
+    yield q
+    q.close()
+
+
+# =============================================================================
+# Queue Tests
+# =============================================================================
+
+class TestVaultWriteQueue:
+    """Test write-behind queue behaviour"""
+
+    def test_writes_deferred_until_flush(self, queue, tmp_path):
+        path = tmp_path / "note.md"
+        queue.write_text(path, "hello")
+
+        assert not path.exists()
+        assert queue.exists(path)
+        assert queue.read_text(path) == "hello"
+
+        result = queue.flush()
+
+        assert result["files_written"] == 1
+        assert path.read_text(encoding="utf-8") == "hello"
+        assert queue.pending_count() == 0
+
+    def test_repeated_writes_coalesced(self, queue, tmp_path):
+        path = tmp_path / "daily.md"
+        for i in range(10):
+            queue.write_text(path, f"version {i}")
+
+        queue.flush()
+        stats = queue.get_stats()
+
+        assert path.read_text(encoding="utf-8") == "version 9"
+        assert stats["writes_requested"] == 10
+        assert stats["writes_coalesced"] == 9
+        assert stats["files_written"] == 1
+
+    def test_read_missing_file(self, queue, tmp_path):
+        assert queue.read_text(tmp_path / "missing.md") is None
+        assert not queue.exists(tmp_path / "missing.md")
+
+    def test_read_falls_back_to_disk(self, queue, tmp_path):
+        path = tmp_path / "existing.md"
+        path.write_text("on disk", encoding="utf-8")
+
+        assert queue.read_text(path) == "on disk"
+
+    def test_max_pending_triggers_flush(self, tmp_path):
+        q = VaultWriteQueue(flush_interval=0, max_pending=3, write_behind=True)
+        for i in range(3):
+            q.write_text(tmp_path / f"{i}.md", "x")
+
+        assert q.pending_count() == 0
+        assert len(list(tmp_path.glob("*.md"))) == 3
+
+    def test_creates_parent_dirs_and_leaves_no_temp_files(self, queue, tmp_path):
+        path = tmp_path / "refs" / "persons" / "anna.md"
+        queue.write_text(path, "stub")
+        queue.flush()
+
+        assert path.read_text(encoding="utf-8") == "stub"
+        assert [p.name for p in path.parent.iterdir()] == ["anna.md"]
+
+    @pytest.mark.parametrize("write_behind", [True, False])
+    def test_new_files_get_default_mode(self, tmp_path, write_behind):
+        umask = os.umask(0)
+        os.umask(umask)
+        q = VaultWriteQueue(flush_interval=0, write_behind=write_behind)
+        path = tmp_path / "note.md"
+        q.write_text(path, "x")
+        q.flush()
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+
+    def test_existing_file_mode_kept(self, queue, tmp_path):
+        path = tmp_path / "note.md"
+        path.write_text("old", encoding="utf-8")
+        path.chmod(0o640)
+        queue.write_text(path, "new")
+        queue.flush()
+
+        assert path.read_text(encoding="utf-8") == "new"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+    def test_discard_glob_drops_pending_writes(self, queue, tmp_path):
+        deleted = tmp_path / "Report_abcd1234.md"
+        kept = tmp_path / "Other_ffff0000.md"
+        queue.write_text(deleted, "doc")
+        queue.write_text(kept, "other")
+
+        assert queue.discard_glob(tmp_path, "*_abcd1234.md") == [deleted]
+        queue.flush()
+
+        assert not deleted.exists()
+        assert not queue.exists(deleted)
+        assert kept.read_text(encoding="utf-8") == "other"
+
+    def test_direct_mode_writes_immediately(self, tmp_path):
+        q = VaultWriteQueue(write_behind=False)
+        path = tmp_path / "direct.md"
+        q.write_text(path, "now")
+
+        assert path.read_text(encoding="utf-8") == "now"
+        assert q.pending_count() == 0
+
+    def test_direct_mode_sees_external_deletes(self, tmp_path):
+        q = VaultWriteQueue(write_behind=False)
+        path = tmp_path / "stub.md"
+        q.write_text(path, "x")
+        path.unlink()
+
+        assert not q.exists(path)
+
+
+# =============================================================================
+# Integration Tests
+# =============================================================================
+
+class TestVaultIntegration:
+    """Test daily notes and stubs going through a shared queue"""
+
+    def test_daily_note_updates_coalesce(self, queue, tmp_path):
+        service = DailyNoteService(refs_dir=str(tmp_path / "refs"), write_queue=queue)
+        day = datetime(2025, 10, 15)
+
+        for i in range(5):
+            service.add_document_to_daily_note(day, f"Doc {i}", "email", f"id{i}", f"file{i}")
+
+        daily_path = service.get_daily_note_path(day)
+        assert not daily_path.exists()
+
+        queue.flush()
+        content = daily_path.read_text(encoding="utf-8")
+
+        assert all(f"[[file{i}|Doc {i}]]" in content for i in range(5))
+        assert queue.get_stats()["files_written"] == 1
+
+    def test_entity_stub_created_once(self, queue, tmp_path):
+        service = ObsidianService(
+            output_dir=str(tmp_path),
+            refs_dir=str(tmp_path / "refs"),
+            write_queue=queue
+        )
+
+        first = service.create_entity_stub("person", "Anna Schmidt")
+        second = service.create_entity_stub("person", "Anna Schmidt")
+        queue.flush()
+
+        assert first == second
+        assert first.exists()
+        assert queue.get_stats()["writes_requested"] == 1
@@ -91,6 +91,48 @@ async def test_search_with_filter(vector_service, mock_collection):
     assert call_args["where"] == filter_dict
 
 
+@pytest.mark.asyncio
+async def test_dense_search_many_single_request(vector_service, mock_collection):
+    """Test several queries share one ChromaDB request"""
+    mock_collection.query.return_value = {
+        "ids": [["doc1"], ["doc2", "doc3"]],
+        "documents": [["Content 1"], ["Content 2", "Content 3"]],
+        "metadatas": [[{}], [{}, {}]],
+        "distances": [[0.1], [0.2, 0.3]]
+    }
+
+    results = await vector_service.dense_search_many(["first", "second"], top_k=2)
+
+    mock_collection.query.assert_called_once()
+    assert mock_collection.query.call_args[1]["query_texts"] == ["first", "second"]
+    assert [[r["chunk_id"] for r in res] for res in results] == [["doc1"], ["doc2", "doc3"]]
+
+
+@pytest.mark.asyncio
+async def test_search_many(vector_service, mock_collection):
+    """Test batch search: one ChromaDB request, cached queries skipped, input order kept"""
+    vector_service.cache.clear()
+    vector_service.hybrid_search_service = Mock()
+    vector_service.hybrid_search_service.hybrid_search_many = Mock(
+        side_effect=lambda queries, dense_results_list, **kwargs: [[{"chunk_id": q}] for q in queries]
+    )
+    mock_collection.query.return_value = {
+        "ids": [["doc1"], ["doc2"]],
+        "documents": [["Content 1"], ["Content 2"]],
+        "metadatas": [[{}], [{}]],
+        "distances": [[0.1], [0.2]]
+    }
+    vector_service.cache.set("cached", 5, [{"chunk_id": "from_cache"}], None, search_type="hybrid")
+
+    results = await vector_service.search_many(["alpha", "cached", "beta", "alpha"], top_k=5)
+
+    assert results == [[{"chunk_id": "alpha"}], [{"chunk_id": "from_cache"}], [{"chunk_id": "beta"}], [{"chunk_id": "alpha"}]]
+    mock_collection.query.assert_called_once()
+    assert mock_collection.query.call_args[1]["query_texts"] == ["alpha", "beta"]
+    assert mock_collection.query.call_args[1]["n_results"] == 15
+    assert vector_service.cache.get("beta", 5, None, search_type="hybrid") == [{"chunk_id": "beta"}]
+
+
 @pytest.mark.asyncio
 async def test_get_document(vector_service, mock_collection):
     """Test retrieving a specific document by ID"""
@@ -0,0 +1,171 @@
+"""
+Unit tests for WatchFolderIngestor
+
+Tests watch-folder ingestion including:
+- Events from a non-loop thread handed to the event loop
+- Debounce until the file size is stable
+- Deduplication by path and by content hash
+- Bounded batches
+- watchdog handler forwarding
+"""
+
+import asyncio
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.watch_folder_service import FileWatchHandler, WatchFolderIngestor
+
+
+class Recorder:
+    """Fake process_file recording batches and peak concurrency"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.paths = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, path: str):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        self.paths.append(path)
+
+
+async def wait_for(condition, timeout: float = 3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+# =============================================================================
+# WatchFolderIngestor Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestWatchFolderIngestor:
+    """Test debouncing, deduplication and batching"""
+
+    async def test_waits_for_stable_size(self, tmp_path):
+        recorder = Recorder()
+        ingestor = WatchFolderIngestor(recorder, debounce_s=0.2, poll_interval_s=0.02)
+        ingestor.start()
+        path = tmp_path / "scan.pdf"
+
+        with open(path, "wb") as f:
+            ingestor.notify(str(path))
+            for _ in range(5):  # still being written
+                f.write(b"x" * 1000)
+                f.flush()
+                await asyncio.sleep(0.1)
+            assert recorder.paths == []
+
+        await wait_for(lambda: recorder.paths)
+        await ingestor.stop()
+
+        assert recorder.paths == [str(path)]
+
+    async def test_events_from_watchdog_thread(self, tmp_path):
+        recorder = Recorder()
+        ingestor = WatchFolderIngestor(recorder, debounce_s=0.05, poll_interval_s=0.02)
+        early = tmp_path / "early.txt"
+        early.write_text("dropped before startup")
+        ingestor.notify(str(early))  # buffered until start()
+        ingestor.start()
+
+        late = tmp_path / "late.txt"
+        late.write_text("dropped later")
+        thread = threading.Thread(target=ingestor.notify, args=(str(late),))
+        thread.start()
+        thread.join()
+
+        await wait_for(lambda: len(recorder.paths) == 2)
+        await ingestor.stop()
+
+        assert sorted(recorder.paths) == [str(early), str(late)]
+
+    async def test_deduplicates_by_path_and_hash(self, tmp_path):
+        recorder = Recorder(delay=0.2)
+        ingestor = WatchFolderIngestor(recorder, debounce_s=0.05, poll_interval_s=0.02)
+        ingestor.start()
+        original = tmp_path / "rechnung.pdf"
+        original.write_bytes(b"same bytes")
+        copy = tmp_path / "rechnung (1).pdf"
+        copy.write_bytes(b"same bytes")
+        (tmp_path / "download.part").write_bytes(b"partial")
+
+        for _ in range(3):
+            ingestor.notify(str(original))
+        ingestor.notify(str(copy))
+        ingestor.notify(str(tmp_path / "download.part"))
+
+        await wait_for(lambda: ingestor.stats["duplicates"] == 1 and recorder.paths)
+        await ingestor.stop()
+
+        assert len(recorder.paths) == 1
+        assert ingestor.stats["queued"] == 1
+
+    async def test_bounded_batches(self, tmp_path):
+        recorder = Recorder(delay=0.05)
+        ingestor = WatchFolderIngestor(recorder, debounce_s=0.05, poll_interval_s=0.02, batch_size=3, queue_size=5)
+        ingestor.start()
+        for i in range(10):
+            path = tmp_path / f"doc{i}.txt"
+            path.write_text(f"document {i}")
+            ingestor.notify(str(path))
+
+        await wait_for(lambda: ingestor.stats["processed"] == 10)
+        await ingestor.stop()
+
+        assert len(recorder.paths) == 10
+        assert recorder.max_in_flight == 3
+        assert ingestor.stats["batches"] >= 4
+
+    async def test_unreadable_file_does_not_stop_debouncer(self, tmp_path, monkeypatch):
+        recorder = Recorder()
+        ingestor = WatchFolderIngestor(recorder, debounce_s=0.05, poll_interval_s=0.02)
+        locked = tmp_path / "locked.pdf"
+        locked.write_bytes(b"no access")
+        real_stat = os.stat
+        monkeypatch.setattr(
+            "src.services.watch_folder_service.os.stat",
+            lambda path: (_ for _ in ()).throw(PermissionError("denied")) if path == str(locked) else real_stat(path)
+        )
+        ingestor.start()
+        ingestor.notify(str(locked))
+        await asyncio.sleep(0.1)
+
+        readable = tmp_path / "readable.pdf"
+        readable.write_bytes(b"fine")
+        ingestor.notify(str(readable))
+        await wait_for(lambda: recorder.paths)
+        await ingestor.stop()
+
+        assert recorder.paths == [str(readable)]
+        assert ingestor.get_stats()["pending"] == 0
+
+
+# =============================================================================
+# FileWatchHandler Tests
+# =============================================================================
+
+class TestFileWatchHandler:
+    """Test watchdog event forwarding"""
+
+    def test_forwards_file_events(self):
+        notified = []
+        handler = FileWatchHandler(SimpleNamespace(notify=notified.append))
+
+        handler.on_created(SimpleNamespace(is_directory=False, src_path="/in/a.pdf"))
+        handler.on_created(SimpleNamespace(is_directory=True, src_path="/in/sub"))
+        handler.on_modified(SimpleNamespace(is_directory=False, src_path="/in/a.pdf"))
+        handler.on_moved(SimpleNamespace(is_directory=False, src_path="/in/b.pdf.part", dest_path="/in/b.pdf"))
+        handler.on_moved(SimpleNamespace(is_directory=False, src_path="/in/c.pdf", dest_path="/processed/c.pdf"))
+
+        assert notified == ["/in/a.pdf", "/in/a.pdf", "/in/b.pdf"]